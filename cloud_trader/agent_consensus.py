@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import numpy as np
+
 from .market_regime import MarketRegime, RegimeMetrics
 from .time_sync import get_timestamp_us
 
@@ -64,6 +66,60 @@ class AgentSignal:
         }
 
 
+SIGNAL_TYPES: List[SignalType] = list(SignalType)
+_SIGNAL_INDEX = {signal_type: i for i, signal_type in enumerate(SIGNAL_TYPES)}
+
+
+@dataclass
+class SignalBatch:
+    """Pending signals for many symbols as parallel arrays.
+
+    Row ``i`` is one signal: ``agent_idx[i]`` indexes ``agent_ids``,
+    ``symbol_idx[i]`` indexes ``symbols`` and ``signal_type[i]`` indexes
+    ``SIGNAL_TYPES``. ``signals`` keeps the originating ``AgentSignal`` objects
+    (same order) when the batch was built from them.
+    """
+
+    agent_ids: List[str]
+    symbols: List[str]
+    agent_idx: np.ndarray
+    symbol_idx: np.ndarray
+    signal_type: np.ndarray
+    confidence: np.ndarray
+    strength: np.ndarray
+    signals: Optional[List[AgentSignal]] = None
+
+    def __len__(self) -> int:
+        return len(self.agent_idx)
+
+    @classmethod
+    def from_signals(cls, signals: List[AgentSignal]) -> "SignalBatch":
+        agents: Dict[str, int] = {}
+        symbols: Dict[str, int] = {}
+        n = len(signals)
+        agent_idx = np.empty(n, dtype=np.int64)
+        symbol_idx = np.empty(n, dtype=np.int64)
+        signal_type = np.empty(n, dtype=np.int64)
+        confidence = np.empty(n, dtype=np.float64)
+        strength = np.empty(n, dtype=np.float64)
+        for i, signal in enumerate(signals):
+            agent_idx[i] = agents.setdefault(signal.agent_id, len(agents))
+            symbol_idx[i] = symbols.setdefault(signal.symbol, len(symbols))
+            signal_type[i] = _SIGNAL_INDEX[signal.signal_type]
+            confidence[i] = signal.confidence
+            strength[i] = signal.strength
+        return cls(
+            agent_ids=list(agents),
+            symbols=list(symbols),
+            agent_idx=agent_idx,
+            symbol_idx=symbol_idx,
+            signal_type=signal_type,
+            confidence=confidence,
+            strength=strength,
+            signals=list(signals),
+        )
+
+
 @dataclass
 class ConsensusResult:
     """Result of consensus voting among agents."""
@@ -201,15 +257,8 @@ class AgentConsensusEngine:
 
     def submit_signal(self, signal: AgentSignal) -> None:
         """Submit a signal from an agent for consensus consideration."""
-        print(
-            f"🔔 SUBMIT_SIGNAL: {signal.agent_id} → {signal.symbol} {signal.signal_type.value} ({signal.confidence:.2f})"
-        )
-
         # Validate agent is registered
         if signal.agent_id not in self.agent_registry:
-            print(
-                f"❌ REJECTED: Agent {signal.agent_id} not registered! Registry has: {list(self.agent_registry.keys())}"
-            )
             logger.warning(f"Received signal from unregistered agent: {signal.agent_id}")
             return
 
@@ -219,10 +268,6 @@ class AgentConsensusEngine:
         # Add to pending aggregation
         self.pending_signals[signal.symbol].append(signal)
 
-        print(
-            f"✅ SIGNAL ADDED: {signal.symbol} now has {len(self.pending_signals[signal.symbol])} pending signals"
-        )
-
         # Signal will be processed in consensus voting
         logger.debug(
             f"Received signal from {signal.agent_id}: {signal.signal_type.value} "
@@ -256,6 +301,174 @@ class AgentConsensusEngine:
 
         return consensus_result
 
+    def drain_pending_batch(self) -> SignalBatch:
+        """Consume every pending signal (all symbols) as one ``SignalBatch``."""
+        signals = [signal for pending in self.pending_signals.values() for signal in pending]
+        self.pending_signals.clear()
+        return SignalBatch.from_signals(signals)
+
+    async def conduct_batch_consensus_vote(
+        self,
+        batch: Optional[SignalBatch] = None,
+        regimes: Optional[Dict[str, RegimeMetrics]] = None,
+        min_confidence: float = 0.0,
+        min_agreement: float = 0.0,
+    ) -> Dict[str, ConsensusResult]:
+        """
+        Vote on every symbol in ``batch`` at once (defaults to all pending signals).
+
+        Scores, agreement and participation match ``conduct_consensus_vote`` but
+        are computed for all symbols in one NumPy pass. Only symbols whose
+        consensus clears ``min_confidence`` and ``min_agreement`` get a
+        ``ConsensusResult`` (and a consensus history entry).
+        """
+        if batch is None:
+            batch = self.drain_pending_batch()
+        if not len(batch):
+            return {}
+
+        n_symbols, n_agents, n_types = len(batch.symbols), len(batch.agent_ids), len(SIGNAL_TYPES)
+        regimes = regimes or {}
+
+        # Weight table per (agent, distinct regime); weights don't depend on the symbol otherwise
+        symbol_regimes = [regimes.get(symbol) for symbol in batch.symbols]
+        regime_keys: Dict[Any, int] = {}
+        regime_samples: List[Optional[RegimeMetrics]] = []
+        regime_code = np.empty(n_symbols, dtype=np.int64)
+        drop_low = np.zeros(n_symbols, dtype=bool)
+        for i, regime in enumerate(symbol_regimes):
+            key = regime.regime if regime else None
+            if key not in regime_keys:
+                regime_keys[key] = len(regime_samples)
+                regime_samples.append(regime)
+            regime_code[i] = regime_keys[key]
+            drop_low[i] = bool(regime) and self._drops_low_confidence(regime)
+        weight_table = np.array(
+            [
+                [self._agent_weight(agent_id, regime) for regime in regime_samples]
+                for agent_id in batch.agent_ids
+            ],
+            dtype=np.float64,
+        ).reshape(n_agents, len(regime_samples))
+
+        # In volatile markets, only consider high-confidence signals
+        keep = ~(drop_low[batch.symbol_idx] & (batch.confidence < 0.7))
+        rows = np.flatnonzero(keep)
+        sym = batch.symbol_idx[rows]
+        agent = batch.agent_idx[rows]
+        types = batch.signal_type[rows]
+        conf = batch.confidence[rows]
+        strength = batch.strength[rows]
+        w = weight_table[agent, regime_code[sym]]
+
+        # Per (symbol, type) sums
+        cell = sym * n_types + types
+        size = n_symbols * n_types
+        shape = (n_symbols, n_types)
+        type_weight = np.bincount(cell, weights=w, minlength=size).reshape(shape)
+        conf_weight = np.bincount(cell, weights=conf * w, minlength=size).reshape(shape)
+        strength_weight = np.bincount(cell, weights=strength * w, minlength=size).reshape(shape)
+        votes = np.bincount(cell, minlength=size).reshape(shape)
+        first_seen = np.full(size, len(rows), dtype=np.int64)
+        np.minimum.at(first_seen, cell, np.arange(len(rows)))
+        first_seen = first_seen.reshape(shape)
+
+        # Each agent's weight counts once per symbol in the total
+        pair = sym * n_agents + agent
+        _, first_pair = np.unique(pair, return_index=True)
+        total_weight = np.bincount(sym[first_pair], weights=w[first_pair], minlength=n_symbols)
+
+        voted = votes > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted_conf = np.where(voted, conf_weight / type_weight, 0.0)
+            weighted_strength = np.where(voted, strength_weight / type_weight, 0.0)
+            participation = np.where(
+                total_weight[:, None] > 0, type_weight / total_weight[:, None], 0.0
+            )
+        score = np.where(voted, weighted_conf * weighted_strength * participation, -np.inf)
+
+        # Highest score wins; ties go to the signal type that was submitted first
+        best = score.max(axis=1, keepdims=True)
+        winner = np.where(score == best, first_seen, np.iinfo(np.int64).max).argmin(axis=1)
+        idx = np.arange(n_symbols)
+        max_score = np.where(np.isfinite(best[:, 0]), best[:, 0], 0.0)
+        participation_sum = participation.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            agreement = np.where(
+                participation_sum > 0, participation[idx, winner] / participation_sum, 0.0
+            )
+        counts = np.bincount(sym, minlength=n_symbols)
+        expected_agents = len(self.agent_registry)
+        participation_rate = counts / expected_agents if expected_agents else np.zeros(n_symbols)
+        confidence = np.minimum(1.0, max_score)
+
+        selected = np.flatnonzero(
+            (counts > 0) & (confidence >= min_confidence) & (agreement >= min_agreement)
+        )
+        if not len(selected):
+            return {}
+
+        # Materialise results only for the symbols that cleared the thresholds
+        order = np.argsort(sym, kind="stable")
+        bounds = np.searchsorted(sym[order], np.arange(n_symbols + 1))
+        results: Dict[str, ConsensusResult] = {}
+        for s_i in selected:
+            symbol = batch.symbols[s_i]
+            symbol_rows = rows[order[bounds[s_i] : bounds[s_i + 1]]]
+            agent_votes = {
+                batch.agent_ids[batch.agent_idx[r]]: self._batch_signal(batch, r)
+                for r in symbol_rows
+            }
+            present = sorted(np.flatnonzero(voted[s_i]), key=lambda t: first_seen[s_i, t])
+            signal_scores = {
+                SIGNAL_TYPES[t]: {
+                    "weighted_confidence": float(weighted_conf[s_i, t]),
+                    "weighted_strength": float(weighted_strength[s_i, t]),
+                    "participation": float(participation[s_i, t]),
+                    "votes": int(votes[s_i, t]),
+                }
+                for t in present
+            }
+            winning_signal = SIGNAL_TYPES[winner[s_i]]
+            result = ConsensusResult(
+                winning_signal=winning_signal,
+                consensus_confidence=float(confidence[s_i]),
+                agreement_level=float(agreement[s_i]),
+                participation_rate=float(participation_rate[s_i]),
+                total_votes=int(counts[s_i]),
+                method_used=ConsensusMethod.WEIGHTED_VOTE,
+                symbol=symbol,
+                timestamp_us=get_timestamp_us(),
+                agent_votes=agent_votes,
+                reasoning=self._generate_consensus_reasoning(
+                    winning_signal,
+                    float(max_score[s_i]),
+                    float(agreement[s_i]),
+                    float(participation_rate[s_i]),
+                    signal_scores,
+                    agent_votes,
+                ),
+            )
+            results[symbol] = result
+            self.consensus_history.append(result)
+
+        if len(self.consensus_history) > 1000:
+            self.consensus_history = self.consensus_history[-1000:]
+        return results
+
+    @staticmethod
+    def _batch_signal(batch: SignalBatch, row: int) -> AgentSignal:
+        if batch.signals is not None:
+            return batch.signals[row]
+        return AgentSignal(
+            agent_id=batch.agent_ids[batch.agent_idx[row]],
+            signal_type=SIGNAL_TYPES[batch.signal_type[row]],
+            confidence=float(batch.confidence[row]),
+            strength=float(batch.strength[row]),
+            symbol=batch.symbols[batch.symbol_idx[row]],
+            timestamp_us=get_timestamp_us(),
+        )
+
     # MOCK METHODS REMOVED
 
     def _apply_regime_filtering(
@@ -267,46 +480,47 @@ class AgentConsensusEngine:
         weights = {}
 
         for signal in filtered_signals:
-            base_weight = self.agent_weights[signal.agent_id]
+            if regime and self._drops_low_confidence(regime) and signal.confidence < 0.7:
+                # In volatile markets, only consider high-confidence signals
+                filtered_signals.remove(signal)
+                continue
 
-            # Apply regime adjustments
-            if regime:
-                regime_adjustments = self.regime_weights.get(regime.regime, {})
-
-                # Reduce weight for conflicting strategies in certain regimes
-                agent_info = self.agent_registry[signal.agent_id]
-                agent_type = agent_info["specialization"]
-
-                if regime.regime == MarketRegime.VOLATILE and regime_adjustments.get(
-                    "high_confidence_only"
-                ):
-                    # In volatile markets, only consider high-confidence signals
-                    if signal.confidence < 0.7:
-                        filtered_signals.remove(signal)
-                        continue
-
-                if regime.regime == MarketRegime.VOLATILE and regime_adjustments.get(
-                    "reduce_participation"
-                ):
-                    # Reduce participation in volatile markets
-                    base_weight *= 0.8
-
-                # Apply specialization-based adjustments
-                for key, multiplier in regime_adjustments.items():
-                    if key in agent_type or agent_type in key:
-                        base_weight *= multiplier
-
-            # Apply performance-based weighting
-            if signal.agent_id in self.agent_performance:
-                performance_weight = self.agent_performance[signal.agent_id].calculate_weight(
-                    base_weight
-                )
-                weights[signal.agent_id] = performance_weight
-            else:
-                weights[signal.agent_id] = base_weight
+            weights[signal.agent_id] = self._agent_weight(signal.agent_id, regime)
 
         return filtered_signals, weights
 
+    def _drops_low_confidence(self, regime: RegimeMetrics) -> bool:
+        return regime.regime == MarketRegime.VOLATILE and bool(
+            self.regime_weights.get(regime.regime, {}).get("high_confidence_only")
+        )
+
+    def _agent_weight(self, agent_id: str, regime: Optional[RegimeMetrics]) -> float:
+        """Voting weight of ``agent_id`` under ``regime`` (regime and performance adjusted)."""
+        base_weight = self.agent_weights[agent_id]
+
+        # Apply regime adjustments
+        if regime:
+            regime_adjustments = self.regime_weights.get(regime.regime, {})
+
+            # Reduce weight for conflicting strategies in certain regimes
+            agent_type = self.agent_registry[agent_id]["specialization"]
+
+            if regime.regime == MarketRegime.VOLATILE and regime_adjustments.get(
+                "reduce_participation"
+            ):
+                # Reduce participation in volatile markets
+                base_weight *= 0.8
+
+            # Apply specialization-based adjustments
+            for key, multiplier in regime_adjustments.items():
+                if key in agent_type or agent_type in key:
+                    base_weight *= multiplier
+
+        # Apply performance-based weighting
+        if agent_id in self.agent_performance:
+            return self.agent_performance[agent_id].calculate_weight(base_weight)
+        return base_weight
+
     def _conduct_voting(
         self, signals: List[AgentSignal], weights: Dict[str, float], symbol: str
     ) -> ConsensusResult:
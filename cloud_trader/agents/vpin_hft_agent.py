@@ -1,8 +1,11 @@
 import asyncio
 import math
 import statistics
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from ..data.order_book import L2OrderBook, OrderBookEngine
+from ..data.vpin import RollingDistribution, VpinEngine
 from ..time_sync import get_precision_clock, get_timestamp_us
 
 try:
@@ -25,8 +28,16 @@ from ..partial_exits import ExitSignal, PartialExitStrategy, PositionExitPlan
 
 
 class VpinHFTAgent:
-    def __init__(self, exchange_client: Any, pubsub_client: Any, risk_manager_topic: str):
+    def __init__(
+        self,
+        exchange_client: Any,
+        pubsub_client: Any,
+        risk_manager_topic: str,
+        order_books: Optional[OrderBookEngine] = None,
+    ):
         self.exchange_client = exchange_client
+        # Live L2 books from the market data stream, when it maintains them
+        self.order_books = order_books
         self.pubsub_client = pubsub_client
         self.risk_manager_topic = risk_manager_topic
         self.vpin_threshold = 0.4  # Dynamic threshold, can be adjusted
@@ -37,14 +48,30 @@ class VpinHFTAgent:
         self.classification_history = []
 
         # Microstructure metrics
-        self.quote_imbalance_history = []
-        self.vpin_cdf_history = []
-        self.volatility_measurements = []
+        self.quote_imbalance_history = deque(maxlen=100)
+        self.vpin_distribution = RollingDistribution(200)
+        self.volatility_measurements = deque(maxlen=50)
 
         # Dynamic bucketing
         self.base_bucket_size = 1000  # Base volume bucket size
         self.volatility_multiplier = 1.0
 
+        # Streaming volume-bucketed VPIN fed by aggTrade events
+        self.vpin_engine = VpinEngine(bucket_volume=self.base_bucket_size)
+
+    def on_agg_trade(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Feed one aggTrade event into the streaming VPIN engine.
+        Returns the symbol's VPIN reading (with CDF and z-score) when a bucket closes.
+        The reading carries the live book's quote imbalance when one is in sync.
+        """
+        reading = self.vpin_engine.handle_message(message)
+        if reading is not None and self.order_books is not None:
+            book = self.order_books.get_book(reading["symbol"])
+            if book is not None and book.mid is not None:
+                reading["quote_imbalance"] = self.calculate_quote_imbalance(book)
+        return reading
+
     def calculate_vpin(self, tick_data_batch: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Calculates VPIN from tick data batch with microsecond-precision timing.
@@ -170,15 +197,23 @@ class VpinHFTAgent:
             tick.get("timestamp_us", 0) % 86400000000,  # Time of day in microseconds
         ]
 
-    def calculate_quote_imbalance(self, order_book: Dict[str, Any]) -> Dict[str, Any]:
+    def calculate_quote_imbalance(
+        self, order_book: Union[Dict[str, Any], L2OrderBook]
+    ) -> Dict[str, Any]:
         """
         Calculate Quote Imbalance metric.
         QI = (BidVolume - AskVolume) / (BidVolume + AskVolume)
+
+        Accepts either a ``{"bids": [{"volume": ...}], ...}`` snapshot or a live L2 book.
         """
-        bid_volume = sum(
-            level["volume"] for level in order_book.get("bids", [])[:5]
-        )  # Top 5 levels
-        ask_volume = sum(level["volume"] for level in order_book.get("asks", [])[:5])
+        if isinstance(order_book, L2OrderBook):
+            bid_volume = sum(order_book.bids.qtys[:5])
+            ask_volume = sum(order_book.asks.qtys[:5])
+        else:
+            bid_volume = sum(
+                level["volume"] for level in order_book.get("bids", [])[:5]
+            )  # Top 5 levels
+            ask_volume = sum(level["volume"] for level in order_book.get("asks", [])[:5])
 
         total_volume = bid_volume + ask_volume
         if total_volume == 0:
@@ -188,8 +223,6 @@ class VpinHFTAgent:
 
         # Calculate z-score
         self.quote_imbalance_history.append(imbalance)
-        if len(self.quote_imbalance_history) > 100:
-            self.quote_imbalance_history = self.quote_imbalance_history[-100:]
 
         if len(self.quote_imbalance_history) >= 10:
             mean = statistics.mean(self.quote_imbalance_history)
@@ -214,11 +247,8 @@ class VpinHFTAgent:
         """
         Calculate VPIN Cumulative Distribution Function and z-score.
         """
-        self.vpin_cdf_history.append(vpin_value)
-        if len(self.vpin_cdf_history) > 200:
-            self.vpin_cdf_history = self.vpin_cdf_history[-200:]
-
-        if len(self.vpin_cdf_history) < 10:
+        self.vpin_distribution.push(vpin_value)
+        if len(self.vpin_distribution) < 10:
             return {
                 "cdf": 0.5,
                 "z_score": 0.0,
@@ -226,40 +256,28 @@ class VpinHFTAgent:
                 "timestamp_us": get_timestamp_us(),
             }
 
-        # Calculate empirical CDF
-        sorted_values = sorted(self.vpin_cdf_history)
-        cdf_value = sum(1 for x in sorted_values if x <= vpin_value) / len(sorted_values)
-
-        # Calculate z-score
-        mean = statistics.mean(self.vpin_cdf_history)
-        stdev = statistics.stdev(self.vpin_cdf_history) if len(self.vpin_cdf_history) > 1 else 1.0
-        z_score = (vpin_value - mean) / stdev if stdev > 0 else 0.0
+        stats = self.vpin_distribution.stats(vpin_value)
+        stats["timestamp_us"] = get_timestamp_us()
+        return stats
 
-        return {
-            "cdf": cdf_value,
-            "z_score": z_score,
-            "percentile": cdf_value * 100,
-            "mean": mean,
-            "stdev": stdev,
-            "timestamp_us": get_timestamp_us(),
-        }
-
-    def calculate_dynamic_bucket_size(self, volatility: float) -> int:
+    def calculate_dynamic_bucket_size(self, volatility: float, symbol: Optional[str] = None) -> int:
         """
         Calculate dynamic volume bucket size based on market volatility.
         Higher volatility = smaller buckets for more frequent signals.
+        With a symbol, the streaming engine switches to the new size at its next bucket.
         """
         # Update volatility measurements
         self.volatility_measurements.append(volatility)
-        if len(self.volatility_measurements) > 50:
-            self.volatility_measurements = self.volatility_measurements[-50:]
 
         if len(self.volatility_measurements) >= 5:
             avg_volatility = statistics.mean(self.volatility_measurements)
             # Scale bucket size inversely with volatility (more volatile = smaller buckets)
             self.volatility_multiplier = max(0.1, min(5.0, 1.0 / (avg_volatility + 0.1)))
 
-        return int(self.base_bucket_size * self.volatility_multiplier)
+        bucket_size = int(self.base_bucket_size * self.volatility_multiplier)
+        if symbol is not None:
+            self.vpin_engine.set_bucket_volume(symbol, bucket_size)
+        return bucket_size
 
     def generate_hybrid_signal(
         self,
@@ -272,7 +290,10 @@ class VpinHFTAgent:
         Generate hybrid trading signal using VPIN, Quote Imbalance, and cross-market correlations.
         Adapts thresholds based on market regime for optimal performance.
         """
-        vpin_cdf = self.calculate_vpin_cdf(vpin_data["vpin"])
+        if "z_score" in vpin_data:
+            vpin_cdf = vpin_data  # streaming reading already carries its CDF stats
+        else:
+            vpin_cdf = self.calculate_vpin_cdf(vpin_data["vpin"])
 
         # Calculate correlation score
         correlation_score = sum(corr.get("z_score", 0) for corr in correlations)
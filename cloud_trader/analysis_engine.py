@@ -1,6 +1,6 @@
 import logging
 import random
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 from .definitions import SYMBOL_CONFIG, MinimalAgentState
 
@@ -16,14 +16,23 @@ logger = logging.getLogger(__name__)
 
 
 class AnalysisEngine:
-    def __init__(self, exchange_client, feature_pipeline, swarm_manager, grok_manager=None):
+    def __init__(
+        self,
+        exchange_client,
+        feature_pipeline,
+        swarm_manager,
+        grok_manager=None,
+        ticker_snapshots=None,
+    ):
         self.exchange_client = exchange_client
         self.feature_pipeline = feature_pipeline
         self.swarm_manager = swarm_manager
         self.grok_manager = grok_manager
+        # Shared TickerSnapshotEngine; consulted before a per-symbol REST call
+        self.ticker_snapshots = ticker_snapshots
 
     async def analyze_market(
-        self, agent: MinimalAgentState, symbol: str, ticker_map: Dict[str, Any] = None
+        self, agent: MinimalAgentState, symbol: str, ticker_map: Mapping[str, Any] = None
     ) -> Dict[str, Any]:
         """
         Perform basic technical analysis suited to the agent's specialization.
@@ -37,6 +46,8 @@ class AnalysisEngine:
         print(f"DEBUG: AnalysisEngine analyzing {symbol} for {agent.id}")
         try:
             # 1. Fetch market data
+            if not ticker_map and self.ticker_snapshots is not None:
+                ticker_map = await self.ticker_snapshots.get()
             if ticker_map and symbol in ticker_map:
                 ticker = ticker_map[symbol]
             else:
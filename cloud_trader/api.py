@@ -3316,14 +3316,17 @@ async def stop_options():
 @app.get("/dashboard")
 async def dashboard() -> Dict[str, object]:
     """Get comprehensive dashboard data"""
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import JSONResponse, Response
 
     try:
         import asyncio
 
         # Add timeout to prevent hanging
-        data = await asyncio.wait_for(trading_service.dashboard_snapshot(), timeout=10.0)
-        response = JSONResponse(content=data)
+        await asyncio.wait_for(trading_service.dashboard_snapshot(), timeout=10.0)
+        # Serialized once per dashboard version and shared by every poller
+        response = Response(
+            content=trading_service.dashboard_snapshot_bytes(), media_type="application/json"
+        )
 
         return response
     except asyncio.TimeoutError:
@@ -15,7 +15,13 @@ logger = logging.getLogger(__name__)
 
 
 def init_autonomous_components(
-    feature_pipeline, exchange_client, symphony_client, settings, hl_client=None, drift_client=None
+    feature_pipeline,
+    exchange_client,
+    symphony_client,
+    settings,
+    hl_client=None,
+    drift_client=None,
+    order_books=None,
 ) -> tuple:
     """
     Initialize all autonomous trading components.
@@ -79,6 +85,7 @@ def init_autonomous_components(
             exchange_client=exchange_client,
             pubsub_client=None,  # Can be connected to GCP PubSub if available
             risk_manager_topic="sapphire-hft-risk",
+            order_books=order_books,  # Live L2 books for quote imbalance, if streamed
         )
         logger.info("✅ VpinHFTAgent initialized (HFT microstructure agent)")
     except ImportError:
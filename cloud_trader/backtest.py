@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from .backtesting.candle_store import CandleStore
 from .strategies import StrategySelector, StrategySignal
 from .strategy import MarketSnapshot
 
@@ -55,11 +56,69 @@ class BacktestResults:
     strategy_performance: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
 
+class AlignedMarket:
+    """Symbols pre-aligned onto one (time x symbol) grid for the backtest loop.
+
+    Built once per run: ``close``/``volume``/``change_24h`` are dense arrays with
+    NaN where a symbol has no bar, ``valid`` marks the bars that exist and
+    ``rows`` maps each cell back to the row of that symbol's own frame so
+    strategy windows are positional slices rather than index lookups.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.symbols = list(frames)
+        self.frames = frames
+        index = pd.DatetimeIndex([])
+        for df in frames.values():
+            index = index.union(df.index)
+        self.index = index
+        self.timestamps: List[pd.Timestamp] = list(index)
+
+        shape = (len(index), len(self.symbols))
+        self.close = np.full(shape, np.nan)
+        self.volume = np.full(shape, np.nan)
+        self.change_24h = np.zeros(shape)
+        self.valid = np.zeros(shape, dtype=bool)
+        self.rows = np.full(shape, -1, dtype=np.int64)
+
+        for col, symbol in enumerate(self.symbols):
+            df = frames[symbol]
+            positions = index.get_indexer(df.index)
+            closes = df["close"].to_numpy(dtype=np.float64)
+            self.close[positions, col] = closes
+            self.volume[positions, col] = df["volume"].to_numpy(dtype=np.float64)
+            self.valid[positions, col] = True
+            self.rows[positions, col] = np.arange(len(df))
+
+            # 24-bar change on the symbol's own rows (assumes hourly data)
+            change = np.zeros(len(df))
+            if len(df) > 24:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    change[24:] = (closes[24:] - closes[:-24]) / closes[:-24] * 100
+                change[~np.isfinite(change)] = 0.0
+            self.change_24h[positions, col] = change
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def columns_at(self, t: int) -> np.ndarray:
+        """Symbol columns that have a bar at cursor ``t``, in symbol order."""
+        return np.flatnonzero(self.valid[t])
+
+    def window(self, col: int, t: int, size: int) -> pd.DataFrame:
+        """Last ``size`` bars of a symbol up to and including cursor ``t``."""
+        row = int(self.rows[t, col])
+        return self.frames[self.symbols[col]].iloc[max(0, row - size + 1) : row + 1]
+
+
 class Backtester:
     """Backtests trading strategies on historical data."""
 
-    def __init__(self, initial_capital: float = 10000.0):
+    def __init__(
+        self, initial_capital: float = 10000.0, candle_store: Optional[CandleStore] = None
+    ):
         self.initial_capital = initial_capital
+        self.candle_store = candle_store
         self.capital = initial_capital
         self.positions: Dict[str, BacktestTrade] = {}
         self.closed_trades: List[BacktestTrade] = []
@@ -83,12 +142,12 @@ class Backtester:
             logger.error("No historical data loaded")
             return BacktestResults()
 
-        # Align timestamps across all symbols
-        timestamps = self._get_aligned_timestamps(all_data)
+        # Align all symbols onto one grid, then walk it with an integer cursor
+        market = AlignedMarket(all_data)
 
-        # Process each timestamp
-        for timestamp in timestamps:
-            await self._process_timestamp(timestamp, all_data)
+        timestamp = None
+        for t, timestamp in enumerate(market.timestamps):
+            await self._process_bar(market, t, timestamp)
 
         # Close any remaining positions at the end
         for symbol, trade in list(self.positions.items()):
@@ -99,40 +158,30 @@ class Backtester:
         # Calculate results
         return self._calculate_results(start_date, end_date)
 
-    async def _process_timestamp(
-        self, timestamp: pd.Timestamp, all_data: Dict[str, pd.DataFrame]
-    ) -> None:
-        """Process a single timestamp in the backtest."""
-        current_data = {}
-
-        # Get current data for each symbol
-        for symbol, df in all_data.items():
-            try:
-                row = df.loc[timestamp]
-                current_data[symbol] = row
-            except KeyError:
-                # Symbol doesn't have data at this timestamp
-                continue
-
-        if not current_data:
+    async def _process_bar(self, market: AlignedMarket, t: int, timestamp: pd.Timestamp) -> None:
+        """Process the bar at cursor ``t`` across all symbols."""
+        columns = market.columns_at(t)
+        if not len(columns):
             return
 
+        prices = {market.symbols[col]: market.close[t, col] for col in columns}
+
         # Check existing positions for exit conditions
-        self._check_exits(current_data, timestamp)
+        self._check_exits(prices, timestamp)
 
         # Evaluate entry signals
-        await self._check_entries(current_data, timestamp, all_data)
+        await self._check_entries(market, t, columns, timestamp)
 
         # Update equity curve
-        self._update_equity(current_data)
+        self._update_equity(prices)
 
-    def _check_exits(self, current_data: Dict[str, pd.Series], timestamp: pd.Timestamp) -> None:
+    def _check_exits(self, prices: Dict[str, float], timestamp: pd.Timestamp) -> None:
         """Check if any positions should be closed."""
         for symbol, trade in list(self.positions.items()):
-            if symbol not in current_data:
+            if symbol not in prices:
                 continue
 
-            current_price = current_data[symbol]["close"]
+            current_price = prices[symbol]
 
             # Calculate P&L
             if trade.side == "BUY":
@@ -160,30 +209,33 @@ class Backtester:
 
     async def _check_entries(
         self,
-        current_data: Dict[str, pd.Series],
+        market: AlignedMarket,
+        t: int,
+        columns: np.ndarray,
         timestamp: pd.Timestamp,
-        all_data: Dict[str, pd.DataFrame],
     ) -> None:
         """Check for new entry signals."""
         # Limit number of concurrent positions
         if len(self.positions) >= 5:
             return
 
-        for symbol, row in current_data.items():
+        for col in columns:
+            symbol = market.symbols[col]
             # Skip if already have position
             if symbol in self.positions:
                 continue
 
+            price = market.close[t, col]
+
             # Create market snapshot
             snapshot = MarketSnapshot(
-                symbol=symbol,
-                price=row["close"],
-                volume=row["volume"],
-                change_24h=self._calculate_24h_change(symbol, timestamp, all_data),
+                price=price,
+                volume=market.volume[t, col],
+                change_24h=market.change_24h[t, col],
             )
 
             # Get historical data for strategies
-            historical = self._get_historical_window(symbol, timestamp, all_data, 30)
+            historical = market.window(col, t, 30)
 
             # Get strategy signal
             signal = await self.strategy_selector.select_best_strategy(symbol, snapshot, historical)
@@ -191,14 +243,14 @@ class Backtester:
             if signal.direction != "HOLD" and signal.confidence > 0.6:
                 # Calculate position size (max 2% of capital per trade)
                 position_size = min(signal.position_size, 0.02) * self.capital
-                quantity = position_size / row["close"]
+                quantity = position_size / price
 
                 # Open position
                 trade = BacktestTrade(
                     timestamp=timestamp,
                     symbol=symbol,
                     side=signal.direction,
-                    entry_price=row["close"],
+                    entry_price=price,
                     quantity=quantity,
                     strategy=signal.strategy_name,
                 )
@@ -232,14 +284,14 @@ class Backtester:
 
         self.closed_trades.append(trade)
 
-    def _update_equity(self, current_data: Dict[str, pd.Series]) -> None:
+    def _update_equity(self, prices: Dict[str, float]) -> None:
         """Update equity curve with current positions."""
         total_equity = self.capital
 
         # Add unrealized P&L from open positions
         for symbol, trade in self.positions.items():
-            if symbol in current_data:
-                current_price = current_data[symbol]["close"]
+            if symbol in prices:
+                current_price = prices[symbol]
                 if trade.side == "BUY":
                     unrealized_pnl = (current_price - trade.entry_price) * trade.quantity
                 else:
@@ -329,8 +381,13 @@ class Backtester:
         self, symbol: str, start_date: datetime, end_date: datetime, interval: str
     ) -> Optional[pd.DataFrame]:
         """Load historical data for a symbol."""
-        # In production, this would fetch from exchange API or database
-        # For now, generate synthetic data for testing
+        if self.candle_store is not None:
+            df = self.candle_store.read_frame(symbol, interval, start_date, end_date)
+            if df is not None:
+                return df
+            logger.warning(f"No stored {interval} candles for {symbol}, using synthetic data")
+
+        # Synthetic fallback when no candle store is configured
 
         periods = {"1h": timedelta(hours=1), "4h": timedelta(hours=4), "1d": timedelta(days=1)}
 
@@ -378,47 +435,6 @@ class Backtester:
 
         return df
 
-    def _get_aligned_timestamps(self, all_data: Dict[str, pd.DataFrame]) -> List[pd.Timestamp]:
-        """Get timestamps that exist in at least one symbol's data."""
-        all_timestamps = set()
-        for df in all_data.values():
-            all_timestamps.update(df.index)
-        return sorted(all_timestamps)
-
-    def _calculate_24h_change(
-        self, symbol: str, timestamp: pd.Timestamp, all_data: Dict[str, pd.DataFrame]
-    ) -> float:
-        """Calculate 24h percentage change."""
-        df = all_data.get(symbol)
-        if df is None:
-            return 0.0
-
-        try:
-            current_idx = df.index.get_loc(timestamp)
-            if current_idx >= 24:  # Assuming hourly data
-                current_price = df.iloc[current_idx]["close"]
-                past_price = df.iloc[current_idx - 24]["close"]
-                return (current_price - past_price) / past_price * 100
-        except:
-            pass
-
-        return 0.0
-
-    def _get_historical_window(
-        self, symbol: str, timestamp: pd.Timestamp, all_data: Dict[str, pd.DataFrame], window: int
-    ) -> pd.DataFrame:
-        """Get historical data window for technical analysis."""
-        df = all_data.get(symbol)
-        if df is None:
-            return pd.DataFrame()
-
-        try:
-            current_idx = df.index.get_loc(timestamp)
-            start_idx = max(0, current_idx - window + 1)
-            return df.iloc[start_idx : current_idx + 1]
-        except:
-            return pd.DataFrame()
-
     def print_results(self, results: BacktestResults) -> None:
         """Print formatted backtest results."""
         print("\n" + "=" * 60)
@@ -0,0 +1,277 @@
+"""
+Columnar on-disk candle store for backtesting.
+
+Layout: ``<root>/<interval>/<SYMBOL>/<column>.bin`` - one raw little-endian
+array per column (``ts`` as int64 epoch-ms, OHLCV as float64). Columns are
+appended in place and read back through ``np.memmap``, so time-range reads
+binary-search the timestamp column and only touch the pages they return.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+_DTYPES = {"ts": np.dtype("<i8"), **{c: np.dtype("<f8") for c in COLUMNS}}
+_SCHEMA_VERSION = 1
+
+
+def _to_ms(value: Optional[Any]) -> Optional[int]:
+    """datetime / Timestamp / ISO string / epoch-ms -> epoch-ms."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.to_datetime64().astype("datetime64[ms]").astype(np.int64))
+
+
+@dataclass
+class AlignedCandles:
+    """Candles for several symbols on one shared timestamp axis.
+
+    ``data[column]`` has shape ``(len(symbols), len(timestamps))``; bars a
+    symbol does not have are NaN and ``present`` is False there.
+    """
+
+    symbols: List[str]
+    timestamps: np.ndarray
+    data: Dict[str, np.ndarray]
+    present: np.ndarray
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+
+class CandleStore:
+    """Append-only, memory-mappable OHLCV store partitioned by interval and symbol."""
+
+    def __init__(self, root: str = "data/candles"):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    # ----- paths -----
+
+    def _partition(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.replace("/", "_").upper())
+
+    def _column_path(self, symbol: str, interval: str, column: str) -> str:
+        return os.path.join(self._partition(symbol, interval), f"{column}.bin")
+
+    def _length(self, symbol: str, interval: str) -> int:
+        path = self._column_path(symbol, interval, "ts")
+        if not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // _DTYPES["ts"].itemsize
+
+    def _map(self, symbol: str, interval: str, column: str, length: int) -> np.ndarray:
+        if length == 0:
+            return np.empty(0, dtype=_DTYPES[column])
+        return np.memmap(
+            self._column_path(symbol, interval, column),
+            dtype=_DTYPES[column],
+            mode="r",
+            shape=(length,),
+        )
+
+    # ----- metadata -----
+
+    def symbols(self, interval: str) -> List[str]:
+        base = os.path.join(self.root, interval)
+        if not os.path.isdir(base):
+            return []
+        return sorted(name for name in os.listdir(base) if self._length(name, interval) > 0)
+
+    def has(self, symbol: str, interval: str) -> bool:
+        return self._length(symbol, interval) > 0
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time (epoch-ms) of the newest stored bar, or None."""
+        length = self._length(symbol, interval)
+        if length == 0:
+            return None
+        return int(self._map(symbol, interval, "ts", length)[-1])
+
+    def time_range(self, symbol: str, interval: str) -> Optional[tuple]:
+        length = self._length(symbol, interval)
+        if length == 0:
+            return None
+        ts = self._map(symbol, interval, "ts", length)
+        return int(ts[0]), int(ts[-1])
+
+    # ----- writes -----
+
+    def append(self, symbol: str, interval: str, candles: Any) -> int:
+        """Append bars newer than the stored tail; returns the number of new bars.
+
+        ``candles`` may be a DataFrame (DatetimeIndex or ``timestamp`` column),
+        a dict of column arrays with ``ts``, or REST kline rows. A bar with the
+        same open time as the stored tail replaces it (the still-forming candle).
+        """
+        columns = self._normalize(candles)
+        ts = columns["ts"]
+        if len(ts) == 0:
+            return 0
+        order = np.argsort(ts, kind="stable")
+        if np.any(order != np.arange(len(ts))):
+            columns = {name: values[order] for name, values in columns.items()}
+            ts = columns["ts"]
+        # Keep the last occurrence of duplicate timestamps
+        keep = np.append(ts[1:] != ts[:-1], True)
+        if not keep.all():
+            columns = {name: values[keep] for name, values in columns.items()}
+            ts = columns["ts"]
+
+        partition = self._partition(symbol, interval)
+        os.makedirs(partition, exist_ok=True)
+        length = self._length(symbol, interval)
+        last = self.last_timestamp(symbol, interval)
+
+        if last is not None:
+            if ts[-1] < last:
+                return 0
+            tail = np.searchsorted(ts, last)
+            if tail < len(ts) and ts[tail] == last:
+                # Overwrite the stored tail bar in place
+                for name in COLUMNS:
+                    self._write_at(
+                        symbol, interval, name, length - 1, columns[name][tail : tail + 1]
+                    )
+                tail += 1
+            columns = {name: values[tail:] for name, values in columns.items()}
+            ts = columns["ts"]
+        if len(ts) == 0:
+            return 0
+
+        # Data columns first, timestamps last: the ts length is the committed row count
+        for name in (*COLUMNS, "ts"):
+            path = self._column_path(symbol, interval, name)
+            self._truncate(path, length * _DTYPES[name].itemsize)
+            with open(path, "ab") as fh:
+                fh.write(np.ascontiguousarray(columns[name], dtype=_DTYPES[name]).tobytes())
+        self._write_schema(partition)
+        return len(ts)
+
+    def _write_at(self, symbol: str, interval: str, column: str, row: int, values: np.ndarray):
+        with open(self._column_path(symbol, interval, column), "r+b") as fh:
+            fh.seek(row * _DTYPES[column].itemsize)
+            fh.write(np.ascontiguousarray(values, dtype=_DTYPES[column]).tobytes())
+
+    @staticmethod
+    def _truncate(path: str, size: int) -> None:
+        # Drop bytes a crashed append left past the committed length
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with open(path, "r+b") as fh:
+                fh.truncate(size)
+
+    @staticmethod
+    def _write_schema(partition: str) -> None:
+        path = os.path.join(partition, "schema.json")
+        if not os.path.exists(path):
+            schema = {"version": _SCHEMA_VERSION, "columns": {k: v.str for k, v in _DTYPES.items()}}
+            with open(path, "w") as fh:
+                json.dump(schema, fh)
+
+    @staticmethod
+    def _normalize(candles: Any) -> Dict[str, np.ndarray]:
+        if isinstance(candles, pd.DataFrame):
+            frame = candles
+            if "timestamp" in frame.columns:
+                index = pd.DatetimeIndex(pd.to_datetime(frame["timestamp"]))
+            else:
+                index = pd.DatetimeIndex(frame.index)
+            if index.tz is not None:
+                index = index.tz_convert("UTC").tz_localize(None)
+            out = {"ts": index.values.astype("datetime64[ms]").astype(np.int64)}
+            for name in COLUMNS:
+                out[name] = frame[name].to_numpy(dtype=np.float64)
+            return out
+        if isinstance(candles, dict):
+            return {
+                "ts": np.asarray(candles["ts"], dtype=np.int64),
+                **{name: np.asarray(candles[name], dtype=np.float64) for name in COLUMNS},
+            }
+        rows = list(candles)
+        if not rows:
+            return {name: np.empty(0, dtype=_DTYPES[name]) for name in ("ts", *COLUMNS)}
+        # REST kline rows: [open_time, open, high, low, close, volume, ...]
+        matrix = np.array([row[:6] for row in rows], dtype=np.float64)
+        out = {"ts": matrix[:, 0].astype(np.int64)}
+        for i, name in enumerate(COLUMNS, start=1):
+            out[name] = matrix[:, i]
+        return out
+
+    # ----- reads -----
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Sequence[str] = COLUMNS,
+    ) -> Dict[str, np.ndarray]:
+        """Bars with ``start <= ts <= end`` as memory-mapped column views (plus ``ts``)."""
+        length = self._length(symbol, interval)
+        ts = self._map(symbol, interval, "ts", length)
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_ms(start), side="left"))
+        hi = length if end is None else int(np.searchsorted(ts, _to_ms(end), side="right"))
+        out = {"ts": ts[lo:hi]}
+        for name in columns:
+            out[name] = self._map(symbol, interval, name, length)[lo:hi]
+        return out
+
+    def read_frame(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Same as :meth:`read` as an OHLCV DataFrame indexed by timestamp."""
+        columns = self.read(symbol, interval, start, end)
+        if len(columns["ts"]) == 0:
+            return None
+        index = pd.DatetimeIndex(
+            pd.to_datetime(np.asarray(columns["ts"]), unit="ms"), name="timestamp"
+        )
+        return pd.DataFrame({name: np.array(columns[name]) for name in COLUMNS}, index=index)
+
+    def read_aligned(
+        self,
+        symbols: Iterable[str],
+        interval: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Sequence[str] = COLUMNS,
+        dtype: Any = np.float64,
+    ) -> AlignedCandles:
+        """Read several symbols onto the union of their timestamps."""
+        symbols = list(symbols)
+        slices = [self.read(symbol, interval, start, end, columns) for symbol in symbols]
+        stamps = [np.asarray(s["ts"]) for s in slices if len(s["ts"])]
+        if not stamps:
+            timestamps = np.empty(0, dtype=np.int64)
+        elif all(len(t) == len(stamps[0]) and np.array_equal(t, stamps[0]) for t in stamps[1:]):
+            timestamps = stamps[0].copy()  # common case: identical bar grid
+        else:
+            timestamps = np.unique(np.concatenate(stamps))
+
+        shape = (len(symbols), len(timestamps))
+        data = {name: np.full(shape, np.nan, dtype=dtype) for name in columns}
+        present = np.zeros(shape, dtype=bool)
+        for row, columns_slice in enumerate(slices):
+            ts = np.asarray(columns_slice["ts"])
+            if len(ts) == 0:
+                continue
+            positions = np.searchsorted(timestamps, ts)
+            present[row, positions] = True
+            for name in columns:
+                data[name][row, positions] = columns_slice[name]
+        return AlignedCandles(symbols=symbols, timestamps=timestamps, data=data, present=present)
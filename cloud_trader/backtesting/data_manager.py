@@ -13,14 +13,16 @@ import httpx
 import pandas as pd
 
 from ..logger import get_logger
+from .candle_store import CandleStore
 
 logger = get_logger(__name__)
 
 
 class BacktestDataManager:
-    def __init__(self, data_dir: str = "data/historical"):
+    def __init__(self, data_dir: str = "data/historical", store: Optional[CandleStore] = None):
         self.data_dir = data_dir
         os.makedirs(self.data_dir, exist_ok=True)
+        self.store = store or CandleStore(os.path.join(self.data_dir, "candles"))
 
     async def fetch_ohlcv(
         self, symbol: str, interval: str = "1h", limit: int = 1000
@@ -101,10 +103,9 @@ class BacktestDataManager:
 
                 df_ohlc["volume"] = 1000000.0  # Mock volume to prevent NaN errors
 
-                # Save to cache
-                clean_symbol = symbol.replace("/", "_")
-                cache_path = os.path.join(self.data_dir, f"{clean_symbol}_{interval}_cg.csv")
-                df_ohlc.to_csv(cache_path)
+                # Save to cache - only bars newer than the stored tail are written
+                added = self.store.append(symbol, interval, df_ohlc)
+                logger.info(f"Stored {added} new {interval} bars for {symbol}")
 
                 return df_ohlc
 
@@ -112,13 +113,30 @@ class BacktestDataManager:
                 logger.error(f"Failed to fetch data for {symbol}: {e}")
                 return self._load_from_cache(symbol, interval)
 
-    def _load_from_cache(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
-        cache_path = os.path.join(self.data_dir, f"{symbol}_{interval}.csv")
-        if os.path.exists(cache_path):
+    def _load_from_cache(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[pd.DataFrame]:
+        if not self.store.has(symbol, interval):
+            self._import_legacy_csv(symbol, interval)
+        df = self.store.read_frame(symbol, interval, start, end)
+        if df is not None:
             logger.info(f"Loading {symbol} from cache...")
-            df = pd.read_csv(cache_path, index_col="timestamp", parse_dates=True)
-            return df[["open", "high", "low", "close", "volume"]]
-        return None
+        return df
+
+    def _import_legacy_csv(self, symbol: str, interval: str) -> None:
+        """One-time migration of the old per-symbol CSV caches into the candle store."""
+        clean_symbol = symbol.replace("/", "_")
+        for name in (f"{clean_symbol}_{interval}_cg.csv", f"{clean_symbol}_{interval}.csv"):
+            cache_path = os.path.join(self.data_dir, name)
+            if os.path.exists(cache_path):
+                df = pd.read_csv(cache_path, index_col="timestamp", parse_dates=True)
+                self.store.append(symbol, interval, df[["open", "high", "low", "close", "volume"]])
+                logger.info(f"Imported {cache_path} into candle store")
+                return
 
     def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
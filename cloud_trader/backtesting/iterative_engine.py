@@ -5,7 +5,7 @@ Simulates trading step-by-step to allow stateful agent interactions.
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -114,3 +114,75 @@ class IterativeBacktestEngine:
             equity_curve=pd.Series(equity_curve, index=df.index),
             metrics={"final_equity": capital},
         )
+
+    def run_signals(
+        self,
+        df: pd.DataFrame,
+        signal: Union[pd.Series, np.ndarray],
+        size_fraction: Union[float, pd.Series, np.ndarray] = 1.0,
+    ) -> IterativeResult:
+        """
+        Vectorized equivalent of ``run_agent`` for stateless signal series.
+
+        ``signal[i]`` is read as the action ``run_agent`` would get from its
+        step function on bar i: 1 opens a long, 0 or -1 closes it, anything
+        else (or NaN) holds. ``size_fraction`` is the fraction of equity used
+        on entry. Fills, commissions and marks come out of array operations,
+        so only the round trips are ever iterated (via cumprod).
+        """
+        prices = df["close"].to_numpy(dtype=np.float64)
+        n = len(prices)
+        if n == 0:
+            return IterativeResult(
+                total_return=0.0,
+                equity_curve=pd.Series(dtype=np.float64, index=df.index),
+                metrics={"final_equity": self.initial_capital, "trades": 0, "commission": 0.0},
+            )
+
+        if isinstance(signal, pd.Series):
+            signal = signal.reindex(df.index)
+        raw = np.asarray(signal, dtype=np.float64)
+        fractions = np.broadcast_to(np.asarray(size_fraction, dtype=np.float64), (n,))
+        c = self.commission
+
+        # Position after each bar's action (long/flat, like run_agent) and going into it;
+        # a zero-size buy leaves run_agent's position untouched, i.e. a hold
+        buy = (raw == 1) & (fractions > 0)
+        target = np.where(buy, 1.0, np.where((raw == 0) | (raw == -1), 0.0, np.nan))
+        state = pd.Series(target).ffill().fillna(0.0).to_numpy()
+        held = np.concatenate(([0.0], state[:-1]))
+
+        entries = np.flatnonzero((state == 1) & (held == 0))
+        exits = np.flatnonzero((state == 0) & (held == 1))
+        if len(exits) < len(entries):
+            exits = np.append(exits, n - 1)  # final close on the last bar
+
+        # Capital multiplier per round trip: pay f*(1+c) in, get f*(1-c)*r back
+        entry_px, exit_px, f = prices[entries], prices[exits], fractions[entries]
+        growth = 1 - f * (1 + c) + f * (1 - c) * exit_px / entry_px
+        capital = self.initial_capital * np.concatenate(([1.0], np.cumprod(growth)))
+
+        # Mark to market before each bar's action, like run_agent's equity curve
+        entered = np.concatenate(([0], np.cumsum((state == 1) & (held == 0))[:-1]))
+        equity = capital[entered]
+        in_trade = np.flatnonzero(held == 1)
+        if len(in_trade):
+            k = entered[in_trade] - 1
+            cash = capital[k] * (1 - f[k] * (1 + c))
+            units = capital[k] * f[k] / entry_px[k]
+            equity = equity.copy()
+            equity[in_trade] = cash + units * prices[in_trade]
+
+        units = capital[:-1] * f / entry_px
+        commission = float(np.sum(units * (entry_px + exit_px) * c))
+        final_equity = float(capital[-1])
+
+        return IterativeResult(
+            total_return=(final_equity / self.initial_capital) - 1,
+            equity_curve=pd.Series(equity, index=df.index),
+            metrics={
+                "final_equity": final_equity,
+                "trades": int(len(entries)),
+                "commission": commission,
+            },
+        )
@@ -0,0 +1,449 @@
+"""
+Historical replay of the live decision pipeline.
+
+``ReplayHarness`` points a real ``TradingService`` at ``SimulatedExchange`` -
+an ``AsterClient``-compatible venue backed by the ``CandleStore`` - and steps
+a ``VirtualClock`` bar by bar. Each step runs the production scan cycle
+(``AnalysisEngine.analyze_market`` -> ``AgentConsensusEngine.conduct_consensus_vote``
+-> ``_execute_trade_order``), so decisions come from the same code that trades
+live. The service modules see the virtual clock through their ``time`` import;
+per-stage timings are recorded with the real wall clock.
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+import time as _time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from unittest import mock
+
+import numpy as np
+
+from .candle_store import CandleStore
+
+logger = logging.getLogger(__name__)
+
+_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+DAY_MS = _UNIT_MS["d"]
+
+
+def interval_ms(interval: str) -> int:
+    """``"15m"`` / ``"1h"`` / ``"1d"`` -> bar length in milliseconds."""
+    return int(interval[:-1]) * _UNIT_MS[interval[-1]]
+
+
+class VirtualClock:
+    """Simulated epoch clock that stands in for the ``time`` module.
+
+    ``time()`` returns the simulated timestamp; everything else (``perf_counter``,
+    ``monotonic``, ``sleep`` ...) falls through to the real module.
+    """
+
+    def __init__(self, start_ms: int = 0):
+        self.now_ms = int(start_ms)
+
+    def time(self) -> float:
+        return self.now_ms / 1000.0
+
+    def advance_to(self, ms: int) -> None:
+        self.now_ms = max(self.now_ms, int(ms))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_time, name)
+
+
+class SimulatedExchange:
+    """``AsterClient``-compatible market data and market-order fills from the candle store.
+
+    Only bars that have closed by the clock's current time are visible. Market
+    orders fill immediately at the last close, adjusted by ``slippage_bps`` and
+    charged ``fee_rate`` on notional; positions are netted per symbol.
+    """
+
+    def __init__(
+        self,
+        store: CandleStore,
+        clock: VirtualClock,
+        interval: str = "1h",
+        balance: float = 10000.0,
+        fee_rate: float = 0.0004,
+        slippage_bps: float = 2.0,
+        spread_bps: float = 2.0,
+    ):
+        self.store = store
+        self.clock = clock
+        self.interval = interval
+        self.balance = balance
+        self.fee_rate = fee_rate
+        self.slippage = slippage_bps / 10000.0
+        self.spread = spread_bps / 10000.0
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.fills: List[Dict[str, Any]] = []
+        self.fees_paid = 0.0
+        self._order_ids = itertools.count(1)
+
+    # ----- market data -----
+
+    def _closed(self, symbol: str, interval: str, start: Optional[int] = None) -> Dict[str, Any]:
+        """Bars of ``interval`` whose close time is at or before the clock."""
+        end = self.clock.now_ms - interval_ms(interval)
+        return self.store.read(symbol, interval, start=start, end=end)
+
+    def last_price(self, symbol: str) -> float:
+        bars = self._closed(symbol, self.interval, start=self.clock.now_ms - DAY_MS)
+        return float(bars["close"][-1]) if len(bars["ts"]) else 0.0
+
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        bars = self._closed(symbol, self.interval, start=self.clock.now_ms - DAY_MS)
+        if not len(bars["ts"]):
+            return {}
+        close = np.asarray(bars["close"])
+        volume = np.asarray(bars["volume"])
+        last, first = float(close[-1]), float(bars["open"][0])
+        return {
+            "symbol": symbol,
+            "lastPrice": str(last),
+            "openPrice": str(first),
+            "highPrice": str(float(np.max(bars["high"]))),
+            "lowPrice": str(float(np.min(bars["low"]))),
+            "priceChange": str(last - first),
+            "priceChangePercent": str((last - first) / first * 100 if first else 0.0),
+            "volume": str(float(volume.sum())),
+            "quoteVolume": str(float((close * volume).sum())),
+            "closeTime": self.clock.now_ms - 1,
+        }
+
+    async def get_all_tickers(self) -> List[Dict[str, Any]]:
+        tickers = [await self.get_ticker(s) for s in self.store.symbols(self.interval)]
+        return [t for t in tickers if t]
+
+    async def get_ticker_price(self, symbol: str) -> Dict[str, Any]:
+        return {"symbol": symbol, "price": str(self.last_price(symbol))}
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 100) -> List[List[Any]]:
+        bars = self._closed(symbol, interval)
+        step = interval_ms(interval)
+        rows = []
+        for i in range(max(0, len(bars["ts"]) - limit), len(bars["ts"])):
+            ts = int(bars["ts"][i])
+            close, volume = float(bars["close"][i]), float(bars["volume"][i])
+            rows.append(
+                [
+                    ts,
+                    str(float(bars["open"][i])),
+                    str(float(bars["high"][i])),
+                    str(float(bars["low"][i])),
+                    str(close),
+                    str(volume),
+                    ts + step - 1,
+                    str(close * volume),
+                    0,
+                    "0",
+                    "0",
+                    "0",
+                ]
+            )
+        return rows
+
+    async def get_historical_klines(
+        self, symbol: str, interval: str = "1h", limit: int = 100
+    ) -> Optional[List[List[Any]]]:
+        return await self.get_klines(symbol, interval, limit)
+
+    async def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        """Symmetric synthetic book around the last close."""
+        price = self.last_price(symbol)
+        if price <= 0:
+            return {"bids": [], "asks": []}
+        half = price * self.spread / 2
+        tick = price * self.spread
+        levels = range(min(limit, 20))
+        return {
+            "lastUpdateId": self.clock.now_ms,
+            "bids": [[str(price - half - i * tick), "1.0"] for i in levels],
+            "asks": [[str(price + half + i * tick), "1.0"] for i in levels],
+        }
+
+    # ----- orders and account -----
+
+    async def place_order(
+        self, symbol: str, side: str, order_type: Any = None, quantity: float = 0.0, **kwargs
+    ) -> Dict[str, Any]:
+        price = self.last_price(symbol)
+        if price <= 0 or not quantity:
+            raise ValueError(f"No replay price for {symbol} at {self.clock.now_ms}")
+
+        sign = 1.0 if side == "BUY" else -1.0
+        fill_price = price * (1 + sign * self.slippage)
+        fee = abs(quantity) * fill_price * self.fee_rate
+        self.fees_paid += fee
+        self.balance -= fee
+        self._apply_fill(symbol, sign * float(quantity), fill_price)
+
+        order_id = str(next(self._order_ids))
+        order = {
+            "orderId": order_id,
+            "symbol": symbol,
+            "side": side,
+            "type": getattr(order_type, "value", order_type),
+            "status": "FILLED",
+            "origQty": str(quantity),
+            "executedQty": str(quantity),
+            "avgPrice": str(fill_price),
+            "updateTime": self.clock.now_ms,
+        }
+        self.orders[order_id] = order
+        self.fills.append({**order, "fee": fee, "timestamp": self.clock.now_ms})
+        return order
+
+    def _apply_fill(self, symbol: str, signed_qty: float, price: float) -> None:
+        pos = self.positions.get(symbol, {"amount": 0.0, "entry": 0.0})
+        amount, entry = pos["amount"], pos["entry"]
+        if amount == 0 or np.sign(amount) == np.sign(signed_qty):
+            total = amount + signed_qty
+            entry = (amount * entry + signed_qty * price) / total
+            amount = total
+        else:
+            closed = min(abs(amount), abs(signed_qty)) * np.sign(amount)
+            self.balance += closed * (price - entry)
+            amount += signed_qty
+            if np.sign(amount) != np.sign(pos["amount"]) and amount != 0:
+                entry = price  # flipped through zero
+        if abs(amount) < 1e-12:
+            self.positions.pop(symbol, None)
+        else:
+            self.positions[symbol] = {"amount": amount, "entry": entry}
+
+    async def get_order(
+        self, symbol: str, order_id: Optional[str] = None, **kwargs
+    ) -> Dict[str, Any]:
+        order_id = order_id or kwargs.get("orderId")
+        return self.orders.get(str(order_id), {"status": "UNKNOWN"})
+
+    def unrealized_pnl(self) -> float:
+        return sum(
+            p["amount"] * (self.last_price(s) - p["entry"]) for s, p in self.positions.items()
+        )
+
+    async def get_position_risk(self) -> List[Dict[str, Any]]:
+        risk = []
+        for symbol, pos in self.positions.items():
+            mark = self.last_price(symbol)
+            risk.append(
+                {
+                    "symbol": symbol,
+                    "positionAmt": str(pos["amount"]),
+                    "entryPrice": str(pos["entry"]),
+                    "markPrice": str(mark),
+                    "unRealizedProfit": str(pos["amount"] * (mark - pos["entry"])),
+                    "leverage": "1",
+                }
+            )
+        return risk
+
+    async def get_account_info_v2(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "asset": "USDT",
+                "balance": str(self.balance),
+                "crossWalletBalance": str(self.balance),
+                "crossUnPnl": str(self.unrealized_pnl()),
+                "availableBalance": str(self.balance),
+            }
+        ]
+
+    async def get_account_info_v4(self) -> Dict[str, Any]:
+        unrealized = self.unrealized_pnl()
+        return {
+            "totalWalletBalance": self.balance,
+            "totalUnrealizedProfit": unrealized,
+            "totalMarginBalance": self.balance + unrealized,
+            "availableBalance": self.balance,
+            "positions": await self.get_position_risk(),
+        }
+
+
+@dataclass
+class StageTimer:
+    """Wall-clock samples per pipeline stage."""
+
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        self.samples.setdefault(stage, []).append(elapsed_ms)
+
+    def wrap(self, stage: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        async def timed(*args, **kwargs):
+            t0 = _time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.record(stage, (_time.perf_counter() - t0) * 1000.0)
+
+        return timed
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        stages = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            stages[stage] = {
+                "count": len(ordered),
+                "avg_ms": sum(ordered) / len(ordered),
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max_ms": ordered[-1],
+            }
+        return stages
+
+
+@dataclass
+class ReplayReport:
+    """Decisions and latency from one replay run."""
+
+    cycles: int = 0
+    simulated_ms: int = 0
+    wall_ms: float = 0.0
+    fills: List[Dict[str, Any]] = field(default_factory=list)
+    consensus: List[Dict[str, Any]] = field(default_factory=list)
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    final_balance: float = 0.0
+    fees_paid: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.simulated_ms / self.wall_ms if self.wall_ms > 0 else float("inf")
+
+    def decisions(self) -> List[tuple]:
+        """``(timestamp, symbol, side)`` per fill - a stable fingerprint for regression tests."""
+        return [(f["timestamp"], f["symbol"], f["side"]) for f in self.fills]
+
+
+# Modules whose ``time.time()`` must follow the replay clock
+CLOCKED_MODULES = (
+    "cloud_trader.trading_service",
+    "cloud_trader.platform_router",
+    "cloud_trader.data.feature_pipeline",
+    "cloud_trader.swarm.manager",
+)
+
+
+class ReplayHarness:
+    """Drives a ``TradingService`` scan cycle over historical bars at accelerated speed."""
+
+    def __init__(
+        self,
+        service: Any,
+        store: CandleStore,
+        symbols: Sequence[str],
+        interval: str = "1h",
+        balance: float = 10000.0,
+        seed: Optional[int] = 0,
+        **exchange_kwargs: Any,
+    ):
+        self.service = service
+        self.store = store
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.seed = seed
+        self.clock = VirtualClock()
+        self.exchange = SimulatedExchange(
+            store, self.clock, interval=interval, balance=balance, **exchange_kwargs
+        )
+        self.timer = StageTimer()
+        self._installed = False
+
+    def install(self) -> None:
+        """Point the service's market data, analysis and execution at the simulated venue."""
+        if self._installed:
+            return
+        from ..analysis_engine import AnalysisEngine
+        from ..data.feature_pipeline import FeaturePipeline
+        from ..platform_router import PlatformType
+
+        service, exchange = self.service, self.exchange
+        service._exchange = exchange
+        service._paper_exchange = exchange
+        if service.position_manager is not None:
+            service.position_manager.exchange_client = exchange
+        service._feature_pipeline = FeaturePipeline(exchange)
+        service._analysis_engine = AnalysisEngine(
+            exchange, service._feature_pipeline, service._swarm_manager
+        )
+        service._market_structure = {
+            symbol: {"symbol": symbol, "min_qty": 0.0, "min_notional": 5.0}
+            for symbol in self.symbols
+        }
+        service._portfolio.balance = exchange.balance
+        service._portfolio.equity = exchange.balance
+        service._account_balance = exchange.balance
+        service._save_positions = lambda: None
+
+        # Everything executes on the simulated Aster venue, without anti-HFT jitter
+        router = service.platform_router
+        router._determine_platform = lambda agent, symbol: PlatformType.ASTER
+        router.jitter_range = (0.0, 0.0)
+
+        engine = service._analysis_engine
+        engine.analyze_market = self.timer.wrap("analyze", engine.analyze_market)
+        consensus = service._consensus_engine
+        consensus.conduct_consensus_vote = self.timer.wrap(
+            "consensus", consensus.conduct_consensus_vote
+        )
+        service._execute_trade_order = self.timer.wrap("execute", service._execute_trade_order)
+        self._installed = True
+
+    def timestamps(self, start: Optional[Any] = None, end: Optional[Any] = None) -> np.ndarray:
+        """Close times of every replay bar in ``[start, end]``."""
+        aligned = self.store.read_aligned(self.symbols, self.interval, start, end, ("close",))
+        return aligned.timestamps + interval_ms(self.interval)
+
+    async def run(
+        self,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        cycle: Optional[Callable[[], Awaitable[Any]]] = None,
+        warmup_bars: int = 0,
+    ) -> ReplayReport:
+        """Replay ``[start, end]`` one bar per cycle.
+
+        ``cycle`` defaults to the service's scan-and-execute step; pass e.g.
+        ``service._execute_trading_cycle`` to replay a wider loop.
+        ``warmup_bars`` skips the first bars so indicators have history.
+        """
+        self.install()
+        cycle = self.timer.wrap("cycle", cycle or self.service._scan_and_execute_new_trades)
+        closes = self.timestamps(start, end)[warmup_bars:]
+        if self.seed is not None:
+            random.seed(self.seed)
+
+        report = ReplayReport()
+        wall_start = _time.perf_counter()
+        with ExitStack() as stack:
+            for module in CLOCKED_MODULES:
+                stack.enter_context(mock.patch(f"{module}.time", self.clock))
+            for close_ms in closes:
+                self.clock.advance_to(int(close_ms))
+                self.service._portfolio.balance = self.exchange.balance
+                try:
+                    await cycle()
+                except Exception as e:
+                    logger.warning(f"Replay cycle at {int(close_ms)} failed: {e}")
+                report.cycles += 1
+                await asyncio.sleep(0)
+
+        report.wall_ms = (_time.perf_counter() - wall_start) * 1000.0
+        if len(closes):
+            report.simulated_ms = int(closes[-1] - closes[0]) + interval_ms(self.interval)
+        report.fills = list(self.exchange.fills)
+        report.consensus = list(self.service._consensus_history)
+        report.stages = self.timer.to_dict()
+        report.final_balance = self.exchange.balance
+        report.fees_paid = self.exchange.fees_paid
+        logger.info(
+            f"Replay: {report.cycles} cycles, {len(report.fills)} fills, "
+            f"{report.speedup:.0f}x real time"
+        )
+        return report
@@ -14,16 +14,18 @@ def momentum_strategy(df: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
     """
     rsi_period = params.get("rsi_period", 14)
     sma_period = params.get("sma_period", 50)
+    rsi_max = params.get("rsi_max", 70)
 
     # Logic
-    # 1. Trend Filter: Close > SMA
-    trend_up = df["close"] > df["sma_50"]  # Pre-calculated or calc here
+    # 1. Trend Filter: Close > SMA (falls back to sma_50 if that period isn't prepared)
+    sma = df.get(f"sma_{sma_period}", df["sma_50"])
+    trend_up = df["close"] > sma
 
     # 2. Momentum Trigger: MACD > Signal
     macd_bullish = df["macd"] > df["macd_signal"]
 
-    # 3. RSI Filter: Not Overbought (> 70)
-    rsi_safe = df["rsi"] < 70
+    # 3. RSI Filter: Not Overbought
+    rsi_safe = df["rsi"] < rsi_max
 
     signal = pd.Series(0, index=df.index)
 
@@ -46,8 +48,12 @@ def mean_reversion_strategy(df: pd.DataFrame, params: Dict[str, Any]) -> pd.Seri
 
     signal = pd.Series(0, index=df.index)
 
-    # Long: Price breaks below lower band
-    long_cond = df["close"] < df["bb_lower"]
+    # Long: Price breaks below lower band (rebuilt from std_20 so bb_dev is tunable)
+    if "std_20" in df:
+        bb_lower = df["sma_20"] - df["std_20"] * bb_dev
+    else:
+        bb_lower = df["bb_lower"]
+    long_cond = df["close"] < bb_lower
 
     # Short/Exit: Price breaks above upper or mean
     exit_cond = df["close"] > df["sma_20"]
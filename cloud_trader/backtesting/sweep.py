@@ -0,0 +1,331 @@
+"""
+Parallel walk-forward and parameter-sweep runner.
+
+Every (fold x parameter set) task is scored with ``EnhancedBacktester`` on a
+process pool. The prepared feature frame is published once into shared
+memory and mapped read-only by each worker, so tasks only ship a fold and a
+params dict. Finished tasks are appended to ``<output>.jsonl`` as they land
+and the ranked leaderboard at ``<output>`` is rewritten after each one;
+rerunning against the same output path skips tasks already recorded.
+"""
+
+import itertools
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..backtester import EnhancedBacktester, Trade
+
+logger = logging.getLogger(__name__)
+
+StrategyFunc = Callable[[pd.DataFrame, Dict[str, Any]], pd.Series]
+
+METRICS = (
+    "sharpe_ratio",
+    "sortino_ratio",
+    "calmar_ratio",
+    "total_return",
+    "max_drawdown",
+    "win_rate",
+    "total_trades",
+)
+
+
+# ----- parameter spaces -----
+
+
+def grid(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of every value list in ``space``."""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_sample(
+    space: Dict[str, Any], n: int, seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Draw ``n`` parameter sets from ``space``.
+
+    A ``(low, high)`` tuple is sampled uniformly (integers if both bounds are
+    ints); any other sequence is sampled by choice.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n):
+        params = {}
+        for key, spec in space.items():
+            if isinstance(spec, tuple) and len(spec) == 2:
+                low, high = spec
+                if isinstance(low, int) and isinstance(high, int):
+                    params[key] = rng.randint(low, high)
+                else:
+                    params[key] = rng.uniform(low, high)
+            else:
+                params[key] = rng.choice(list(spec))
+        samples.append(params)
+    return samples
+
+
+# ----- folds -----
+
+
+@dataclass(frozen=True)
+class Fold:
+    """One walk-forward split as half-open row ranges into the frame."""
+
+    index: int
+    train: Tuple[int, int]
+    test: Tuple[int, int]
+
+
+def walk_forward_folds(
+    n_rows: int, train_size: int, test_size: int, step: Optional[int] = None
+) -> List[Fold]:
+    """Rolling train/test windows; ``step`` defaults to ``test_size``."""
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size + test_size <= n_rows:
+        split = start + train_size
+        folds.append(Fold(len(folds), (start, split), (split, split + test_size)))
+        start += step
+    return folds
+
+
+# ----- scoring -----
+
+
+def signals_to_trades(
+    df: pd.DataFrame, signal: pd.Series, symbol: str, capital: float
+) -> List[Trade]:
+    """Turn a 1/0/-1 position series into round-trip trades at bar closes."""
+    side = np.nan_to_num(np.asarray(signal, dtype=np.float64))
+    closes = df["close"].to_numpy(dtype=np.float64)
+    times = df.index
+    trades: List[Trade] = []
+    if len(side) == 0:
+        return trades
+
+    # Only bars where the position changes matter
+    changes = np.flatnonzero(np.diff(side, prepend=0.0))
+    open_at: Optional[int] = None
+    for i in changes:
+        if open_at is not None:
+            trades.append(_trade(symbol, side[open_at], closes, times, open_at, i, capital))
+            open_at = None
+        if side[i] != 0:
+            open_at = int(i)
+    if open_at is not None and open_at < len(side) - 1:
+        trades.append(_trade(symbol, side[open_at], closes, times, open_at, len(side) - 1, capital))
+    return trades
+
+
+def _trade(symbol, direction, closes, times, entry, exit_, capital) -> Trade:
+    return Trade(
+        symbol=symbol,
+        side="LONG" if direction > 0 else "SHORT",
+        entry_price=float(closes[entry]),
+        exit_price=float(closes[exit_]),
+        size=capital / closes[entry] if closes[entry] > 0 else 0.0,
+        entry_time=times[entry],
+        exit_time=times[exit_],
+    )
+
+
+def evaluate(
+    frame: pd.DataFrame,
+    strategy: StrategyFunc,
+    params: Dict[str, Any],
+    fold: Fold,
+    backtester: EnhancedBacktester,
+    symbol: str,
+) -> Dict[str, Any]:
+    """Score one parameter set on one fold (in-sample and out-of-sample)."""
+    record: Dict[str, Any] = {"fold": fold.index, "params": params}
+    for label, (start, stop) in (("is", fold.train), ("oos", fold.test)):
+        window = frame.iloc[start:stop]
+        trades = signals_to_trades(
+            window, strategy(window, params), symbol, backtester.initial_capital
+        )
+        result = backtester.run_with_frictions(trades)
+        for metric in METRICS:
+            record[f"{label}_{metric}"] = float(getattr(result, metric))
+    return record
+
+
+# ----- shared memory frame -----
+
+
+def _publish(frame: pd.DataFrame) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    """Copy the index and numeric columns into one shared block."""
+    numeric = frame.select_dtypes(include=[np.number])
+    n_rows, n_cols = len(numeric), numeric.shape[1]
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * n_rows * (n_cols + 1)))
+    index = np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)
+    index[:] = pd.DatetimeIndex(frame.index).asi8
+    data = np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=shm.buf, offset=8 * n_rows)
+    data[:] = numeric.to_numpy(dtype=np.float64)
+    spec = {
+        "name": shm.name,
+        "rows": n_rows,
+        "columns": list(numeric.columns),
+        "index_name": frame.index.name,
+    }
+    return shm, spec
+
+
+def _attach(spec: Dict[str, Any]) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    n_rows, columns = spec["rows"], spec["columns"]
+    index = np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)
+    data = np.ndarray((n_rows, len(columns)), dtype=np.float64, buffer=shm.buf, offset=8 * n_rows)
+    data.flags.writeable = False
+    frame = pd.DataFrame(
+        data,
+        index=pd.DatetimeIndex(index.view("datetime64[ns]"), name=spec["index_name"]),
+        columns=columns,
+        copy=False,
+    )
+    return shm, frame
+
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(spec, strategy, backtester, symbol) -> None:
+    shm, frame = _attach(spec)
+    _WORKER.update(shm=shm, frame=frame, strategy=strategy, backtester=backtester, symbol=symbol)
+
+
+def _run_task(fold: Fold, params: Dict[str, Any]) -> Dict[str, Any]:
+    w = _WORKER
+    return evaluate(w["frame"], w["strategy"], params, fold, w["backtester"], w["symbol"])
+
+
+# ----- runner -----
+
+
+class SweepRunner:
+    """Distributes folds x parameter sets and keeps a resumable ranked leaderboard."""
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        strategy: StrategyFunc,
+        output_path: str,
+        backtester: Optional[EnhancedBacktester] = None,
+        symbol: str = "SOL/USD",
+        rank_by: str = "oos_sharpe_ratio",
+        max_workers: Optional[int] = None,
+    ):
+        self.frame = frame
+        self.strategy = strategy
+        self.output_path = output_path
+        self.records_path = f"{output_path}.jsonl"
+        self.backtester = backtester or EnhancedBacktester()
+        self.symbol = symbol
+        self.rank_by = rank_by
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _key(fold: int, params: Dict[str, Any]) -> str:
+        return f"{fold}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    def load_records(self) -> List[Dict[str, Any]]:
+        """Records from previous runs; a torn trailing line is ignored."""
+        records = []
+        if not os.path.exists(self.records_path):
+            return records
+        with open(self.records_path) as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping torn sweep record in {self.records_path}")
+        return records
+
+    def run(
+        self, param_sets: Iterable[Dict[str, Any]], folds: Sequence[Fold]
+    ) -> List[Dict[str, Any]]:
+        """Evaluate every pending task and return the ranked leaderboard."""
+        records = self.load_records()
+        done = {self._key(r["fold"], r["params"]) for r in records}
+        tasks = [
+            (fold, params)
+            for params in param_sets
+            for fold in folds
+            if self._key(fold.index, params) not in done
+        ]
+        logger.info(f"Sweep: {len(tasks)} pending tasks ({len(done)} already recorded)")
+        if not tasks:
+            return self.write_leaderboard(records)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        with open(self.records_path, "a") as sink:
+            for record in self._execute(tasks):
+                sink.write(json.dumps(record, default=str) + "\n")
+                sink.flush()
+                records.append(record)
+                self.write_leaderboard(records)
+        return self.write_leaderboard(records)
+
+    def _execute(self, tasks: List[Tuple[Fold, Dict[str, Any]]]) -> Iterable[Dict[str, Any]]:
+        if self.max_workers == 1:
+            for fold, params in tasks:
+                yield evaluate(
+                    self.frame, self.strategy, params, fold, self.backtester, self.symbol
+                )
+            return
+
+        shm, spec = _publish(self.frame)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(spec, self.strategy, self.backtester, self.symbol),
+            ) as pool:
+                futures = [pool.submit(_run_task, fold, params) for fold, params in tasks]
+                for future in as_completed(futures):
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.error(f"Sweep task failed: {e}")
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def leaderboard(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Average each parameter set's metrics across folds and rank them."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            key = json.dumps(record["params"], sort_keys=True, default=str)
+            grouped.setdefault(key, []).append(record)
+
+        rows = []
+        for group in grouped.values():
+            row: Dict[str, Any] = {"params": group[0]["params"], "folds": len(group)}
+            for label in ("is", "oos"):
+                for metric in METRICS:
+                    key = f"{label}_{metric}"
+                    row[key] = float(np.mean([r[key] for r in group]))
+            rows.append(row)
+
+        rows.sort(key=lambda r: r.get(self.rank_by, float("-inf")), reverse=True)
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        return rows
+
+    def write_leaderboard(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows = self.leaderboard(records)
+        tmp_path = f"{self.output_path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(rows, fh, indent=2, default=str)
+        os.replace(tmp_path, self.output_path)
+        return rows
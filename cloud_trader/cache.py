@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import logging
 import pickle
+import sys
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from fnmatch import fnmatch
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 try:  # pragma: no cover - optional dependency
     import redis.asyncio as redis
@@ -192,22 +195,98 @@ class BaseCache(ABC):
         return all(result is True for result in results)
 
 
+class _CacheEntry:
+    """Stored value plus its expiry (monotonic clock) and approximate size."""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+def _estimate_size(value: Any) -> int:
+    """Cheap, shallow size estimate used for the byte bound (one container level deep)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+def _key_prefixes(key: str) -> List[str]:
+    """Namespace prefixes of a key, e.g. ``market:snap:BTC`` -> ``market:``, ``market:snap:``."""
+    return [key[: idx + 1] for idx, char in enumerate(key) if char == ":"]
+
+
 class InMemoryCache(BaseCache):
-    """Simple in-memory cache with TTL support."""
+    """In-memory cache with TTL expiry and an LRU size bound.
+
+    Every operation is O(1) (amortised O(log n) for TTL bookkeeping):
+
+    * entries live in an ``OrderedDict`` kept in LRU order, bounded by
+      ``cache_max_entries`` and ``cache_max_bytes``;
+    * expiries go on a min-heap that a background reaper drains, while ``get``
+      only checks the expiry of the entry it reads;
+    * keys are indexed by their ``:``-separated namespace prefixes so
+      ``clear_pattern`` only inspects keys in the matching namespace.
+
+    Nothing awaits between reading and mutating the store, so no lock is needed
+    on the event loop.
+    """
 
     backend = "memory"
 
-    def __init__(self, settings: Optional[Settings] = None) -> None:
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        reaper_interval: Optional[float] = None,
+    ) -> None:
         super().__init__(settings=settings)
-        self._store: Dict[str, Tuple[Any, Optional[float]]] = {}
-        self._lock = asyncio.Lock()
+        self.max_entries = (
+            self._settings.cache_max_entries if max_entries is None else max_entries
+        )
+        self.max_bytes = self._settings.cache_max_bytes if max_bytes is None else max_bytes
+        self.reaper_interval = (
+            self._settings.cache_reaper_interval_seconds
+            if reaper_interval is None
+            else reaper_interval
+        )
+        self._store: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._prefix_index: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "deletes": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
 
     async def connect(self) -> None:
         logger.info("Using in-memory cache backend")
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_loop())
 
     async def disconnect(self) -> None:
-        async with self._lock:
-            self._store.clear()
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+        self._store.clear()
+        self._expiry_heap.clear()
+        self._prefix_index.clear()
+        self._bytes = 0
 
     def is_connected(self) -> bool:
         return True
@@ -216,47 +295,141 @@ class InMemoryCache(BaseCache):
         """Test connectivity to the cache backend."""
         return True  # In-memory cache is always available
 
-    def _purge_expired(self) -> None:
-        now = time.time()
-        expired = [key for key, (_, expiry) in self._store.items() if expiry and expiry <= now]
-        for key in expired:
-            self._store.pop(key, None)
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reaper_interval)
+            try:
+                self._reap_expired()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug("Cache reaper error: %s", exc)
+
+    def _reap_expired(self, limit: Optional[int] = None) -> int:
+        """Pop due entries off the expiry heap; stale heap items are skipped."""
+        now = time.monotonic()
+        heap = self._expiry_heap
+        reaped = 0
+        while heap and heap[0][0] <= now and (limit is None or reaped < limit):
+            expires_at, key = heapq.heappop(heap)
+            entry = self._store.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self._stats["expirations"] += 1
+            reaped += 1
+
+        # Overwrites leave stale heap items behind; rebuild once they dominate.
+        if len(heap) > 2 * len(self._store) + 1024:
+            self._expiry_heap = [
+                (entry.expires_at, key)
+                for key, entry in self._store.items()
+                if entry.expires_at is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+        return reaped
+
+    def _remove(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._store.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        for prefix in _key_prefixes(key):
+            bucket = self._prefix_index.get(prefix)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._prefix_index[prefix]
+        return entry
+
+    def _evict_over_bounds(self) -> None:
+        store = self._store
+        while len(store) > 1 and (
+            (self.max_entries and len(store) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(store))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    @staticmethod
+    def _is_expired(entry: _CacheEntry, now: float) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= now
 
     async def get(self, key: str) -> Optional[Any]:
-        async with self._lock:
-            self._purge_expired()
-            entry = self._store.get(key)
-            if not entry:
-                return None
-            value, expiry = entry
-            if expiry and expiry <= time.time():
-                self._store.pop(key, None)
-                return None
-            return value
+        entry = self._store.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        if self._is_expired(entry, time.monotonic()):
+            self._remove(key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._store.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry.value
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        expires_at = time.time() + ttl if ttl and ttl > 0 else None
-        async with self._lock:
-            self._store[key] = (value, expires_at)
+        expires_at = time.monotonic() + ttl if ttl and ttl > 0 else None
+        size = _estimate_size(value)
+
+        previous = self._store.get(key)
+        if previous is not None:
+            self._bytes -= previous.size
+            self._store.move_to_end(key)
+        else:
+            for prefix in _key_prefixes(key):
+                self._prefix_index.setdefault(prefix, set()).add(key)
+
+        self._store[key] = _CacheEntry(value, expires_at, size)
+        self._bytes += size
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+        self._stats["sets"] += 1
+
+        self._reap_expired(limit=8)
+        self._evict_over_bounds()
         return True
 
     async def delete(self, key: str) -> bool:
-        async with self._lock:
-            removed = self._store.pop(key, None) is not None
+        removed = self._remove(key) is not None
+        if removed:
+            self._stats["deletes"] += 1
         return removed
 
     async def clear_pattern(self, pattern: str) -> int:
-        async with self._lock:
-            self._purge_expired()
-            matched = [key for key in self._store if fnmatch(key, pattern)]
-            for key in matched:
-                self._store.pop(key, None)
-        return len(matched)
+        literal_end = min(
+            (idx for idx in (pattern.find(ch) for ch in "*?[") if idx >= 0),
+            default=len(pattern),
+        )
+        literal = pattern[:literal_end]
+        if literal_end == len(pattern):
+            candidates: Any = [literal] if literal in self._store else []
+        else:
+            namespace_end = literal.rfind(":")
+            if namespace_end >= 0:
+                candidates = self._prefix_index.get(literal[: namespace_end + 1], ())
+            else:
+                candidates = self._store.keys()
+
+        now = time.monotonic()
+        matched = 0
+        for key in [k for k in candidates if fnmatch(k, pattern)]:
+            entry = self._remove(key)
+            if entry is not None and not self._is_expired(entry, now):
+                matched += 1
+        return matched
 
     async def get_stats(self) -> Optional[Dict[str, Any]]:
-        async with self._lock:
-            self._purge_expired()
-            return {"backend": "memory", "entries": len(self._store)}
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "backend": "memory",
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "pending_expiries": len(self._expiry_heap),
+            **self._stats,
+            "hit_rate": self._stats["hits"] / max(lookups, 1),
+        }
 
 
 class RedisCache(BaseCache):
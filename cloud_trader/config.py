@@ -65,6 +65,73 @@ class Settings(BaseSettings):
         default="https://fapi.asterdex.com", validation_alias="ASTER_REST_URL"
     )
     ws_base_url: str = Field(default="wss://fstream.asterdex.com", validation_alias="ASTER_WS_URL")
+    aster_read_freshness_seconds: float = Field(
+        default=0.0,
+        ge=0.0,
+        validation_alias="ASTER_READ_FRESHNESS_SECONDS",
+        description=(
+            "Serve identical public market-data reads from the last response for this long "
+            "(0 = in-flight sharing only)"
+        ),
+    )
+    aster_http_max_connections: int = Field(
+        default=50,
+        ge=1,
+        validation_alias="ASTER_HTTP_MAX_CONNECTIONS",
+        description="Connection pool size for the Aster REST client",
+    )
+    aster_http_keepalive_seconds: float = Field(
+        default=120.0,
+        ge=0.0,
+        validation_alias="ASTER_HTTP_KEEPALIVE_SECONDS",
+        description="How long idle pooled connections are kept open",
+    )
+    aster_http2: bool = Field(
+        default=True,
+        validation_alias="ASTER_HTTP2",
+        description="Use HTTP/2 for Aster REST calls when the h2 package is installed",
+    )
+    aster_prewarm_connections: int = Field(
+        default=2,
+        ge=0,
+        validation_alias="ASTER_PREWARM_CONNECTIONS",
+        description="Connections opened at startup so the first order does not pay for DNS/TLS",
+    )
+    market_stream_enabled: bool = Field(
+        default=True,
+        validation_alias="MARKET_STREAM_ENABLED",
+        description="Feed tickers, depth and klines from Aster websockets instead of REST polling",
+    )
+    market_stream_max_symbols: int = Field(
+        default=100,
+        ge=0,
+        validation_alias="MARKET_STREAM_MAX_SYMBOLS",
+        description="Maximum symbols with per-symbol depth/kline streams",
+    )
+    market_stream_kline_interval: str = Field(
+        default="1h",
+        validation_alias="MARKET_STREAM_KLINE_INTERVAL",
+        description="Kline interval kept current by the market data stream",
+    )
+    market_stream_order_books: bool = Field(
+        default=True,
+        validation_alias="MARKET_STREAM_ORDER_BOOKS",
+        description=(
+            "Maintain local L2 books from the diff-depth stream instead of partial depth snapshots"
+        ),
+    )
+    market_stream_agg_trades: bool = Field(
+        default=True,
+        validation_alias="MARKET_STREAM_AGG_TRADES",
+        description="Subscribe per-symbol aggTrade streams to feed the streaming VPIN engine",
+    )
+    order_book_snapshot_limit: int = Field(
+        default=500,
+        ge=5,
+        le=1000,
+        validation_alias="ORDER_BOOK_SNAPSHOT_LIMIT",
+        description="Levels requested per REST snapshot when (re)syncing a local order book",
+    )
 
     @field_validator("rest_base_url", "ws_base_url", "model_endpoint", "llm_endpoint")
     @classmethod
@@ -293,6 +360,25 @@ class Settings(BaseSettings):
         validation_alias="AGENT_CACHE_TTL_SECONDS",
         description="Cache TTL for agent responses in seconds",
     )
+    scan_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=128,
+        validation_alias="SCAN_MAX_CONCURRENCY",
+        description="Maximum symbols analysed concurrently in a swarm scan cycle",
+    )
+    scan_cycle_deadline_seconds: float = Field(
+        default=45.0,
+        ge=0,
+        validation_alias="SCAN_CYCLE_DEADLINE_SECONDS",
+        description="Wall-clock budget for a swarm scan cycle (0 disables the deadline)",
+    )
+    scan_max_symbols: int = Field(
+        default=0,
+        ge=0,
+        validation_alias="SCAN_MAX_SYMBOLS",
+        description="Symbols sampled per scan cycle (0 scans the whole market structure)",
+    )
     max_symbols_per_agent: int = Field(
         default=50,
         ge=1,
@@ -365,6 +451,24 @@ class Settings(BaseSettings):
         validation_alias="CACHE_BACKEND",
         description="Cache backend to use ('memory' or 'redis')",
     )
+    cache_max_entries: int = Field(
+        default=50_000,
+        ge=0,
+        validation_alias="CACHE_MAX_ENTRIES",
+        description="LRU bound on in-memory cache entries (0 = unbounded)",
+    )
+    cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        validation_alias="CACHE_MAX_BYTES",
+        description="Approximate LRU bound on in-memory cache size in bytes (0 = unbounded)",
+    )
+    cache_reaper_interval_seconds: float = Field(
+        default=1.0,
+        gt=0.0,
+        validation_alias="CACHE_REAPER_INTERVAL_SECONDS",
+        description="How often the in-memory cache reaper drops expired entries",
+    )
     database_url: str | None = Field(
         default=None,
         validation_alias="DATABASE_URL",
@@ -0,0 +1,143 @@
+"""Materialized, versioned dashboard state.
+
+The dashboard payload is split into named sections (positions, trades, agents,
+...). A section is rebuilt only when it is stale:
+
+- it was ``touch``-ed by an event (fill, position change, ...),
+- its ``fingerprint`` changed (an O(1) probe such as deque length + head id),
+- its ``ttl`` expired (market-driven values such as mark prices), or
+- a section it ``depends`` on was rebuilt in the same refresh.
+
+The sections are then composed into the full payload. The version only
+increases when the composed payload actually differs from the previous one,
+and the serialized bytes are cached per version, so any number of dashboards
+polling an unchanged state cost one dict lookup each.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize a dashboard payload (numpy scalars and datetimes included)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=str).encode()
+
+
+@dataclass
+class _Section:
+    build: Callable[[], Any]
+    fingerprint: Optional[Callable[[], Hashable]] = None
+    ttl: Optional[float] = None
+    depends: Tuple[str, ...] = ()
+    value: Any = None
+    built_at: float = float("-inf")
+    last_print: Any = None
+    dirty: bool = True
+    failures: int = 0
+
+
+class DashboardState:
+    """Sectioned dashboard payload with a monotonically increasing version."""
+
+    # Keys stamped onto every version; not part of the change comparison
+    _STAMP_KEYS = ("timestamp", "version")
+
+    def __init__(
+        self, compose: Callable[[Dict[str, Any]], Dict[str, Any]], min_interval: float = 0.25
+    ):
+        """
+        Args:
+            compose: Builds the full payload from ``{section name: section value}``
+            min_interval: Seconds between refreshes when no section was touched
+        """
+        self.compose = compose
+        self.min_interval = min_interval
+        self.version = 0
+        self.data: Dict[str, Any] = {}
+        self._sections: Dict[str, _Section] = {}
+        self._bytes: Optional[bytes] = None
+        self._refreshed_at = float("-inf")
+
+    def add_section(
+        self,
+        name: str,
+        build: Callable[[], Any],
+        fingerprint: Optional[Callable[[], Hashable]] = None,
+        ttl: Optional[float] = None,
+        depends: Iterable[str] = (),
+    ) -> None:
+        """Register a section; sections must be added after their dependencies."""
+        self._sections[name] = _Section(build, fingerprint, ttl, tuple(depends))
+
+    def touch(self, *names: str) -> None:
+        """Mark sections stale (no names = all sections)."""
+        for name in names or self._sections:
+            self._sections[name].dirty = True
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild stale sections; returns True when the version advanced."""
+        now = time.monotonic()
+        dirty = any(section.dirty for section in self._sections.values())
+        if not force and not dirty and now - self._refreshed_at < self.min_interval:
+            return False
+        self._refreshed_at = now
+
+        rebuilt = set()
+        for name, section in self._sections.items():
+            stamp = section.fingerprint() if section.fingerprint is not None else None
+            stale = (
+                force
+                or section.dirty
+                or stamp != section.last_print
+                or (section.ttl is not None and now - section.built_at >= section.ttl)
+                or any(dep in rebuilt for dep in section.depends)
+            )
+            if not stale:
+                continue
+            try:
+                section.value = section.build()
+                section.failures = 0
+            except Exception as e:
+                # Keep serving the previous value; retry on the next event or TTL
+                section.failures += 1
+                section.built_at = now
+                section.dirty = False
+                logger.warning(f"⚠️ Dashboard section '{name}' failed to build: {e}")
+                continue
+            section.built_at = now
+            section.last_print = stamp
+            section.dirty = False
+            rebuilt.add(name)
+
+        if not rebuilt and self.version:
+            return False
+
+        payload = self.compose({name: s.value for name, s in self._sections.items()})
+        previous = {k: v for k, v in self.data.items() if k not in self._STAMP_KEYS}
+        if self.version and payload == previous:
+            return False
+
+        payload["timestamp"] = time.time()
+        payload["version"] = self.version + 1
+        self.data = payload
+        self.version += 1
+        self._bytes = None
+        return True
+
+    def to_bytes(self) -> bytes:
+        """Serialized payload of the current version (computed once per version)."""
+        if self._bytes is None:
+            self._bytes = dumps(self.data)
+        return self._bytes
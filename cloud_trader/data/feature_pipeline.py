@@ -4,7 +4,7 @@ import asyncio
 import random
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 
@@ -16,6 +16,8 @@ except ImportError:
 
 from ..definitions import DRIFT_SYMBOLS, HYPERLIQUID_SYMBOLS, SYMPHONY_SYMBOLS
 from ..logger import get_logger
+from .order_book import L2OrderBook
+from .streaming_indicators import StreamingIndicatorEngine
 
 logger = get_logger(__name__)
 
@@ -29,6 +31,9 @@ class FeaturePipeline:
         self.client = exchange_client
         self._analysis_cache: Dict[str, Dict[str, Any]] = {}
         self._cache_ttl = 60  # Cache analysis for 60 seconds
+        self.kline_interval = "1h"  # Candle interval behind the TA snapshot
+        # Incremental per-symbol indicator state (O(1) per new candle)
+        self._indicator_engine = StreamingIndicatorEngine()
 
     async def fetch_candles(self, symbol: str, interval: str = "1h", limit: int = 100) -> Any:
         """Fetch OHLCV data and return as DataFrame."""
@@ -309,9 +314,22 @@ class FeaturePipeline:
         # Cache miss - Parallel fetch for speed
         return await self._fetch_and_analyze(symbol)
 
+    def _live_book(self, symbol: str) -> Optional[L2OrderBook]:
+        """Locally maintained L2 book when the client exposes one (StoreBackedExchange)."""
+        get_live_book = getattr(self.client, "get_live_book", None)
+        if not callable(get_live_book):
+            return None
+        book = get_live_book(symbol)
+        return book if isinstance(book, L2OrderBook) else None
+
     async def _fetch_and_analyze(self, symbol: str) -> Dict[str, Any]:
         """Internal fetch and analyze for a single symbol."""
-        candles_task = self.fetch_candles(symbol, interval="1h", limit=100)
+        live_book = self._live_book(symbol)
+        if live_book is not None:
+            df = await self.fetch_candles(symbol, interval=self.kline_interval, limit=100)
+            return self._process_analysis(symbol, df, live_book)
+
+        candles_task = self.fetch_candles(symbol, interval=self.kline_interval, limit=100)
         orderbook_task = self.client.get_order_book(symbol, limit=20)
 
         results = await asyncio.gather(candles_task, orderbook_task, return_exceptions=True)
@@ -341,9 +359,8 @@ class FeaturePipeline:
                     df = await self.fetch_candles(symbol, interval, limit)
                     # We only cache the DF for now, full analysis happens on demand or next
                     if pd is not None and isinstance(df, pd.DataFrame) and not df.empty:
-                        # Pre-calculate indicators while we are at it
-                        df = self.calculate_indicators(df, symbol)
-                        # Store in a temporary DF cache if needed, or just let get_market_analysis use it
+                        # Warm the streaming indicator state while we are at it
+                        self._indicator_engine.ingest_frame(symbol, df)
                         # Here we will just perform the full analysis to fully warm the cache
                         analysis = await self.get_market_analysis(symbol)
                         return True
@@ -358,48 +375,98 @@ class FeaturePipeline:
             f"✅ [PREFETCH] Completed: {success_count}/{len(symbols)} symbols warmed in cache."
         )
 
-    def _process_analysis(self, symbol: str, df: Any, orderbook: Dict[str, Any]) -> Dict[str, Any]:
+    def update_candle(
+        self, symbol: str, candle: Dict[str, Any], closed: bool = True
+    ) -> Dict[str, Any]:
+        """Push a streamed candle into the indicator engine and return the TA snapshot.
+
+        Closed candles advance the per-symbol state; partial candles are
+        evaluated without committing. The cached analysis for ``symbol`` is
+        refreshed in place so agents see the new values immediately.
+        """
+        latest = self._indicator_engine.update(symbol, candle, closed=closed)
+        ta_data = self._ta_snapshot(latest)
+        if symbol in self._analysis_cache:
+            cached, _ = self._analysis_cache[symbol]
+            self._analysis_cache[symbol] = ({**cached, **ta_data}, time.time())
+        return ta_data
+
+    def on_kline(self, symbol: str, interval: str, row: List[Any], closed: bool) -> None:
+        """``MarketDataStore`` kline listener: advance the indicators as candles stream in.
+
+        Only symbols already warmed from a REST frame are updated. Candles at or
+        before the last committed bar are ignored; a skipped bar drops the state
+        so the next ``ingest_frame`` rebuilds it from history.
+        """
+        if interval != self.kline_interval:
+            return
+        last = self._indicator_engine.last_timestamp(symbol)
+        if last is None:
+            return
+        open_time = int(row[0])
+        if open_time <= last:
+            return
+        if open_time - last > int(row[6]) - open_time + 1:
+            self._indicator_engine.reset(symbol)
+            return
+        candle = {
+            "timestamp": open_time,
+            "high": row[2],
+            "low": row[3],
+            "close": row[4],
+            "volume": row[5],
+        }
+        self.update_candle(symbol, candle, closed=closed)
+
+    @staticmethod
+    def _ta_snapshot(latest: Any) -> Dict[str, Any]:
+        """Build the agent-facing TA dict from an indicator row."""
+        return {
+            "price": float(latest["close"]),
+            "rsi": float(latest.get("RSI_14", 50)),
+            "atr": float(latest.get("ATRr_14", 0)),
+            "ema_20": float(latest.get("EMA_20", 0)),
+            "ema_50": float(latest.get("EMA_50", 0)),
+            "trend": "BULLISH" if latest["close"] > latest.get("EMA_50", 0) else "BEARISH",
+            "volatility_state": (
+                "HIGH" if latest.get("ATRr_14", 0) > (latest["close"] * 0.02) else "LOW"
+            ),
+            # New Indicators
+            "macd_val": float(latest.get("MACD", 0)),
+            "macd_signal": float(latest.get("MACD_signal", 0)),
+            "macd_hist": float(latest.get("MACD_hist", 0)),
+            "bb_upper": float(latest.get("BB_upper", 0)),
+            "bb_mid": float(latest.get("BB_mid", 0)),
+            "bb_lower": float(latest.get("BB_lower", 0)),
+            "stoch_k": float(latest.get("STOCH_K", 50)),
+            "stoch_d": float(latest.get("STOCH_D", 50)),
+            "cci": float(latest.get("CCI", 0)),
+            "adx": float(latest.get("ADX", 0)),
+            "obv": float(latest.get("OBV", 0)),
+            # Advanced
+            "fib_0_5": float(latest.get("FIB_0.5", 0)),
+            "fib_0_618": float(latest.get("FIB_0.618", 0)),
+            "wyckoff_phase": str(latest.get("WYCKOFF_PHASE", "NEUTRAL")),
+            "vsop": float(latest.get("VSOP", 50)),
+        }
+
+    def _process_analysis(
+        self, symbol: str, df: Any, orderbook: Union[Dict[str, Any], L2OrderBook]
+    ) -> Dict[str, Any]:
         """Process raw data into analysis result."""
         ta_data = {}
         if pd is not None and isinstance(df, pd.DataFrame) and not df.empty:
-            df = self.calculate_indicators(df, symbol)
-            print(f"✅ [PIPELINE] Complete for {symbol}")
-            import sys
-
-            sys.stdout.flush()
-            latest = df.iloc[-1]
-            ta_data = {
-                "price": float(latest["close"]),
-                "rsi": float(latest.get("RSI_14", 50)),
-                "atr": float(latest.get("ATRr_14", 0)),
-                "ema_20": float(latest.get("EMA_20", 0)),
-                "ema_50": float(latest.get("EMA_50", 0)),
-                "trend": "BULLISH" if latest["close"] > latest.get("EMA_50", 0) else "BEARISH",
-                "volatility_state": (
-                    "HIGH" if latest.get("ATRr_14", 0) > (latest["close"] * 0.02) else "LOW"
-                ),
-                # New Indicators
-                "macd_val": float(latest.get("MACD", 0)),
-                "macd_signal": float(latest.get("MACD_signal", 0)),
-                "macd_hist": float(latest.get("MACD_hist", 0)),
-                "bb_upper": float(latest.get("BB_upper", 0)),
-                "bb_mid": float(latest.get("BB_mid", 0)),
-                "bb_lower": float(latest.get("BB_lower", 0)),
-                "stoch_k": float(latest.get("STOCH_K", 50)),
-                "stoch_d": float(latest.get("STOCH_D", 50)),
-                "cci": float(latest.get("CCI", 0)),
-                "adx": float(latest.get("ADX", 0)),
-                "obv": float(latest.get("OBV", 0)),
-                # Advanced
-                "fib_0_5": float(latest.get("FIB_0.5", 0)),
-                "fib_0_618": float(latest.get("FIB_0.618", 0)),
-                "wyckoff_phase": str(latest.get("WYCKOFF_PHASE", "NEUTRAL")),
-                "vsop": float(latest.get("VSOP", 50)),
-            }
+            # Only bars newer than the last committed one are applied
+            latest = self._indicator_engine.ingest_frame(symbol, df)
+            if latest is not None:
+                ta_data = self._ta_snapshot(latest)
 
         # 2. Order Book Analysis (Depth & Pressure)
         ob_data = {"bid_pressure": 0.0, "spread_pct": 0.0}
-        if isinstance(orderbook, dict) and "bids" in orderbook:
+        if isinstance(orderbook, L2OrderBook):
+            # Live book: adds microprice, top-5 imbalance and 10bps depth
+            ob_data = orderbook.features(levels=20)
+        elif isinstance(orderbook, dict) and "bids" in orderbook:
             try:
                 bids = [float(x[1]) for x in orderbook["bids"]]
                 asks = [float(x[1]) for x in orderbook["asks"]]
@@ -0,0 +1,563 @@
+"""Websocket-fed, in-process market data store.
+
+``MarketDataStreamService`` subscribes to the Aster combined streams (all-market
+tickers and book tickers plus per-symbol depth, klines and optionally aggregate
+trades) and keeps ``MarketDataStore`` current. ``StoreBackedExchange`` wraps an ``AsterClient`` so
+existing callers (``AnalysisEngine``, ``FeaturePipeline``, ``PositionManager``)
+read tickers, order books and klines from memory and only hit REST when the
+store has a gap (unknown symbol, stale entry, or kline history lost across a
+reconnect). When an ``OrderBookEngine`` is attached, per-symbol depth comes from
+the diff-depth stream and order book reads are served from the local L2 books.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..exchange import AsterWebSocketClient
+from .order_book import L2OrderBook, OrderBookEngine
+
+logger = logging.getLogger(__name__)
+
+KlineListener = Callable[[str, str, List[Any], bool], None]
+AggTradeListener = Callable[[Dict[str, Any]], Any]
+
+# REST field names for the websocket 24hr ticker payload
+_TICKER_FIELDS = {
+    "s": "symbol",
+    "p": "priceChange",
+    "P": "priceChangePercent",
+    "w": "weightedAvgPrice",
+    "c": "lastPrice",
+    "Q": "lastQty",
+    "o": "openPrice",
+    "h": "highPrice",
+    "l": "lowPrice",
+    "v": "volume",
+    "q": "quoteVolume",
+    "O": "openTime",
+    "C": "closeTime",
+    "F": "firstId",
+    "L": "lastId",
+    "n": "count",
+}
+
+
+_INTERVAL_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800, "M": 2592000}
+
+
+def _interval_seconds(interval: str) -> float:
+    """Bar length of a kline interval such as ``"15m"`` or ``"4h"``."""
+    try:
+        return int(interval[:-1]) * _INTERVAL_SECONDS[interval[-1]]
+    except (KeyError, ValueError, IndexError):
+        return 60.0
+
+
+def _kline_row(k: Dict[str, Any]) -> List[Any]:
+    """Websocket kline payload -> REST kline row."""
+    return [
+        k["t"],
+        k["o"],
+        k["h"],
+        k["l"],
+        k["c"],
+        k["v"],
+        k["T"],
+        k.get("q"),
+        k.get("n"),
+        k.get("V"),
+        k.get("Q"),
+        k.get("B", "0"),
+    ]
+
+
+class MarketDataStore:
+    """Latest tickers, top-of-book, depth snapshots and rolling klines per symbol.
+
+    Entries are stamped with the local receive time; getters return ``None`` for
+    missing or stale data so callers can fall back to REST. A kline series is
+    stale once it has gone one bar interval without a stream update or reseed.
+    """
+
+    def __init__(
+        self,
+        max_klines: int = 500,
+        ticker_max_age: float = 5.0,
+        book_max_age: float = 2.0,
+        depth_max_age: float = 2.0,
+    ) -> None:
+        self.max_klines = max_klines
+        self.ticker_max_age = ticker_max_age
+        self.book_max_age = book_max_age
+        self.depth_max_age = depth_max_age
+
+        self._tickers: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._book_tickers: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._depth: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._klines: Dict[Tuple[str, str], Deque[List[Any]]] = {}
+        self._kline_written: Dict[Tuple[str, str], float] = {}
+        self._kline_streamed: Set[Tuple[str, str]] = set()
+        self._kline_listeners: List[KlineListener] = []
+        self._agg_trade_listeners: List[AggTradeListener] = []
+        self.stats: Dict[str, int] = {"messages": 0, "hits": 0, "misses": 0, "gaps": 0}
+
+    # ----- writers -----
+
+    def add_kline_listener(self, listener: KlineListener) -> None:
+        self._kline_listeners.append(listener)
+
+    def add_agg_trade_listener(self, listener: AggTradeListener) -> None:
+        """Receive every aggTrade event; trades are passed through, not stored."""
+        self._agg_trade_listeners.append(listener)
+
+    def handle_message(self, message: Any) -> None:
+        """Apply one raw (or combined-stream wrapped) websocket message."""
+        if isinstance(message, dict) and "stream" in message and "data" in message:
+            message = message["data"]
+        if isinstance(message, list):
+            for item in message:
+                self.handle_message(item)
+            return
+        if not isinstance(message, dict):
+            return
+
+        event = message.get("e")
+        now = time.monotonic()
+        self.stats["messages"] += 1
+        if event == "24hrTicker":
+            ticker = {rest: message[ws] for ws, rest in _TICKER_FIELDS.items() if ws in message}
+            self._tickers[message["s"]] = (now, ticker)
+        elif event == "bookTicker":
+            self._book_tickers[message["s"]] = (
+                now,
+                {
+                    "symbol": message["s"],
+                    "bidPrice": message["b"],
+                    "bidQty": message["B"],
+                    "askPrice": message["a"],
+                    "askQty": message["A"],
+                    "time": message.get("T", message.get("E")),
+                },
+            )
+        elif event == "depthUpdate":
+            self._depth[message["s"]] = (
+                now,
+                {
+                    "lastUpdateId": message.get("u"),
+                    "E": message.get("E"),
+                    "T": message.get("T"),
+                    "bids": message.get("b", []),
+                    "asks": message.get("a", []),
+                },
+            )
+        elif event == "kline":
+            k = message["k"]
+            self._apply_kline(message["s"], k["i"], _kline_row(k), bool(k.get("x")))
+        elif event == "aggTrade":
+            for listener in self._agg_trade_listeners:
+                try:
+                    listener(message)
+                except Exception as exc:
+                    logger.debug("aggTrade listener failed for %s: %s", message.get("s"), exc)
+
+    def _apply_kline(self, symbol: str, interval: str, row: List[Any], closed: bool) -> None:
+        key = (symbol, interval)
+        self._kline_written[key] = time.monotonic()
+        self._kline_streamed.add(key)
+        series = self._klines.get(key)
+        if series is None:
+            # No history yet: keep the live candle so the series can be seeded later
+            series = self._klines[key] = deque(maxlen=self.max_klines)
+        if series and series[-1][0] == row[0]:
+            series[-1] = row
+        elif not series or row[0] > series[-1][0]:
+            series.append(row)
+        for listener in self._kline_listeners:
+            try:
+                listener(symbol, interval, row, closed)
+            except Exception as exc:
+                logger.debug("Kline listener failed for %s: %s", symbol, exc)
+
+    def seed_klines(self, symbol: str, interval: str, rows: Iterable[List[Any]]) -> None:
+        """Install REST history, keeping any newer streamed candles on top."""
+        series: Deque[List[Any]] = deque((list(r) for r in rows), maxlen=self.max_klines)
+        live = self._klines.get((symbol, interval))
+        if live:
+            last_open = series[-1][0] if series else None
+            for row in live:
+                if last_open is None or row[0] > last_open:
+                    series.append(row)
+                elif row[0] == last_open:
+                    series[-1] = row
+        self._klines[(symbol, interval)] = series
+        self._kline_written[(symbol, interval)] = time.monotonic()
+
+    def mark_gap(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Drop kline history that may have missed bars (e.g. after a disconnect)."""
+        self.stats["gaps"] += 1
+        if symbols is None:
+            self._klines.clear()
+            self._kline_written.clear()
+            self._kline_streamed.clear()
+            return
+        wanted = set(symbols)
+        for key in [key for key in self._kline_written if key[0] in wanted]:
+            self._klines.pop(key, None)
+            self._kline_written.pop(key, None)
+            self._kline_streamed.discard(key)
+
+    # ----- readers -----
+
+    def _fresh(self, table: Dict[str, Tuple[float, Any]], symbol: str, max_age: float) -> Any:
+        entry = table.get(symbol)
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def get_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
+        ticker = self._fresh(self._tickers, symbol, self.ticker_max_age)
+        return dict(ticker) if ticker is not None else None
+
+    def get_all_tickers(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            dict(ticker)
+            for stamp, ticker in self._tickers.values()
+            if now - stamp <= self.ticker_max_age
+        ]
+
+    def get_book_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
+        book = self._fresh(self._book_tickers, symbol, self.book_max_age)
+        return dict(book) if book is not None else None
+
+    def get_order_book(self, symbol: str, limit: int = 20) -> Optional[Dict[str, Any]]:
+        book = self._fresh(self._depth, symbol, self.depth_max_age)
+        if book is None:
+            return None
+        if limit > max(len(book["bids"]), len(book["asks"])):
+            # Asked for more levels than the partial-depth stream carries
+            return None
+        return {
+            **book,
+            "bids": [list(level) for level in book["bids"][:limit]],
+            "asks": [list(level) for level in book["asks"][:limit]],
+        }
+
+    def is_streaming_klines(self, symbol: str, interval: str) -> bool:
+        """Whether kline stream messages for this pair arrived since the last gap."""
+        return (symbol, interval) in self._kline_streamed
+
+    def get_klines(self, symbol: str, interval: str, limit: int) -> Optional[List[List[Any]]]:
+        key = (symbol, interval)
+        series = self._klines.get(key)
+        written = self._kline_written.get(key, float("-inf"))
+        if (
+            series is None
+            or len(series) < limit
+            or time.monotonic() - written > _interval_seconds(interval)
+        ):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return [list(row) for row in list(series)[-limit:]]
+
+
+class StoreBackedExchange:
+    """Read-through wrapper: market-data reads come from the store, REST on gaps.
+
+    Everything that is not a market-data read (orders, account, filters, ...)
+    is delegated to the wrapped client unchanged.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: MarketDataStore,
+        stream: Optional["MarketDataStreamService"] = None,
+        order_books: Optional[OrderBookEngine] = None,
+    ) -> None:
+        self._client = client
+        self._store = store
+        self._stream = stream
+        self._order_books = order_books
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _normalize(self, symbol: str) -> str:
+        normalize = getattr(self._client, "_normalize_symbol", None)
+        return normalize(symbol) if callable(normalize) else symbol
+
+    def _track(self, symbol: str) -> None:
+        if self._stream is not None:
+            self._stream.track([symbol])
+
+    def _streams_klines(self, symbol: str, interval: str) -> bool:
+        if self._stream is not None:
+            return self._stream.streams_klines(symbol, interval)
+        # No stream service attached: trust whatever feeds the store directly
+        return self._store.is_streaming_klines(symbol, interval)
+
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        ticker = self._store.get_ticker(self._normalize(symbol))
+        if ticker is not None:
+            return ticker
+        return await self._client.get_ticker(symbol)
+
+    async def get_all_tickers(self) -> List[Dict[str, Any]]:
+        tickers = self._store.get_all_tickers()
+        if tickers:
+            return tickers
+        return await self._client.get_all_tickers()
+
+    def get_live_book(self, symbol: str) -> Optional[L2OrderBook]:
+        """Synced local L2 book for ``symbol``, or None when unavailable."""
+        if self._order_books is None:
+            return None
+        return self._order_books.get_book(self._normalize(symbol))
+
+    async def get_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        normalized = self._normalize(symbol)
+        live = self.get_live_book(normalized)
+        if live is not None:
+            return live.to_dict(limit)
+        book = self._store.get_order_book(normalized, limit)
+        if book is not None:
+            return book
+        self._track(normalized)
+        return await self._client.get_order_book(symbol, limit=limit)
+
+    async def get_historical_klines(
+        self, symbol: str, interval: str = "1h", limit: int = 100
+    ) -> Optional[List[List[Any]]]:
+        normalized = self._normalize(symbol)
+        # Only streamed series stay current; anything else would be frozen at its REST copy
+        if self._streams_klines(normalized, interval):
+            rows = self._store.get_klines(normalized, interval, limit)
+            if rows is not None:
+                return rows
+        rows = await self._client.get_historical_klines(symbol, interval, limit)
+        if rows:
+            self._track(normalized)
+            if self._stream is None or self._stream.streams_klines(normalized, interval):
+                self._store.seed_klines(normalized, interval, rows)
+        return rows
+
+
+class _StreamConnection:
+    """One combined-stream socket and the streams it carries."""
+
+    def __init__(self, symbols: Optional[List[str]] = None, streams: Iterable[str] = ()) -> None:
+        self.symbols = symbols  # None for the all-market connection
+        self.streams: List[str] = list(streams)
+        self.subscribed: Set[str] = set()
+        self.client: Any = None
+
+
+class MarketDataStreamService:
+    """Keeps a ``MarketDataStore`` fed from Aster websocket streams.
+
+    All-market ticker and book-ticker streams run on one connection; per-symbol
+    depth, kline and (with ``agg_trades``) aggTrade streams are packed into
+    further connections of at most ``streams_per_connection`` streams. Symbols
+    tracked while the service runs are added to the newest connection with a
+    SUBSCRIBE while it has room, so lazily tracked symbols share sockets. Each
+    connection reconnects with exponential backoff and, since the
+    combined-stream URL is rebuilt from all of its streams, resubscribes simply
+    by reconnecting. Kline history for the affected symbols is dropped on
+    disconnect so it gets reseeded from REST.
+    """
+
+    def __init__(
+        self,
+        store: MarketDataStore,
+        base_url: str = "wss://fstream.asterdex.com",
+        kline_interval: str = "1h",
+        depth_levels: int = 20,
+        max_symbols: int = 100,
+        streams_per_connection: int = 200,
+        reconnect_backoff: float = 1.0,
+        client_factory: Callable[[str], Any] = AsterWebSocketClient,
+        order_books: Optional[OrderBookEngine] = None,
+        agg_trades: bool = False,
+    ) -> None:
+        self.store = store
+        self.order_books = order_books
+        self.agg_trades = agg_trades
+        self.base_url = base_url
+        self.kline_interval = kline_interval
+        self.depth_levels = depth_levels
+        self.max_symbols = max_symbols
+        self.streams_per_connection = max(2, streams_per_connection)
+        self.reconnect_backoff = reconnect_backoff
+        self._client_factory = client_factory
+        self._symbols: Set[str] = set()
+        self._pending: List[str] = []
+        self._connections: List[_StreamConnection] = []
+        self._tasks: List[asyncio.Task] = []
+        self._subscribe_tasks: Set[asyncio.Task] = set()
+        self._clients: List[Any] = []
+        self._running = False
+        self.reconnects = 0
+
+    @property
+    def symbols(self) -> Set[str]:
+        return set(self._symbols)
+
+    def _symbol_streams(self, symbol: str) -> List[str]:
+        if self.order_books is not None:
+            depth = AsterWebSocketClient.diff_depth_stream(symbol, "100ms")
+        else:
+            depth = AsterWebSocketClient.depth_stream(symbol, self.depth_levels, "100ms")
+        streams = [depth, AsterWebSocketClient.kline_stream(symbol, self.kline_interval)]
+        if self.agg_trades:
+            streams.append(AsterWebSocketClient.agg_trade_stream(symbol))
+        return streams
+
+    def streams_klines(self, symbol: str, interval: str) -> bool:
+        """Whether this service keeps ``symbol``'s ``interval`` klines current."""
+        return interval == self.kline_interval and symbol in self._symbols
+
+    def track(self, symbols: Iterable[str]) -> None:
+        """Add symbols to the per-symbol streams (new connections are opened as needed)."""
+        for symbol in symbols:
+            if symbol in self._symbols or len(self._symbols) >= self.max_symbols:
+                continue
+            self._symbols.add(symbol)
+            self._pending.append(symbol)
+        if self._running:
+            self._spawn_pending()
+
+    async def start(self, symbols: Iterable[str] = ()) -> None:
+        if self._running:
+            return
+        self._running = True
+        global_streams = [
+            AsterWebSocketClient.all_ticker_stream(),
+            AsterWebSocketClient.all_book_ticker_stream(),
+        ]
+        self._spawn(_StreamConnection(streams=global_streams))
+        self.track(symbols)
+        self._spawn_pending()
+        logger.info(
+            "Market data stream started (%d symbols, %d connections)",
+            len(self._symbols),
+            len(self._connections),
+        )
+
+    async def stop(self) -> None:
+        self._running = False
+        for client in self._clients:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+        tasks = self._tasks + list(self._subscribe_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._subscribe_tasks.clear()
+        self._connections.clear()
+        self._clients.clear()
+        if self.order_books is not None:
+            await self.order_books.close()
+
+    def _spawn_pending(self) -> None:
+        """Pack pending symbols onto the newest symbol connection, opening more when full."""
+        grown: List[_StreamConnection] = []
+        for symbol in self._pending:
+            streams = self._symbol_streams(symbol)
+            conn = self._connections[-1] if self._connections else None
+            if (
+                conn is None
+                or conn.symbols is None
+                or len(conn.streams) + len(streams) > self.streams_per_connection
+            ):
+                conn = self._spawn(_StreamConnection(symbols=[]))
+            elif conn not in grown:
+                grown.append(conn)
+            conn.symbols.append(symbol)
+            conn.streams.extend(streams)
+        self._pending = []
+
+        for conn in grown:
+            task = asyncio.create_task(self._subscribe_new_streams(conn))
+            self._subscribe_tasks.add(task)
+            task.add_done_callback(self._subscribe_tasks.discard)
+
+    def _spawn(self, conn: _StreamConnection) -> _StreamConnection:
+        self._connections.append(conn)
+        self._tasks.append(asyncio.create_task(self._run_connection(conn)))
+        return conn
+
+    async def _subscribe_new_streams(self, conn: _StreamConnection) -> None:
+        """SUBSCRIBE streams added to ``conn`` since its socket connected."""
+        client = conn.client
+        new_streams = [stream for stream in conn.streams if stream not in conn.subscribed]
+        if client is None or not new_streams:
+            return  # not connected: the next connect carries them in its URL
+        conn.subscribed.update(new_streams)
+        try:
+            await client.subscribe(new_streams, wait_for_ack=False)
+        except Exception as exc:
+            logger.warning("Market data subscribe failed (%s); reconnecting", exc)
+            await client.disconnect()
+
+    async def _run_connection(self, conn: _StreamConnection) -> None:
+        backoff = self.reconnect_backoff
+        while self._running:
+            client = self._client_factory(self.base_url)
+            self._clients.append(client)
+            connected_at = time.monotonic()
+            streams = list(conn.streams)
+            try:
+                await client.connect(AsterWebSocketClient.combined_stream(streams))
+                conn.client = client
+                conn.subscribed = set(streams)
+                await self._subscribe_new_streams(conn)  # added while connecting
+                await client.listen(self._on_message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if self._running:
+                    logger.warning("Market data stream dropped (%s); reconnecting", exc)
+            finally:
+                conn.client = None
+                self._clients.remove(client)
+                try:
+                    await client.disconnect()
+                except Exception:
+                    pass
+
+            if not self._running:
+                break
+            if conn.symbols:
+                self.store.mark_gap(list(conn.symbols))
+                if self.order_books is not None:
+                    self.order_books.invalidate(list(conn.symbols))
+            self.reconnects += 1
+            if time.monotonic() - connected_at > 60:
+                backoff = self.reconnect_backoff
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _on_message(self, message: Any) -> None:
+        try:
+            if (
+                self.order_books is not None
+                and isinstance(message, dict)
+                and "@depth@" in str(message.get("stream", ""))
+            ):
+                self.order_books.handle_message(message)
+                return
+            self.store.handle_message(message)
+        except Exception as exc:
+            logger.debug("Failed to apply market data message: %s", exc)
@@ -0,0 +1,353 @@
+"""Local L2 order books maintained from diff-depth websocket updates.
+
+Each side of an ``L2OrderBook`` is a pair of parallel, sorted Python lists
+(prices and quantities; bids are stored negated so both sides ascend from the
+touch), updated with ``bisect``. Top-of-book queries are O(1) and level-walking
+queries (depth within N bps, imbalance over N levels, market impact for a
+size) are O(k) in the levels touched.
+
+``OrderBookEngine`` applies Binance-style diff-depth events (``U``/``u``/``pu``
+update ids) on top of a REST snapshot, detects sequence gaps, and resyncs from
+a fresh snapshot while buffering the events that arrive meanwhile.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SnapshotFetcher = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+class _BookSide:
+    """Sorted price levels for one side; ``keys`` ascend away from the touch."""
+
+    __slots__ = ("sign", "keys", "qtys")
+
+    def __init__(self, sign: float) -> None:
+        self.sign = sign  # +1 for asks, -1 for bids
+        self.keys: List[float] = []
+        self.qtys: List[float] = []
+
+    def clear(self) -> None:
+        self.keys.clear()
+        self.qtys.clear()
+
+    def set_level(self, price: float, qty: float) -> None:
+        key = self.sign * price
+        idx = bisect_left(self.keys, key)
+        exists = idx < len(self.keys) and self.keys[idx] == key
+        if qty <= 0:
+            if exists:
+                del self.keys[idx]
+                del self.qtys[idx]
+        elif exists:
+            self.qtys[idx] = qty
+        else:
+            self.keys.insert(idx, key)
+            self.qtys.insert(idx, qty)
+
+    def trim(self, max_levels: int) -> None:
+        if len(self.keys) > max_levels:
+            del self.keys[max_levels:]
+            del self.qtys[max_levels:]
+
+    def price(self, idx: int) -> float:
+        return self.sign * self.keys[idx]
+
+    def levels(self, limit: int) -> List[Tuple[float, float]]:
+        return [(self.sign * k, q) for k, q in zip(self.keys[:limit], self.qtys[:limit])]
+
+
+class L2OrderBook:
+    """Sorted L2 book for a single symbol with microstructure queries."""
+
+    def __init__(self, symbol: str, max_levels: int = 1000) -> None:
+        self.symbol = symbol
+        self.max_levels = max_levels
+        self.bids = _BookSide(-1.0)
+        self.asks = _BookSide(1.0)
+        self.last_update_id: int = 0
+        self.updated_at: float = 0.0
+
+    # ----- mutation -----
+
+    def load_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        self.apply_levels(snapshot.get("bids", []), snapshot.get("asks", []))
+        self.last_update_id = int(snapshot.get("lastUpdateId", 0))
+
+    def apply_levels(self, bids: Iterable[Any], asks: Iterable[Any]) -> None:
+        for price, qty in ((float(level[0]), float(level[1])) for level in bids):
+            self.bids.set_level(price, qty)
+        for price, qty in ((float(level[0]), float(level[1])) for level in asks):
+            self.asks.set_level(price, qty)
+        self.bids.trim(self.max_levels)
+        self.asks.trim(self.max_levels)
+        self.updated_at = time.monotonic()
+
+    # ----- O(1) queries -----
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids.price(0) if self.bids.keys else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks.price(0) if self.asks.keys else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        if not self.bids.keys or not self.asks.keys:
+            return None
+        return (self.bids.price(0) + self.asks.price(0)) / 2.0
+
+    @property
+    def spread(self) -> Optional[float]:
+        if not self.bids.keys or not self.asks.keys:
+            return None
+        return self.asks.price(0) - self.bids.price(0)
+
+    @property
+    def spread_pct(self) -> float:
+        ask = self.best_ask
+        spread = self.spread
+        return spread / ask if spread is not None and ask else 0.0
+
+    @property
+    def microprice(self) -> Optional[float]:
+        """Top-of-book price weighted toward the side with less resting size."""
+        if not self.bids.keys or not self.asks.keys:
+            return None
+        bid, ask = self.bids.price(0), self.asks.price(0)
+        bid_qty, ask_qty = self.bids.qtys[0], self.asks.qtys[0]
+        total = bid_qty + ask_qty
+        if total <= 0:
+            return (bid + ask) / 2.0
+        return (bid * ask_qty + ask * bid_qty) / total
+
+    # ----- O(k) queries -----
+
+    def imbalance(self, levels: int = 5) -> float:
+        """(bid qty - ask qty) / total over the top ``levels`` of each side, in [-1, 1]."""
+        bid_qty = sum(self.bids.qtys[:levels])
+        ask_qty = sum(self.asks.qtys[:levels])
+        total = bid_qty + ask_qty
+        return (bid_qty - ask_qty) / total if total > 0 else 0.0
+
+    def depth_within_bps(self, bps: float) -> Dict[str, float]:
+        """Resting quantity and notional on each side within ``bps`` of mid."""
+        mid = self.mid
+        result = {"bid_qty": 0.0, "ask_qty": 0.0, "bid_notional": 0.0, "ask_notional": 0.0}
+        if mid is None:
+            return result
+        band = mid * bps / 10_000.0
+        for side, name, limit in (
+            (self.bids, "bid", mid - band),
+            (self.asks, "ask", mid + band),
+        ):
+            # keys ascend away from the touch, so the band is a key prefix
+            end = bisect_left(side.keys, side.sign * limit + 1e-12)
+            qtys = side.qtys[:end]
+            result[f"{name}_qty"] = sum(qtys)
+            result[f"{name}_notional"] = sum(
+                side.sign * key * qty for key, qty in zip(side.keys[:end], qtys)
+            )
+        return result
+
+    def market_impact(self, side: str, quantity: float) -> Dict[str, Any]:
+        """Simulate a market order of ``quantity`` walking the book.
+
+        ``side`` is the taker side: ``BUY`` consumes asks, ``SELL`` consumes bids.
+        """
+        book_side = self.asks if side.upper() == "BUY" else self.bids
+        remaining = quantity
+        cost = 0.0
+        levels = 0
+        worst = None
+        for key, qty in zip(book_side.keys, book_side.qtys):
+            if remaining <= 0:
+                break
+            take = min(qty, remaining)
+            price = book_side.sign * key
+            cost += take * price
+            remaining -= take
+            worst = price
+            levels += 1
+
+        filled = quantity - remaining
+        avg_price = cost / filled if filled > 0 else None
+        mid = self.mid
+        impact_bps = None
+        if avg_price is not None and mid:
+            impact_bps = abs(avg_price - mid) / mid * 10_000.0
+        return {
+            "filled_qty": filled,
+            "unfilled_qty": max(remaining, 0.0),
+            "avg_price": avg_price,
+            "worst_price": worst,
+            "levels_consumed": levels,
+            "impact_bps": impact_bps,
+        }
+
+    def to_dict(self, limit: int = 20) -> Dict[str, Any]:
+        """REST-shaped depth payload (string prices/quantities)."""
+        return {
+            "lastUpdateId": self.last_update_id,
+            "bids": [[repr(p), repr(q)] for p, q in self.bids.levels(limit)],
+            "asks": [[repr(p), repr(q)] for p, q in self.asks.levels(limit)],
+        }
+
+    def features(self, levels: int = 20, depth_bps: float = 10.0) -> Dict[str, Any]:
+        """Feature dict consumed by FeaturePipeline."""
+        bid_qty = sum(self.bids.qtys[:levels])
+        ask_qty = sum(self.asks.qtys[:levels])
+        total = bid_qty + ask_qty
+        depth = self.depth_within_bps(depth_bps)
+        return {
+            "bid_pressure": bid_qty / total if total > 0 else 0.0,
+            "spread_pct": self.spread_pct,
+            "mid_price": self.mid or 0.0,
+            "microprice": self.microprice or 0.0,
+            "imbalance_5": self.imbalance(5),
+            f"depth_{int(depth_bps)}bps_bid": depth["bid_notional"],
+            f"depth_{int(depth_bps)}bps_ask": depth["ask_notional"],
+        }
+
+
+class OrderBookEngine:
+    """Maintains synced ``L2OrderBook`` instances from diff-depth streams."""
+
+    def __init__(
+        self,
+        snapshot_fetcher: Optional[SnapshotFetcher] = None,
+        max_levels: int = 1000,
+        max_concurrent_resyncs: int = 2,
+        max_buffered_events: int = 1000,
+    ) -> None:
+        self._snapshot_fetcher = snapshot_fetcher
+        self.max_levels = max_levels
+        self.max_buffered_events = max_buffered_events
+        self._books: Dict[str, L2OrderBook] = {}
+        self._synced: Dict[str, bool] = {}
+        self._prev_final_id: Dict[str, Optional[int]] = {}
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._resync_tasks: Dict[str, asyncio.Task] = {}
+        self._resync_semaphore = asyncio.Semaphore(max_concurrent_resyncs)
+        self.stats: Dict[str, int] = {"updates": 0, "gaps": 0, "resyncs": 0, "stale_dropped": 0}
+
+    def get_book(self, symbol: str) -> Optional[L2OrderBook]:
+        """Return the book only while it is in sync."""
+        return self._books.get(symbol) if self._synced.get(symbol) else None
+
+    def is_synced(self, symbol: str) -> bool:
+        return bool(self._synced.get(symbol))
+
+    def invalidate(self, symbols: Iterable[str]) -> None:
+        """Mark books out of sync (e.g. after a stream disconnect); the next diff resyncs."""
+        for symbol in symbols:
+            self._synced[symbol] = False
+            self._buffers.pop(symbol, None)
+
+    def load_snapshot(self, symbol: str, snapshot: Dict[str, Any]) -> None:
+        """Install a REST snapshot and replay buffered events newer than it."""
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = L2OrderBook(symbol, self.max_levels)
+        book.load_snapshot(snapshot)
+        self._synced[symbol] = True
+        self._prev_final_id[symbol] = None
+
+        buffered = self._buffers.pop(symbol, [])
+        for event in buffered:
+            if not self._apply(symbol, book, event):
+                break
+
+    def apply_diff(self, symbol: str, event: Dict[str, Any]) -> bool:
+        """Apply one diff-depth event. Returns False when the book needs a resync."""
+        book = self._books.get(symbol)
+        if book is None or not self._synced.get(symbol):
+            self._buffer(symbol, event)
+            self._schedule_resync(symbol)
+            return False
+        return self._apply(symbol, book, event)
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        if "data" in message:
+            message = message["data"]
+        if message.get("e") == "depthUpdate" and "s" in message:
+            self.apply_diff(message["s"], message)
+
+    def _apply(self, symbol: str, book: L2OrderBook, event: Dict[str, Any]) -> bool:
+        first_id = int(event.get("U", 0))
+        final_id = int(event.get("u", 0))
+        if final_id < book.last_update_id:
+            self.stats["stale_dropped"] += 1
+            return True
+
+        prev_final = self._prev_final_id.get(symbol)
+        if prev_final is None:
+            # First event after a snapshot must straddle lastUpdateId
+            in_sequence = first_id <= book.last_update_id <= final_id
+        else:
+            in_sequence = int(event.get("pu", prev_final)) == prev_final
+
+        if not in_sequence:
+            self.stats["gaps"] += 1
+            logger.debug("Order book gap for %s; resyncing", symbol)
+            self._synced[symbol] = False
+            self._buffer(symbol, event)
+            self._schedule_resync(symbol)
+            return False
+
+        book.apply_levels(event.get("b", []), event.get("a", []))
+        book.last_update_id = final_id
+        self._prev_final_id[symbol] = final_id
+        self.stats["updates"] += 1
+        return True
+
+    def _buffer(self, symbol: str, event: Dict[str, Any]) -> None:
+        buffer = self._buffers.setdefault(symbol, [])
+        buffer.append(event)
+        if len(buffer) > self.max_buffered_events:
+            del buffer[: len(buffer) - self.max_buffered_events]
+
+    def _schedule_resync(self, symbol: str) -> None:
+        if self._snapshot_fetcher is None:
+            return
+        task = self._resync_tasks.get(symbol)
+        if task is not None and not task.done():
+            return
+        try:
+            self._resync_tasks[symbol] = asyncio.get_running_loop().create_task(self.resync(symbol))
+        except RuntimeError:  # pragma: no cover - no running loop
+            pass
+
+    async def resync(self, symbol: str) -> bool:
+        """Fetch a REST snapshot and rebuild ``symbol``'s book."""
+        if self._snapshot_fetcher is None:
+            return False
+        async with self._resync_semaphore:
+            try:
+                snapshot = await self._snapshot_fetcher(symbol)
+            except Exception as exc:
+                logger.warning("Order book snapshot failed for %s: %s", symbol, exc)
+                return False
+        if not snapshot or "lastUpdateId" not in snapshot:
+            return False
+        self.stats["resyncs"] += 1
+        self.load_snapshot(symbol, snapshot)
+        return self.is_synced(symbol)
+
+    async def close(self) -> None:
+        tasks = [t for t in self._resync_tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._resync_tasks.clear()
@@ -0,0 +1,455 @@
+"""Incremental per-symbol indicator engine.
+
+Keeps running EMAs, Wilder smoothing and fixed-size rolling windows for each
+symbol so a new candle costs O(1) instead of a full DataFrame recompute. Values
+match ``FeaturePipeline.calculate_indicators`` column for column; the last row
+of a recompute is what ``StreamingIndicatorEngine.update`` returns.
+
+Closed candles are committed to the state. A partial (still-forming) candle is
+evaluated against the committed state without mutating it, so it can be
+re-sent as often as the exchange updates it.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+NAN = float("nan")
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """Division with pandas semantics (x/0 -> +-inf, 0/0 -> NaN)."""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+def _epoch_ms(value: Any) -> int:
+    """Candle open time (epoch ms, ``datetime64`` or ``Timestamp``) as integer epoch ms."""
+    if isinstance(value, (int, float, np.number)):
+        return int(value)
+    return int(np.datetime64(value, "ms").astype(np.int64))
+
+
+def _epoch_ms_array(values: Any) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ms]").astype(np.int64)
+    if values.dtype.kind in "iuf":
+        return values.astype(np.int64)
+    return np.array([_epoch_ms(v) for v in values], dtype=np.int64)
+
+
+def _clip(value: float, lower: float, upper: float) -> float:
+    if math.isnan(value):
+        return value
+    return min(max(value, lower), upper)
+
+
+class _Ewm:
+    """``Series.ewm(alpha=..., adjust=False).mean()`` as a running value."""
+
+    __slots__ = ("alpha", "value", "_gap")
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.value = NAN
+        self._gap = 0
+
+    def push(self, x: float, commit: bool = True) -> float:
+        value, gap = self.value, self._gap
+        if math.isnan(x):
+            if not math.isnan(value):
+                gap += 1
+        elif math.isnan(value):
+            value, gap = x, 0
+        else:
+            # pandas reweights the previous value across NaN gaps (ignore_na=False)
+            weight = (1.0 - self.alpha) ** (gap + 1)
+            value = (weight * value + self.alpha * x) / (weight + self.alpha)
+            gap = 0
+        if commit:
+            self.value, self._gap = value, gap
+        return value
+
+
+class _RollingWindow:
+    """Fixed-size ring buffer with running (shifted) sums for mean/std.
+
+    Mirrors ``Series.rolling(size).mean()/.std()``: NaN until the window is
+    full, and NaN while any value in the window is NaN.
+    """
+
+    __slots__ = ("size", "_buf", "_idx", "_count", "_nans", "_sum", "_sumsq", "_shift", "_pushes")
+
+    _RESYNC_EVERY = 4096
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._buf = np.full(size, NAN)
+        self._idx = 0
+        self._count = 0
+        self._nans = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._shift: Optional[float] = None
+        self._pushes = 0
+
+    def push(self, x: float, commit: bool = True) -> Tuple[float, float]:
+        """Add ``x`` and return ``(mean, std)`` of the resulting window."""
+        is_nan = math.isnan(x)
+        shift = self._shift
+        if shift is None and not is_nan:
+            shift = x
+
+        count, nans, total, total_sq = self._count, self._nans, self._sum, self._sumsq
+        if count == self.size:
+            old = float(self._buf[self._idx])
+            if math.isnan(old):
+                nans -= 1
+            else:
+                d = old - shift
+                total -= d
+                total_sq -= d * d
+        else:
+            count += 1
+        if is_nan:
+            nans += 1
+        else:
+            d = x - shift
+            total += d
+            total_sq += d * d
+
+        if commit:
+            self._buf[self._idx] = x
+            self._idx = (self._idx + 1) % self.size
+            self._count, self._nans, self._sum, self._sumsq = count, nans, total, total_sq
+            self._shift = shift
+            self._pushes += 1
+            if self._pushes % self._RESYNC_EVERY == 0:
+                self._resync()
+
+        if count < self.size or nans:
+            return NAN, NAN
+        mean = shift + total / count
+        if count < 2:
+            return mean, NAN
+        var = max((total_sq - total * total / count) / (count - 1), 0.0)
+        return mean, math.sqrt(var)
+
+    def _resync(self) -> None:
+        """Recompute the running sums from the buffer to bound float drift."""
+        valid = self._buf[~np.isnan(self._buf)]
+        if self._shift is None or valid.size == 0:
+            return
+        d = valid - self._shift
+        self._sum = float(d.sum())
+        self._sumsq = float((d * d).sum())
+
+
+class _RollingExtreme:
+    """Rolling min/max over a monotonic deque (amortised O(1) per push)."""
+
+    __slots__ = ("size", "min_periods", "_is_max", "_deque", "_n")
+
+    def __init__(self, size: int, mode: str = "max", min_periods: Optional[int] = None) -> None:
+        self.size = size
+        self.min_periods = size if min_periods is None else min_periods
+        self._is_max = mode == "max"
+        self._deque: Deque[Tuple[int, float]] = deque()
+        self._n = 0
+
+    def _better(self, a: float, b: float) -> bool:
+        return a >= b if self._is_max else a <= b
+
+    def push(self, x: float, commit: bool = True) -> float:
+        start = self._n + 1 - self.size
+        if commit:
+            while self._deque and self._better(x, self._deque[-1][1]):
+                self._deque.pop()
+            self._deque.append((self._n, x))
+            while self._deque[0][0] < start:
+                self._deque.popleft()
+            self._n += 1
+            result = self._deque[0][1]
+        else:
+            result = x
+            for i, value in self._deque:
+                if i >= start:
+                    if not self._better(result, value):
+                        result = value
+                    break
+        if min(self._n + (0 if commit else 1), self.size) < self.min_periods:
+            return NAN
+        return result
+
+
+class IndicatorState:
+    """Running indicator state for a single symbol."""
+
+    def __init__(self) -> None:
+        self.bars = 0
+        self.last_timestamp: Optional[int] = None  # open time of the last committed bar, epoch ms
+        self.prev_close = NAN
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.obv = 0.0
+
+        self.ema20 = _Ewm(2 / 21)
+        self.ema50 = _Ewm(2 / 51)
+        self.ema12 = _Ewm(2 / 13)
+        self.ema26 = _Ewm(2 / 27)
+        self.macd_signal = _Ewm(2 / 10)
+
+        self.rsi_gain = _RollingWindow(14)
+        self.rsi_loss = _RollingWindow(14)
+        self.atr = _RollingWindow(14)
+        self.bb = _RollingWindow(20)
+
+        self.stoch_low = _RollingExtreme(14, "min")
+        self.stoch_high = _RollingExtreme(14, "max")
+        self.stoch_d = _RollingWindow(3)
+
+        self.cci_tp = _RollingWindow(20)
+        self.cci_dev = _RollingWindow(20)
+
+        self.plus_dm = _Ewm(1 / 14)
+        self.minus_dm = _Ewm(1 / 14)
+        self.tr_smooth = _Ewm(1 / 14)
+        self.adx = _Ewm(1 / 14)
+
+        self.fib_high = _RollingExtreme(100, "max", min_periods=1)
+        self.fib_low = _RollingExtreme(100, "min", min_periods=1)
+
+        self.avg_volatility = _RollingWindow(50)
+        self.obv_history: Deque[float] = deque(maxlen=6)
+        self.obv_slope = _RollingWindow(20)
+
+    def apply(
+        self, high: float, low: float, close: float, volume: float, commit: bool = True
+    ) -> Dict[str, Any]:
+        """Advance by one bar and return that bar's indicator row."""
+        prev_close, prev_high, prev_low = self.prev_close, self.prev_high, self.prev_low
+        row: Dict[str, Any] = {"high": high, "low": low, "close": close, "volume": volume}
+
+        ema20 = self.ema20.push(close, commit)
+        ema50 = self.ema50.push(close, commit)
+        row["EMA_20"] = ema20
+        row["EMA_50"] = ema50
+
+        # RSI 14 (simple rolling means, like calculate_indicators)
+        delta = close - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain, _ = self.rsi_gain.push(gain, commit)
+        avg_loss, _ = self.rsi_loss.push(loss, commit)
+        rs = _div(avg_gain, avg_loss)
+        rsi = 100 - 100 / (1 + rs) if not math.isnan(rs) else NAN
+        row["RSI_14"] = rsi
+
+        # ATR 14
+        if math.isnan(prev_close):
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        atr, _ = self.atr.push(true_range, commit)
+        row["ATRr_14"] = atr
+
+        # MACD (12, 26, 9)
+        macd = self.ema12.push(close, commit) - self.ema26.push(close, commit)
+        macd_signal = self.macd_signal.push(macd, commit)
+        row["MACD"] = macd
+        row["MACD_signal"] = macd_signal
+        row["MACD_hist"] = macd - macd_signal
+
+        # Bollinger Bands (20, 2)
+        bb_mid, bb_std = self.bb.push(close, commit)
+        row["BB_mid"] = bb_mid
+        row["BB_std"] = bb_std
+        row["BB_upper"] = bb_mid + bb_std * 2
+        row["BB_lower"] = bb_mid - bb_std * 2
+
+        # Stochastic (14, 3)
+        low14 = self.stoch_low.push(low, commit)
+        high14 = self.stoch_high.push(high, commit)
+        stoch_k = 100 * _div(close - low14, high14 - low14)
+        stoch_d, _ = self.stoch_d.push(stoch_k, commit)
+        row["STOCH_K"] = stoch_k
+        row["STOCH_D"] = stoch_d
+
+        # CCI (20)
+        tp = (high + low + close) / 3
+        sma_tp, _ = self.cci_tp.push(tp, commit)
+        mean_dev, _ = self.cci_dev.push(abs(tp - sma_tp), commit)
+        row["CCI"] = _div(tp - sma_tp, 0.015 * mean_dev)
+
+        # OBV
+        if close > prev_close:
+            obv = self.obv + volume
+        elif close < prev_close:
+            obv = self.obv - volume
+        else:
+            obv = self.obv
+        row["OBV"] = obv
+
+        # ADX (14)
+        raw_plus = high - prev_high
+        raw_minus = prev_low - low
+        plus_dm = raw_plus if (raw_plus > raw_minus and raw_plus > 0) else 0.0
+        minus_dm = raw_minus if (raw_minus > plus_dm and raw_minus > 0) else 0.0
+        plus_smooth = self.plus_dm.push(plus_dm, commit)
+        minus_smooth = self.minus_dm.push(minus_dm, commit)
+        tr_smooth = self.tr_smooth.push(true_range, commit)
+        plus_di = 100 * _div(plus_smooth, tr_smooth)
+        minus_di = 100 * _div(minus_smooth, tr_smooth)
+        dx = 100 * _div(abs(plus_di - minus_di), plus_di + minus_di)
+        row["plus_di"] = plus_di
+        row["minus_di"] = minus_di
+        row["ADX"] = self.adx.push(dx, commit)
+
+        # Fibonacci retracements (lookback 100)
+        swing_high = self.fib_high.push(high, commit)
+        swing_low = self.fib_low.push(low, commit)
+        diff = swing_high - swing_low
+        if diff > 0:
+            row["FIB_HIGH"] = swing_high
+            row["FIB_LOW"] = swing_low
+            for level in (0.236, 0.382, 0.5, 0.618, 0.786):
+                row[f"FIB_{level}"] = swing_low + level * diff
+        else:
+            row["FIB_0.5"] = close
+
+        # Wyckoff phase estimator
+        volatility = _div(atr, close)
+        avg_volatility, _ = self.avg_volatility.push(volatility, commit)
+        if close > ema50 and rsi > 50:
+            phase = "MARKUP"
+        elif close < ema50 and rsi < 50:
+            phase = "MARKDOWN"
+        elif close < ema50 and rsi > 30 and volatility < avg_volatility:
+            phase = "ACCUMULATION"
+        elif close > ema50 and rsi > 70 and volatility > avg_volatility:
+            phase = "DISTRIBUTION"
+        else:
+            phase = "NEUTRAL"
+        row["WYCKOFF_PHASE"] = phase
+
+        # VSOP index
+        history = self.obv_history
+        slope = obv - history[-5] if len(history) >= 5 else NAN
+        slope_mean, slope_std = self.obv_slope.push(slope, commit)
+        obv_norm = (slope - slope_mean) / (slope_std + 1e-6)
+        volume_score = 50 + _clip(obv_norm, -2, 2) * 25
+        trend_score = 75 if close > ema20 else 25
+        row["VSOP"] = (volume_score + trend_score + rsi) / 3
+
+        if commit:
+            history.append(obv)
+            self.obv = obv
+            self.prev_close, self.prev_high, self.prev_low = close, high, low
+            self.bars += 1
+        return row
+
+
+class StreamingIndicatorEngine:
+    """Per-symbol incremental indicators fed by closed and partial candles."""
+
+    def __init__(self) -> None:
+        self._states: Dict[str, IndicatorState] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+    def has_state(self, symbol: str) -> bool:
+        return symbol in self._states
+
+    def bars(self, symbol: str) -> int:
+        state = self._states.get(symbol)
+        return state.bars if state else 0
+
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        """Open time (epoch ms) of the last committed candle for ``symbol``."""
+        state = self._states.get(symbol)
+        return state.last_timestamp if state else None
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._states.clear()
+            self._latest.clear()
+        else:
+            self._states.pop(symbol, None)
+            self._latest.pop(symbol, None)
+
+    def update(self, symbol: str, candle: Mapping[str, Any], closed: bool = True) -> Dict[str, Any]:
+        """Apply one candle (``high``/``low``/``close``/``volume``[/``timestamp``]).
+
+        Closed candles advance the state; partial candles are evaluated against
+        it without side effects. Returns the indicator row for the candle.
+        """
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = IndicatorState()
+
+        row = state.apply(
+            float(candle["high"]),
+            float(candle["low"]),
+            float(candle["close"]),
+            float(candle.get("volume", 0.0)),
+            commit=closed,
+        )
+        if closed and "timestamp" in candle:
+            state.last_timestamp = _epoch_ms(candle["timestamp"])
+        self._latest[symbol] = row
+        return row
+
+    def ingest_frame(self, symbol: str, df: Any) -> Optional[Dict[str, Any]]:
+        """Merge a REST candle frame into the state and return the latest row.
+
+        Only bars newer than the last committed one are applied; the final row
+        is treated as the still-forming candle. If the frame does not overlap
+        the committed history (first run or a gap) the state is rebuilt.
+        """
+        if df is None or len(df) == 0:
+            return self._latest.get(symbol)
+
+        timestamps = _epoch_ms_array(df["timestamp"].to_numpy()) if "timestamp" in df else None
+        state = self._states.get(symbol)
+        start = 0
+        if state is not None and timestamps is not None and state.last_timestamp is not None:
+            if timestamps[0] > state.last_timestamp:
+                self.reset(symbol)
+            else:
+                start = int(np.searchsorted(timestamps, state.last_timestamp, side="right"))
+        elif state is not None:
+            self.reset(symbol)
+
+        highs = df["high"].to_numpy(dtype=float)
+        lows = df["low"].to_numpy(dtype=float)
+        closes = df["close"].to_numpy(dtype=float)
+        volumes = df["volume"].to_numpy(dtype=float)
+        last = len(closes) - 1
+
+        row = self._latest.get(symbol)
+        for i in range(start, last + 1):
+            candle: Dict[str, Any] = {
+                "high": highs[i],
+                "low": lows[i],
+                "close": closes[i],
+                "volume": volumes[i],
+            }
+            if timestamps is not None:
+                candle["timestamp"] = int(timestamps[i])
+            row = self.update(symbol, candle, closed=i < last)
+        return row
+
+    def snapshot(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest indicator row for ``symbol`` (partial candle if one was sent)."""
+        return self._latest.get(symbol)
+
+    def snapshots(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        keys = self._latest.keys() if symbols is None else symbols
+        return {s: self._latest[s] for s in keys if s in self._latest}
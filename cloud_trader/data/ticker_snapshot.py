@@ -0,0 +1,237 @@
+"""Shared whole-market ticker snapshots.
+
+``TickerSnapshotEngine`` refreshes the 24hr ticker of every symbol with a
+single ``get_all_tickers`` request (served from the ``!ticker@arr`` stream when
+the client is a ``StoreBackedExchange``) at most once per ``refresh_interval``.
+Callers inside one interval share the same request and the same snapshot.
+
+A ``TickerSnapshot`` keeps the numeric ticker fields as float64 columns
+(struct-of-arrays) addressed through a stable symbol -> row index, and is never
+mutated once published, so consumers hold it without copying. It is a read-only
+``Mapping[str, TickerRow]`` whose rows answer ``ticker.get("lastPrice")`` like
+the REST dicts did, so existing ``ticker_map`` consumers take it unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numeric REST ticker fields kept per symbol, in column order
+TICKER_FIELDS = (
+    "lastPrice",
+    "priceChange",
+    "priceChangePercent",
+    "weightedAvgPrice",
+    "openPrice",
+    "highPrice",
+    "lowPrice",
+    "volume",
+    "quoteVolume",
+)
+_FIELD_INDEX = {name: i for i, name in enumerate(TICKER_FIELDS)}
+_LAST = _FIELD_INDEX["lastPrice"]
+
+
+class TickerRow(Mapping):
+    """Read-only view of one symbol's row in a ``TickerSnapshot``."""
+
+    __slots__ = ("_snapshot", "_row", "symbol")
+
+    def __init__(self, snapshot: "TickerSnapshot", row: int, symbol: str) -> None:
+        self._snapshot = snapshot
+        self._row = row
+        self.symbol = symbol
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "symbol":
+            return self.symbol
+        field = _FIELD_INDEX.get(key)
+        if field is None:
+            raise KeyError(key)
+        value = float(self._snapshot.values[field, self._row])
+        if math.isnan(value):
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield "symbol"
+        column = self._snapshot.values[:, self._row]
+        for name, value in zip(TICKER_FIELDS, column.tolist()):
+            if not math.isnan(value):
+                yield name
+
+    def __len__(self) -> int:
+        return 1 + int(np.count_nonzero(~np.isnan(self._snapshot.values[:, self._row])))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+class TickerSnapshot(Mapping):
+    """Immutable whole-market ticker table keyed by symbol."""
+
+    __slots__ = ("index", "values", "version", "timestamp")
+
+    def __init__(
+        self, index: Dict[str, int], values: np.ndarray, version: int, timestamp: float
+    ) -> None:
+        values.setflags(write=False)
+        self.index = index
+        self.values = values
+        self.version = version
+        self.timestamp = timestamp
+
+    @classmethod
+    def empty(cls) -> "TickerSnapshot":
+        return cls({}, np.empty((len(TICKER_FIELDS), 0)), 0, 0.0)
+
+    def _row(self, symbol: str) -> Optional[int]:
+        row = self.index.get(symbol)
+        if row is None or row >= self.values.shape[1] or math.isnan(self.values[_LAST, row]):
+            return None
+        return row
+
+    def __getitem__(self, symbol: str) -> TickerRow:
+        row = self._row(symbol)
+        if row is None:
+            raise KeyError(symbol)
+        return TickerRow(self, row, symbol)
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and self._row(symbol) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (symbol for symbol in self.index if self._row(symbol) is not None)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.values[_LAST])))
+
+    def column(self, field: str) -> np.ndarray:
+        """Read-only view of one field for every indexed symbol (NaN = no data)."""
+        return self.values[_FIELD_INDEX[field]]
+
+    def price(self, symbol: str, default: float = 0.0) -> float:
+        row = self._row(symbol)
+        return float(self.values[_LAST, row]) if row is not None else default
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp if self.timestamp else math.inf
+
+
+class TickerSnapshotEngine:
+    """Single-request, fixed-cadence ticker refresh shared by every consumer."""
+
+    def __init__(
+        self,
+        client: Any = None,
+        symbols: Optional[Iterable[str]] = None,
+        refresh_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            client: Exchange client exposing ``get_all_tickers`` (or ``get_ticker``)
+            symbols: Symbols fetched one by one when the client has no bulk endpoint
+            refresh_interval: Seconds a snapshot is served before the next refresh
+        """
+        self.client = client
+        self.symbols = list(symbols or [])
+        self.refresh_interval = refresh_interval
+
+        self._index: Dict[str, int] = {}
+        self._snapshot = TickerSnapshot.empty()
+        self._refreshed_at = -math.inf
+        self._lock = asyncio.Lock()
+        self.stats = {"refreshes": 0, "requests": 0, "failures": 0}
+
+    @property
+    def latest(self) -> TickerSnapshot:
+        """The most recent snapshot, without triggering a refresh."""
+        return self._snapshot
+
+    def _is_fresh(self) -> bool:
+        return time.monotonic() - self._refreshed_at < self.refresh_interval
+
+    async def get(self) -> TickerSnapshot:
+        """Current snapshot, refreshing it first when the interval has elapsed."""
+        if self._is_fresh() or self.client is None:
+            return self._snapshot
+        async with self._lock:
+            # Another caller may have refreshed while we waited
+            if not self._is_fresh():
+                await self._refresh()
+        return self._snapshot
+
+    async def _refresh(self) -> None:
+        try:
+            rows = await self._fetch()
+            self.publish(rows)
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.warning(f"⚠️ Ticker snapshot refresh failed, serving last snapshot: {e}")
+        finally:
+            # A failed refresh also waits out the interval instead of retrying every call
+            self._refreshed_at = time.monotonic()
+
+    async def _fetch(self) -> List[Dict[str, Any]]:
+        if hasattr(self.client, "get_all_tickers"):
+            self.stats["requests"] += 1
+            rows = await self.client.get_all_tickers()
+            if not isinstance(rows, list):
+                raise ValueError(f"unexpected get_all_tickers payload: {type(rows).__name__}")
+            return rows
+
+        self.stats["requests"] += len(self.symbols)
+        results = await asyncio.gather(
+            *(self.client.get_ticker(symbol) for symbol in self.symbols),
+            return_exceptions=True,
+        )
+        return [
+            {**res, "symbol": res.get("symbol", symbol)}
+            for symbol, res in zip(self.symbols, results)
+            if isinstance(res, dict) and res
+        ]
+
+    def publish(self, rows: Iterable[Dict[str, Any]], merge: bool = False) -> TickerSnapshot:
+        """Build and publish a new snapshot from REST-shaped ticker dicts.
+
+        With ``merge`` the previous snapshot's rows are carried over and only
+        the given symbols are replaced (partial pushes such as ``!ticker@arr``).
+        """
+        rows = [row for row in rows if row.get("symbol")]
+        index = self._index
+        new_symbols = [row["symbol"] for row in rows if row["symbol"] not in index]
+        if new_symbols:
+            # Copy-on-write so published snapshots keep a consistent index
+            index = dict(index)
+            for symbol in new_symbols:
+                index.setdefault(symbol, len(index))
+            self._index = index
+
+        values = np.full((len(TICKER_FIELDS), len(index)), np.nan)
+        if merge:
+            previous = self._snapshot.values
+            values[:, : previous.shape[1]] = previous
+
+        for row in rows:
+            column = index[row["symbol"]]
+            for field, name in enumerate(TICKER_FIELDS):
+                raw = row.get(name)
+                if raw is not None:
+                    try:
+                        values[field, column] = float(raw)
+                    except (TypeError, ValueError):
+                        pass
+
+        self.stats["refreshes"] += 1
+        self._snapshot = TickerSnapshot(index, values, self._snapshot.version + 1, time.time())
+        return self._snapshot
@@ -0,0 +1,280 @@
+"""Streaming per-symbol VPIN from aggregate trade events.
+
+Each trade is split into buy and sell volume by bulk-volume classification
+(``buy = qty * Phi(dp / sigma)``, with ``sigma`` an EWMA of per-trade price
+changes) and poured into equal-volume buckets; a trade larger than the space
+left in a bucket spills into the next one. Closed buckets land in a fixed-size
+ring of order-flow imbalances ``|Vbuy - Vsell| / V`` whose running sum gives
+VPIN in O(1). Every VPIN reading also enters a ``RollingDistribution`` that
+keeps a sorted copy of the window, so the empirical CDF and z-score of a new
+reading cost one bisect instead of a sort.
+
+``VpinEngine.handle_message`` accepts raw Binance ``aggTrade`` payloads.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_right, insort
+from typing import Any, Dict, Iterable, Optional
+
+_SQRT2 = math.sqrt(2.0)
+
+
+def _normal_cdf(z: float) -> float:
+    return 0.5 * (1.0 + math.erf(z / _SQRT2))
+
+
+class RollingDistribution:
+    """Fixed window of values with incremental empirical CDF, mean and stdev."""
+
+    __slots__ = ("size", "_ring", "_sorted", "_pos", "_count", "_sum", "_sumsq")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._ring = array("d", bytes(8 * size))
+        self._sorted: list = []
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, value: float) -> None:
+        if self._count == self.size:
+            old = self._ring[self._pos]
+            del self._sorted[bisect_right(self._sorted, old) - 1]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self._count += 1
+        self._ring[self._pos] = value
+        insort(self._sorted, value)
+        self._sum += value
+        self._sumsq += value * value
+        self._pos += 1
+        if self._pos == self.size:
+            self._pos = 0
+            # Re-anchor the running sums once per lap so float drift cannot build up
+            self._sum = math.fsum(self._sorted)
+            self._sumsq = math.fsum(v * v for v in self._sorted)
+
+    def cdf(self, value: float) -> float:
+        return bisect_right(self._sorted, value) / self._count if self._count else 0.5
+
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+
+    def stdev(self) -> float:
+        """Sample standard deviation (``statistics.stdev``); 1.0 below two values."""
+        n = self._count
+        if n < 2:
+            return 1.0
+        var = (self._sumsq - self._sum * self._sum / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def stats(self, value: float) -> Dict[str, float]:
+        mean, stdev = self.mean(), self.stdev()
+        cdf = self.cdf(value)
+        return {
+            "cdf": cdf,
+            "z_score": (value - mean) / stdev if stdev > 0 else 0.0,
+            "percentile": cdf * 100,
+            "mean": mean,
+            "stdev": stdev,
+        }
+
+
+class VpinState:
+    """Bucket fill, imbalance ring and VPIN distribution for one symbol."""
+
+    __slots__ = (
+        "bucket_volume",
+        "next_bucket_volume",
+        "window",
+        "alpha",
+        "last_price",
+        "variance",
+        "bucket_buy",
+        "bucket_filled",
+        "imbalances",
+        "pos",
+        "count",
+        "total",
+        "buckets",
+        "trades",
+        "vpin",
+        "distribution",
+        "updated_us",
+    )
+
+    def __init__(self, bucket_volume: float, window: int, cdf_window: int, alpha: float) -> None:
+        self.bucket_volume = bucket_volume
+        self.next_bucket_volume = bucket_volume
+        self.window = window
+        self.alpha = alpha
+        self.last_price = math.nan
+        self.variance = 0.0
+        self.bucket_buy = 0.0
+        self.bucket_filled = 0.0
+        self.imbalances = array("d", bytes(8 * window))
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.buckets = 0
+        self.trades = 0
+        self.vpin = 0.0
+        self.distribution = RollingDistribution(cdf_window)
+        self.updated_us = 0
+
+    def buy_fraction(self, price: float) -> float:
+        """Bulk-volume classification of one trade against the running dp variance."""
+        last = self.last_price
+        self.last_price = price
+        if last != last:  # first trade
+            return 0.5
+        dp = price - last
+        if dp != 0.0:
+            if self.variance == 0.0:
+                self.variance = dp * dp
+            else:
+                self.variance += self.alpha * (dp * dp - self.variance)
+        if self.variance == 0.0:
+            return 0.5
+        return _normal_cdf(dp / math.sqrt(self.variance))
+
+    def add(self, price: float, qty: float, timestamp_us: int) -> int:
+        """Pour one trade into the buckets; returns how many buckets it closed."""
+        self.trades += 1
+        self.updated_us = timestamp_us
+        fraction = self.buy_fraction(price)
+        closed = 0
+        while qty > 0.0:
+            take = min(qty, self.bucket_volume - self.bucket_filled)
+            self.bucket_buy += take * fraction
+            self.bucket_filled += take
+            qty -= take
+            if self.bucket_filled >= self.bucket_volume:
+                self._close_bucket()
+                closed += 1
+        return closed
+
+    def _close_bucket(self) -> None:
+        volume = self.bucket_filled
+        imbalance = abs(2.0 * self.bucket_buy - volume) / volume
+        if self.count == self.window:
+            self.total -= self.imbalances[self.pos]
+        else:
+            self.count += 1
+        self.imbalances[self.pos] = imbalance
+        self.total += imbalance
+        self.pos += 1
+        if self.pos == self.window:
+            self.pos = 0
+            self.total = math.fsum(self.imbalances[: self.count])
+
+        self.buckets += 1
+        self.vpin = self.total / self.count
+        self.distribution.push(self.vpin)
+        self.bucket_buy = 0.0
+        self.bucket_filled = 0.0
+        self.bucket_volume = self.next_bucket_volume
+
+    def reading(self, symbol: str, min_history: int = 10) -> Dict[str, Any]:
+        reading: Dict[str, Any] = {
+            "symbol": symbol,
+            "vpin": self.vpin,
+            "buckets": self.buckets,
+            "trades": self.trades,
+            "bucket_volume": self.bucket_volume,
+            "bucket_fill": self.bucket_filled / self.bucket_volume,
+            "confidence": self.count / self.window,
+            "timestamp_us": self.updated_us,
+        }
+        if len(self.distribution) < min_history:
+            reading.update(cdf=0.5, z_score=0.0, percentile=50.0)
+        else:
+            reading.update(self.distribution.stats(self.vpin))
+        return reading
+
+
+class VpinEngine:
+    """Per-symbol streaming VPIN over equal-volume buckets."""
+
+    def __init__(
+        self,
+        bucket_volume: float = 1000.0,
+        window: int = 50,
+        cdf_window: int = 200,
+        sigma_alpha: float = 0.05,
+    ) -> None:
+        self.bucket_volume = bucket_volume
+        self.window = window
+        self.cdf_window = cdf_window
+        self.sigma_alpha = sigma_alpha
+        self._states: Dict[str, VpinState] = {}
+        self._bucket_volumes: Dict[str, float] = {}
+
+    def _state(self, symbol: str) -> VpinState:
+        state = self._states.get(symbol)
+        if state is None:
+            volume = self._bucket_volumes.get(symbol, self.bucket_volume)
+            state = self._states[symbol] = VpinState(
+                volume, self.window, self.cdf_window, self.sigma_alpha
+            )
+        return state
+
+    def set_bucket_volume(self, symbol: str, volume: float) -> None:
+        """Resize a symbol's buckets; the bucket being filled keeps its size."""
+        if volume <= 0:
+            raise ValueError("bucket volume must be positive")
+        self._bucket_volumes[symbol] = volume
+        state = self._states.get(symbol)
+        if state is not None:
+            state.next_bucket_volume = volume
+            if state.bucket_filled == 0.0:
+                state.bucket_volume = volume
+
+    def on_trade(
+        self, symbol: str, price: float, qty: float, timestamp_us: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """Feed one trade. Returns a fresh reading when it closed a bucket, else None."""
+        if qty <= 0 or price <= 0:
+            return None
+        state = self._state(symbol)
+        if state.add(price, qty, timestamp_us):
+            return state.reading(symbol)
+        return None
+
+    def handle_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if "data" in message:
+            message = message["data"]
+        if message.get("e") != "aggTrade" or "s" not in message:
+            return None
+        return self.on_trade(
+            message["s"],
+            float(message["p"]),
+            float(message["q"]),
+            int(message.get("T", 0)) * 1000,
+        )
+
+    def vpin(self, symbol: str) -> float:
+        state = self._states.get(symbol)
+        return state.vpin if state is not None else 0.0
+
+    def snapshot(self, symbol: str) -> Optional[Dict[str, Any]]:
+        state = self._states.get(symbol)
+        return state.reading(symbol) if state is not None else None
+
+    def snapshots(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        names = self._states if symbols is None else [s for s in symbols if s in self._states]
+        return {symbol: self._states[symbol].reading(symbol) for symbol in names}
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol, None)
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 import httpx
 
 from .logger import get_logger
+from .rate_limit_manager import get_venue_limiter
 
 logger = get_logger(__name__)
 
@@ -111,6 +112,7 @@ class DriftClient:
         price = 0.0
         try:
             # Fetch Real Price from CoinGecko (Backup source) with timeout
+            await get_venue_limiter("coingecko").acquire({"requests": 1}, timeout=10.0)
             async with httpx.AsyncClient(timeout=10.0) as client:
                 resp = await client.get(
                     "https://api.coingecko.com/api/v3/simple/price",
@@ -288,6 +290,7 @@ class DriftClient:
                 logger.debug(f"No CoinGecko mapping for {base}")
                 return 0.0
 
+            await get_venue_limiter("coingecko").acquire({"requests": 1}, timeout=5.0)
             async with httpx.AsyncClient(timeout=5.0) as client:
                 resp = await client.get(
                     "https://api.coingecko.com/api/v3/simple/price",
@@ -3,15 +3,20 @@ Event Bus - Decoupled Event-Driven Communication
 
 Implements Redis Pub/Sub for cross-instance messaging with local fallback.
 Enables loose coupling between services while maintaining real-time communication.
+Local delivery goes through per-subscriber bounded queues so publishers (the
+trading loop) never wait on slow consumers such as dashboards or notifiers.
 """
 
 import asyncio
 import json
 import logging
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .metrics import EVENT_BUS_BACKLOG, EVENT_BUS_DELIVERY_LATENCY, EVENT_BUS_DROPPED
 
 logger = logging.getLogger(__name__)
 
@@ -65,13 +70,186 @@ class EventTypes:
 EventCallback = Callable[[Event], None]
 
 
+class OverflowPolicy:
+    """What a subscriber queue does when it is full."""
+
+    DROP = "drop"  # discard the oldest queued event
+    COALESCE = "coalesce"  # keep only the newest event per coalesce key
+    BLOCK = "block"  # make the publisher wait for space (backpressure)
+
+
+class _Shard:
+    """One ordered lane of a subscription, drained by a single worker task."""
+
+    __slots__ = ("pending", "ready", "space", "idle", "seq")
+
+    def __init__(self) -> None:
+        # key -> (enqueued_at, event); insertion order is delivery order
+        self.pending: "OrderedDict[Any, Tuple[float, Event]]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.space = asyncio.Event()
+        self.space.set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.seq = 0
+
+
+class _Subscription:
+    """A subscriber callback with its own bounded queue(s) and worker task(s).
+
+    Events are sharded by event type, so each event type is delivered to the
+    callback in publish order while different types may run concurrently when
+    ``shards > 1``.
+    """
+
+    def __init__(
+        self,
+        event_type: str,
+        callback: EventCallback,
+        inline: bool,
+        max_queue: int,
+        overflow: str,
+        shards: int,
+        coalesce_key: Optional[Callable[[Event], Any]],
+    ) -> None:
+        self.event_type = event_type
+        self.callback = callback
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.inline = inline
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow
+        self.coalesce_key = coalesce_key or (lambda event: event.event_type)
+        self.is_async = asyncio.iscoroutinefunction(callback)
+        self.shards = [_Shard() for _ in range(max(1, shards))]
+        self.workers: List[asyncio.Task] = []
+        self.stats = {
+            "delivered": 0,
+            "errors": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "blocked": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+        }
+
+    @property
+    def backlog(self) -> int:
+        return sum(len(shard.pending) for shard in self.shards)
+
+    def _shard_for(self, event: Event) -> _Shard:
+        if len(self.shards) == 1:
+            return self.shards[0]
+        return self.shards[hash(event.event_type) % len(self.shards)]
+
+    def ensure_workers(self) -> None:
+        if self.inline or self.workers:
+            return
+        self.workers = [asyncio.create_task(self._run(shard)) for shard in self.shards]
+
+    async def put(self, event: Event) -> None:
+        self.ensure_workers()
+        shard = self._shard_for(event)
+        if self.overflow == OverflowPolicy.COALESCE:
+            key = self.coalesce_key(event)
+            if key in shard.pending:
+                # Replace in place: keeps the slot, delivers only the newest
+                shard.pending[key] = (shard.pending[key][0], event)
+                self.stats["coalesced"] += 1
+                EVENT_BUS_DROPPED.labels(subscriber=self.name, reason="coalesced").inc()
+                return
+        else:
+            shard.seq += 1
+            key = shard.seq
+
+        while len(shard.pending) >= self.max_queue:
+            if self.overflow == OverflowPolicy.BLOCK:
+                self.stats["blocked"] += 1
+                shard.space.clear()
+                await shard.space.wait()
+                continue
+            shard.pending.popitem(last=False)
+            self.stats["dropped"] += 1
+            EVENT_BUS_DROPPED.labels(subscriber=self.name, reason="overflow").inc()
+
+        shard.pending[key] = (time.monotonic(), event)
+        shard.idle.clear()
+        shard.ready.set()
+        EVENT_BUS_BACKLOG.labels(subscriber=self.name).set(self.backlog)
+
+    async def invoke(self, event: Event) -> bool:
+        try:
+            if self.is_async:
+                await self.callback(event)
+            else:
+                self.callback(event)
+            return True
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"❌ EventBus callback error for {event.event_type}: {e}")
+            return False
+
+    def record_latency(self, enqueued_at: float) -> None:
+        latency = time.monotonic() - enqueued_at
+        self.stats["delivered"] += 1
+        self.stats["latency_total"] += latency
+        if latency > self.stats["latency_max"]:
+            self.stats["latency_max"] = latency
+        EVENT_BUS_DELIVERY_LATENCY.labels(subscriber=self.name).observe(latency)
+
+    async def _run(self, shard: _Shard) -> None:
+        while True:
+            if not shard.pending:
+                shard.idle.set()
+                shard.ready.clear()
+                await shard.ready.wait()
+                continue
+            _, (enqueued_at, event) = shard.pending.popitem(last=False)
+            shard.space.set()
+            await self.invoke(event)
+            self.record_latency(enqueued_at)
+            EVENT_BUS_BACKLOG.labels(subscriber=self.name).set(self.backlog)
+
+    async def drain(self) -> None:
+        for shard in self.shards:
+            await shard.idle.wait()
+
+    async def close(self) -> None:
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def snapshot(self) -> Dict[str, Any]:
+        delivered = self.stats["delivered"]
+        return {
+            "subscriber": self.name,
+            "event_type": self.event_type,
+            "mode": "inline" if self.inline else "queued",
+            "overflow": self.overflow,
+            "backlog": self.backlog,
+            "delivered": delivered,
+            "errors": self.stats["errors"],
+            "dropped": self.stats["dropped"],
+            "coalesced": self.stats["coalesced"],
+            "blocked": self.stats["blocked"],
+            "avg_latency_ms": (
+                self.stats["latency_total"] / delivered * 1000 if delivered else 0.0
+            ),
+            "max_latency_ms": self.stats["latency_max"] * 1000,
+        }
+
+
 class EventBus:
     """
     Event Bus for decoupled inter-service communication.
 
     Features:
     - Local pub/sub for same-instance communication
-    - Redis Pub/Sub for cross-instance communication (when available)
+    - Per-subscriber bounded queues and worker tasks, so a slow consumer
+      never stalls the publisher (drop / coalesce / block overflow policies)
+    - Per-event-type ordering for every subscriber
+    - Redis Pub/Sub for cross-instance communication (when available),
+      published in pipelined batches
     - Event history for debugging
     - Async-native design
 
@@ -80,6 +258,9 @@ class EventBus:
 
         # Subscribe to events
         bus.subscribe(EventTypes.TRADE_EXECUTED, on_trade_executed)
+        bus.subscribe(
+            EventTypes.PORTFOLIO_UPDATED, push_dashboard, overflow=OverflowPolicy.COALESCE
+        )
 
         # Publish events
         await bus.publish(Event(
@@ -89,14 +270,27 @@ class EventBus:
         ))
     """
 
-    def __init__(self, instance_id: str = "default"):
+    def __init__(
+        self,
+        instance_id: str = "default",
+        max_queue: int = 1000,
+        overflow: str = OverflowPolicy.DROP,
+        redis_batch_size: int = 100,
+        redis_flush_interval: float = 0.005,
+    ):
         self.instance_id = instance_id
-        self._subscribers: Dict[str, List[EventCallback]] = defaultdict(list)
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.redis_batch_size = redis_batch_size
+        self.redis_flush_interval = redis_flush_interval
+        self._subscribers: Dict[str, List[_Subscription]] = defaultdict(list)
         self._redis = None
         self._pubsub = None
         self._listener_task: Optional[asyncio.Task] = None
-        self._history: List[Event] = []
-        self._history_limit = 1000
+        self._flush_task: Optional[asyncio.Task] = None
+        self._redis_outbox: List[Tuple[str, str]] = []
+        self._redis_wakeup = asyncio.Event()
+        self._history: Deque[Event] = deque(maxlen=1000)
         self._shutdown_event = asyncio.Event()
 
         # Statistics
@@ -106,6 +300,7 @@ class EventBus:
             "callbacks_executed": 0,
             "callback_errors": 0,
             "redis_connected": False,
+            "redis_batches": 0,
         }
 
     async def init(self) -> None:
@@ -124,31 +319,79 @@ class EventBus:
             logger.warning(f"⚠️ EventBus Redis connection failed, using local-only mode: {e}")
 
     async def start(self) -> None:
-        """Start the event bus listener."""
+        """Start the event bus listener and the batched Redis publisher."""
         if self._redis and self._pubsub:
             self._listener_task = asyncio.create_task(self._redis_listener())
             logger.info("🚀 EventBus Redis listener started")
+        if self._redis:
+            self._flush_task = asyncio.create_task(self._redis_flusher())
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.ensure_workers()
 
-    async def stop(self) -> None:
-        """Stop the event bus."""
+    async def stop(self, drain_timeout: float = 2.0) -> None:
+        """Stop the event bus, giving queued deliveries a chance to finish."""
         self._shutdown_event.set()
 
-        if self._listener_task:
-            self._listener_task.cancel()
-            try:
-                await self._listener_task
-            except asyncio.CancelledError:
-                pass
+        try:
+            await asyncio.wait_for(self.drain(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ EventBus stopped with undelivered events")
+
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                await subscription.close()
+
+        for task in (self._listener_task, self._flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await self._flush_redis()
 
         if self._pubsub:
             await self._pubsub.close()
 
         logger.info("🛑 EventBus stopped")
 
-    def subscribe(self, event_type: str, callback: EventCallback) -> None:
-        """Subscribe to an event type."""
-        self._subscribers[event_type].append(callback)
-        logger.debug(f"📩 Subscribed to {event_type}: {callback.__qualname__}")
+    def subscribe(
+        self,
+        event_type: str,
+        callback: EventCallback,
+        *,
+        inline: bool = False,
+        max_queue: Optional[int] = None,
+        overflow: Optional[str] = None,
+        shards: int = 1,
+        coalesce_key: Optional[Callable[[Event], Any]] = None,
+    ) -> None:
+        """Subscribe to an event type.
+
+        By default the callback runs on its own worker task behind a bounded
+        queue. ``inline=True`` keeps the old behaviour of awaiting the callback
+        inside ``publish``; use it only for cheap subscribers that must observe
+        the event before the publisher continues.
+        """
+        subscription = _Subscription(
+            event_type,
+            callback,
+            inline=inline,
+            max_queue=max_queue or self.max_queue,
+            overflow=overflow or self.overflow,
+            shards=shards,
+            coalesce_key=coalesce_key,
+        )
+        self._subscribers[event_type].append(subscription)
+        logger.debug(f"📩 Subscribed to {event_type}: {subscription.name}")
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Workers start on the first delivery / bus start
+            return
+        subscription.ensure_workers()
 
         # Also subscribe to Redis channel if connected
         if self._redis and self._pubsub:
@@ -156,29 +399,38 @@ class EventBus:
 
     def unsubscribe(self, event_type: str, callback: EventCallback) -> bool:
         """Unsubscribe from an event type."""
-        if event_type in self._subscribers:
-            try:
-                self._subscribers[event_type].remove(callback)
+        for subscription in self._subscribers.get(event_type, []):
+            if subscription.callback == callback:
+                self._subscribers[event_type].remove(subscription)
+                for task in subscription.workers:
+                    task.cancel()
                 return True
-            except ValueError:
-                return False
         return False
 
     async def publish(self, event: Event) -> None:
-        """Publish an event to all subscribers."""
+        """Publish an event to all subscribers.
+
+        Returns once the event is queued for every subscriber (and inline
+        subscribers have run); it only waits on a consumer whose overflow
+        policy is ``BLOCK`` and whose queue is full.
+        """
         self.stats["events_published"] += 1
 
         # Add to history
         self._history.append(event)
-        if len(self._history) > self._history_limit:
-            self._history = self._history[-self._history_limit :]
 
         # Publish to Redis if connected
         if self._redis:
-            try:
-                await self._redis.publish(event.event_type, json.dumps(event.to_dict()))
-            except Exception as e:
-                logger.debug(f"Redis publish failed: {e}")
+            payload = json.dumps(event.to_dict())
+            if self._flush_task and not self._flush_task.done():
+                self._redis_outbox.append((event.event_type, payload))
+                if len(self._redis_outbox) >= self.redis_batch_size:
+                    self._redis_wakeup.set()
+            else:
+                try:
+                    await self._redis.publish(event.event_type, payload)
+                except Exception as e:
+                    logger.debug(f"Redis publish failed: {e}")
 
         # Local delivery
         await self._deliver_event(event)
@@ -187,19 +439,56 @@ class EventBus:
         """Deliver event to local subscribers."""
         self.stats["events_received"] += 1
 
-        callbacks = self._subscribers.get(event.event_type, [])
-        callbacks += self._subscribers.get("*", [])  # Wildcard subscribers
+        subscriptions = self._subscribers.get(event.event_type, []) + self._subscribers.get(
+            "*", []
+        )  # Wildcard subscribers
 
-        for callback in callbacks:
-            try:
+        # Inline subscribers first so a BLOCK queue cannot delay them
+        for subscription in subscriptions:
+            if subscription.inline:
+                self.stats["callbacks_executed"] += 1
+                started = time.monotonic()
+                if not await subscription.invoke(event):
+                    self.stats["callback_errors"] += 1
+                subscription.record_latency(started)
+        for subscription in subscriptions:
+            if not subscription.inline:
                 self.stats["callbacks_executed"] += 1
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event)
-                else:
-                    callback(event)
+                await subscription.put(event)
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered."""
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in subscriptions:
+                await subscription.drain()
+
+    async def _redis_flusher(self) -> None:
+        """Publish queued Redis messages in pipelined batches."""
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._redis_wakeup.wait(), timeout=self.redis_flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._redis_wakeup.clear()
+                await self._flush_redis()
+        except asyncio.CancelledError:
+            pass
+
+    async def _flush_redis(self) -> None:
+        while self._redis_outbox and self._redis:
+            batch = self._redis_outbox[: self.redis_batch_size]
+            del self._redis_outbox[: self.redis_batch_size]
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for channel, payload in batch:
+                    pipe.publish(channel, payload)
+                await pipe.execute()
+                self.stats["redis_batches"] += 1
             except Exception as e:
-                self.stats["callback_errors"] += 1
-                logger.error(f"❌ EventBus callback error for {event.event_type}: {e}")
+                logger.debug(f"Redis batch publish failed ({len(batch)} events): {e}")
 
     async def _redis_listener(self) -> None:
         """Listen for Redis Pub/Sub messages."""
@@ -230,20 +519,33 @@ class EventBus:
         self, event_type: Optional[str] = None, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Get recent event history."""
-        events = self._history
+        events = list(self._history)
 
         if event_type:
             events = [e for e in events if e.event_type == event_type]
 
         return [e.to_dict() for e in events[-limit:]]
 
+    def get_subscriber_stats(self) -> List[Dict[str, Any]]:
+        """Per-subscriber backlog, drop and latency statistics."""
+        return [
+            subscription.snapshot()
+            for subscriptions in self._subscribers.values()
+            for subscription in subscriptions
+        ]
+
     def get_stats(self) -> Dict[str, Any]:
         """Get event bus statistics."""
+        subscribers = self.get_subscriber_stats()
         return {
             **self.stats,
+            "callback_errors": self.stats["callback_errors"]
+            + sum(s["errors"] for s in subscribers if s["mode"] == "queued"),
             "instance_id": self.instance_id,
-            "subscriber_count": sum(len(cbs) for cbs in self._subscribers.values()),
+            "subscriber_count": len(subscribers),
             "history_size": len(self._history),
+            "redis_pending": len(self._redis_outbox),
+            "subscribers": subscribers,
         }
 
 
@@ -16,9 +16,11 @@ All trading logic uses only verified, documented API capabilities.
 from __future__ import annotations
 
 import asyncio
+import copy
 import hashlib
 import hmac
 import json
+import logging
 import re
 import time
 from decimal import Decimal
@@ -31,6 +33,45 @@ from pydantic import BaseModel, Field
 
 from .credentials import Credentials
 from .enums import MarginType, OrderType, PositionSide, ResponseType, TimeInForce, WorkingType
+from .metrics import ASTER_API_LATENCY, ASTER_API_RATE_LIMIT_USAGE, ASTER_API_REQUESTS
+from .rate_limit_manager import Priority, VenueRateLimiter, get_venue_limiter
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Request weights that differ from 1 (Binance-compatible futures/spot API)
+_ENDPOINT_WEIGHTS = {
+    "/fapi/v2/balance": 5,
+    "/fapi/v2/account": 5,
+    "/fapi/v2/positionRisk": 5,
+    "/fapi/v1/income": 30,
+    "/fapi/v1/userTrades": 5,
+    "/fapi/v1/commissionRate": 20,
+    "/fapi/v1/adlQuantile": 5,
+    "/fapi/v1/forceOrders": 20,
+    "/api/v3/account": 10,
+}
+# Weights when the symbol parameter is omitted (all-market variants)
+_ALL_SYMBOL_WEIGHTS = {
+    "/fapi/v1/ticker/24hr": 40,
+    "/fapi/v1/ticker/price": 2,
+    "/fapi/v1/ticker/bookTicker": 5,
+    "/fapi/v1/openOrders": 40,
+    "/api/v3/ticker/24hr": 40,
+}
+_ORDER_ENDPOINTS = {
+    "/fapi/v1/order",
+    "/fapi/v1/batchOrders",
+    "/fapi/v1/allOpenOrders",
+    "/fapi/v1/countdownCancelAll",
+    "/api/v3/order",
+}
 
 
 class AsterAPIError(Exception):
@@ -213,12 +254,46 @@ class AsterClient:
         self,
         credentials: Optional[Credentials] = None,
         base_url: str = "https://fapi.asterdex.com",
+        coalesce_reads: bool = True,
+        read_freshness_seconds: float = 0.0,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 120.0,
+        http2: bool = True,
+        timeout: float = 10.0,
+        rate_limiter: Optional[VenueRateLimiter] = None,
     ):
         self._credentials = credentials
         self._base_url = base_url
-        self._client = httpx.AsyncClient(base_url=self._base_url, timeout=10.0)
+        # Shared per-venue token buckets; requests wait for capacity instead of hitting 429s
+        self._rate_limiter = rate_limiter or get_venue_limiter(self._venue)
+        # Long-lived keep-alive pool: connections (and their DNS/TLS setup) are
+        # reused, and warmup() opens them before the first order goes out.
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2 and HTTP2_AVAILABLE,
+        )
+        # HMAC state keyed with the secret once; copied per signature
+        self._hmac = (
+            hmac.new(credentials.api_secret.encode("utf-8"), digestmod=hashlib.sha256)
+            if credentials and credentials.api_secret
+            else None
+        )
+        self.rate_limit_usage: Dict[str, int] = {}
         self._filter_cache: Dict[str, Dict[str, Any]] = {}
         self._filter_cache_time: Dict[str, float] = {}
+        # Single-flight coalescing for public market-data GETs
+        self._coalesce_reads = coalesce_reads
+        self._read_freshness_seconds = read_freshness_seconds
+        self._inflight_reads: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        self._fresh_reads: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+        self.coalesce_stats: Dict[str, int] = {"requests": 0, "coalesced": 0, "fresh_hits": 0}
 
     def _normalize_symbol(self, symbol: str) -> str:
         """Centralized robust normalization for Aster API (Strip non-alphanumeric + USDC -> USDT)."""
@@ -235,9 +310,55 @@ class AsterClient:
 
         return normalized
 
+    _ping_endpoint = "/fapi/v1/ping"
+    _venue = "aster"
+
     async def close(self) -> None:
         await self._client.aclose()
 
+    async def warmup(self, connections: int = 2) -> None:
+        """Open ``connections`` pooled connections ahead of the first real request."""
+        results = await asyncio.gather(
+            *(self._client.get(self._ping_endpoint) for _ in range(max(1, connections))),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning("Aster connection warmup: %d/%d failed", len(failures), len(results))
+
+    @staticmethod
+    def _request_cost(
+        method: str, endpoint: str, params: Dict[str, Any], signed: bool
+    ) -> Tuple[Dict[str, float], Priority]:
+        """Token cost and priority lane for one request."""
+        weight = _ENDPOINT_WEIGHTS.get(endpoint, 1)
+        if "symbol" not in params and endpoint in _ALL_SYMBOL_WEIGHTS:
+            weight = _ALL_SYMBOL_WEIGHTS[endpoint]
+        elif endpoint.endswith("/depth"):
+            limit = int(params.get("limit", 100))
+            weight = 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+        elif endpoint.endswith("klines"):
+            limit = int(params.get("limit", 500))
+            weight = 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+
+        if endpoint in _ORDER_ENDPOINTS:
+            cost: Dict[str, float] = {"weight": weight}
+            if method == "POST":
+                cost["orders"] = cost["orders_10s"] = 1
+            return cost, Priority.ORDER
+        return {"weight": weight}, Priority.ACCOUNT if signed else Priority.MARKET_DATA
+
+    def _signature(self, query_string: str) -> str:
+        if self._hmac is None:
+            if not self._credentials or not self._credentials.api_secret:
+                raise ValueError("API secret is not configured")
+            self._hmac = hmac.new(
+                self._credentials.api_secret.encode("utf-8"), digestmod=hashlib.sha256
+            )
+        mac = self._hmac.copy()
+        mac.update(query_string.encode("utf-8"))
+        return mac.hexdigest()
+
     def _sign_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
         if not self._credentials or not self._credentials.api_secret:
             raise ValueError("API secret is not configured")
@@ -245,12 +366,7 @@ class AsterClient:
         # Sort parameters for consistent signature generation
         sorted_params = sorted(params.items())
         query_string = urlencode(sorted_params, doseq=True)
-        signature = hmac.new(
-            self._credentials.api_secret.encode("utf-8"),
-            query_string.encode("utf-8"),
-            hashlib.sha256,
-        ).hexdigest()
-        params["signature"] = signature
+        params["signature"] = self._signature(query_string)
         return params
 
     async def _make_request(
@@ -268,78 +384,110 @@ class AsterClient:
         if "pair" in params:
             params["pair"] = self._normalize_symbol(params["pair"])
 
-        # removed flood print
-        # Send params in body for state-changing methods, query string for GET
-        if method.upper() in ["POST", "PUT", "DELETE"]:
-            if signed:
-                # For signed requests, we must ensure the body matches the signature exactly.
-                # httpx might reorder params, so we construct the body string manually.
-                if not self._credentials or not self._credentials.api_secret:
-                    raise ValueError("API secret is not configured")
-
-                # Timestamp is already added by _sign_request if we called it,
-                # but here we are handling it manually to control the string.
-                # Let's NOT call _sign_request above for these methods to avoid double timestamping/signing issues
-                # if we were to refactor. But currently _sign_request is called above.
-                # Wait, if we call _sign_request above, params has 'signature' and 'timestamp'.
-                # And it is sorted? No, params is a dict.
-
-                # Let's redo the signing here to be safe and explicit,
-                # OR trust that we can reconstruct the string from params.
-                # Better to redo it or modify the flow.
-
-                # RE-IMPLEMENTING logic to avoid the _sign_request call above which returns a dict.
-                # We need the sorted query string.
-                pass
-
-        # Let's rewrite the whole block to be cleaner.
+        if signed or not self._coalesce_reads or method.upper() != "GET":
+            return await self._send_request(method, endpoint, params, signed)
+        return await self._coalesced_get(endpoint, params)
+
+    async def _coalesced_get(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Single-flight public GET: identical concurrent reads share one HTTP call.
+
+        Requests are keyed on endpoint + sorted params. Callers that arrive while
+        a request is in flight await the same task (shielded, so one caller being
+        cancelled does not cancel the others). With ``read_freshness_seconds`` > 0
+        a completed result is also served for that long. Every caller gets its own
+        copy of the payload so mutations never leak between callers.
+        """
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+        if self._read_freshness_seconds > 0:
+            cached = self._fresh_reads.get(key)
+            if cached is not None:
+                stored_at, payload = cached
+                if time.monotonic() - stored_at < self._read_freshness_seconds:
+                    self.coalesce_stats["fresh_hits"] += 1
+                    return copy.deepcopy(payload)
+                self._fresh_reads.pop(key, None)
+
+        task = self._inflight_reads.get(key)
+        if task is None:
+            self.coalesce_stats["requests"] += 1
+            task = asyncio.ensure_future(self._send_request("GET", endpoint, dict(params)))
+            self._inflight_reads[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish_read(key, done))
+        else:
+            self.coalesce_stats["coalesced"] += 1
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def _finish_read(self, key: Tuple[Any, ...], task: asyncio.Future) -> None:
+        if self._inflight_reads.get(key) is task:
+            del self._inflight_reads[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self._read_freshness_seconds > 0:
+            self._fresh_reads[key] = (time.monotonic(), copy.deepcopy(task.result()))
+            if len(self._fresh_reads) > 4096:
+                cutoff = time.monotonic() - self._read_freshness_seconds
+                self._fresh_reads = {
+                    k: v for k, v in self._fresh_reads.items() if v[0] >= cutoff
+                }
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        signed: bool = False,
+    ) -> Dict[str, Any]:
+        method = method.upper()
+        has_body = method in ("POST", "PUT", "DELETE")
+        headers: Dict[str, str] = {}
+        base_query = ""
+        if signed:
+            if not self._credentials or not self._credentials.api_key:
+                raise ValueError("API key is not configured for a signed request")
+            if not self._credentials.api_secret:
+                raise ValueError("API secret is not configured")
+            headers["X-MBX-APIKEY"] = self._credentials.api_key
+            if has_body:
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            # Encode once; only the timestamp changes between attempts.
+            # The signature covers the exact string sent, so order is ours to pick.
+            base_query = urlencode(
+                sorted((k, v) for k, v in params.items() if k not in ("timestamp", "signature")),
+                doseq=True,
+            )
 
         retries = 3
         backoff_factor = 1.0  # Initial usage is simple backoff
+        cost, priority = self._request_cost(method, endpoint, params, signed)
 
         for attempt in range(retries + 1):
+            await self._rate_limiter.acquire(cost, priority)
+            started = time.perf_counter()
             if signed:
-                if not self._credentials or not self._credentials.api_key:
-                    raise ValueError("API key is not configured for a signed request")
-
-                if not self._credentials.api_secret:
-                    raise ValueError("API secret is not configured")
-
-                # RE-SIGN REQUEST FOR EACH ATTEMPT (Timestamp freshness)
-                params["timestamp"] = int(time.time() * 1000)
-                sorted_params = sorted(params.items())
-                query_string = urlencode(sorted_params, doseq=True)
-                signature = hmac.new(
-                    self._credentials.api_secret.encode("utf-8"),
-                    query_string.encode("utf-8"),
-                    hashlib.sha256,
-                ).hexdigest()
-
-                headers = {"X-MBX-APIKEY": self._credentials.api_key}
-
-                if method.upper() in ["POST", "PUT", "DELETE"]:
-                    payload = query_string + "&signature=" + signature
-                    headers["Content-Type"] = "application/x-www-form-urlencoded"
+                # Re-sign each attempt so the timestamp stays fresh
+                timestamp = f"timestamp={int(time.time() * 1000)}"
+                query_string = f"{base_query}&{timestamp}" if base_query else timestamp
+                payload = f"{query_string}&signature={self._signature(query_string)}"
+                if has_body:
                     response = await self._client.request(
                         method, endpoint, content=payload, headers=headers
                     )
-                else:
-                    full_query = query_string + "&signature=" + signature
-                    url = f"{endpoint}?{full_query}"
-                    response = await self._client.request(method, url, headers=headers)
-            else:
-                headers = {}
-                if method.upper() in ["POST", "PUT", "DELETE"]:
-                    response = await self._client.request(
-                        method, endpoint, data=params, headers=headers
-                    )
                 else:
                     response = await self._client.request(
-                        method, endpoint, params=params, headers=headers
+                        method, f"{endpoint}?{payload}", headers=headers
                     )
+            elif has_body:
+                response = await self._client.request(method, endpoint, data=params)
+            else:
+                response = await self._client.request(method, endpoint, params=params)
+            self._record_response(method, endpoint, response, time.perf_counter() - started)
 
-            # Check for Rate Limit (429)
-            if response.status_code == 429:
+            # Rate limited (429) or IP ban (418): pause the whole venue, then
+            # retry once the limiter hands out capacity again
+            if response.status_code in (418, 429):
                 if attempt < retries:
                     retry_after = backoff_factor * (2**attempt)
                     # Respect server header if present
@@ -349,36 +497,24 @@ class AsterClient:
                         except ValueError:
                             pass
 
-                    print(
-                        f"⚠️ Rate limit hit (429). Retrying in {retry_after}s... (Attempt {attempt + 1}/{retries})"
+                    logger.warning(
+                        "Rate limit hit (%d) on %s. Retrying in %ss (attempt %d/%d)",
+                        response.status_code,
+                        endpoint,
+                        retry_after,
+                        attempt + 1,
+                        retries,
                     )
-                    await asyncio.sleep(retry_after)
+                    self._rate_limiter.penalize(retry_after)
                     continue
                 else:
-                    print("❌ Rate limit retries exhausted.")
+                    logger.error("Rate limit retries exhausted on %s", endpoint)
 
             try:
                 response.raise_for_status()
                 # Break loop on success
                 break
             except HTTPStatusError as exc:
-                if response.status_code == 429:
-                    # This block is technically unreachable due to the check above, but good for safety
-                    pass
-
-                # Silence expected noise logs for invalid symbols/delivering symbols during scanning/restart
-                if response.status_code != 429:
-                    error_data = {}
-                    try:
-                        error_data = exc.response.json()
-                    except:
-                        pass
-
-                    error_code = error_data.get("code")
-                    if error_code not in [-1121, -4108]:
-                        print(
-                            f"DEBUG: Error Response from {endpoint} (params={params}): {exc.response.text}"
-                        )
                 content = exc.response.text
                 # Try to parse Aster API error format
                 try:
@@ -386,6 +522,12 @@ class AsterClient:
                     error_code = error_data.get("code")
                     error_msg = error_data.get("msg", content)
 
+                    # Silence expected noise for invalid/delivering symbols during scans
+                    if response.status_code != 429 and error_code not in (-1121, -4108):
+                        logger.debug(
+                            "Error response from %s (params=%s): %s", endpoint, params, content
+                        )
+
                     if error_code in ASTER_ERROR_CODES:
                         error_name, error_class = ASTER_ERROR_CODES[error_code]
                         raise error_class(error_code, error_msg)
@@ -401,7 +543,7 @@ class AsterClient:
                             )
                         else:
                             raise AsterAPIError(error_code or exc.response.status_code, error_msg)
-                except (ValueError, TypeError):
+                except (ValueError, TypeError, AttributeError):
                     # Not JSON response, use generic error
                     raise RuntimeError(
                         f"Aster API error {exc.response.status_code} on {endpoint}: {content}"
@@ -409,6 +551,23 @@ class AsterClient:
 
         return response.json()
 
+    def _record_response(
+        self, method: str, endpoint: str, response: httpx.Response, elapsed: float
+    ) -> None:
+        """Per-endpoint latency plus rate-limit usage from the response headers."""
+        ASTER_API_REQUESTS.labels(endpoint=endpoint, method=method).inc()
+        ASTER_API_LATENCY.labels(endpoint=endpoint, method=method).observe(elapsed)
+        for header, value in response.headers.items():
+            header = header.lower()
+            if header.startswith(("x-mbx-used-weight-", "x-mbx-order-count-")):
+                try:
+                    used = int(value)
+                except ValueError:
+                    continue
+                self.rate_limit_usage[header] = used
+                ASTER_API_RATE_LIMIT_USAGE.labels(header=header).set(used)
+        self._rate_limiter.sync_from_headers(self.rate_limit_usage)
+
     async def get_klines(
         self, symbol: str, interval: str, limit: int = 100
     ) -> List[Dict[str, Any]]:
@@ -929,12 +1088,15 @@ class AsterWebSocketClient:
         self._subscriptions: Dict[str, Any] = {}
         self._running = False
 
-    async def connect(self) -> None:
-        """Connect to the WebSocket."""
+    async def connect(self, path: str = "/ws/") -> None:
+        """Connect to the WebSocket.
+
+        Pass ``combined_stream(...)`` as ``path`` for combined streams.
+        """
         try:
             import websockets
 
-            self._websocket = await websockets.connect(self.base_url + "/ws/")
+            self._websocket = await websockets.connect(self.base_url + path)
             self._running = True
         except ImportError:
             raise RuntimeError("websockets library is required for WebSocket support")
@@ -946,8 +1108,12 @@ class AsterWebSocketClient:
             await self._websocket.close()
             self._websocket = None
 
-    async def subscribe(self, streams: List[str]) -> None:
-        """Subscribe to streams."""
+    async def subscribe(self, streams: List[str], wait_for_ack: bool = True) -> None:
+        """Subscribe to streams.
+
+        Pass ``wait_for_ack=False`` while ``listen`` is running; the ack then
+        arrives through the listen callback instead of a second ``recv``.
+        """
         if not self._websocket:
             raise RuntimeError("WebSocket not connected")
 
@@ -955,6 +1121,8 @@ class AsterWebSocketClient:
         subscribe_msg = {"method": "SUBSCRIBE", "params": streams, "id": request_id}
 
         await self._websocket.send(json.dumps(subscribe_msg))
+        if not wait_for_ack:
+            return
 
         # Wait for confirmation
         response = await self._websocket.recv()
@@ -1026,6 +1194,12 @@ class AsterWebSocketClient:
         speed_suffix = "@500ms" if speed == "500ms" else "@100ms" if speed == "100ms" else ""
         return f"{symbol.lower()}@depth{levels}{speed_suffix}"
 
+    @staticmethod
+    def diff_depth_stream(symbol: str, speed: str = "100ms") -> str:
+        """Diff. book depth stream (incremental updates with U/u/pu ids)."""
+        speed_suffix = "@500ms" if speed == "500ms" else "@100ms" if speed == "100ms" else ""
+        return f"{symbol.lower()}@depth{speed_suffix}"
+
     @staticmethod
     def force_order_stream(symbol: str) -> str:
         """Liquidation order stream."""
@@ -1325,12 +1499,16 @@ if __name__ == "__main__":
 class AsterSpotClient(AsterClient):
     """Client for Aster Spot API."""
 
+    _ping_endpoint = "/api/v3/ping"
+    _venue = "aster_spot"
+
     def __init__(
         self,
         credentials: Optional[Credentials] = None,
         base_url: str = "https://api.asterdex.com",  # Spot API URL
+        **kwargs: Any,
     ):
-        super().__init__(credentials, base_url)
+        super().__init__(credentials, base_url, **kwargs)
 
     async def get_exchange_info(self) -> Dict[str, Any]:
         """Get full exchange information (Spot)."""
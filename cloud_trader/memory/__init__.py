@@ -8,6 +8,7 @@ from .episodic_memory import (
     store_episode,
 )
 from .reflection_agent import ReflectionAgent, get_reflection_agent, reflect_on_episode
+from .vector_index import HashingEmbedder, VectorIndex
 
 __all__ = [
     # Core types
@@ -19,6 +20,9 @@ __all__ = [
     "get_episodic_memory",
     "store_episode",
     "recall_similar_episodes",
+    # Similarity index
+    "HashingEmbedder",
+    "VectorIndex",
     # Reflection
     "ReflectionAgent",
     "get_reflection_agent",
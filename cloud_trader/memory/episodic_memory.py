@@ -2,12 +2,13 @@
 Episodic Trading Memory - Main Memory System
 
 Provides storage, retrieval, and similarity search for trading episodes.
-Uses vector embeddings for semantic similarity matching.
+Uses local vector embeddings and an ANN index for semantic similarity matching.
 
 This is a novel contribution to the ACTS trading system.
 """
 
 import asyncio
+import heapq
 import json
 import logging
 import os
@@ -17,6 +18,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from .episode import Episode, TradeOutcome, create_episode
+from .segment_store import SegmentStore
+from .vector_index import Embedder, HashingEmbedder, VectorIndex
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +36,8 @@ class EpisodicMemory:
 
     Storage:
     - In-memory deque for recent episodes (fast access)
-    - File-based persistence for long-term storage
-    - Vector embeddings for similarity search (using text-based matching for now)
+    - Append-only segment log for long-term storage
+    - Vector index over episode embeddings for similarity search
     """
 
     def __init__(
@@ -42,6 +45,7 @@ class EpisodicMemory:
         storage_path: Optional[str] = None,
         max_memory_episodes: int = 1000,
         max_recent_episodes: int = 100,
+        embedder: Optional[Embedder] = None,
     ):
         """
         Initialize episodic memory.
@@ -50,6 +54,7 @@ class EpisodicMemory:
             storage_path: Path for persistent storage (if None, memory only)
             max_memory_episodes: Maximum episodes to keep in memory
             max_recent_episodes: Number of recent episodes for quick access
+            embedder: Text -> vector function (defaults to local feature hashing)
         """
         self.storage_path = Path(storage_path) if storage_path else None
         self.max_memory = max_memory_episodes
@@ -66,10 +71,17 @@ class EpisodicMemory:
         self._profitable_ids: List[str] = []
         self._unprofitable_ids: List[str] = []
 
+        # Similarity index over market_state_embedding_text (created on first insert)
+        self._embedder: Embedder = embedder or HashingEmbedder()
+        self._index: Optional[VectorIndex] = None
+
         # Stats
         self._total_stored = 0
         self._total_retrievals = 0
 
+        # Append-only episode log under storage_path
+        self._store: Optional[SegmentStore] = None
+
         # Load persisted episodes if available
         if self.storage_path:
             self._load_from_disk()
@@ -98,6 +110,7 @@ class EpisodicMemory:
             else:
                 self._unprofitable_ids.append(episode_id)
 
+        self._index_episode(episode)
         self._total_stored += 1
 
         # Persist to disk (async)
@@ -137,6 +150,9 @@ class EpisodicMemory:
             if episode_id not in self._unprofitable_ids:
                 self._unprofitable_ids.append(episode_id)
 
+        if self._index is not None:
+            self._index.update_metadata(episode_id, profitable=episode.was_profitable())
+
         # Persist
         if self.storage_path:
             await self._persist_episode(episode)
@@ -182,8 +198,9 @@ class EpisodicMemory:
         """
         Find episodes similar to the current market state.
 
-        Uses text-based similarity matching. In a production system,
-        this could use vector embeddings for better semantic matching.
+        Candidates come from the vector index (top matches by cosine
+        similarity, plus the best profitable matches when preferred) and are
+        then re-ranked with the profitability boost and recency bonus.
 
         Args:
             current_state_text: Current market state as text
@@ -196,41 +213,35 @@ class EpisodicMemory:
         """
         self._total_retrievals += 1
 
-        candidates = []
+        if self._index is None or limit <= 0:
+            return []
 
-        # Get candidate pool
-        if symbol and symbol in self._by_symbol:
-            candidate_ids = self._by_symbol[symbol]
-        else:
-            candidate_ids = list(self._episodes.keys())
+        filters = {"symbol": symbol} if symbol and symbol in self._by_symbol else {}
+        query = self._embedder(current_state_text)
+        pool = max(limit * 4, limit + 10)
 
-        # Calculate similarity scores
-        for episode_id in candidate_ids:
+        hits = dict(self._index.search(query, k=pool, filters=filters or None))
+        if prefer_profitable:
+            hits.update(self._index.search(query, k=limit, filters={**filters, "profitable": True}))
+
+        now = datetime.now()
+        candidates = []
+        for episode_id, similarity in hits.items():
             episode = self._episodes.get(episode_id)
             if not episode:
                 continue
 
-            # Simple text similarity (word overlap)
-            similarity = self._calculate_similarity(
-                current_state_text, episode.market_state_embedding_text
-            )
-
             # Boost profitable episodes
             if prefer_profitable and episode.was_profitable():
                 similarity *= 1.3
 
             # Slight recency bonus
-            age_days = (datetime.now() - episode.timestamp).days
-            recency_bonus = max(0, 1 - age_days / 30) * 0.1
-            similarity += recency_bonus
+            age_days = (now - episode.timestamp).days
+            similarity += max(0, 1 - age_days / 30) * 0.1
 
             candidates.append((episode, similarity))
 
-        # Sort by similarity (highest first)
-        candidates.sort(key=lambda x: x[1], reverse=True)
-
-        # Return top results
-        result = [ep for ep, _ in candidates[:limit]]
+        result = [ep for ep, _ in heapq.nlargest(limit, candidates, key=lambda x: x[1])]
 
         logger.debug(f"🔍 Recalled {len(result)} similar episodes for {symbol or 'any'}")
 
@@ -290,88 +301,107 @@ class EpisodicMemory:
             "symbols_tracked": list(self._by_symbol.keys()),
         }
 
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """
-        Calculate simple text similarity using word overlap.
-
-        In production, this should use vector embeddings (e.g., from Vertex AI)
-        for proper semantic similarity.
-        """
-        if not text1 or not text2:
-            return 0.0
-
-        # Normalize and tokenize
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        # Jaccard similarity
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-
-        return intersection / union if union > 0 else 0.0
+    def _index_episode(self, episode: Episode) -> None:
+        """Insert (or replace) an episode's embedding in the similarity index."""
+        vector = self._embedder(episode.market_state_embedding_text)
+        if self._index is None:
+            self._index = VectorIndex(dim=len(vector))
+        self._index.add(
+            episode.episode_id,
+            vector,
+            {"symbol": episode.symbol, "profitable": episode.was_profitable()},
+        )
 
     def _prune_old_episodes(self):
         """Remove oldest episodes when over memory limit."""
-        # Sort by timestamp and remove oldest
-        sorted_episodes = sorted(self._episodes.items(), key=lambda x: x[1].timestamp)
-
         # Keep newest max_memory episodes
-        to_remove = len(sorted_episodes) - self.max_memory
-        for episode_id, _ in sorted_episodes[:to_remove]:
-            del self._episodes[episode_id]
+        to_remove = len(self._episodes) - self.max_memory
+        oldest = heapq.nsmallest(to_remove, self._episodes.values(), key=lambda ep: ep.timestamp)
+        for episode in oldest:
+            del self._episodes[episode.episode_id]
+            if self._index is not None:
+                self._index.remove(episode.episode_id)
+            symbol_ids = self._by_symbol.get(episode.symbol)
+            if symbol_ids and episode.episode_id in symbol_ids:
+                symbol_ids.remove(episode.episode_id)
 
         logger.debug(f"🧹 Pruned {to_remove} old episodes")
 
     async def _persist_episode(self, episode: Episode):
-        """Persist episode to disk."""
-        if not self.storage_path:
+        """Append the episode's current version to the segment log."""
+        if self._store is None:
             return
 
         try:
-            self.storage_path.mkdir(parents=True, exist_ok=True)
-            filepath = self.storage_path / f"{episode.episode_id}.json"
-
-            with open(filepath, "w") as f:
-                json.dump(episode.to_dict(), f, indent=2)
-
+            self._store.put(
+                episode.episode_id,
+                episode.to_dict(),
+                symbol=episode.symbol,
+                ts=episode.timestamp.timestamp(),
+            )
         except Exception as e:
             logger.error(f"Failed to persist episode: {e}")
 
     def _load_from_disk(self):
-        """Load episodes from disk storage."""
-        if not self.storage_path or not self.storage_path.exists():
+        """Open the segment log and load the newest ``max_memory`` episodes."""
+        if not self.storage_path:
             return
 
+        try:
+            self._store = SegmentStore(self.storage_path / "log")
+        except Exception as e:
+            logger.error(f"Failed to open episode log in {self.storage_path}: {e}")
+            return
+        self._migrate_json_files()
+
         count = 0
-        for filepath in self.storage_path.glob("*.json"):
+        for episode_id, data in self._store.tail(self.max_memory):
             try:
-                with open(filepath) as f:
-                    data = json.load(f)
-                    episode = Episode.from_dict(data)
+                episode = Episode.from_dict(data)
 
-                    # Add to memory structures
-                    self._episodes[episode.episode_id] = episode
+                # Add to memory structures
+                self._episodes[episode.episode_id] = episode
 
-                    if episode.symbol not in self._by_symbol:
-                        self._by_symbol[episode.symbol] = []
-                    self._by_symbol[episode.symbol].append(episode.episode_id)
+                if episode.symbol not in self._by_symbol:
+                    self._by_symbol[episode.symbol] = []
+                self._by_symbol[episode.symbol].append(episode.episode_id)
 
-                    if episode.outcome:
-                        if episode.was_profitable():
-                            self._profitable_ids.append(episode.episode_id)
-                        else:
-                            self._unprofitable_ids.append(episode.episode_id)
+                if episode.outcome:
+                    if episode.was_profitable():
+                        self._profitable_ids.append(episode.episode_id)
+                    else:
+                        self._unprofitable_ids.append(episode.episode_id)
 
-                    count += 1
+                self._index_episode(episode)
+                count += 1
 
             except Exception as e:
-                logger.warning(f"Failed to load episode from {filepath}: {e}")
+                logger.warning(f"Failed to load episode {episode_id}: {e}")
 
         if count > 0:
-            logger.info(f"📂 Loaded {count} episodes from disk")
+            logger.info(f"📂 Loaded {count} of {len(self._store)} episodes from disk")
+
+    def _migrate_json_files(self):
+        """Move legacy one-file-per-episode JSON into the segment log."""
+        migrated = 0
+        for filepath in self.storage_path.glob("*.json"):
+            try:
+                with open(filepath) as f:
+                    data = json.load(f)
+                episode = Episode.from_dict(data)
+                self._store.put(
+                    episode.episode_id,
+                    data,
+                    symbol=episode.symbol,
+                    ts=episode.timestamp.timestamp(),
+                )
+                filepath.unlink()
+                migrated += 1
+            except Exception as e:
+                logger.warning(f"Failed to migrate episode file {filepath}: {e}")
+
+        if migrated > 0:
+            logger.info(f"📦 Migrated {migrated} episode files into the segment log")
 
 
 # Global memory instance
@@ -0,0 +1,260 @@
+"""
+Episodic Trading Memory - Vector Index
+
+Local embeddings and an approximate-nearest-neighbour index for episode
+recall. Nothing here touches the network.
+
+- ``HashingEmbedder`` maps text to a fixed-size, L2-normalised vector by
+  feature-hashing word unigrams and bigrams with sublinear term weights.
+  Any callable ``str -> vector`` (e.g. a locally cached MiniLM model) can be
+  used instead.
+- ``VectorIndex`` keeps vectors in one contiguous float32 matrix and buckets
+  them with random-hyperplane LSH tables. A query scores only the union of
+  its buckets, so its cost tracks bucket size rather than index size. Small
+  or heavily filtered candidate sets are scored exactly. Inserts and deletes
+  are incremental, and top-k uses ``argpartition`` rather than a full sort.
+"""
+
+import re
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+Embedder = Callable[[str], np.ndarray]
+
+_TOKEN_RE = re.compile(r"[a-z0-9_.%$+-]+")
+
+
+class HashingEmbedder:
+    """Signed feature hashing of unigrams and bigrams into ``dim`` buckets."""
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def __call__(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = _TOKEN_RE.findall(text.lower()) if text else []
+        if not tokens:
+            return vector
+
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        counts: Dict[str, int] = {}
+        for feature in features:
+            counts[feature] = counts.get(feature, 0) + 1
+
+        for feature, count in counts.items():
+            # crc32 is stable across processes, unlike hash()
+            h = zlib.crc32(feature.encode())
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign * (1.0 + np.log(count))
+
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index with LSH candidate generation and metadata filters.
+
+    Metadata is a flat dict of hashable values per item; ``search(filters=...)``
+    keeps only items whose metadata matches every given key.
+    """
+
+    def __init__(
+        self,
+        dim: int = 256,
+        n_tables: int = 8,
+        n_bits: int = 12,
+        exact_threshold: int = 4096,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            dim: Vector dimensionality
+            n_tables: Number of LSH hash tables (more tables -> better recall)
+            n_bits: Hyperplanes per table (more bits -> smaller buckets)
+            exact_threshold: Candidate sets at or below this size are scored exactly
+            seed: Seed for the random hyperplanes
+        """
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.exact_threshold = exact_threshold
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._powers = (1 << np.arange(n_bits, dtype=np.int64))
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._keys = np.zeros((0, n_tables), dtype=np.int64)
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in range(n_tables)]
+        self._postings: Dict[Tuple[str, Any], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._slots
+
+    # ----- mutation -----
+
+    def add(
+        self, item_id: str, vector: np.ndarray, metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Insert or replace one item."""
+        if item_id in self._slots:
+            self.remove(item_id)
+
+        vector = self._normalise(vector)
+        slot = self._free.pop() if self._free else self._grow()
+        keys = self._hash(vector[None, :])[0]
+
+        self._vectors[slot] = vector
+        self._keys[slot] = keys
+        self._ids[slot] = item_id
+        self._metadata[slot] = dict(metadata or {})
+        self._slots[item_id] = slot
+
+        for table, key in zip(self._tables, keys.tolist()):
+            table.setdefault(key, set()).add(slot)
+        for posting in self._metadata[slot].items():
+            self._postings.setdefault(posting, set()).add(slot)
+
+    def remove(self, item_id: str) -> bool:
+        """Delete one item; its slot is reused by a later insert."""
+        slot = self._slots.pop(item_id, None)
+        if slot is None:
+            return False
+
+        for table, key in zip(self._tables, self._keys[slot].tolist()):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del table[key]
+        self._unpost(slot)
+
+        self._vectors[slot] = 0.0
+        self._ids[slot] = None
+        self._metadata[slot] = None
+        self._free.append(slot)
+        return True
+
+    def update_metadata(self, item_id: str, **changes: Any) -> bool:
+        """Change filterable metadata in place without re-hashing the vector."""
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return False
+        self._unpost(slot)
+        self._metadata[slot].update(changes)
+        for posting in self._metadata[slot].items():
+            self._postings.setdefault(posting, set()).add(slot)
+        return True
+
+    # ----- queries -----
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-``k`` ``(item_id, cosine)`` pairs, best first."""
+        if k <= 0 or not self._slots:
+            return []
+
+        vector = self._normalise(vector)
+        allowed = self._filtered_slots(filters)
+        if allowed is not None and not allowed:
+            return []
+
+        pool_size = len(allowed) if allowed is not None else len(self._slots)
+        if pool_size <= self.exact_threshold:
+            candidates = allowed if allowed is not None else self._slots.values()
+        else:
+            candidates = self._lsh_candidates(vector)
+            if allowed is not None:
+                candidates &= allowed
+            if len(candidates) < k:
+                # Too few bucket hits to fill the answer: fall back to an exact scan
+                candidates = allowed if allowed is not None else self._slots.values()
+
+        return self._top_k(vector, np.fromiter(candidates, dtype=np.int64), k)
+
+    def get_metadata(self, item_id: str) -> Optional[Dict[str, Any]]:
+        slot = self._slots.get(item_id)
+        return dict(self._metadata[slot]) if slot is not None else None
+
+    def ids(self) -> Iterable[str]:
+        return self._slots.keys()
+
+    # ----- internals -----
+
+    def _normalise(self, vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Expected vector of dim {self.dim}, got {vector.shape[0]}")
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        bits = (vectors @ self._planes.T) > 0
+        bits = bits.reshape(len(vectors), self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ self._powers
+
+    def _grow(self) -> int:
+        slot = len(self._ids)
+        if slot == len(self._vectors):
+            capacity = max(64, 2 * slot)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:slot] = self._vectors
+            keys = np.zeros((capacity, self.n_tables), dtype=np.int64)
+            keys[:slot] = self._keys
+            self._vectors, self._keys = vectors, keys
+        self._ids.append(None)
+        self._metadata.append(None)
+        return slot
+
+    def _unpost(self, slot: int) -> None:
+        for posting in self._metadata[slot].items():
+            slots = self._postings.get(posting)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._postings[posting]
+
+    def _filtered_slots(self, filters: Optional[Dict[str, Any]]) -> Optional[Set[int]]:
+        if not filters:
+            return None
+        postings = sorted(
+            (self._postings.get(item, set()) for item in filters.items()), key=len
+        )
+        allowed = set(postings[0])
+        for slots in postings[1:]:
+            allowed &= slots
+        return allowed
+
+    def _lsh_candidates(self, vector: np.ndarray) -> Set[int]:
+        candidates: Set[int] = set()
+        for table, key in zip(self._tables, self._hash(vector[None, :])[0].tolist()):
+            bucket = table.get(key)
+            if bucket:
+                candidates |= bucket
+        return candidates
+
+    def _top_k(self, vector: np.ndarray, slots: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if len(slots) == 0:
+            return []
+        scores = self._vectors[slots] @ vector
+        if len(slots) > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+        else:
+            part = np.arange(len(slots))
+        order = part[np.argsort(-scores[part], kind="stable")]
+        return [(self._ids[slots[i]], float(scores[i])) for i in order]
@@ -13,7 +13,13 @@ ASTER_API_LATENCY = Histogram(
     "aster_api_latency_seconds",
     "Latency of requests to the Aster API",
     ["endpoint", "method"],
-    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+
+ASTER_API_RATE_LIMIT_USAGE = Gauge(
+    "aster_api_rate_limit_usage",
+    "Request weight / order count used in the current window, from X-MBX-* response headers",
+    ["header"],
 )
 
 # Trading decision metrics
@@ -347,3 +353,31 @@ AGENT_CONFLICT_SCORE = Histogram(
     "Disagreement score between agents",
     buckets=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
 )
+
+# Scan pipeline metrics
+SCAN_PHASE_LATENCY = Histogram(
+    "scan_phase_latency_seconds",
+    "Latency of each scan pipeline phase (gather, vote, execute) and the whole cycle",
+    ["phase"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+)
+
+# Event bus dispatch metrics
+EVENT_BUS_DELIVERY_LATENCY = Histogram(
+    "event_bus_delivery_latency_seconds",
+    "Time from publish to subscriber callback completion",
+    ["subscriber"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+
+EVENT_BUS_BACKLOG = Gauge(
+    "event_bus_backlog",
+    "Events queued for a subscriber and not yet delivered",
+    ["subscriber"],
+)
+
+EVENT_BUS_DROPPED = Counter(
+    "event_bus_dropped_total",
+    "Events dropped or coalesced away because a subscriber queue was full",
+    ["subscriber", "reason"],
+)
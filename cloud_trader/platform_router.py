@@ -81,6 +81,7 @@ class PlatformRouter:
     def __init__(self, service):
         self.service = service
         self.history: List[ExecutionResult] = []
+        self.jitter_range = (0.1, 1.5)  # seconds; replay sets (0, 0)
         self.stats = {
             p.value: {"trades": 0, "wins": 0, "errors": 0, "avg_latency": 0.0} for p in PlatformType
         }
@@ -195,9 +196,10 @@ class PlatformRouter:
         # 1. Jitter: Add random delay to avoid HFT detection
         import random
 
-        jitter = random.uniform(0.1, 1.5)
-        logger.debug(f"🎲 [ROUTER] Applying {jitter:.2f}s jitter for {agent.name}")
-        await asyncio.sleep(jitter)
+        jitter = random.uniform(*self.jitter_range)
+        if jitter > 0:
+            logger.debug(f"🎲 [ROUTER] Applying {jitter:.2f}s jitter for {agent.name}")
+            await asyncio.sleep(jitter)
 
         # 2. Fuzzing: Slightly adjust quantity to avoid round-number patterns
         quantity_fuzz = random.uniform(0.98, 1.02)  # +/- 2%
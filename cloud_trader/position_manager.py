@@ -4,6 +4,7 @@ import time
 from decimal import ROUND_DOWN, Decimal
 from typing import Any, Dict, List, Optional, Tuple
 
+from .data.ticker_snapshot import TickerSnapshot, TickerSnapshotEngine
 from .definitions import SYMBOL_CONFIG, MinimalAgentState
 from .exchange import OrderType
 
@@ -17,12 +18,24 @@ class PositionManager:
     """
 
     def __init__(self, exchange_client, agent_states: Dict[str, MinimalAgentState]):
+        # One whole-market ticker request per refresh, shared by every consumer
+        self.ticker_snapshots = TickerSnapshotEngine(symbols=SYMBOL_CONFIG.keys())
         self.exchange_client = exchange_client
         self.agent_states = agent_states
         self.open_positions: Dict[str, Dict[str, Any]] = {}
         self._tpsl_placed: set = set()  # Track which symbols have TP/SL already placed
         self._symbol_precision_cache: Dict[str, int] = {}  # Cache price precision
 
+    @property
+    def exchange_client(self):
+        return self._exchange_client
+
+    @exchange_client.setter
+    def exchange_client(self, client):
+        # The live client is attached after construction; keep the snapshot engine on it
+        self._exchange_client = client
+        self.ticker_snapshots.client = client
+
     async def _round_price(self, symbol: str, price: float) -> str:
         """Round price to tickSize and return formatted string."""
         try:
@@ -166,26 +179,10 @@ class PositionManager:
         except Exception as e:
             print(f"⚠️ Failed to sync open positions from exchange: {e}")
 
-    async def monitor_positions(self) -> Dict[str, Any]:
-        """Monitor open positions for TP/SL hits and return current ticker map."""
-        ticker_map = {}
-        try:
-            # Always fetch all tickers in SYMBOL_CONFIG to support both monitoring AND new trade analysis
-            # This acts as a cache for this tick
-            symbols_to_fetch = list(SYMBOL_CONFIG.keys())
-            tasks = [self.exchange_client.get_ticker(sym) for sym in symbols_to_fetch]
-            tickers = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for sym, res in zip(symbols_to_fetch, tickers):
-                if isinstance(res, dict):
-                    ticker_map[sym] = res
-                else:
-                    # print(f"⚠️ Failed to fetch ticker for {sym}: {res}")
-                    pass
-
-        except Exception as e:
-            print(f"⚠️ Error fetching batched tickers: {e}")
-            return {}
+    async def monitor_positions(self) -> TickerSnapshot:
+        """Monitor open positions for TP/SL hits and return the current ticker snapshot."""
+        # Whole-market snapshot: supports both monitoring AND new trade analysis this tick
+        ticker_map = await self.ticker_snapshots.get()
 
         if not self.open_positions:
             return ticker_map
@@ -1,7 +1,13 @@
 import asyncio
+import heapq
+import itertools
+import logging
 import time
-from collections import defaultdict
-from typing import Any, Dict
+from collections import defaultdict, deque
+from enum import IntEnum
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 class RateLimitManager:
@@ -20,18 +26,27 @@ class RateLimitManager:
             self.default_rps = default_rps  # Default requests per second
             self.default_rpm = default_rpm  # Default requests per minute
 
-        self._request_timestamps: Dict[str, list[float]] = defaultdict(list)
+        self._request_timestamps: Dict[str, Deque[float]] = defaultdict(deque)
         self._rate_limits: Dict[str, Dict[str, Any]] = defaultdict(
             lambda: {"rps": self.default_rps, "rpm": self.default_rpm, "last_reset": time.time()}
         )
         self._throttled_agents: Dict[str, float] = {}  # agent_id: throttle_until_timestamp
 
     def _clean_old_timestamps(self, agent_id: str):
-        """Removes timestamps older than 60 seconds to keep the list relevant for RPM."""
-        now = time.time()
-        self._request_timestamps[agent_id] = [
-            ts for ts in self._request_timestamps[agent_id] if now - ts <= 60
-        ]
+        """Drops timestamps older than 60 seconds, oldest first, to keep the RPM window current."""
+        cutoff = time.time() - 60
+        timestamps = self._request_timestamps[agent_id]
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
+
+    @staticmethod
+    def _count_since(timestamps: Deque[float], since: float) -> int:
+        count = 0
+        for ts in reversed(timestamps):
+            if ts < since:
+                break
+            count += 1
+        return count
 
     def record_request(self, agent_id: str, endpoint: str = "default"):
         """Records an API request for a given agent."""
@@ -60,7 +75,7 @@ class RateLimitManager:
         now = time.time()
 
         agent_limits = self._rate_limits[agent_id]
-        current_rps = sum(1 for ts in self._request_timestamps[agent_id] if now - ts <= 1)
+        current_rps = self._count_since(self._request_timestamps[agent_id], now - 1)
         current_rpm = len(self._request_timestamps[agent_id])
 
         if current_rps > agent_limits["rps"]:
@@ -95,7 +110,7 @@ class RateLimitManager:
         now = time.time()
 
         agent_limits = self._rate_limits[agent_id]
-        current_rps = sum(1 for ts in self._request_timestamps[agent_id] if now - ts <= 1)
+        current_rps = self._count_since(self._request_timestamps[agent_id], now - 1)
         current_rpm = len(self._request_timestamps[agent_id])
 
         return {
@@ -125,3 +140,214 @@ class RateLimitManager:
             if time.time() - start_time > timeout:
                 raise TimeoutError(f"Timeout waiting for rate limit capacity for agent {agent_id}")
             await asyncio.sleep(0.1)  # Wait a short period before re-checking
+
+
+class Priority(IntEnum):
+    """Request lanes; lower values are served first when capacity is short."""
+
+    ORDER = 0  # place / cancel / amend
+    ACCOUNT = 1  # balances, positions, open orders
+    MARKET_DATA = 2  # tickers, depth, klines, reference prices
+
+
+class TokenBucket:
+    """Continuously refilling bucket of ``capacity`` tokens per ``period`` seconds."""
+
+    def __init__(self, capacity: float, period: float) -> None:
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens
+
+    def delay_for(self, tokens: float, now: float, floor: float = 0.0) -> float:
+        """Seconds until ``tokens`` can be taken while leaving ``floor`` in the bucket."""
+        missing = tokens + floor - self.available(now)
+        return max(0.0, missing / self.rate)
+
+    def take(self, tokens: float) -> None:
+        self.tokens -= tokens
+
+    def sync_used(self, used: float, now: float) -> None:
+        """Trust the server's view of usage when it is stricter than ours."""
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class VenueRateLimiter:
+    """Token buckets for one venue, shared by every client that talks to it.
+
+    Each request acquires a cost per bucket (e.g. ``{"weight": 5, "orders": 1}``).
+    Waiters are served strictly by priority lane then arrival, so a queued
+    order placement jumps ahead of market-data polling, and non-order lanes may
+    not dip into the ``order_reserve`` fraction of any bucket.
+    """
+
+    def __init__(
+        self,
+        venue: str,
+        buckets: Mapping[str, Tuple[float, float]],
+        order_reserve: float = 0.1,
+        header_buckets: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.venue = venue
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(capacity, period) for name, (capacity, period) in buckets.items()
+        }
+        self.order_reserve = order_reserve
+        # lower-cased response header -> bucket it reports usage for
+        self.header_buckets = dict(header_buckets or {})
+        self._waiters: List[Tuple[int, int, Dict[str, float], asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._blocked_until = 0.0
+        self.stats: Dict[str, float] = {
+            "acquired": 0,
+            "waited": 0,
+            "wait_seconds": 0.0,
+            "penalties": 0,
+        }
+
+    def _delay(self, cost: Mapping[str, float], priority: int, now: float) -> float:
+        delay = max(0.0, self._blocked_until - now)
+        for name, tokens in cost.items():
+            bucket = self.buckets.get(name)
+            if bucket is None:
+                continue
+            floor = bucket.capacity * self.order_reserve if priority > Priority.ORDER else 0.0
+            delay = max(delay, bucket.delay_for(tokens, now, floor))
+        return delay
+
+    def _take(self, cost: Mapping[str, float]) -> None:
+        for name, tokens in cost.items():
+            bucket = self.buckets.get(name)
+            if bucket is not None:
+                bucket.take(tokens)
+        self.stats["acquired"] += 1
+
+    async def acquire(
+        self,
+        cost: Mapping[str, float],
+        priority: int = Priority.MARKET_DATA,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Wait until ``cost`` fits in every bucket, then consume it."""
+        head_priority = self._waiters[0][0] if self._waiters else None
+        if (head_priority is None or priority < head_priority) and self._delay(
+            cost, priority, time.monotonic()
+        ) == 0.0:
+            self._take(cost)
+            return
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), dict(cost), future))
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        started = time.monotonic()
+        self.stats["waited"] += 1
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timed out waiting for {self.venue} rate limit capacity")
+        finally:
+            self.stats["wait_seconds"] += time.monotonic() - started
+
+    async def _dispatch(self) -> None:
+        assert self._wakeup is not None
+        while self._waiters:
+            priority, _, cost, future = self._waiters[0]
+            if future.done():  # cancelled or timed out
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._delay(cost, priority, time.monotonic())
+            if delay == 0.0:
+                heapq.heappop(self._waiters)
+                self._take(cost)
+                future.set_result(None)
+                continue
+            # Sleep until the head fits, or until a higher-priority waiter arrives
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def sync_from_headers(self, headers: Mapping[str, Any]) -> None:
+        """Apply server-reported usage (e.g. ``X-MBX-USED-WEIGHT-1M``) to the buckets."""
+        now = time.monotonic()
+        for header, value in headers.items():
+            name = self.header_buckets.get(header.lower())
+            if name is None or name not in self.buckets:
+                continue
+            try:
+                self.buckets[name].sync_used(float(value), now)
+            except (TypeError, ValueError):
+                continue
+
+    def penalize(self, retry_after: float) -> None:
+        """Server said 429/418: stop every lane for ``retry_after`` seconds."""
+        self.stats["penalties"] += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        for bucket in self.buckets.values():
+            bucket.tokens = min(bucket.tokens, 0.0)
+        logger.warning(
+            "%s rate limited by server; pausing requests for %.1fs", self.venue, retry_after
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "venue": self.venue,
+            "queued": sum(1 for *_, f in self._waiters if not f.done()),
+            "blocked_for": max(0.0, self._blocked_until - now),
+            "buckets": {
+                name: {"available": bucket.available(now), "capacity": bucket.capacity}
+                for name, bucket in self.buckets.items()
+            },
+            **self.stats,
+        }
+
+
+# Published venue limits: bucket -> (capacity, period seconds)
+VENUE_LIMITS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "aster": {"weight": (2400, 60), "orders": (1200, 60), "orders_10s": (300, 10)},
+    "aster_spot": {"weight": (6000, 60), "orders": (1200, 60), "orders_10s": (100, 10)},
+    "hyperliquid": {"weight": (1200, 60)},
+    "coingecko": {"requests": (30, 60)},
+}
+
+VENUE_HEADERS: Dict[str, Dict[str, str]] = {
+    "aster": {
+        "x-mbx-used-weight-1m": "weight",
+        "x-mbx-order-count-1m": "orders",
+        "x-mbx-order-count-10s": "orders_10s",
+    },
+}
+VENUE_HEADERS["aster_spot"] = VENUE_HEADERS["aster"]
+
+_venue_limiters: Dict[str, VenueRateLimiter] = {}
+
+
+def get_venue_limiter(venue: str) -> VenueRateLimiter:
+    """Process-wide limiter for ``venue`` so all clients share its budget."""
+    limiter = _venue_limiters.get(venue)
+    if limiter is None:
+        limiter = _venue_limiters[venue] = VenueRateLimiter(
+            venue,
+            VENUE_LIMITS.get(venue, {"requests": (600, 60)}),
+            header_buckets=VENUE_HEADERS.get(venue),
+        )
+    return limiter
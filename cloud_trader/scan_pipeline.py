@@ -0,0 +1,191 @@
+"""Concurrent, deadline-bounded symbol scan pipeline.
+
+Symbols are fanned out to a bounded pool of gather tasks (agent analysis). As
+each symbol finishes gathering it is streamed straight into the vote/execute
+phase, so the first actionable consensus does not wait for the slowest symbol.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from .metrics import SCAN_PHASE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+G = TypeVar("G")
+V = TypeVar("V")
+
+GatherFn = Callable[[str], Awaitable[G]]
+VoteFn = Callable[[str, G], Awaitable[Optional[V]]]
+ExecuteFn = Callable[[str, V], Awaitable[Any]]
+
+
+@dataclass
+class ScanCycleStats:
+    """Timing and throughput summary for a single scan cycle."""
+
+    symbols_requested: int = 0
+    symbols_gathered: int = 0
+    symbols_voted: int = 0
+    symbols_executed: int = 0
+    symbols_failed: int = 0
+    symbols_timed_out: int = 0
+    deadline_hit: bool = False
+    started_at: float = field(default_factory=time.time)
+    total_ms: float = 0.0
+    phase_ms: Dict[str, List[float]] = field(
+        default_factory=lambda: {"gather": [], "vote": [], "execute": []}
+    )
+
+    def record(self, phase: str, elapsed_ms: float) -> None:
+        self.phase_ms[phase].append(elapsed_ms)
+        SCAN_PHASE_LATENCY.labels(phase=phase).observe(elapsed_ms / 1000.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        phases: Dict[str, Dict[str, float]] = {}
+        for phase, samples in self.phase_ms.items():
+            if samples:
+                ordered = sorted(samples)
+                phases[phase] = {
+                    "count": len(ordered),
+                    "avg_ms": sum(ordered) / len(ordered),
+                    "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    "max_ms": ordered[-1],
+                }
+            else:
+                phases[phase] = {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "symbols_requested": self.symbols_requested,
+            "symbols_gathered": self.symbols_gathered,
+            "symbols_voted": self.symbols_voted,
+            "symbols_executed": self.symbols_executed,
+            "symbols_failed": self.symbols_failed,
+            "symbols_timed_out": self.symbols_timed_out,
+            "deadline_hit": self.deadline_hit,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "phases": phases,
+        }
+
+
+class ScanPipeline(Generic[G, V]):
+    """Fan symbols out under a concurrency limit and stream results to consensus.
+
+    ``gather`` runs concurrently (at most ``max_concurrency`` symbols at a time).
+    ``vote`` and ``execute`` run sequentially in completion order so that
+    position-limit and exposure checks always see the latest state.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        cycle_deadline_seconds: float = 45.0,
+        history_size: int = 50,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.cycle_deadline_seconds = float(cycle_deadline_seconds)
+        self.history: Deque[ScanCycleStats] = deque(maxlen=history_size)
+
+    @property
+    def last_stats(self) -> Optional[ScanCycleStats]:
+        return self.history[-1] if self.history else None
+
+    async def run(
+        self,
+        symbols: Sequence[str],
+        gather: GatherFn,
+        vote: VoteFn,
+        execute: ExecuteFn,
+    ) -> ScanCycleStats:
+        """Run one scan cycle and return its stats."""
+        stats = ScanCycleStats(symbols_requested=len(symbols))
+        cycle_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _gather_one(symbol: str) -> Tuple[str, G, float]:
+            async with semaphore:
+                t0 = time.perf_counter()
+                result = await gather(symbol)
+                return symbol, result, (time.perf_counter() - t0) * 1000.0
+
+        pending = {asyncio.create_task(_gather_one(symbol)) for symbol in symbols}
+        loop = asyncio.get_running_loop()
+        deadline = None
+        if self.cycle_deadline_seconds > 0:
+            deadline = loop.time() + self.cycle_deadline_seconds
+
+        try:
+            while pending:
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        stats.deadline_hit = True
+                        break
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None:
+                        stats.symbols_failed += 1
+                        logger.warning("Scan gather failed: %s", exc)
+                        continue
+                    symbol, gathered, gather_ms = task.result()
+                    stats.symbols_gathered += 1
+                    stats.record("gather", gather_ms)
+                    await self._vote_and_execute(symbol, gathered, vote, execute, stats)
+        finally:
+            if pending:
+                stats.symbols_timed_out = len(pending)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        stats.total_ms = (time.perf_counter() - cycle_start) * 1000.0
+        SCAN_PHASE_LATENCY.labels(phase="cycle").observe(stats.total_ms / 1000.0)
+        self.history.append(stats)
+        return stats
+
+    async def _vote_and_execute(
+        self,
+        symbol: str,
+        gathered: G,
+        vote: VoteFn,
+        execute: ExecuteFn,
+        stats: ScanCycleStats,
+    ) -> None:
+        try:
+            t0 = time.perf_counter()
+            decision = await vote(symbol, gathered)
+            stats.record("vote", (time.perf_counter() - t0) * 1000.0)
+            stats.symbols_voted += 1
+            if decision is None:
+                return
+
+            t0 = time.perf_counter()
+            await execute(symbol, decision)
+            stats.record("execute", (time.perf_counter() - t0) * 1000.0)
+            stats.symbols_executed += 1
+        except Exception as exc:
+            stats.symbols_failed += 1
+            logger.warning("Scan vote/execute failed for %s: %s", symbol, exc)
@@ -19,9 +19,11 @@ try:
         Integer,
         String,
         UniqueConstraint,
+        insert,
         text,
     )
     from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
     from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -64,6 +66,8 @@ except ImportError:
     Integer = DummyType
     String = DummyType
     UniqueConstraint = DummyType
+    insert = DummyType
+    pg_insert = DummyType
     text = DummyType
     JSONB = DummyType
 
@@ -431,6 +435,79 @@ class TradingStorage:
             logger.error(f"Failed to insert position: {e}")
             return None
 
+    async def insert_batch(
+        self,
+        trades: Optional[List[Dict[str, Any]]] = None,
+        positions: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Insert many trade and position rows in one transaction (multi-row INSERTs).
+
+        Rows take the keyword arguments of ``insert_trade`` / ``insert_position``.
+        Trades whose ``order_id`` already exists are skipped, so replaying a batch
+        after a crash is safe.
+        """
+        if not self._initialized or not self._session_factory:
+            return False
+        if not trades and not positions:
+            return True
+
+        try:
+            async with self._session_factory() as session:
+                if trades:
+                    await session.execute(
+                        pg_insert(Trade).on_conflict_do_nothing(index_elements=["order_id"]),
+                        [self._trade_values(row) for row in trades],
+                    )
+                if positions:
+                    await session.execute(
+                        insert(Position), [self._position_values(row) for row in positions]
+                    )
+                await session.commit()
+                return True
+        except Exception as e:
+            logger.error(
+                f"Failed to insert batch ({len(trades or [])} trades, "
+                f"{len(positions or [])} positions): {e}"
+            )
+            return False
+
+    @staticmethod
+    def _trade_values(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "timestamp": row["timestamp"],
+            "symbol": row["symbol"].upper(),
+            "side": row["side"].upper(),
+            "price": row["price"],
+            "quantity": row["quantity"],
+            "notional": row["notional"],
+            "agent_id": row.get("agent_id"),
+            "agent_model": row.get("agent_model"),
+            "strategy": row.get("strategy"),
+            "order_id": row.get("order_id"),
+            "execution_id": row.get("execution_id"),
+            "fee": row.get("fee"),
+            "slippage_bps": row.get("slippage_bps"),
+            "extra_metadata": row.get("metadata"),
+        }
+
+    @staticmethod
+    def _position_values(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "timestamp": row["timestamp"],
+            "symbol": row["symbol"].upper(),
+            "agent_id": row.get("agent_id"),
+            "side": row["side"].upper(),
+            "size": row["size"],
+            "entry_price": row["entry_price"],
+            "current_price": row["current_price"],
+            "notional": row["notional"],
+            "unrealized_pnl": row["unrealized_pnl"],
+            "unrealized_pnl_pct": row["unrealized_pnl_pct"],
+            "leverage": row.get("leverage"),
+            "status": row.get("status", "open"),
+            "extra_metadata": row.get("metadata"),
+        }
+
     async def insert_market_snapshot(
         self,
         timestamp: datetime,
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 try:
     import pandas as pd
@@ -15,6 +17,143 @@ except ImportError:  # pragma: no cover - handled gracefully at runtime
 
 logger = logging.getLogger(__name__)
 
+_EPSILON = float(np.finfo(np.float64).eps)
+
+
+# ===== BATCH KERNEL HELPERS =====
+# All helpers operate on 2-D float arrays shaped (symbols, bars) and reproduce
+# the pandas-ta formulas row-wise so batch and per-symbol results agree.
+
+
+def _as_matrix(values: Any) -> np.ndarray:
+    matrix = np.asarray(values, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError("batch inputs must be 2-D arrays shaped (symbols, bars)")
+    return matrix
+
+
+def _shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    shifted = np.full_like(x, np.nan)
+    shifted[:, periods:] = x[:, :-periods]
+    return shifted
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Row-wise ``Series.ewm(alpha=alpha, adjust=False).mean()``.
+
+    Recurses over the bar axis with one vector op per bar for all symbols.
+    Leading NaNs delay seeding; interior NaNs are re-weighted the way pandas
+    does, so gaps behave identically.
+    """
+    xt = np.ascontiguousarray(x.T)
+    out = np.empty_like(xt)
+    valid = ~np.isnan(xt)
+    started = valid.any(axis=1)
+    if not started.any():
+        out.fill(np.nan)
+        return out.T
+
+    start = int(np.argmax(started))
+    out[:start] = np.nan
+    decay = 1.0 - alpha
+
+    if valid[start:].all():
+        weighted = xt[start].copy()
+        out[start] = weighted
+        for t in range(start + 1, len(xt)):
+            weighted = decay * weighted + alpha * xt[t]
+            out[t] = weighted
+        return out.T
+
+    weighted = xt[start].copy()
+    old_wt = np.ones(xt.shape[1])
+    out[start] = weighted
+    for t in range(start + 1, len(xt)):
+        cur = xt[t]
+        observed = valid[t]
+        seeded = ~np.isnan(weighted)
+        old_wt = np.where(seeded, old_wt * decay, old_wt)
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        update = seeded & observed
+        weighted = np.where(update, blended, np.where(observed, cur, weighted))
+        old_wt = np.where(update, 1.0, old_wt)
+        out[t] = weighted
+    return out.T
+
+
+def _rma(x: np.ndarray, length: int) -> np.ndarray:
+    return _ewm(x, 1.0 / length)
+
+
+def _ema(x: np.ndarray, length: int, first_valid: int = 0) -> np.ndarray:
+    """pandas-ta EMA with an SMA seed (``presma=True``) starting at ``first_valid``."""
+    seeded = np.full_like(x, np.nan)
+    seed_at = first_valid + length - 1
+    if seed_at >= x.shape[1]:
+        return seeded
+    seeded[:, seed_at] = x[:, first_valid : seed_at + 1].mean(axis=1)
+    seeded[:, seed_at + 1 :] = x[:, seed_at + 1 :]
+    return _ewm(seeded, 2.0 / (length + 1))
+
+
+def _non_zero(diff: np.ndarray) -> np.ndarray:
+    """Add epsilon to every row that contains a zero range (pandas-ta ``non_zero_range``)."""
+    has_zero = (diff == 0).any(axis=-1, keepdims=True)
+    return np.where(has_zero, diff + _EPSILON, diff)
+
+
+def _atr(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int, prenan: bool = False
+) -> np.ndarray:
+    prev_close = _shift(close)
+    true_range = np.fmax(
+        np.fmax(np.abs(_non_zero(high - low)), np.abs(high - prev_close)),
+        np.abs(prev_close - low),
+    )
+    if prenan:
+        true_range[:, 0] = np.nan
+    seed = np.nanmean(true_range[:, :length], axis=1)
+    true_range[:, : length - 1] = np.nan
+    true_range[:, length - 1] = seed
+    return _rma(true_range, length)
+
+
+def _rsi(close: np.ndarray, length: int) -> np.ndarray:
+    diff = close - _shift(close)
+    positive = np.where(diff < 0, 0.0, diff)
+    negative = np.where(diff > 0, 0.0, diff)
+    positive_avg = _rma(positive, length)
+    negative_avg = _rma(negative, length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 * positive_avg / (positive_avg + np.abs(negative_avg))
+
+
+_BATCH_KEYS = (
+    "rsi",
+    "stoch_rsi_k",
+    "stoch_rsi_d",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "atr",
+    "bb_upper",
+    "bb_middle",
+    "bb_lower",
+    "bb_bandwidth",
+    "bb_percent_b",
+    "adx",
+    "plus_di",
+    "minus_di",
+    "vwap",
+    "obv",
+    "obv_change",
+    "ema_20",
+    "ema_50",
+    "sma_200",
+)
+
 
 class TAIndicators:
     """Technical analysis indicators for market data."""
@@ -81,10 +220,11 @@ class TAIndicators:
 
             latest = macd_df.iloc[-1]
 
+            # Column order: MACD, MACDh (histogram), MACDs (signal)
             try:
                 macd_val = float(latest.iloc[0])
-                signal_val = float(latest.iloc[1])
-                histogram_val = float(latest.iloc[2])
+                histogram_val = float(latest.iloc[1])
+                signal_val = float(latest.iloc[2])
             except (ValueError, TypeError, IndexError) as exc:  # pragma: no cover
                 logger.error(f"Unexpected MACD structure: {exc}")
                 return None
@@ -269,7 +409,8 @@ class TAIndicators:
             if k_val is None:
                 return None
 
-            return {"k": k_val * 100, "d": d_val * 100 if d_val else None}
+            # pandas-ta already scales %K/%D to 0-100
+            return {"k": k_val, "d": d_val}
         except Exception as exc:
             logger.error(f"Error calculating Stochastic RSI: {exc}")
             return None
@@ -306,10 +447,15 @@ class TAIndicators:
             if adx_df is None or adx_df.empty:
                 return None
 
+            # Column order: ADX, ADXR, DMP (+DI), DMN (-DI)
             latest = adx_df.iloc[-1]
             adx_val = float(latest.iloc[0]) if pd.notna(latest.iloc[0]) else None
-            plus_di = float(latest.iloc[1]) if len(latest) > 1 and pd.notna(latest.iloc[1]) else None
-            minus_di = float(latest.iloc[2]) if len(latest) > 2 and pd.notna(latest.iloc[2]) else None
+            plus_di = (
+                float(latest.iloc[2]) if len(latest) > 2 and pd.notna(latest.iloc[2]) else None
+            )
+            minus_di = (
+                float(latest.iloc[3]) if len(latest) > 3 and pd.notna(latest.iloc[3]) else None
+            )
 
             if adx_val is None:
                 return None
@@ -335,7 +481,9 @@ class TAIndicators:
             volume: List of volume
 
         Returns:
-            VWAP value
+            VWAP value anchored at the first bar supplied. pandas-ta anchors on a
+            DatetimeIndex, which plain price lists do not carry, so the typical
+            price (HLC/3) is volume-weighted over the whole window instead.
         """
         if not ta or not pd or len(close) < 2:
             return None
@@ -345,17 +493,12 @@ class TAIndicators:
                 {"high": high, "low": low, "close": close, "volume": volume},
                 dtype="float64",
             )
-            vwap_series = ta.vwap(
-                high=df["high"],
-                low=df["low"],
-                close=df["close"],
-                volume=df["volume"],
-            )
-
-            if vwap_series is None or vwap_series.empty:
+            total_volume = df["volume"].sum()
+            if not total_volume:
                 return None
 
-            value = vwap_series.iloc[-1]
+            typical_price = (df["high"] + df["low"] + df["close"]) / 3.0
+            value = (typical_price * df["volume"]).sum() / total_volume
             return float(value) if pd.notna(value) else None
         except Exception as exc:
             logger.error(f"Error calculating VWAP: {exc}")
@@ -484,9 +627,15 @@ class TAIndicators:
             "sma_200": TAIndicators.calculate_sma(close, 200),
         }
 
+        current_price = close[-1] if len(close) else 0
+        result.update(TAIndicators._summarize_signals(result, current_price))
+        return result
+
+    @staticmethod
+    def _summarize_signals(result: Dict[str, Any], current_price: float) -> Dict[str, Any]:
+        """Aggregate per-indicator readings into a signal strength and bias."""
         # Calculate aggregate signal strength (-1 to +1)
         signals = []
-        current_price = close[-1] if close else 0
 
         # RSI signal
         if result["rsi"]:
@@ -535,12 +684,233 @@ class TAIndicators:
                 signals.append(-0.2)
 
         # Aggregate
-        result["signal_strength"] = sum(signals) / len(signals) if signals else 0
-        result["signal_count"] = len(signals)
-        result["bias"] = "bullish" if result["signal_strength"] > 0.1 else "bearish" if result["signal_strength"] < -0.1 else "neutral"
+        signal_strength = sum(signals) / len(signals) if signals else 0
+        return {
+            "signal_strength": signal_strength,
+            "signal_count": len(signals),
+            "bias": (
+                "bullish"
+                if signal_strength > 0.1
+                else "bearish" if signal_strength < -0.1 else "neutral"
+            ),
+        }
+
+    # ===== BATCH KERNEL =====
+
+    @staticmethod
+    def calculate_batch(
+        high: Any,
+        low: Any,
+        close: Any,
+        volume: Any,
+    ) -> Dict[str, np.ndarray]:
+        """Calculate every indicator for many symbols in one vectorized pass.
+
+        Each input is a 2-D array shaped (symbols, bars) with the oldest bar
+        first. Recursive indicators step over the bar axis once for all symbols
+        instead of making a pandas round-trip per symbol and indicator. Only
+        NumPy is required, and the formulas mirror the pandas-ta defaults used
+        by the per-symbol methods.
+
+        Args:
+            high: High prices (symbols x bars)
+            low: Low prices (symbols x bars)
+            close: Closing prices (symbols x bars)
+            volume: Volume (symbols x bars)
+
+        Returns:
+            Dict of 1-D arrays (one value per symbol) for the latest bar. Values
+            are NaN wherever the per-symbol method would return None.
+        """
+        high, low, close, volume = (_as_matrix(a) for a in (high, low, close, volume))
+        if not (high.shape == low.shape == close.shape == volume.shape):
+            raise ValueError("high, low, close and volume must share the same shape")
+
+        n_symbols, n_bars = close.shape
+        empty = np.full(n_symbols, np.nan)
+        if n_bars == 0:
+            return {key: empty.copy() for key in _BATCH_KEYS}
+
+        result: Dict[str, np.ndarray] = {}
+        last_close = close[:, -1]
+
+        # RSI / Stochastic RSI share the RSI series
+        rsi_series = _rsi(close, 14) if n_bars >= 15 else None
+        result["rsi"] = rsi_series[:, -1] if rsi_series is not None else empty.copy()
+
+        if rsi_series is not None and n_bars >= 14 + 14 + 3:
+            windows = np.lib.stride_tricks.sliding_window_view(rsi_series, 14, axis=1)
+            lowest = windows.min(axis=-1)
+            highest = windows.max(axis=-1)
+            stoch = 100.0 * (rsi_series[:, 13:] - lowest) / _non_zero(highest - lowest)
+            k_tail = np.lib.stride_tricks.sliding_window_view(stoch[:, -5:], 3, axis=1).mean(
+                axis=-1
+            )
+            result["stoch_rsi_k"] = k_tail[:, -1]
+            result["stoch_rsi_d"] = k_tail.mean(axis=1)
+        else:
+            result["stoch_rsi_k"] = empty.copy()
+            result["stoch_rsi_d"] = empty.copy()
+
+        # MACD (12, 26, 9)
+        if n_bars >= 26 + 9:
+            macd_series = _ema(close, 12) - _ema(close, 26)
+            signal_series = _ema(macd_series, 9, first_valid=25)
+            result["macd"] = macd_series[:, -1]
+            result["macd_signal"] = signal_series[:, -1]
+            result["macd_histogram"] = macd_series[:, -1] - signal_series[:, -1]
+        else:
+            result["macd"] = empty.copy()
+            result["macd_signal"] = empty.copy()
+            result["macd_histogram"] = empty.copy()
+
+        # ATR (14)
+        result["atr"] = _atr(high, low, close, 14)[:, -1] if n_bars >= 15 else empty.copy()
+
+        # Bollinger Bands (20, 2.0) - only the latest window is needed
+        if n_bars >= 20:
+            window = close[:, -20:]
+            middle = window.mean(axis=1)
+            deviation = 2.0 * window.std(axis=1, ddof=0)
+            upper = middle + deviation
+            lower = middle - deviation
+            band_range = upper - lower
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result["bb_bandwidth"] = 100.0 * band_range / middle
+            result["bb_percent_b"] = (last_close - lower) / np.where(
+                band_range == 0, _EPSILON, band_range
+            )
+            result["bb_upper"] = upper
+            result["bb_middle"] = middle
+            result["bb_lower"] = lower
+        else:
+            for key in ("bb_upper", "bb_middle", "bb_lower", "bb_bandwidth", "bb_percent_b"):
+                result[key] = empty.copy()
+
+        # ADX (14) with +DI / -DI
+        if n_bars >= 28:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = 100.0 / _atr(high, low, close, 14, prenan=True)
+                up = high - _shift(high)
+                down = _shift(low) - low
+                plus_dm = np.where(np.isnan(up), np.nan, np.where((up > down) & (up > 0), up, 0.0))
+                minus_dm = np.where(
+                    np.isnan(down), np.nan, np.where((down > up) & (down > 0), down, 0.0)
+                )
+                plus_di = scale * _rma(plus_dm, 14)
+                minus_di = scale * _rma(minus_dm, 14)
+                dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            result["adx"] = _rma(dx, 14)[:, -1]
+            result["plus_di"] = plus_di[:, -1]
+            result["minus_di"] = minus_di[:, -1]
+        else:
+            result["adx"] = empty.copy()
+            result["plus_di"] = empty.copy()
+            result["minus_di"] = empty.copy()
+
+        # VWAP anchored at the first bar (see calculate_vwap)
+        if n_bars >= 2:
+            total_volume = volume.sum(axis=1)
+            typical_price = (high + low + close) / 3.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                vwap = (typical_price * volume).sum(axis=1) / total_volume
+            result["vwap"] = np.where(total_volume == 0, np.nan, vwap)
+        else:
+            result["vwap"] = empty.copy()
+
+        # OBV and its 5-bar change
+        if n_bars >= 10:
+            direction = np.sign(close - _shift(close))
+            direction[:, 0] = 0.0  # pandas-ta leaves the first bar unsigned
+            obv = np.cumsum(direction * volume, axis=1)
+            result["obv"] = obv[:, -1]
+            result["obv_change"] = obv[:, -1] - obv[:, -5]
+        else:
+            result["obv"] = empty.copy()
+            result["obv_change"] = empty.copy()
+
+        # Moving averages
+        result["ema_20"] = _ema(close, 20)[:, -1] if n_bars >= 20 else empty.copy()
+        result["ema_50"] = _ema(close, 50)[:, -1] if n_bars >= 50 else empty.copy()
+        result["sma_200"] = close[:, -200:].mean(axis=1) if n_bars >= 200 else empty.copy()
 
         return result
 
+    @staticmethod
+    def get_comprehensive_analysis_batch(
+        high: Any,
+        low: Any,
+        close: Any,
+        volume: Any,
+    ) -> List[Dict[str, Any]]:
+        """Batch variant of :meth:`get_comprehensive_analysis`.
+
+        Args:
+            high: High prices (symbols x bars)
+            low: Low prices (symbols x bars)
+            close: Closing prices (symbols x bars)
+            volume: Volume (symbols x bars)
+
+        Returns:
+            One analysis dict per symbol row, shaped like get_comprehensive_analysis
+        """
+        batch = TAIndicators.calculate_batch(high, low, close, volume)
+        closes = _as_matrix(close)
+        n_symbols = closes.shape[0]
+
+        def value(key: str, row: int) -> Optional[float]:
+            item = batch[key][row]
+            return None if np.isnan(item) else float(item)
+
+        analyses: List[Dict[str, Any]] = []
+        for row in range(n_symbols):
+            result: Dict[str, Any] = {
+                "rsi": value("rsi", row),
+                "macd": None,
+                "atr": value("atr", row),
+                "bollinger": None,
+                "stoch_rsi": None,
+                "adx": None,
+                "vwap": value("vwap", row),
+                "obv": None,
+                "ema_20": value("ema_20", row),
+                "ema_50": value("ema_50", row),
+                "sma_200": value("sma_200", row),
+            }
+
+            macd = [value(k, row) for k in ("macd", "macd_signal", "macd_histogram")]
+            if None not in macd:
+                result["macd"] = dict(zip(("macd", "signal", "histogram"), macd))
+
+            bollinger = {
+                name: value(f"bb_{name}", row)
+                for name in ("upper", "middle", "lower", "bandwidth", "percent_b")
+            }
+            if bollinger["middle"] is not None:
+                result["bollinger"] = bollinger
+
+            stoch_k = value("stoch_rsi_k", row)
+            if stoch_k is not None:
+                result["stoch_rsi"] = {"k": stoch_k, "d": value("stoch_rsi_d", row)}
+
+            adx = value("adx", row)
+            if adx is not None:
+                result["adx"] = {
+                    "adx": adx,
+                    "plus_di": value("plus_di", row),
+                    "minus_di": value("minus_di", row),
+                }
+
+            obv = value("obv", row)
+            if obv is not None:
+                result["obv"] = {"obv": obv, "obv_change": value("obv_change", row)}
+
+            current_price = closes[row, -1] if closes.shape[1] else 0
+            result.update(TAIndicators._summarize_signals(result, current_price))
+            analyses.append(result)
+
+        return analyses
+
 
 def kelly_criterion(
     expected_return: float,
@@ -4,68 +4,261 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import statistics
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Deque, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
 
 from .time_sync import get_timestamp_us
 
 logger = logging.getLogger(__name__)
 
 
+class RollingCorrelationEngine:
+    """
+    Rolling return correlations and betas over a (symbols x window) ring matrix.
+
+    Each bar writes one column of returns. Running sums, squares and
+    cross-products are masked by which symbols were present in a bar, so
+    every pair is measured over the bars both symbols traded. Updating them
+    costs a few O(N^2) outer products per bar. Correlations are then a single
+    element-wise pass, with no per-pair Python loop. A full recompute (three
+    matrix products over the window) runs once per window to cancel
+    floating-point drift.
+
+    The market return of a bar is the equal-weighted mean return of the
+    symbols present in it; betas are measured against it.
+    """
+
+    def __init__(self, window: int = 500, min_samples: int = 30, capacity: int = 32):
+        """
+        Args:
+            window: Bars kept in the ring
+            min_samples: Overlapping bars needed before a correlation/beta is reported
+            capacity: Initial symbol rows (grows by doubling)
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.ticks = 0
+
+        self._last_price = np.zeros(capacity)
+        self._returns = np.zeros((capacity, window))  # 0 where the symbol had no return
+        self._mask = np.zeros((capacity, window))  # 1.0 where it had one
+        self._market = np.zeros(window)
+
+        # Running masked moments: [i, j] is taken over bars where both i and j are present
+        self._cross = np.zeros((capacity, capacity))  # sum x_i * x_j
+        self._sum = np.zeros((capacity, capacity))  # sum x_i
+        self._sumsq = np.zeros((capacity, capacity))  # sum x_i^2
+        self._count = np.zeros((capacity, capacity))  # bars
+        self._sum_xm = np.zeros(capacity)  # sum x_i * market
+        self._sum_m = np.zeros(capacity)  # sum market (bars where i is present)
+        self._sum_mm = np.zeros(capacity)  # sum market^2 (bars where i is present)
+
+    def _row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == len(self._last_price):
+                self._grow(2 * row)
+            self.index[symbol] = row
+            self.symbols.append(symbol)
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        def pad(array: np.ndarray, square: bool = False) -> np.ndarray:
+            shape = (capacity, capacity) if square else (capacity,) + array.shape[1:]
+            grown = np.zeros(shape)
+            grown[tuple(slice(0, n) for n in array.shape)] = array
+            return grown
+
+        self._last_price = pad(self._last_price)
+        self._returns = pad(self._returns)
+        self._mask = pad(self._mask)
+        for name in ("_cross", "_sum", "_sumsq", "_count"):
+            setattr(self, name, pad(getattr(self, name), square=True))
+        for name in ("_sum_xm", "_sum_m", "_sum_mm"):
+            setattr(self, name, pad(getattr(self, name)))
+
+    def update(self, prices: Mapping[str, float]) -> bool:
+        """Append one bar of prices; returns False if no symbol produced a return."""
+        rows = []
+        values = []
+        for symbol, price in prices.items():
+            if price and price > 0:
+                rows.append(self._row(symbol))
+                values.append(price)
+        if not rows:
+            return False
+
+        k = len(self.symbols)
+        rows_arr = np.asarray(rows)
+        new = np.asarray(values, dtype=float)
+        prev = self._last_price[rows_arr]
+        self._last_price[rows_arr] = new
+
+        has_return = prev > 0
+        x = np.zeros(k)
+        m = np.zeros(k)
+        if not has_return.any():
+            return False
+        x[rows_arr[has_return]] = new[has_return] / prev[has_return] - 1.0
+        m[rows_arr[has_return]] = 1.0
+        market = float(x.sum() / m.sum())
+
+        col = self.ticks % self.window
+        if self.ticks >= self.window:
+            self._accumulate(
+                self._returns[:k, col], self._mask[:k, col], float(self._market[col]), -1.0
+            )
+        self._returns[:k, col] = x
+        self._mask[:k, col] = m
+        self._market[col] = market
+        self._accumulate(x, m, market, 1.0)
+        self.ticks += 1
+
+        if self.ticks % self.window == 0:
+            self.recompute()
+        return True
+
+    def _accumulate(self, x: np.ndarray, m: np.ndarray, market: float, sign: float) -> None:
+        k = len(x)
+        self._cross[:k, :k] += sign * np.outer(x, x)
+        self._sum[:k, :k] += sign * np.outer(x, m)
+        self._sumsq[:k, :k] += sign * np.outer(x * x, m)
+        self._count[:k, :k] += sign * np.outer(m, m)
+        self._sum_xm[:k] += sign * market * x
+        self._sum_m[:k] += sign * market * m
+        self._sum_mm[:k] += sign * market * market * m
+
+    def recompute(self) -> None:
+        """Rebuild every running moment from the ring in one pass of matrix products."""
+        k = len(self.symbols)
+        x = self._returns[:k]
+        m = self._mask[:k]
+        self._cross[:k, :k] = x @ x.T
+        self._sum[:k, :k] = x @ m.T
+        self._sumsq[:k, :k] = (x * x) @ m.T
+        self._count[:k, :k] = m @ m.T
+        self._sum_xm[:k] = x @ self._market
+        self._sum_m[:k] = m @ self._market
+        self._sum_mm[:k] = m @ (self._market * self._market)
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation matrix in ``symbols`` order (NaN = too few samples/flat)."""
+        k = len(self.symbols)
+        n = self._count[:k, :k]
+        sx = self._sum[:k, :k]
+        ssq = self._sumsq[:k, :k]
+        cov = n * self._cross[:k, :k] - sx * sx.T
+        var = n * ssq - sx * sx
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.sqrt(var * var.T)
+        # Flat series (variance lost to rounding) and thin overlaps are undefined
+        flat = var <= 1e-12 * n * ssq
+        corr[(n < self.min_samples) | flat | flat.T] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return corr
+
+    def betas(self) -> np.ndarray:
+        """Beta of each symbol against the equal-weighted market return (NaN = too few)."""
+        k = len(self.symbols)
+        n = np.diagonal(self._count[:k, :k])
+        sx = np.diagonal(self._sum[:k, :k])
+        cov = n * self._sum_xm[:k] - sx * self._sum_m[:k]
+        var = n * self._sum_mm[:k] - self._sum_m[:k] ** 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            beta = cov / var
+        beta[(n < self.min_samples) | (var <= 1e-12 * n * self._sum_mm[:k])] = np.nan
+        return beta
+
+    def sample_size(self) -> int:
+        """Bars currently in the window."""
+        return min(self.ticks, self.window)
+
+
 @dataclass
 class CorrelationMatrix:
-    """Correlation matrix between trading symbols."""
+    """Correlation matrix between trading symbols (dense, NaN = unknown)."""
 
     symbols: List[str]
-    correlations: Dict[Tuple[str, str], float]
+    values: np.ndarray
     timestamp_us: int
     sample_size: int
+    index: Dict[str, int] = field(init=False, repr=False)
+    _groups: Dict[float, List[Set[str]]] = field(init=False, repr=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.values.setflags(write=False)
+
+    @property
+    def correlations(self) -> Dict[Tuple[str, str], float]:
+        """Known pairwise correlations keyed by the sorted symbol pair."""
+        rows, cols = np.nonzero(np.triu(~np.isnan(self.values), k=1))
+        return {
+            tuple(sorted((self.symbols[i], self.symbols[j]))): float(self.values[i, j])
+            for i, j in zip(rows.tolist(), cols.tolist())
+        }
 
     def get_correlation(self, symbol1: str, symbol2: str) -> float:
         """Get correlation between two symbols."""
         if symbol1 == symbol2:
             return 1.0
-        key = tuple(sorted([symbol1, symbol2]))
-        return self.correlations.get(key, 0.0)
+        i = self.index.get(symbol1)
+        j = self.index.get(symbol2)
+        if i is None or j is None:
+            return 0.0
+        value = self.values[i, j]
+        return 0.0 if np.isnan(value) else float(value)
+
+    def row(self, symbol: str) -> Optional[np.ndarray]:
+        """Correlations of ``symbol`` with every symbol (0 for itself and unknown pairs)."""
+        i = self.index.get(symbol)
+        if i is None:
+            return None
+        row = np.nan_to_num(self.values[i], nan=0.0)
+        row[i] = 0.0
+        return row
 
     def get_symbol_correlations(self, symbol: str) -> Dict[str, float]:
         """Get all correlations for a specific symbol."""
-        return {s: self.get_correlation(symbol, s) for s in self.symbols if s != symbol}
+        row = self.row(symbol)
+        if row is None:
+            return {s: 0.0 for s in self.symbols if s != symbol}
+        return {s: v for s, v in zip(self.symbols, row.tolist()) if s != symbol}
 
     def get_highly_correlated_groups(self, threshold: float = 0.7) -> List[Set[str]]:
-        """Find groups of highly correlated symbols."""
-        visited = set()
-        groups = []
-
-        for symbol in self.symbols:
-            if symbol in visited:
-                continue
-
-            # Find all symbols correlated with this one above threshold
-            group = {symbol}
-            stack = [symbol]
+        """Find groups of highly correlated symbols (cached per threshold)."""
+        cached = self._groups.get(threshold)
+        if cached is not None:
+            return [set(group) for group in cached]
 
-            while stack:
-                current = stack.pop()
-                if current in visited:
-                    continue
-                visited.add(current)
+        with np.errstate(invalid="ignore"):
+            adjacency = np.abs(self.values) >= threshold
+        np.fill_diagonal(adjacency, False)
 
-                for other_symbol in self.symbols:
-                    if (
-                        other_symbol not in visited
-                        and other_symbol not in group
-                        and abs(self.get_correlation(current, other_symbol)) >= threshold
-                    ):
-                        group.add(other_symbol)
-                        stack.append(other_symbol)
-
-            if len(group) > 1:
-                groups.append(group)
+        # Connected components over the thresholded graph
+        unvisited = np.ones(len(self.symbols), dtype=bool)
+        groups = []
+        for start in np.flatnonzero(adjacency.any(axis=1)).tolist():
+            if not unvisited[start]:
+                continue
+            unvisited[start] = False
+            members = [start]
+            frontier = [start]
+            while frontier:
+                reached = adjacency[frontier].any(axis=0) & unvisited
+                frontier = np.flatnonzero(reached).tolist()
+                unvisited[frontier] = False
+                members.extend(frontier)
+            groups.append({self.symbols[i] for i in members})
 
-        return groups
+        self._groups[threshold] = groups
+        return [set(group) for group in groups]
 
 
 @dataclass
@@ -105,22 +298,22 @@ class TradeCorrelationAnalyzer:
     def __init__(self, window_size: int = 1000, correlation_window: int = 500):
         # Price data storage
         self.price_history: Dict[str, Deque[float]] = defaultdict(lambda: Deque(maxlen=window_size))
-        self.return_history: Dict[str, Deque[float]] = defaultdict(
-            lambda: Deque(maxlen=correlation_window)
-        )
+
+        # Rolling returns, correlations and betas (one bar = one price per symbol)
+        self.engine = RollingCorrelationEngine(window=correlation_window)
+        self._pending_bar: Dict[str, float] = {}
+        self._matrix_tick = -1
 
         # Correlation tracking
         self.correlation_matrices: Deque[CorrelationMatrix] = Deque(
             maxlen=10
         )  # Keep last 10 matrices
-        self.correlation_cache: Dict[Tuple[str, str], float] = {}
 
         # Risk analysis
         self.position_history: Deque[Dict] = Deque(maxlen=1000)
         self.portfolio_exposures: Dict[str, PositionExposure] = {}
 
         # Market beta calculations
-        self.market_returns: Deque[float] = Deque(maxlen=correlation_window)
         self.symbol_betas: Dict[str, float] = {}
 
         # Risk thresholds
@@ -131,23 +324,23 @@ class TradeCorrelationAnalyzer:
     def add_price_data(self, symbol: str, price: float, volume: Optional[float] = None) -> None:
         """
         Add price data for correlation analysis.
-        Calculates returns and updates correlation matrices.
+        Prices are collected into a bar, which is committed to the correlation
+        engine when a symbol already in it reports again.
         """
         self.price_history[symbol].append(price)
-
-        # Calculate returns if we have enough price data
-        prices = list(self.price_history[symbol])
-        if len(prices) >= 2:
-            ret = (prices[-1] - prices[-2]) / prices[-2] if prices[-2] != 0 else 0
-            self.return_history[symbol].append(ret)
-
-            # Update market returns (simple average for now)
-            if len(self.return_history[symbol]) >= 10:
-                self.market_returns.append(statistics.mean(list(self.return_history[symbol])[-10:]))
-
-        # Update correlations periodically
-        if len(self.return_history[symbol]) % 100 == 0:  # Every 100 data points
-            self._update_correlations()
+        if symbol in self._pending_bar:
+            self.engine.update(self._pending_bar)
+            self._pending_bar = {}
+        self._pending_bar[symbol] = price
+
+    def add_price_snapshot(self, prices: Mapping[str, float]) -> None:
+        """Add one bar of prices for many symbols at once (e.g. a whole-market ticker)."""
+        if self._pending_bar:
+            self.engine.update(self._pending_bar)
+            self._pending_bar = {}
+        for symbol, price in prices.items():
+            self.price_history[symbol].append(price)
+        self.engine.update(prices)
 
     def add_position_update(
         self, symbol: str, position_size: float, market_value: float, entry_price: float
@@ -165,7 +358,9 @@ class TradeCorrelationAnalyzer:
         self._update_portfolio_exposures()
 
     def get_correlation_matrix(self) -> Optional[CorrelationMatrix]:
-        """Get the latest correlation matrix."""
+        """Get the latest correlation matrix (rebuilt at most once per bar)."""
+        if self._matrix_tick != self.engine.ticks:
+            self._update_correlations()
         return self.correlation_matrices[-1] if self.correlation_matrices else None
 
     def get_symbol_correlation_risk(self, symbol: str) -> Dict[str, float]:
@@ -177,15 +372,15 @@ class TradeCorrelationAnalyzer:
         if not matrix:
             return {"correlation_risk": 0.0, "recommended_limit": 1.0}
 
-        correlations = matrix.get_symbol_correlations(symbol)
+        row = matrix.row(symbol)
+        if row is None:
+            row = np.zeros(len(matrix.symbols))
 
         # Calculate weighted correlation risk
-        high_corr_symbols = [s for s, corr in correlations.items() if abs(corr) > 0.5]
-        avg_high_corr = (
-            statistics.mean([abs(correlations[s]) for s in high_corr_symbols])
-            if high_corr_symbols
-            else 0
-        )
+        strength = np.abs(row)
+        high = np.flatnonzero(strength > 0.5)
+        high_corr_symbols = [matrix.symbols[i] for i in high.tolist()]
+        avg_high_corr = float(strength[high].mean()) if len(high) else 0
 
         # Risk score based on correlation concentration
         correlation_risk = min(avg_high_corr * len(high_corr_symbols) / 5.0, 1.0)
@@ -309,73 +504,38 @@ class TradeCorrelationAnalyzer:
         return sorted(clusters, key=lambda x: x["risk_score"], reverse=True)
 
     def _update_correlations(self) -> None:
-        """Update correlation matrices for all symbol pairs."""
-        symbols = list(self.return_history.keys())
-        if len(symbols) < 2:
+        """Publish the engine's current correlation matrix and betas."""
+        self._matrix_tick = self.engine.ticks
+        if len(self.engine.symbols) < 2:
             return
 
-        # Ensure all symbols have the same return history length
-        min_length = min(len(self.return_history[s]) for s in symbols)
-        if min_length < 30:  # Need minimum sample size
-            return
-
-        # Calculate correlation matrix
-        correlations = {}
-        sample_size = min_length
-
-        for i, symbol1 in enumerate(symbols):
-            for symbol2 in symbols[i + 1 :]:
-                returns1 = list(self.return_history[symbol1])[-sample_size:]
-                returns2 = list(self.return_history[symbol2])[-sample_size:]
-
-                try:
-                    correlation = statistics.correlation(returns1, returns2)
-                    key = tuple(sorted([symbol1, symbol2]))
-                    correlations[key] = correlation
-                except (statistics.StatisticsError, ZeroDivisionError):
-                    continue
-
-        if correlations:
-            matrix = CorrelationMatrix(
-                symbols=symbols,
-                correlations=correlations,
-                timestamp_us=get_timestamp_us(),
-                sample_size=sample_size,
-            )
-            self.correlation_matrices.append(matrix)
+        values = self.engine.correlation()
+        if np.isnan(values[~np.eye(len(values), dtype=bool)]).all():
+            return  # Need minimum sample size
 
-            # Update cache
-            self.correlation_cache.update(correlations)
+        matrix = CorrelationMatrix(
+            symbols=list(self.engine.symbols),
+            values=values,
+            timestamp_us=get_timestamp_us(),
+            sample_size=self.engine.sample_size(),
+        )
+        self.correlation_matrices.append(matrix)
 
-            # Update betas
-            self._update_symbol_betas()
+        # Update betas
+        self._update_symbol_betas()
 
     def _update_symbol_betas(self) -> None:
         """Update beta calculations for all symbols."""
-        if not self.market_returns or len(self.market_returns) < 30:
-            return
-
-        market_returns_list = list(self.market_returns)
-
-        for symbol, returns in self.return_history.items():
-            if len(returns) < 30:
-                continue
-
-            symbol_returns = list(returns)[-len(market_returns_list) :]
-
-            if len(symbol_returns) != len(market_returns_list):
-                continue
-
-            try:
-                beta = statistics.linear_regression(market_returns_list, symbol_returns).slope
+        betas = self.engine.betas()
+        for symbol, beta in zip(self.engine.symbols, betas.tolist()):
+            if not np.isnan(beta):
                 self.symbol_betas[symbol] = max(0.1, min(3.0, beta))  # Bound beta
-            except (statistics.StatisticsError, ZeroDivisionError):
-                self.symbol_betas[symbol] = 1.0  # Default beta
 
     def _update_portfolio_exposures(self) -> None:
         """Update portfolio exposure calculations."""
         if not self.position_history:
             return
+        self.get_correlation_matrix()  # refresh betas
 
         # Get latest positions
         latest_positions = {}
@@ -414,15 +574,10 @@ class TradeCorrelationAnalyzer:
         if len(cluster) < 2:
             return 0.0
 
-        correlations = []
-        cluster_list = list(cluster)
-
-        for i in range(len(cluster_list)):
-            for j in range(i + 1, len(cluster_list)):
-                corr = matrix.get_correlation(cluster_list[i], cluster_list[j])
-                correlations.append(abs(corr))
-
-        return statistics.mean(correlations) if correlations else 0.0
+        rows = [matrix.index[s] for s in cluster if s in matrix.index]
+        sub = np.nan_to_num(np.abs(matrix.values[np.ix_(rows, rows)]), nan=0.0)
+        upper = sub[np.triu_indices(len(rows), k=1)]
+        return float(upper.mean()) if len(upper) else 0.0
 
     def get_risk_management_recommendations(self) -> Dict[str, any]:
         """Get comprehensive risk management recommendations."""
@@ -451,10 +606,10 @@ class TradeCorrelationAnalyzer:
                     )
 
             # Find diversification opportunities (low correlation symbols)
-            avg_correlations = {}
-            for symbol in matrix.symbols:
-                corr_values = [abs(c) for c in matrix.get_symbol_correlations(symbol).values()]
-                avg_correlations[symbol] = statistics.mean(corr_values) if corr_values else 0
+            strength = np.nan_to_num(np.abs(matrix.values), nan=0.0)
+            np.fill_diagonal(strength, 0.0)
+            others = max(len(matrix.symbols) - 1, 1)
+            avg_correlations = dict(zip(matrix.symbols, (strength.sum(axis=1) / others).tolist()))
 
             # Symbols with low average correlation are diversification opportunities
             low_corr_symbols = sorted(avg_correlations.items(), key=lambda x: x[1])[:5]
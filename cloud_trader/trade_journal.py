@@ -0,0 +1,364 @@
+"""Write-behind persistence for trades and open positions.
+
+Every trade and every position change is appended as one JSON line to a local
+journal (a few hundred bytes, no file rewrite), so the trading loop never
+blocks on persistence. A background flusher group-commits the journalled rows
+to ``TradingStorage`` in one multi-row transaction once ``batch_size`` rows are
+pending or ``flush_interval`` has passed, fsyncs the journal off the event loop
+and records the last committed sequence number in a checkpoint file.
+
+Positions are snapshotted incrementally: ``snapshot_positions`` diffs the
+current book against the last journalled state and appends only the symbols
+that changed or closed.
+
+On start-up ``recover`` replays the journal to rebuild the recent trades and
+the open positions, and re-queues rows past the checkpoint that never reached
+the database. The journal is compacted to the retained trades plus the live
+positions once it grows past ``compact_records`` lines.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "trading_journal.jsonl"
+CHECKPOINT_FILE = "trading_journal.ckpt"
+
+# Keys holding live objects (agent state) that are rebuilt on load, not journalled
+_TRANSIENT_POSITION_KEYS = ("agent",)
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if isinstance(value, str):
+        try:
+            return _to_datetime(datetime.fromisoformat(value))
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def trade_row(trade: Dict[str, Any]) -> Dict[str, Any]:
+    """Trade record -> ``TradingStorage`` trade row."""
+    price = _float(trade.get("price"))
+    quantity = _float(trade.get("quantity"))
+    order_id = trade.get("order_id") or trade.get("id")
+    return {
+        "timestamp": _to_datetime(trade.get("timestamp")),
+        "symbol": str(trade.get("symbol", "UNKNOWN")),
+        "side": str(trade.get("side", "UNKNOWN")),
+        "price": price,
+        "quantity": quantity,
+        "notional": _float(trade.get("value"), price * quantity),
+        "agent_id": trade.get("agent_id"),
+        "agent_model": trade.get("agent_model") or trade.get("model"),
+        "strategy": trade.get("strategy"),
+        "order_id": str(order_id) if order_id is not None else None,
+        "fee": _float(trade["fee"]) if trade.get("fee") is not None else None,
+        "metadata": trade,
+    }
+
+
+def position_row(symbol: str, position: Optional[Dict[str, Any]], ts: float) -> Dict[str, Any]:
+    """Position snapshot (``None`` = closed) -> ``TradingStorage`` position row."""
+    position = position or {}
+    size = abs(_float(position.get("quantity")))
+    entry = _float(position.get("entry_price"))
+    current = _float(position.get("current_price"), entry)
+    pnl = _float(position.get("unrealized_pnl"))
+    cost = size * entry
+    leverage = position.get("leverage")
+    return {
+        "timestamp": _to_datetime(ts),
+        "symbol": symbol,
+        "agent_id": position.get("agent_id"),
+        "side": "SHORT" if position.get("side") == "SELL" else "LONG",
+        "size": size,
+        "entry_price": entry,
+        "current_price": current,
+        "notional": size * current,
+        "unrealized_pnl": pnl,
+        "unrealized_pnl_pct": pnl / cost * 100 if cost else 0.0,
+        "leverage": _float(leverage) if leverage is not None else None,
+        "status": "open" if position else "closed",
+        "metadata": position or None,
+    }
+
+
+class TradeJournal:
+    """Local append-only journal with write-behind group commit to SQL storage."""
+
+    def __init__(
+        self,
+        directory: str,
+        storage: Any = None,
+        max_trades: int = 200,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        compact_records: int = 5000,
+        max_pending: int = 50000,
+    ):
+        """
+        Args:
+            directory: Directory holding the journal and checkpoint files
+            storage: ``TradingStorage`` (or None for local-only persistence)
+            max_trades: Trades kept in the journal after compaction (and recovered)
+            batch_size: Pending rows that trigger an immediate group commit
+            flush_interval: Maximum seconds a row waits before being committed
+            compact_records: Journal lines that trigger compaction
+            max_pending: Cap on uncommitted rows held while storage is down
+        """
+        self.directory = directory
+        self.storage = storage
+        self.max_trades = max_trades
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_records = compact_records
+        self.max_pending = max_pending
+
+        self.path = os.path.join(directory, JOURNAL_FILE)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_FILE)
+
+        self._seq = 0
+        self._committed = 0
+        self._lines = 0
+        self._fh = None
+
+        # Retained state, as journal lines, for compaction
+        self._trade_lines: Deque[Tuple[int, str]] = deque(maxlen=max_trades)
+        self._position_lines: Dict[str, Tuple[int, str]] = {}
+        # Last journalled serialisation per open position, for diffing
+        self._position_state: Dict[str, str] = {}
+
+        self._pending: List[Tuple[int, str, Any]] = []
+        self._compact_buffer: Optional[List[str]] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.stats = {"appends": 0, "commits": 0, "rows_committed": 0, "commit_failures": 0}
+
+    # ----- recovery -----
+
+    def recover(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Replay the journal. Returns (recent trades newest first, open positions)."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._committed = self._read_checkpoint()
+
+        trades: Deque[Dict[str, Any]] = deque(maxlen=self.max_trades)
+        positions: Dict[str, Dict[str, Any]] = {}
+        valid_bytes = 0
+
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for raw in f:
+                    try:
+                        if not raw.endswith(b"\n"):
+                            raise ValueError("unterminated record")
+                        record = json.loads(raw)
+                    except ValueError:
+                        # Torn write at the tail from a crash: drop it and everything after
+                        logger.warning(
+                            f"⚠️ Truncating torn trade journal record at byte {valid_bytes}"
+                        )
+                        break
+                    valid_bytes += len(raw)
+                    line = raw.decode().rstrip("\n")
+                    self._apply(record, line)
+                    if record["t"] == "trade":
+                        trades.appendleft(record["d"])
+                    elif record["t"] == "pos":
+                        positions[record["k"]] = record["d"]
+                    else:
+                        positions.pop(record["k"], None)
+            if valid_bytes < os.path.getsize(self.path):
+                with open(self.path, "r+b") as f:
+                    f.truncate(valid_bytes)
+
+        self._fh = open(self.path, "a", encoding="utf-8")
+        if self._pending:
+            logger.info(
+                f"♻️ Trade journal: {len(self._pending)} rows pending SQL commit after replay"
+            )
+        return list(trades), positions
+
+    def _read_checkpoint(self) -> int:
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                return int(json.load(f).get("committed", 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _apply(self, record: Dict[str, Any], line: str) -> None:
+        """Fold one journal record into the retained and pending state."""
+        seq = record["q"]
+        self._seq = max(self._seq, seq)
+        self._lines += 1
+        kind = record["t"]
+        if kind == "trade":
+            self._trade_lines.append((seq, line))
+        elif kind == "pos":
+            self._position_lines[record["k"]] = (seq, line)
+            self._position_state[record["k"]] = json.dumps(record["d"], sort_keys=True)
+        else:
+            self._position_lines.pop(record["k"], None)
+            self._position_state.pop(record["k"], None)
+
+        if self.storage is not None and seq > self._committed:
+            self._pending.append((seq, kind, record))
+            if len(self._pending) > self.max_pending:
+                dropped = self._pending.pop(0)
+                logger.warning(f"⚠️ Trade journal backlog full, dropped SQL row #{dropped[0]}")
+
+    # ----- writes -----
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._seq += 1
+        record["q"] = self._seq
+        line = json.dumps(record, default=str)
+        # json round trip so replayed state matches what recovery would read
+        self._apply(json.loads(line), line)
+        if self._fh is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(line + "\n")
+        self._fh.flush()
+        if self._compact_buffer is not None:
+            self._compact_buffer.append(line)
+        self.stats["appends"] += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def record_trade(self, trade: Dict[str, Any]) -> None:
+        """Journal one trade."""
+        self._append({"t": "trade", "ts": time.time(), "d": trade})
+
+    def snapshot_positions(self, positions: Mapping[str, Dict[str, Any]]) -> int:
+        """Journal the positions that changed since the last snapshot; returns how many."""
+        changes = 0
+        now = time.time()
+        for symbol, position in positions.items():
+            data = {k: v for k, v in position.items() if k not in _TRANSIENT_POSITION_KEYS}
+            state = json.dumps(data, sort_keys=True, default=str)
+            if self._position_state.get(symbol) != state:
+                self._append({"t": "pos", "k": symbol, "ts": now, "d": data})
+                changes += 1
+        for symbol in [s for s in self._position_state if s not in positions]:
+            self._append({"t": "close", "k": symbol, "ts": now})
+            changes += 1
+        return changes
+
+    # ----- group commit -----
+
+    def start(self) -> None:
+        """Start the background flusher (needs a running event loop)."""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                if self._lines > self.compact_records and not self._pending:
+                    await self.compact()
+            except Exception as e:
+                logger.error(f"⚠️ Trade journal flush failed: {e}")
+
+    async def flush(self) -> int:
+        """fsync the journal and group-commit pending rows; returns rows committed."""
+        if self._fh is not None:
+            await asyncio.to_thread(os.fsync, self._fh.fileno())
+
+        if not self._pending or self.storage is None or not self.storage.is_ready():
+            return 0
+
+        batch = self._pending[: self.batch_size * 10]
+        trades = [trade_row(record["d"]) for _, kind, record in batch if kind == "trade"]
+        positions = [
+            position_row(record["k"], record.get("d"), record.get("ts", time.time()))
+            for _, kind, record in batch
+            if kind != "trade"
+        ]
+        if not await self.storage.insert_batch(trades=trades, positions=positions):
+            self.stats["commit_failures"] += 1
+            return 0
+
+        del self._pending[: len(batch)]
+        self._committed = batch[-1][0]
+        await asyncio.to_thread(self._write_checkpoint, self._committed)
+        self.stats["commits"] += 1
+        self.stats["rows_committed"] += len(batch)
+        if self._pending:
+            self._wakeup.set()
+        return len(batch)
+
+    def _write_checkpoint(self, committed: int) -> None:
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"committed": committed, "saved_at": time.time()}, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    # ----- compaction -----
+
+    async def compact(self) -> None:
+        """Rewrite the journal as retained trades plus live positions."""
+        kept = sorted([*self._trade_lines, *self._position_lines.values()])
+        self._compact_buffer = []
+        tmp = self.path + ".tmp"
+        try:
+            await asyncio.to_thread(self._write_lines, tmp, [line for _, line in kept])
+            # Lines appended while the snapshot was being written go after it
+            with open(tmp, "a", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in self._compact_buffer)
+            self._fh.close()
+            os.replace(tmp, self.path)
+            self._fh = open(self.path, "a", encoding="utf-8")
+            self._lines = len(kept) + len(self._compact_buffer)
+            logger.info(f"🧹 Compacted trade journal to {self._lines} records")
+        finally:
+            self._compact_buffer = None
+
+    @staticmethod
+    def _write_lines(path: str, lines: List[str]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def close(self) -> None:
+        """Stop the flusher, commit what is pending and close the journal."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"⚠️ Final trade journal flush failed: {e}")
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
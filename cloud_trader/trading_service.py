@@ -11,7 +11,7 @@ import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
@@ -25,8 +25,15 @@ from .autonomous_agent import AutonomousAgent
 from .config import Settings, get_settings
 from .credentials import CredentialManager
 from .data.feature_pipeline import FeaturePipeline
+from .data.market_data_store import (
+    MarketDataStore,
+    MarketDataStreamService,
+    StoreBackedExchange,
+)
+from .data.order_book import OrderBookEngine
 
 # NEW: Autonomous Trading Components
+from .dashboard_state import DashboardState
 from .data_store import DataStore
 from .definitions import (
     AGENT_DEFINITIONS,
@@ -48,16 +55,19 @@ from .reentry_queue import ReEntryQueue, get_reentry_queue
 from .request_batching import BatchProcessor, BatchStrategy, RequestBatchManager
 from .resilience import with_retry, with_timeout
 from .risk import PortfolioState, RiskManager
+from .scan_pipeline import ScanPipeline
 from .self_healing import SelfHealingWatchdog
 from .storage import TradingStorage  # Import storage layer
 from .swarm import SwarmManager
 from .symphony_config import AGENTS_CONFIG
+from .trade_journal import TradeJournal
 from .websocket_manager import (
+    SubscriptionType,
     broadcast_agent_status,
     broadcast_consensus_decision,
     broadcast_market_regime,
-    broadcast_portfolio_update,
     broadcast_trade_update,
+    get_websocket_manager,
 )
 
 # Adaptive TP/SL Calculator
@@ -263,7 +273,14 @@ class TradingService:
         self._swarm_manager = SwarmManager()
         self._feature_pipeline = None
         self._analysis_engine = None
+        self._market_data_store = MarketDataStore()
+        self._market_stream: Optional[MarketDataStreamService] = None
+        self._order_books: Optional[OrderBookEngine] = None
         self._consensus_engine = AgentConsensusEngine()
+        self._scan_pipeline = ScanPipeline(
+            max_concurrency=self._settings.scan_max_concurrency,
+            cycle_deadline_seconds=self._settings.scan_cycle_deadline_seconds,
+        )
 
         # NEW: Autonomous Trading Components (initialized in _init_autonomous_components)
         self.data_store = None
@@ -302,6 +319,11 @@ class TradingService:
         self._aster_fees = 0.0  # Track cumulative fees paid
         self._swept_profits = 0.0  # Track swept profits for dashboard
         self._latencies = deque(maxlen=50)  # Store recent API latencies in ms
+        self._correlation_version: Optional[int] = None  # Last ticker snapshot fed to correlations
+
+        # Materialized dashboard (versioned, incrementally rebuilt)
+        self._dashboard_message_cache: Dict[str, Dict[str, Any]] = {}
+        self._dashboard = self._init_dashboard_state()
 
         # Populate initial agent states from Symphony Config
         if AGENTS_CONFIG:
@@ -332,6 +354,9 @@ class TradingService:
         # SQL Storage (PostgreSQL/TimescaleDB)
         self._storage = TradingStorage(settings=self._settings)
 
+        # Local write-behind journal for trades/positions, group-committed to SQL
+        self._journal = TradeJournal(os.path.join("/tmp", "logs"), storage=self._storage)
+
         # Legacy State (To be deprecated - kept minimal for compatibility)
         self._last_day_check = datetime.now().day
         self.current_regime: Optional[RegimeMetrics] = None
@@ -383,10 +408,26 @@ class TradingService:
             logger.error(f"Manager initialization failed: {e}")
 
     def _load_persistent_data(self):
-        """Load trades and positions from disk."""
+        """Load trades and positions by replaying the local journal."""
         logger.debug("Loading persistent data...")
-        self._load_trades()
-        self._load_positions()
+        try:
+            trades, positions = self._journal.recover()
+            if not trades and not positions:
+                trades, positions = self._migrate_legacy_state()
+
+            self._recent_trades = deque(trades, maxlen=200)
+            for pos in positions.values():
+                # Live agent objects are not journalled; reattach by id
+                agent = self._agent_states.get(pos.get("agent_id"))
+                if agent is not None:
+                    pos["agent"] = agent
+            self._open_positions = positions
+            print(
+                f"✅ Loaded {len(self._recent_trades)} historical trades, "
+                f"{len(self._open_positions)} open positions"
+            )
+        except Exception as e:
+            print(f"⚠️ Failed to load persistent trading state: {e}")
 
     @property
     def _market_structure(self) -> Dict[str, Dict[str, Any]]:
@@ -672,10 +713,18 @@ class TradingService:
         # Init Clients
         credentials = await loop.run_in_executor(None, self._credential_manager.get_credentials)
         if self._settings.enable_aster:
-            self._exchange = AsterClient(credentials=credentials)
+            self._exchange = AsterClient(
+                credentials=credentials,
+                read_freshness_seconds=self._settings.aster_read_freshness_seconds,
+                max_connections=self._settings.aster_http_max_connections,
+                keepalive_expiry=self._settings.aster_http_keepalive_seconds,
+                http2=self._settings.aster_http2,
+            )
             from .exchange import AsterSpotClient
 
             self._spot_exchange = AsterSpotClient(credentials=credentials)
+            if self._settings.aster_prewarm_connections:
+                await self._exchange.warmup(self._settings.aster_prewarm_connections)
         else:
             logger.info("⏸️ Aster Exchange integration DISABLED via config")
             # Use AsyncMock to prevent "object MagicMock can't be used in 'await' expression"
@@ -688,9 +737,36 @@ class TradingService:
             self._spot_exchange.get_balance.return_value = 0
             self._spot_exchange.get_orders.return_value = []
 
+        # Market data reads go through the websocket-fed store (REST on gaps)
+        market_data_client = self._exchange_client
+        if self._settings.enable_aster and self._settings.market_stream_enabled:
+            if self._settings.market_stream_order_books:
+                snapshot_limit = self._settings.order_book_snapshot_limit
+                exchange_client = self._exchange_client
+                self._order_books = OrderBookEngine(
+                    snapshot_fetcher=lambda symbol: exchange_client.get_order_book(
+                        symbol, limit=snapshot_limit
+                    )
+                )
+            self._market_stream = MarketDataStreamService(
+                self._market_data_store,
+                base_url=self._settings.ws_base_url,
+                kline_interval=self._settings.market_stream_kline_interval,
+                max_symbols=self._settings.market_stream_max_symbols,
+                order_books=self._order_books,
+                agg_trades=self._settings.market_stream_agg_trades,
+            )
+            market_data_client = StoreBackedExchange(
+                self._exchange_client,
+                self._market_data_store,
+                self._market_stream,
+                order_books=self._order_books,
+            )
+            await self._market_stream.start(SYMBOL_CONFIG.keys())
+
         # Update Managers with Live Client
         self.market_data_manager.exchange_client = self._exchange_client
-        self.position_manager.exchange_client = self._exchange_client
+        self.position_manager.exchange_client = market_data_client
 
         # Init Risk Manager
         self._risk_manager = RiskManager(self._settings)
@@ -713,11 +789,15 @@ class TradingService:
 
         # AI Components
         logger.debug("Initializing AI components...")
-        self._feature_pipeline = FeaturePipeline(self._exchange_client)
+        self._feature_pipeline = FeaturePipeline(market_data_client)
+        if self._market_stream is not None:
+            # Streamed candles advance the indicators between REST refreshes
+            self._market_data_store.add_kline_listener(self._feature_pipeline.on_kline)
         self._analysis_engine = AnalysisEngine(
-            self._exchange_client,
+            market_data_client,
             self._feature_pipeline,
             self._swarm_manager,
+            ticker_snapshots=self.position_manager.ticker_snapshots,
         )
         await self._initialize_basic_agents()
 
@@ -777,7 +857,11 @@ class TradingService:
             hl_client=self.hl_client,
             drift_client=self.drift,
             settings=self._settings,
+            order_books=self._order_books,
         )
+        if self.vpin_hft_agent and self._market_stream is not None:
+            # Streamed aggTrades feed the agent's volume-bucketed VPIN
+            self._market_data_store.add_agg_trade_listener(self.vpin_hft_agent.on_agg_trade)
 
         # WORLD-CLASS RESILIENCE: Reset circuit breakers on fresh startup
         # Removed in favor of PubSub
@@ -834,6 +918,9 @@ class TradingService:
                 "🗄️ SQL Storage SKIPPED: DATABASE_URL is empty in settings and environment"
             )
 
+        # Background fsync + group commit of journalled trades/positions
+        self._journal.start()
+
         # Initialize BigQuery Streamer for Production
         try:
             self._bq = await get_bigquery_streamer()
@@ -855,17 +942,28 @@ class TradingService:
         """Fetch all available symbols and their precision/filters from exchange."""
         await self.market_data_manager.fetch_structure()
 
-    def _load_trades(self):
-        """Load recent trades from JSON file."""
-        try:
-            file_path = os.path.join("/tmp", "logs", "trades.json")
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    trades_data = json.load(f)
-                    self._recent_trades = deque(trades_data, maxlen=200)
-                print(f"✅ Loaded {len(self._recent_trades)} historical trades")
-        except Exception as e:
-            print(f"⚠️ Failed to load trade history: {e}")
+    def _migrate_legacy_state(self) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """One-time import of the old whole-file trades.json / positions.json into the journal."""
+        trades_path = os.path.join("/tmp", "logs", "trades.json")
+        positions_path = os.path.join("/tmp", "positions.json")
+        trades: List[Dict] = []
+        positions: Dict[str, Dict] = {}
+
+        if os.path.exists(trades_path):
+            with open(trades_path, "r") as f:
+                trades = json.load(f)
+            for trade in reversed(trades):  # file is newest first
+                self._journal.record_trade(trade)
+            os.remove(trades_path)
+        if os.path.exists(positions_path):
+            with open(positions_path, "r") as f:
+                positions = json.load(f)
+            self._journal.snapshot_positions(positions)
+            os.remove(positions_path)
+
+        if trades or positions:
+            print(f"📦 Migrated {len(trades)} trades, {len(positions)} positions into trade journal")
+        return trades, positions
 
     def _save_trade(self, trade_data: Dict):
         """Save a new trade to the persistent history."""
@@ -873,14 +971,11 @@ class TradingService:
             # Add to in-memory deque
             self._recent_trades.appendleft(trade_data)
 
-            # 1. Local Persistence (Graceful degradation)
+            # 1. Local Persistence (journal append; SQL commit happens write-behind)
             try:
-                os.makedirs("/tmp/logs", exist_ok=True)
-                file_path = os.path.join("/tmp", "logs", "trades.json")
-                with open(file_path, "w") as f:
-                    json.dump(list(self._recent_trades), f, default=str)
+                self._journal.record_trade(trade_data)
             except Exception as e:
-                logger.warning(f"⚠️ Failed to save local trade file: {e}")
+                logger.warning(f"⚠️ Failed to journal trade: {e}")
 
             # 2. Production BigQuery Streaming
             if hasattr(self, "_bq") and self._bq and self._bq.is_ready():
@@ -905,24 +1000,11 @@ class TradingService:
         except Exception as e:
             logger.error(f"⚠️ Failed to process trade save sequence: {e}")
 
-    def _load_positions(self):
-        """Load open positions from JSON file."""
-        try:
-            file_path = os.path.join("/tmp", "positions.json")
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    positions_data = json.load(f)
-                    self._open_positions = positions_data
-                print(f"✅ Loaded {len(self._open_positions)} open positions")
-        except Exception as e:
-            print(f"⚠️ Failed to load open positions: {e}")
-
     def _save_positions(self):
-        """Save open positions to JSON file."""
+        """Journal the open positions that changed since the last save."""
+        self._dashboard.touch("positions", "agents")
         try:
-            file_path = os.path.join("/tmp", "positions.json")
-            with open(file_path, "w") as f:
-                json.dump(self._open_positions, f)
+            self._journal.snapshot_positions(self._open_positions)
         except Exception as e:
             print(f"⚠️ Failed to save open positions: {e}")
 
@@ -1549,7 +1631,7 @@ class TradingService:
         return await self.position_manager.check_profit_taking(symbol, position, current_price)
 
     async def _analyze_market_for_agent(
-        self, agent: MinimalAgentState, symbol: str, ticker_map: Dict[str, Any] = None
+        self, agent: MinimalAgentState, symbol: str, ticker_map: Mapping[str, Any] = None
     ) -> Dict[str, Any]:
         """
         Perform basic technical analysis suited to the agent's specialization.
@@ -1613,8 +1695,32 @@ class TradingService:
                 total_exposure += pos["quantity"] * price
         return total_exposure
 
-    async def _execute_agent_trading(self, ticker_map: Dict[str, Any] = None):
+    async def _shared_tickers(self) -> Mapping[str, Any]:
+        """Current whole-market ticker snapshot (empty before the position manager exists)."""
+        if self.position_manager is None:
+            return {}
+        return await self.position_manager.ticker_snapshots.get()
+
+    async def _update_correlation_prices(self, ticker_map: Mapping[str, Any]) -> None:
+        """Roll the correlation engine forward one bar per new ticker snapshot."""
+        version = getattr(ticker_map, "version", None)
+        if not ticker_map or (version is not None and version == self._correlation_version):
+            return
+        self._correlation_version = version
+        try:
+            from .trade_correlation import get_correlation_analyzer
+
+            analyzer = await get_correlation_analyzer()
+            analyzer.add_price_snapshot(
+                {symbol: float(t.get("lastPrice", 0) or 0) for symbol, t in ticker_map.items()}
+            )
+        except Exception as e:
+            logger.debug(f"Correlation price update skipped: {e}")
+
+    async def _execute_agent_trading(self, ticker_map: Mapping[str, Any] = None):
         """Execute real trades with intelligent market analysis and multi-symbol support."""
+        if ticker_map is None:
+            ticker_map = await self._shared_tickers()
 
         # 1. Select active agents
         # Circuit Breaker Check
@@ -1849,7 +1955,12 @@ class TradingService:
             pass  # This block is now empty as new entries are handled by _execute_new_trades
 
     async def _scan_and_execute_new_trades(self):
-        """Scan for new trades using the swarm consensus approach."""
+        """Scan for new trades using the swarm consensus approach.
+
+        Symbols are analysed concurrently by ``self._scan_pipeline`` under the
+        configured concurrency limit and cycle deadline. Each symbol is voted on
+        and executed as soon as its agents finish, instead of after the batch.
+        """
 
         # Get active agents
         active_agents = [a for a in self._agent_states.values() if a.active]
@@ -1862,314 +1973,341 @@ class TradingService:
         print(
             f"✅ DEBUG: {len(active_agents)} active agents ready (Total: {len(self._agent_states)}, Breached: {breached_count})"
         )
-        print(f"🚀 SCAN: Starting _scan_and_execute_new_trades (Per-Symbol Mode)...")
-
-        # Optimization: Limit symbols to scan for responsiveness
-        import random
+        print(f"🚀 SCAN: Starting _scan_and_execute_new_trades (Pipelined Mode)...")
 
         all_symbols = list(self._market_structure.keys()) if self._market_structure else []
-        # UNLOCKED: Increased from 5 to 30 symbols per cycle due to Bulk Prefetching optimization
-        symbols_to_scan = (
-            random.sample(all_symbols, min(30, len(all_symbols))) if all_symbols else []
-        )
+        scan_limit = self._settings.scan_max_symbols
+        if scan_limit and len(all_symbols) > scan_limit:
+            all_symbols = random.sample(all_symbols, scan_limit)
 
+        symbols_to_scan = [s for s in all_symbols if self._is_symbol_scannable(s)]
         if not symbols_to_scan:
             print("⚠️ No symbols to scan found in market structure")
             return
 
-        print(f"🎯 Scanning {len(symbols_to_scan)} symbols: {symbols_to_scan}")
+        print(f"🎯 Scanning {len(symbols_to_scan)} symbols")
 
-        for symbol in symbols_to_scan:
-            # Check if we already have a position
-            if symbol in self._open_positions:
-                continue
+        stats = await self._scan_pipeline.run(
+            symbols_to_scan,
+            gather=lambda symbol: self._gather_symbol_signals(symbol, active_agents),
+            vote=self._vote_symbol_consensus,
+            execute=lambda symbol, consensus: self._execute_consensus_trade(
+                symbol, consensus, active_agents
+            ),
+        )
 
-            # COOLDOWN: Don't enter new position if we traded this symbol in last 15 mins
-            if hasattr(self, "_last_trade_time") and symbol in self._last_trade_time:
-                if time.time() - self._last_trade_time[symbol] < 900:  # 15 minutes
-                    continue
+        phases = stats.to_dict()["phases"]
+        logger.info(
+            f"Scan cycle: {stats.symbols_gathered}/{stats.symbols_requested} gathered, "
+            f"{stats.symbols_executed} executed, {stats.symbols_timed_out} timed out in "
+            f"{stats.total_ms:.0f}ms (gather p95={phases['gather']['p95_ms']:.0f}ms, "
+            f"vote avg={phases['vote']['avg_ms']:.1f}ms, "
+            f"execute avg={phases['execute']['avg_ms']:.0f}ms)"
+        )
 
-            # --- PHASE 1: GATHER SIGNALS (Concurrent) ---
-            # All agents analyze this symbol concurrently
-            analysis_tasks = []
-            for agent in active_agents:
-                analysis_tasks.append(self._analyze_market_for_agent(agent, symbol))
+    def _is_symbol_scannable(self, symbol: str) -> bool:
+        """Return False for symbols with an open position or a recent entry."""
+        # Check if we already have a position
+        if symbol in self._open_positions:
+            return False
 
-            # Wait for all agents to analyze this symbol
-            results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
+        # COOLDOWN: Don't enter new position if we traded this symbol in last 15 mins
+        if hasattr(self, "_last_trade_time") and symbol in self._last_trade_time:
+            if time.time() - self._last_trade_time[symbol] < 900:  # 15 minutes
+                return False
 
-            # Process results
-            params_updated = False
-            for i, analysis in enumerate(results):
-                if isinstance(analysis, Exception):
-                    continue
+        return True
 
-                agent = active_agents[i]
+    async def _gather_symbol_signals(
+        self, symbol: str, active_agents: List[MinimalAgentState]
+    ) -> int:
+        """Phase 1: all agents analyse ``symbol`` concurrently and submit signals.
 
-                # If actionable (or at least worthy of logging), Submit to Consensus
-                # LOWERED THRESHOLD: 0.45 (was 0.65) to ensure Intelligence Feed is active
-                if (
-                    isinstance(analysis, dict)
-                    and analysis.get("signal") in ["BUY", "SELL"]
-                    and analysis.get("confidence", 0) >= 0.45
-                ):
+        Returns the number of signals submitted to the consensus engine.
+        """
+        analysis_tasks = [self._analyze_market_for_agent(agent, symbol) for agent in active_agents]
+        results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
 
-                    # Register if needed
-                    if agent.id not in self._consensus_engine.agent_registry:
-                        self._consensus_engine.register_agent(
-                            agent.id,
-                            agent.type,
-                            "trend" if "trend" in agent.name.lower() else "mean_reversion",
-                        )
+        submitted = 0
+        for agent, analysis in zip(active_agents, results):
+            if isinstance(analysis, Exception):
+                continue
 
-                    # Create Signal
-                    sig_type = (
-                        SignalType.ENTRY_LONG
-                        if analysis["signal"] == "BUY"
-                        else SignalType.ENTRY_SHORT
-                    )
+            # If actionable (or at least worthy of logging), Submit to Consensus
+            # LOWERED THRESHOLD: 0.45 (was 0.65) to ensure Intelligence Feed is active
+            if (
+                isinstance(analysis, dict)
+                and analysis.get("signal") in ["BUY", "SELL"]
+                and analysis.get("confidence", 0) >= 0.45
+            ):
 
-                    agent_signal = AgentSignal(
-                        agent_id=agent.id,
-                        signal_type=sig_type,
-                        confidence=analysis["confidence"],
-                        strength=analysis["confidence"],
-                        symbol=symbol,
-                        timestamp_us=int(time.time() * 1000000),
-                        reasoning=analysis.get("thesis", "Agent Signal"),
+                # Register if needed
+                if agent.id not in self._consensus_engine.agent_registry:
+                    self._consensus_engine.register_agent(
+                        agent.id,
+                        agent.type,
+                        "trend" if "trend" in agent.name.lower() else "mean_reversion",
                     )
 
-                    self._consensus_engine.submit_signal(agent_signal)
-                    params_updated = True
-
-            # --- PHASE 2: CONSENSUS VOTE (Immediate) ---
-            # Query consensus engine for this symbol
-            signals = self._consensus_engine.pending_signals.get(symbol, [])
+                # Create Signal
+                sig_type = (
+                    SignalType.ENTRY_LONG if analysis["signal"] == "BUY" else SignalType.ENTRY_SHORT
+                )
 
-            if not signals or len(signals) == 0:
-                print(f"🚫 DEBUG: No signals for {symbol}, skipping")
-                continue  # No signals for this symbol, move to next
+                agent_signal = AgentSignal(
+                    agent_id=agent.id,
+                    signal_type=sig_type,
+                    confidence=analysis["confidence"],
+                    strength=analysis["confidence"],
+                    symbol=symbol,
+                    timestamp_us=int(time.time() * 1000000),
+                    reasoning=analysis.get("thesis", "Agent Signal"),
+                )
 
-            print(f"📊 DEBUG: {len(signals)} signals for {symbol}, conducting vote...")
-            # Conduct Vote immediately
-            consensus = await self._consensus_engine.conduct_consensus_vote(symbol)
+                self._consensus_engine.submit_signal(agent_signal)
+                submitted += 1
 
-            # Record consensus in history for dashboard
-            if consensus:
-                self._consensus_history.append(
-                    {
-                        "symbol": symbol,
-                        "timestamp": int(time.time()),
-                        "winning_signal": (
-                            str(consensus.winning_signal.value)
-                            if hasattr(consensus.winning_signal, "value")
-                            else str(consensus.winning_signal)
-                        ),
-                        "confidence": float(consensus.consensus_confidence),
-                        "agreement": float(consensus.agreement_level),
-                        "is_strong": bool(consensus.consensus_confidence >= 0.70),
-                        "reasoning": f"Consensus achieved by agent swarm for {symbol}.",
-                    }
-                )
+        return submitted
 
-            if not consensus or not consensus.winning_signal:
-                print(f"🚫 DEBUG: No winning signal for {symbol}")
-                continue
+    async def _vote_symbol_consensus(self, symbol: str, submitted: int):
+        """Phase 2: run the consensus vote for ``symbol``.
 
-            # FILTER: High Conviction Swarm Only
-            # LOWERED THRESHOLD: 0.60 (was 0.75) for Demo/Responsiveness
-            MIN_CONFIDENCE = 0.60
-            MIN_AGREEMENT = 0.45  # (was 0.50)
+        Returns the ``ConsensusResult`` if it clears the strong-consensus filter,
+        otherwise None.
+        """
+        signals = self._consensus_engine.pending_signals.get(symbol, [])
 
-            if (
-                consensus.consensus_confidence < MIN_CONFIDENCE
-                or consensus.agreement_level < MIN_AGREEMENT
-            ):
-                print(f"⚠️ Weak Consensus for {symbol}: Conf={consensus.consensus_confidence:.2f}")
-                # We still produced a consensus result, so it will show up in the UI history!
-                continue
+        if not signals:
+            print(f"🚫 DEBUG: No signals for {symbol}, skipping")
+            return None
 
-            print(
-                f"✅ STRONG CONSENSUS: {symbol} {consensus.winning_signal} (conf={consensus.consensus_confidence:.2f})"
-            )
+        print(f"📊 DEBUG: {len(signals)} signals for {symbol}, conducting vote...")
+        consensus = await self._consensus_engine.conduct_consensus_vote(symbol)
 
-            # --- PHASE 3: EXECUTION ---
-            winning_signal = consensus.winning_signal
-            side = (
-                "BUY"
-                if winning_signal in [SignalType.ENTRY_LONG, SignalType.EXIT_SHORT]
-                else "SELL"
+        # Record consensus in history for dashboard
+        if consensus:
+            self._consensus_history.append(
+                {
+                    "symbol": symbol,
+                    "timestamp": int(time.time()),
+                    "winning_signal": (
+                        str(consensus.winning_signal.value)
+                        if hasattr(consensus.winning_signal, "value")
+                        else str(consensus.winning_signal)
+                    ),
+                    "confidence": float(consensus.consensus_confidence),
+                    "agreement": float(consensus.agreement_level),
+                    "is_strong": bool(consensus.consensus_confidence >= 0.70),
+                    "reasoning": f"Consensus achieved by agent swarm for {symbol}.",
+                }
             )
 
-            # Determine Position Size
-            account_balance = self._portfolio.balance
-            print(f"💰 DEBUG: Account balance: ${account_balance:.2f}")
-
-            # Base size: 15% of account per trade (High Conviction)
-            # Adjusted by confidence
-            base_size = 0.15
-            size_multiplier = consensus.consensus_confidence  # 0.8 to 1.0
-
-            # Apply Agreement Bonus (if everyone agrees, go bigger)
-            agreement_bonus = 1.0 + (consensus.agreement_level - 0.5)
-
-            # --- ASYMMETRIC POSITION SIZING (Refined) ---
-            # Priority 1: User Bullish Bedrocks (BTC, ETH, SOL)
-            BULLISH_BEDROCKS = {"BTCUSDT", "ETHUSDT", "SOLUSDT"}
-
-            # Priority 2: User High-Growth Favorites (ZEC, ASTER, PENGU, HYPE)
-            BULLISH_FAVORITES = {"ZECUSDT", "ASTERUSDT", "PENGUUSDT", "HYPEUSDT"}
-
-            # Priority 3: Market Large Caps
-            LARGE_CAPS = {
-                "BNBUSDT",
-                "XRPUSDT",
-                "ADAUSDT",
-                "DOGEUSDT",
-                "AVAXUSDT",
-                "LINKUSDT",
-                "SUIUSDT",
-                "APTUSDT",
-                "NEARUSDT",
-            }
-
-            if symbol in BULLISH_BEDROCKS:
-                mcap_multiplier = 2.0  # Largest capital allocation
-                print(f"💎 Bedrock Asset: {symbol} -> 2.0x size multiplier")
-            elif symbol in BULLISH_FAVORITES:
-                mcap_multiplier = 1.5  # High-conviction growth
-                print(f"🔥 Bullish Favorite: {symbol} -> 1.5x size multiplier")
-            elif symbol in LARGE_CAPS:
-                mcap_multiplier = 1.0  # Standard large cap
-                print(f"📊 Large Cap: {symbol} -> 1.0x size multiplier")
-            elif any(mid in symbol for mid in ["MATIC", "DOT", "SHIB", "LTC", "TRX", "ATOM"]):
-                mcap_multiplier = 0.8  # Mid cap
-                print(f"📈 Mid Cap: {symbol} -> 0.8x size multiplier")
-            else:
-                # Small caps: Asymmetric bet (Small risk, huge potential)
-                mcap_multiplier = 0.4  # Small absolute notional, letting it run
-                print(f"🚀 Asymmetric Small Cap: {symbol} -> 0.4x size multiplier (High R/R)")
+        if not consensus or not consensus.winning_signal:
+            print(f"🚫 DEBUG: No winning signal for {symbol}")
+            return None
 
-            target_notional = (
-                account_balance * base_size * size_multiplier * agreement_bonus * mcap_multiplier
-            )
-            print(
-                f"📏 DEBUG: Target notional: ${target_notional:.2f} (balance: ${account_balance:.2f}, conf: {consensus.consensus_confidence:.2f}, mcap: {mcap_multiplier}x)"
-            )
+        # FILTER: High Conviction Swarm Only
+        # LOWERED THRESHOLD: 0.60 (was 0.75) for Demo/Responsiveness
+        MIN_CONFIDENCE = 0.60
+        MIN_AGREEMENT = 0.45  # (was 0.50)
+
+        if (
+            consensus.consensus_confidence < MIN_CONFIDENCE
+            or consensus.agreement_level < MIN_AGREEMENT
+        ):
+            print(f"⚠️ Weak Consensus for {symbol}: Conf={consensus.consensus_confidence:.2f}")
+            # We still produced a consensus result, so it will show up in the UI history!
+            return None
 
-            # Hard Cap: Max 25% of account per trade (30% for Tier 1)
-            MAX_POSITION_SIZE = 0.30 if symbol in TIER_1_TOKENS else 0.25
-            max_allowed_notional = account_balance * MAX_POSITION_SIZE
-            if target_notional > max_allowed_notional:
-                target_notional = max_allowed_notional
+        print(
+            f"✅ STRONG CONSENSUS: {symbol} {consensus.winning_signal} (conf={consensus.consensus_confidence:.2f})"
+        )
+        return consensus
 
-            # --- PHASE 3: RISK CHECKS & EXECUTION ---
-            try:
-                # 🛡️ RiskGuard: Global risk protection (MAX $50 loss per trade)
-                if RISK_GUARD_AVAILABLE:
-                    risk_guard = get_risk_guard()
-
-                    # Get stop-loss percentage (default 1.5% if not calculated)
-                    sl_pct = 0.015  # Default stop-loss percentage
-
-                    # Check trade against all risk limits
-                    risk_check = risk_guard.check_trade(
-                        portfolio_balance=account_balance,
-                        proposed_notional=target_notional,
-                        proposed_leverage=5.0,  # Standard leverage (capped at 10x)
-                        stop_loss_pct=sl_pct,
-                        entry_price=1.0,  # Placeholder, actual price checked later
-                        symbol=symbol,
-                        atr_pct=0.02,  # Default ATR, could be fetched from market data
-                    )
+    async def _execute_consensus_trade(
+        self, symbol: str, consensus, active_agents: List[MinimalAgentState]
+    ):
+        """Phase 3: size, risk-check and execute a strong consensus for ``symbol``."""
+        # Another symbol in this cycle may have filled first
+        if not self._is_symbol_scannable(symbol):
+            return
 
-                    if not risk_check.approved:
-                        print(f"🛡️ RiskGuard BLOCKED: {symbol} - {risk_check.reason}")
-                        continue
+        winning_signal = consensus.winning_signal
+        side = (
+            "BUY"
+            if winning_signal in [SignalType.ENTRY_LONG, SignalType.EXIT_SHORT]
+            else "SELL"
+        )
 
-                    # Apply adjusted notional from RiskGuard
-                    if risk_check.adjusted_size < target_notional:
-                        print(
-                            f"🛡️ RiskGuard adjusted: ${target_notional:.2f} → ${risk_check.adjusted_size:.2f}"
-                        )
-                        target_notional = risk_check.adjusted_size
+        # Determine Position Size
+        account_balance = self._portfolio.balance
+        print(f"💰 DEBUG: Account balance: ${account_balance:.2f}")
+
+        # Base size: 15% of account per trade (High Conviction)
+        # Adjusted by confidence
+        base_size = 0.15
+        size_multiplier = consensus.consensus_confidence  # 0.8 to 1.0
+
+        # Apply Agreement Bonus (if everyone agrees, go bigger)
+        agreement_bonus = 1.0 + (consensus.agreement_level - 0.5)
+
+        # --- ASYMMETRIC POSITION SIZING (Refined) ---
+        # Priority 1: User Bullish Bedrocks (BTC, ETH, SOL)
+        BULLISH_BEDROCKS = {"BTCUSDT", "ETHUSDT", "SOLUSDT"}
+
+        # Priority 2: User High-Growth Favorites (ZEC, ASTER, PENGU, HYPE)
+        BULLISH_FAVORITES = {"ZECUSDT", "ASTERUSDT", "PENGUUSDT", "HYPEUSDT"}
+
+        # Priority 3: Market Large Caps
+        LARGE_CAPS = {
+            "BNBUSDT",
+            "XRPUSDT",
+            "ADAUSDT",
+            "DOGEUSDT",
+            "AVAXUSDT",
+            "LINKUSDT",
+            "SUIUSDT",
+            "APTUSDT",
+            "NEARUSDT",
+        }
 
-                    print(
-                        f"🛡️ RiskGuard: MaxLoss=${risk_check.max_loss_usd:.2f} | {risk_check.reason}"
-                    )
+        if symbol in BULLISH_BEDROCKS:
+            mcap_multiplier = 2.0  # Largest capital allocation
+            print(f"💎 Bedrock Asset: {symbol} -> 2.0x size multiplier")
+        elif symbol in BULLISH_FAVORITES:
+            mcap_multiplier = 1.5  # High-conviction growth
+            print(f"🔥 Bullish Favorite: {symbol} -> 1.5x size multiplier")
+        elif symbol in LARGE_CAPS:
+            mcap_multiplier = 1.0  # Standard large cap
+            print(f"📊 Large Cap: {symbol} -> 1.0x size multiplier")
+        elif any(mid in symbol for mid in ["MATIC", "DOT", "SHIB", "LTC", "TRX", "ATOM"]):
+            mcap_multiplier = 0.8  # Mid cap
+            print(f"📈 Mid Cap: {symbol} -> 0.8x size multiplier")
+        else:
+            # Small caps: Asymmetric bet (Small risk, huge potential)
+            mcap_multiplier = 0.4  # Small absolute notional, letting it run
+            print(f"🚀 Asymmetric Small Cap: {symbol} -> 0.4x size multiplier (High R/R)")
 
-                # 1. Exposure & Concentration Checks
-                MAX_TOTAL_EXPOSURE = 0.80
-                MAX_POSITION_SIZE = 0.15  # Reduced from 0.25 for safety
-                MAX_CONCURRENT_POSITIONS = 4
+        target_notional = (
+            account_balance * base_size * size_multiplier * agreement_bonus * mcap_multiplier
+        )
+        print(
+            f"📏 DEBUG: Target notional: ${target_notional:.2f} (balance: ${account_balance:.2f}, conf: {consensus.consensus_confidence:.2f}, mcap: {mcap_multiplier}x)"
+        )
 
-                # Check A: Max Positions Limit
-                if len(self._open_positions) >= MAX_CONCURRENT_POSITIONS:
-                    print(
-                        f"⚠️ Risk Check: Max Positions ({MAX_CONCURRENT_POSITIONS}) Reached - Ultra-Focused Mode"
-                    )
-                    continue
+        # Hard Cap: Max 25% of account per trade (30% for Tier 1)
+        MAX_POSITION_SIZE = 0.30 if symbol in BULLISH_BEDROCKS else 0.25
+        max_allowed_notional = account_balance * MAX_POSITION_SIZE
+        if target_notional > max_allowed_notional:
+            target_notional = max_allowed_notional
 
-                # Check B: Exposure Limit
-                total_position_value = sum(
-                    abs(p["quantity"] * p["entry_price"]) for p in self._open_positions.values()
-                )
-                account_balance = self._account_balance or 1000
-                current_exposure = (
-                    total_position_value / account_balance if account_balance > 0 else 1.0
+        # --- PHASE 3: RISK CHECKS & EXECUTION ---
+        try:
+            # 🛡️ RiskGuard: Global risk protection (MAX $50 loss per trade)
+            if RISK_GUARD_AVAILABLE:
+                risk_guard = get_risk_guard()
+
+                # Get stop-loss percentage (default 1.5% if not calculated)
+                sl_pct = 0.015  # Default stop-loss percentage
+
+                # Check trade against all risk limits
+                risk_check = risk_guard.check_trade(
+                    portfolio_balance=account_balance,
+                    proposed_notional=target_notional,
+                    proposed_leverage=5.0,  # Standard leverage (capped at 10x)
+                    stop_loss_pct=sl_pct,
+                    entry_price=1.0,  # Placeholder, actual price checked later
+                    symbol=symbol,
+                    atr_pct=0.02,  # Default ATR, could be fetched from market data
                 )
 
-                if current_exposure >= MAX_TOTAL_EXPOSURE:
-                    print(
-                        f"⚠️ Risk Check: Exposure Limit Hit ({current_exposure:.1%} >= {MAX_TOTAL_EXPOSURE:.0%})"
-                    )
-                    continue
+                if not risk_check.approved:
+                    print(f"🛡️ RiskGuard BLOCKED: {symbol} - {risk_check.reason}")
+                    return
 
-                # Check C: Position Size Limit
-                max_allowed_notional = account_balance * MAX_POSITION_SIZE
-                if target_notional > max_allowed_notional:
+                # Apply adjusted notional from RiskGuard
+                if risk_check.adjusted_size < target_notional:
                     print(
-                        f"⚠️ Risk Check: Position Size Capped (${target_notional:.2f} -> ${max_allowed_notional:.2f})"
+                        f"🛡️ RiskGuard adjusted: ${target_notional:.2f} → ${risk_check.adjusted_size:.2f}"
                     )
-                    target_notional = max_allowed_notional
+                    target_notional = risk_check.adjusted_size
 
-                # 2. Get Market Context
-                aster_symbol = self._normalize_for_aster(symbol)
-                ticker = await self._exchange_client.get_ticker(aster_symbol)
-                current_price = float(ticker.get("lastPrice", 0))
-                if current_price <= 0:
-                    continue
+                print(
+                    f"🛡️ RiskGuard: MaxLoss=${risk_check.max_loss_usd:.2f} | {risk_check.reason}"
+                )
 
-                quantity_float = target_notional / current_price
+            # 1. Exposure & Concentration Checks
+            MAX_TOTAL_EXPOSURE = 0.80
+            MAX_POSITION_SIZE = 0.15  # Reduced from 0.25 for safety
+            MAX_CONCURRENT_POSITIONS = 4
 
-                # 3. Agent Attribution
-                # Use matching agent definition if possible
-                best_agent_id = (
-                    next(iter(consensus.agent_votes))
-                    if consensus.agent_votes
-                    else active_agents[0].id
-                )
-                best_agent = next(
-                    (a for a in active_agents if a.id == best_agent_id), active_agents[0]
+            # Check A: Max Positions Limit
+            if len(self._open_positions) >= MAX_CONCURRENT_POSITIONS:
+                print(
+                    f"⚠️ Risk Check: Max Positions ({MAX_CONCURRENT_POSITIONS}) Reached - Ultra-Focused Mode"
                 )
-                thesis = f"Swarm Consensus ({consensus.consensus_confidence:.2f}): {consensus.reasoning[:50]}..."
+                return
 
+            # Check B: Exposure Limit
+            total_position_value = sum(
+                abs(p["quantity"] * p["entry_price"]) for p in self._open_positions.values()
+            )
+            account_balance = self._account_balance or 1000
+            current_exposure = (
+                total_position_value / account_balance if account_balance > 0 else 1.0
+            )
+
+            if current_exposure >= MAX_TOTAL_EXPOSURE:
                 print(
-                    f"🗳️ SWARM CONSENSUS: {symbol} {side} | Conf: {consensus.consensus_confidence:.2f} | Agents: {consensus.participation_rate:.0%} | Winner: {best_agent.name}"
+                    f"⚠️ Risk Check: Exposure Limit Hit ({current_exposure:.1%} >= {MAX_TOTAL_EXPOSURE:.0%})"
                 )
+                return
 
-                # 4. EXECUTE
-                await self._execute_trade_order(
-                    best_agent, symbol, side, quantity_float, thesis, is_closing=False
+            # Check C: Position Size Limit
+            max_allowed_notional = account_balance * MAX_POSITION_SIZE
+            if target_notional > max_allowed_notional:
+                print(
+                    f"⚠️ Risk Check: Position Size Capped (${target_notional:.2f} -> ${max_allowed_notional:.2f})"
                 )
+                target_notional = max_allowed_notional
 
-                # Mark as traded
-                if not hasattr(self, "_last_trade_time"):
-                    self._last_trade_time = {}
-                self._last_trade_time[symbol] = time.time()
+            # 2. Get Market Context
+            aster_symbol = self._normalize_for_aster(symbol)
+            ticker = await self._exchange_client.get_ticker(aster_symbol)
+            current_price = float(ticker.get("lastPrice", 0))
+            if current_price <= 0:
+                return
 
-            except Exception as e:
-                print(f"⚠️ Swarm Execution Failed for {symbol}: {e}")
+            quantity_float = target_notional / current_price
+
+            # 3. Agent Attribution
+            # Use matching agent definition if possible
+            best_agent_id = (
+                next(iter(consensus.agent_votes))
+                if consensus.agent_votes
+                else active_agents[0].id
+            )
+            best_agent = next(
+                (a for a in active_agents if a.id == best_agent_id), active_agents[0]
+            )
+            thesis = f"Swarm Consensus ({consensus.consensus_confidence:.2f}): {consensus.reasoning[:50]}..."
+
+            print(
+                f"🗳️ SWARM CONSENSUS: {symbol} {side} | Conf: {consensus.consensus_confidence:.2f} | Agents: {consensus.participation_rate:.0%} | Winner: {best_agent.name}"
+            )
+
+            # 4. EXECUTE
+            await self._execute_trade_order(
+                best_agent, symbol, side, quantity_float, thesis, is_closing=False
+            )
+
+            # Mark as traded
+            if not hasattr(self, "_last_trade_time"):
+                self._last_trade_time = {}
+            self._last_trade_time[symbol] = time.time()
+
+        except Exception as e:
+            print(f"⚠️ Swarm Execution Failed for {symbol}: {e}")
 
     # _initialize_agents removed - using _initialize_basic_agents from AGENT_DEFINITIONS
 
@@ -3296,10 +3434,12 @@ SOURCE: *Source:* Sapphire Duality System"""
         self._mcp.add_message("observation", agent.name, message, context)
         # print(f"💬 CHATTER: {agent.name}: {message}")
 
-    async def _manage_positions(self, ticker_map: Dict[str, Any] = None):
+    async def _manage_positions(self, ticker_map: Mapping[str, Any] = None):
         """Monitor all open positions for TP/SL."""
         if not self._open_positions:
             return
+        if ticker_map is None:
+            ticker_map = await self._shared_tickers()
 
         # Snapshot keys
         for symbol in list(self._open_positions.keys()):
@@ -3914,6 +4054,7 @@ SOURCE: *Source:* Sapphire Duality System"""
                 # 1. Update Market Data
                 # await self._fetch_market_structure()
                 ticker_map = await self._monitor_positions()
+                await self._update_correlation_prices(ticker_map)
 
                 # 1. Strategy Execution (Phase 4 Winner: Mean Reversion)
                 await self._execute_winning_strategy()
@@ -3928,7 +4069,7 @@ SOURCE: *Source:* Sapphire Duality System"""
                 await self._check_liquidation_risk()
 
                 # 5. TP/SL Management
-                await self._manage_positions()
+                await self._manage_positions(ticker_map)
 
                 # NEW: Periodically snapshot agent strategies for evolution tracking
                 await self._take_agent_snapshots()
@@ -3946,9 +4087,8 @@ SOURCE: *Source:* Sapphire Duality System"""
                 # NUCLEAR OPTION: Force broadcast every 5 loops (~5 seconds)
                 if loop_iteration % 5 == 0:
                     try:
-                        # Broadcast Portfolio Update
-                        portfolio_data = await self.dashboard_snapshot()
-                        await broadcast_portfolio_update(portfolio_data)
+                        # Broadcast Portfolio Update (delta against the last pushed version)
+                        await self._publish_dashboard()
 
                         # Broadcast Agent Status
                         for agent_id, state in self._agent_states.items():
@@ -4073,9 +4213,9 @@ SOURCE: *Source:* Sapphire Duality System"""
                         best_opportunity.symbol
                     )
 
-                    if correlation_risk:
+                    matrix = correlation_analyzer.get_correlation_matrix()
+                    if correlation_risk and matrix is not None:
                         # Check correlation with existing positions
-                        matrix = correlation_analyzer.get_correlation_matrix()
                         for existing_symbol in self._open_positions.keys():
                             corr = matrix.get_correlation(best_opportunity.symbol, existing_symbol)
                             if corr and abs(corr) > 0.7:  # High correlation threshold
@@ -4994,6 +5134,9 @@ SOURCE: *Source:* Sapphire Duality System"""
         print("🛑 Stopping trading service...")
         self._stop_event.set()
 
+        if self._market_stream:
+            await self._market_stream.stop()
+
         if self._task:
             self._task.cancel()
             try:
@@ -5059,6 +5202,10 @@ SOURCE: *Source:* Sapphire Duality System"""
             except Exception as e:
                 print(f"   ❌ Failed to close {symbol}: {e}")
 
+        # Commit whatever the write-behind journal still holds
+        self._save_positions()
+        await self._journal.close()
+
         self._health.running = False
         print("✅ Trading service stopped and positions closed.")
 
@@ -5108,45 +5255,83 @@ SOURCE: *Source:* Sapphire Duality System"""
             },
         }
 
-    async def dashboard_snapshot(self) -> Dict[str, Any]:
-        """Provide snapshot for dashboard."""
-        messages = []
-        frontend_messages = []
-        try:
-            messages = list(self._mcp.messages)
-
-            # Transform for frontend
-            for msg in messages:
-                # Determine Agent ID
-                sender = msg.get("sender", "System")
-                agent_id = "system"
-                if sender not in ["System", "Grok CIO", "Execution Algo", "Risk Manager"]:
-                    agent_id = sender.lower().replace(" ", "-")
-
-                # Format Timestamp
-                ts = msg.get("timestamp")
-                try:
-                    iso_time = datetime.fromtimestamp(float(ts)).isoformat()
-                except:
-                    iso_time = datetime.now().isoformat()
+    # ----- dashboard -----
 
-                frontend_messages.append(
-                    {
-                        "id": msg.get("id"),
-                        "agentId": agent_id,
-                        "agentName": sender,
-                        "type": msg.get("type", "info").lower(),
-                        "role": msg.get("type", "info").upper(),
-                        "content": msg.get("content", ""),
-                        "timestamp": iso_time,
-                        "relatedSymbol": None,  # specific parsing if needed later
-                    }
-                )
+    def _init_dashboard_state(self) -> DashboardState:
+        """Materialized dashboard: sections rebuild only when their inputs change."""
+        state = DashboardState(self._compose_dashboard)
+        state.add_section(
+            "messages",
+            self._dashboard_messages,
+            fingerprint=lambda: self._deque_fingerprint(self._mcp.messages, head=-1),
+        )
+        state.add_section(
+            "trades",
+            self._dashboard_trades,
+            fingerprint=lambda: self._deque_fingerprint(self._recent_trades, head=0),
+        )
+        # Mark prices move without events, hence the TTL
+        state.add_section(
+            "positions",
+            self._dashboard_positions,
+            fingerprint=lambda: (len(self._open_positions), len(self._hyperliquid_positions)),
+            ttl=1.0,
+        )
+        state.add_section("agents", self.get_agents, ttl=5.0, depends=("trades",))
+        state.add_section("summary", self._dashboard_summary, ttl=1.0)
+        return state
+
+    @staticmethod
+    def _deque_fingerprint(items, head: int):
+        # O(1) change probe: identity, length and the newest element
+        return (id(items), len(items), id(items[head]) if items else None)
+
+    @staticmethod
+    def _format_mcp_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+        # Determine Agent ID
+        sender = msg.get("sender", "System")
+        agent_id = "system"
+        if sender not in ["System", "Grok CIO", "Execution Algo", "Risk Manager"]:
+            agent_id = sender.lower().replace(" ", "-")
+
+        # Format Timestamp
+        ts = msg.get("timestamp")
+        try:
+            iso_time = datetime.fromtimestamp(float(ts)).isoformat()
+        except (TypeError, ValueError):
+            iso_time = datetime.now().isoformat()
 
-        except Exception as e:
-            print(f"⚠️ Failed to get MCP messages: {e}")
+        return {
+            "id": msg.get("id"),
+            "agentId": agent_id,
+            "agentName": sender,
+            "type": msg.get("type", "info").lower(),
+            "role": msg.get("type", "info").upper(),
+            "content": msg.get("content", ""),
+            "timestamp": iso_time,
+            "relatedSymbol": None,  # specific parsing if needed later
+        }
 
-        # Merge Positions (Aster + Hyperliquid)
+    def _dashboard_messages(self) -> List[Dict[str, Any]]:
+        """Transform MCP messages for the frontend; only new messages are formatted."""
+        cache = self._dashboard_message_cache
+        formatted = []
+        for msg in list(self._mcp.messages):
+            key = msg.get("id")
+            entry = cache.get(key)
+            if entry is None:
+                entry = self._format_mcp_message(msg)
+                if key is not None:
+                    cache[key] = entry
+            formatted.append(entry)
+        if len(cache) > len(formatted):
+            live = {entry["id"] for entry in formatted}
+            for key in [k for k in cache if k not in live]:
+                del cache[key]
+        return formatted
+
+    def _dashboard_positions(self) -> List[Dict[str, Any]]:
+        """Merge Aster and Hyperliquid positions."""
         all_positions = []
 
         # Aster Positions
@@ -5198,44 +5383,64 @@ SOURCE: *Source:* Sapphire Duality System"""
                     "sl": None,
                 }
             )
+        return all_positions
 
-        # Prepare System Split Data
-        aster_pnl = sum(t.get("pnl", 0.0) for t in self._recent_trades)
-        aster_volume = sum(t.get("value", 0.0) for t in self._recent_trades)
-        aster_win_rate = 0.0
-        aster_trades_count = len(self._recent_trades)
-        if aster_trades_count > 0:
-            aster_win_rate = (
-                len([t for t in self._recent_trades if t.get("pnl", 0) > 0])
-                / aster_trades_count
-                * 100
-            )
-
-        hl_pnl = float(self._hyperliquid_metrics.get("realized_pnl", 0.0))
-        hl_fees = float(self._hyperliquid_metrics.get("fees_paid", 0.0))
-        hl_volume = float(self._hyperliquid_metrics.get("total_volume", 0.0))
+    def _dashboard_trades(self) -> Dict[str, Any]:
+        """Realized Aster stats over the recent-trades window."""
+        trades = list(self._recent_trades)
+        count = len(trades)
+        wins = sum(1 for t in trades if t.get("pnl", 0) > 0)
+        return {
+            "pnl": sum(t.get("pnl", 0.0) for t in trades),
+            "volume": sum(t.get("value", 0.0) for t in trades),
+            "count": count,
+            "win_rate": wins / count * 100 if count > 0 else 0.0,
+            "recent": trades[:20],
+        }
 
-        # Calc HL Win Rate
+    def _dashboard_summary(self) -> Dict[str, Any]:
+        """Balances, Hyperliquid metrics and system health."""
         hl_trades = int(self._hyperliquid_metrics.get("total_trades", 0))
         hl_wins = int(self._hyperliquid_metrics.get("winning_trades", 0))
-        hl_win_rate = (hl_wins / hl_trades * 100) if hl_trades > 0 else 0.0
+        return {
+            "running": self._health.running,
+            "balance": self._portfolio.balance,
+            "aster_fees": self._aster_fees,
+            "swept_profits": self._swept_profits,
+            "active_agents": len([a for a in self._agent_states.values() if a.active]),
+            "hl_pnl": float(self._hyperliquid_metrics.get("realized_pnl", 0.0)),
+            "hl_fees": float(self._hyperliquid_metrics.get("fees_paid", 0.0)),
+            "hl_volume": float(self._hyperliquid_metrics.get("total_volume", 0.0)),
+            "hl_win_rate": (hl_wins / hl_trades * 100) if hl_trades > 0 else 0.0,
+            "hl_swept_profits": float(self._hyperliquid_metrics.get("swept_profits", 0.0)),
+            "latency_ms": int(np.mean(self._latencies)) if self._latencies else 0,
+        }
+
+    def _compose_dashboard(self, sections: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the dashboard payload from its materialized sections."""
+        trades = sections["trades"]
+        summary = sections["summary"]
+        all_positions = sections["positions"]
+
+        aster_pnl = trades["pnl"]
+        hl_pnl = summary["hl_pnl"]
 
         systems_data = {
             "aster": {
                 "pnl": aster_pnl,
-                "volume": aster_volume,
-                "fees": self._aster_fees,
-                "win_rate": aster_win_rate,
-                "active_agents": len([a for a in self._agent_states.values() if a.active]),
-                "swept_profits": self._swept_profits,
+                "volume": trades["volume"],
+                "fees": summary["aster_fees"],
+                "win_rate": trades["win_rate"],
+                "active_agents": summary["active_agents"],
+                "swept_profits": summary["swept_profits"],
             },
             "hyperliquid": {
                 "pnl": hl_pnl,
-                "volume": hl_volume,
-                "fees": hl_fees,
-                "win_rate": hl_win_rate,
+                "volume": summary["hl_volume"],
+                "fees": summary["hl_fees"],
+                "win_rate": summary["hl_win_rate"],
                 "active_agents": 1,  # The HL service itself
-                "swept_profits": float(self._hyperliquid_metrics.get("swept_profits", 0.0)),
+                "swept_profits": summary["hl_swept_profits"],
             },
         }
 
@@ -5247,7 +5452,7 @@ SOURCE: *Source:* Sapphire Duality System"""
 
         # Use actual portfolio balance from exchange sync
         # self._portfolio.balance is synced from exchange in _initialize_basic_agents
-        initial_basis = self._portfolio.balance if self._portfolio.balance > 0 else 10000.0
+        initial_basis = summary["balance"] if summary["balance"] > 0 else 10000.0
 
         total_pnl_percent = (total_pnl_combined / initial_basis) * 100 if initial_basis > 0 else 0.0
         aster_pnl_percent = (aster_pnl / max(initial_basis * 0.5, 1.0)) * 100  # Assume 50% alloc
@@ -5255,11 +5460,11 @@ SOURCE: *Source:* Sapphire Duality System"""
 
         return {
             "status": "active",
-            "running": self._health.running,
-            "agents": self.get_agents(),
+            "running": summary["running"],
+            "agents": sections["agents"],
             "open_positions": all_positions,
-            "recentTrades": list(self._recent_trades)[:20],
-            "messages": frontend_messages,
+            "recentTrades": trades["recent"],
+            "messages": sections["messages"],
             "total_pnl": total_pnl_combined,
             "total_pnl_percent": total_pnl_percent,
             "realized_pnl": aster_pnl + hl_pnl,
@@ -5273,13 +5478,30 @@ SOURCE: *Source:* Sapphire Duality System"""
             ),
             "systems": systems_data,
             "system_metrics": {
-                "tps": len(self._recent_trades),  # Signals in current rolling window
-                "latency_ms": int(np.mean(self._latencies)) if self._latencies else 0,
-                "uptime_pct": 100.0 if self._health.running else 0.0,
+                "tps": trades["count"],  # Signals in current rolling window
+                "latency_ms": summary["latency_ms"],
+                "uptime_pct": 100.0 if summary["running"] else 0.0,
             },
-            "timestamp": time.time(),
         }
 
+    async def dashboard_snapshot(self) -> Dict[str, Any]:
+        """Provide snapshot for dashboard (carries a monotonically increasing ``version``)."""
+        self._dashboard.refresh()
+        return dict(self._dashboard.data)
+
+    def dashboard_snapshot_bytes(self) -> bytes:
+        """Serialized dashboard snapshot, cached per version."""
+        self._dashboard.refresh()
+        return self._dashboard.to_bytes()
+
+    async def _publish_dashboard(self) -> None:
+        """Push the dashboard to /ws portfolio subscribers as a JSON-patch delta."""
+        self._dashboard.refresh()
+        manager = await get_websocket_manager()
+        await manager.publish_state(
+            SubscriptionType.PORTFOLIO_CHANGES, self._dashboard.version, self._dashboard.data
+        )
+
     def get_agents(self) -> List[Dict[str, Any]]:
         """Get agent information with performance metrics."""
         # Deduplicate agents by ID (agents are stored by both id and name in _agent_states)
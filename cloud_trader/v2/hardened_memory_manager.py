@@ -13,6 +13,8 @@ This module provides:
 2. Write-ahead logging for crash recovery
 3. Memory health monitoring
 4. Automatic retry with exponential backoff
+5. Id-mapped vector index snapshotted to local disk for warm restarts
+6. Micro-batched embedding and a recall cache for in-loop queries
 
 Author: Sapphire V2 Architecture Team
 Version: 2.1.0
@@ -28,6 +30,7 @@ import os
 import pickle
 import tempfile
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -299,12 +302,229 @@ class WriteAheadLog:
         return cleaned
 
 
+class VectorStore:
+    """
+    Id-mapped embedding store with exact L2 search.
+    
+    Rows live in one float32 matrix with ``memory_id -> row`` and
+    ``row -> memory_id`` maps kept side by side, so search hits map straight
+    back to memories. Uses ``faiss.IndexIDMap2`` when FAISS is installed and a
+    NumPy scan otherwise. A saved store is reopened memory-mapped; the matrix
+    is only copied into RAM on the first write after loading.
+    """
+    
+    VECTORS_FILE = "vectors.npy"
+    IDS_FILE = "ids.json"
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._matrix: np.ndarray = np.zeros((0, dim), dtype=np.float32)
+        self._norms: np.ndarray = np.zeros(0, dtype=np.float32)
+        self._row_ids: list[Optional[str]] = []
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+        self._faiss = faiss.IndexIDMap2(faiss.IndexFlatL2(dim)) if FAISS_AVAILABLE else None
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._rows
+    
+    @property
+    def backend(self) -> str:
+        return "faiss" if self._faiss is not None else "numpy"
+    
+    def add(self, memory_id: str, vector: np.ndarray) -> None:
+        """Insert or replace the vector for a memory."""
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Expected embedding of dim {self.dim}, got {vector.shape[0]}")
+        if memory_id in self._rows:
+            self.remove(memory_id)
+        
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._row_ids)
+            self._row_ids.append(None)
+        self._ensure_capacity(len(self._row_ids))
+        
+        self._matrix[row] = vector
+        self._norms[row] = float(vector @ vector)
+        self._row_ids[row] = memory_id
+        self._rows[memory_id] = row
+        if self._faiss is not None:
+            self._faiss.add_with_ids(vector.reshape(1, -1), np.array([row], dtype=np.int64))
+    
+    def remove(self, memory_id: str) -> bool:
+        row = self._rows.pop(memory_id, None)
+        if row is None:
+            return False
+        self._row_ids[row] = None
+        self._free.append(row)
+        if self._faiss is not None:
+            self._faiss.remove_ids(np.array([row], dtype=np.int64))
+        return True
+    
+    def vector(self, memory_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(memory_id)
+        return self._matrix[row] if row is not None else None
+    
+    def search(self, query: np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Nearest ``k`` memories as ``(memory_id, squared L2 distance)``, closest first."""
+        k = min(k, len(self._rows))
+        if k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        
+        if self._faiss is not None:
+            distances, rows = self._faiss.search(query.reshape(1, -1), k)
+            return [
+                (self._row_ids[row], float(dist))
+                for dist, row in zip(distances[0], rows[0])
+                if row >= 0
+            ]
+        
+        used = len(self._row_ids)
+        distances = self._norms[:used] - 2.0 * (self._matrix[:used] @ query) + float(query @ query)
+        np.maximum(distances, 0.0, out=distances)
+        if self._free:
+            distances[self._free] = np.inf
+        if k < used:
+            top = np.argpartition(distances, k - 1)[:k]
+        else:
+            top = np.arange(used)
+        top = top[np.argsort(distances[top], kind="stable")]
+        return [(self._row_ids[row], float(distances[row])) for row in top[:k]]
+    
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the matrix, or take a writable copy of a memory-mapped one."""
+        size = len(self._matrix)
+        if rows <= size and self._matrix.flags.writeable:
+            return
+        capacity = max(64, rows, 2 * size) if rows > size else size
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        norms = np.zeros(capacity, dtype=np.float32)
+        matrix[:size] = self._matrix
+        norms[:size] = self._norms
+        self._matrix, self._norms = matrix, norms
+    
+    def save(self, directory: Path) -> None:
+        """Write live rows (compacted) and their ids atomically."""
+        directory.mkdir(parents=True, exist_ok=True)
+        ids = [memory_id for memory_id in self._row_ids if memory_id is not None]
+        rows = [self._rows[memory_id] for memory_id in ids]
+        
+        tmp_vectors = directory / f"{self.VECTORS_FILE}.tmp"
+        with open(tmp_vectors, "wb") as f:
+            np.save(f, np.ascontiguousarray(self._matrix[rows], dtype=np.float32))
+        tmp_ids = directory / f"{self.IDS_FILE}.tmp"
+        with open(tmp_ids, "w") as f:
+            json.dump(ids, f)
+        os.replace(tmp_vectors, directory / self.VECTORS_FILE)
+        os.replace(tmp_ids, directory / self.IDS_FILE)
+    
+    @classmethod
+    def load(cls, directory: Path, dim: int) -> Optional["VectorStore"]:
+        """Open a saved store memory-mapped; None if absent or of another dimension."""
+        vectors_path = directory / cls.VECTORS_FILE
+        ids_path = directory / cls.IDS_FILE
+        if not vectors_path.exists() or not ids_path.exists():
+            return None
+        
+        matrix = np.load(vectors_path, mmap_mode="r")
+        with open(ids_path) as f:
+            ids = json.load(f)
+        if matrix.ndim != 2 or matrix.shape[1] != dim or matrix.shape[0] != len(ids):
+            return None
+        
+        store = cls(dim)
+        store._matrix = matrix
+        store._norms = np.einsum("ij,ij->i", matrix, matrix).astype(np.float32)
+        store._row_ids = list(ids)
+        store._rows = {memory_id: row for row, memory_id in enumerate(ids)}
+        if store._faiss is not None and len(ids):
+            store._faiss.add_with_ids(
+                np.ascontiguousarray(matrix), np.arange(len(ids), dtype=np.int64)
+            )
+        return store
+
+
+class BatchingEmbedder:
+    """
+    Coalesces concurrent embedding requests into single model calls.
+    
+    Texts requested within ``max_delay`` seconds of the first pending one
+    (or until ``max_batch`` distinct texts are queued) are encoded together
+    off the event loop; duplicates within a batch are encoded once.
+    """
+    
+    def __init__(
+        self,
+        model: Optional[Any],
+        dim: int,
+        max_batch: int = 32,
+        max_delay: float = 0.005,
+    ):
+        self.model = model
+        self.dim = dim
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+    
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.create_task(self._encode(batch))
+    
+    async def _encode(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        texts = list(batch)
+        vectors: Optional[np.ndarray] = None
+        try:
+            if self.model is None:
+                # Random embeddings for testing
+                logger.debug("[Memory] No embedding model - using random vectors")
+                vectors = np.random.randn(len(texts), self.dim).astype(np.float32)
+            else:
+                encoded = await asyncio.get_running_loop().run_in_executor(
+                    None, self.model.encode, texts
+                )
+                vectors = np.asarray(encoded, dtype=np.float32).reshape(len(texts), -1)
+        except Exception as e:
+            logger.error(f"❌ [Memory] Embedding generation failed: {e}")
+        
+        self.batches += 1
+        for i, text in enumerate(texts):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(None if vectors is None else vectors[i].copy())
+
+
 class HardenedMemoryManager:
     """
     Production-grade memory manager with guaranteed persistence.
     
     Features:
-    - FAISS vector search for semantic retrieval
+    - Id-mapped vector search (FAISS or NumPy) with a local on-disk snapshot
+    - Micro-batched embedding and cached recall results
     - Firestore persistence with verification
     - Write-ahead logging for crash recovery
     - Automatic retry with exponential backoff
@@ -329,6 +549,9 @@ class HardenedMemoryManager:
     EMBEDDING_DIM = 384  # For sentence-transformers
     MAX_RETRY_ATTEMPTS = 3
     RETRY_BASE_DELAY = 1.0  # seconds
+    RECALL_CACHE_SIZE = 256
+    SNAPSHOT_MEMORIES_FILE = "memories.jsonl"
+    SNAPSHOT_MANIFEST_FILE = "manifest.json"
     
     def __init__(
         self,
@@ -336,6 +559,9 @@ class HardenedMemoryManager:
         embedding_model: Optional[Any] = None,
         enable_wal: bool = True,
         wal_dir: Optional[Path] = None,
+        index_dir: Optional[Path] = None,
+        embed_batch_size: int = 32,
+        embed_max_delay: float = 0.005,
     ):
         """
         Initialize memory manager.
@@ -345,15 +571,26 @@ class HardenedMemoryManager:
             embedding_model: Optional embedding model (sentence-transformers)
             enable_wal: Enable write-ahead logging
             wal_dir: Directory for WAL files
+            index_dir: Directory for the local index snapshot (None disables it)
+            embed_batch_size: Maximum texts per embedding model call
+            embed_max_delay: Seconds to wait for more texts before encoding a batch
         """
         self._db = firestore_client
         self._embedding_model = embedding_model
         self._enable_wal = enable_wal
+        self._index_dir = Path(index_dir) if index_dir else None
+        self._embedder = BatchingEmbedder(
+            embedding_model, self.EMBEDDING_DIM, embed_batch_size, embed_max_delay
+        )
         
         # Memory storage
         self._memories: dict[str, Memory] = {}
-        self._index: Optional[Any] = None  # FAISS index
-        self._id_to_index: dict[str, int] = {}  # Map memory ID to FAISS index
+        self._index: Optional[VectorStore] = None
+        self._snapshot_dirty = False
+        
+        # Recall cache keyed by normalized query text (cleared when the index changes)
+        self._recall_cache: OrderedDict[tuple, list[tuple[str, float]]] = OrderedDict()
+        self._query_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
         
         # WAL
         self._wal = WriteAheadLog(wal_dir) if enable_wal else None
@@ -379,12 +616,14 @@ class HardenedMemoryManager:
         
         logger.info("🧠 [Memory] Initializing Hardened Memory Manager...")
         
-        # Initialize FAISS index
-        if FAISS_AVAILABLE:
-            self._index = faiss.IndexFlatL2(self.EMBEDDING_DIM)
-            logger.info(f"✅ [Memory] FAISS index initialized (dim={self.EMBEDDING_DIM})")
-        else:
-            logger.warning("⚠️ [Memory] FAISS not available - vector search disabled")
+        # Warm start from the local snapshot, else an empty index
+        snapshot_time = self._load_local_snapshot()
+        if self._index is None:
+            self._index = VectorStore(self.EMBEDDING_DIM)
+        logger.info(
+            f"✅ [Memory] Vector index ready (dim={self.EMBEDDING_DIM}, "
+            f"backend={self._index.backend})"
+        )
         
         # Initialize Firestore
         try:
@@ -397,8 +636,8 @@ class HardenedMemoryManager:
                 self._health.firestore_connected = True
                 logger.info("✅ [Memory] Firestore connected")
                 
-                # Load existing memories
-                await self._load_from_firestore()
+                # Load existing memories (only newer ones after a warm start)
+                await self._load_from_firestore(since=snapshot_time)
         except Exception as e:
             logger.warning(f"⚠️ [Memory] Firestore unavailable: {e}")
             self._health.firestore_connected = False
@@ -439,12 +678,16 @@ class HardenedMemoryManager:
         await test_ref.set({"timestamp": datetime.utcnow().isoformat()})
         return True
     
-    async def _load_from_firestore(self) -> None:
-        """Load memories from Firestore."""
+    async def _load_from_firestore(self, since: Optional[datetime] = None) -> None:
+        """Load memories from Firestore, optionally only those created after ``since``."""
         if self._db is None:
             return
         
-        docs = self._db.collection(self.FIRESTORE_COLLECTION).stream()
+        collection = self._db.collection(self.FIRESTORE_COLLECTION)
+        if since is not None:
+            docs = collection.where("created_at", ">", since.isoformat()).stream()
+        else:
+            docs = collection.stream()
         count = 0
         
         async for doc in docs:
@@ -462,30 +705,113 @@ class HardenedMemoryManager:
         logger.info(f"📥 [Memory] Loaded {count} memories from Firestore")
     
     async def _add_to_index(self, memory: Memory) -> None:
-        """Add memory to FAISS index."""
+        """Add memory to the vector index."""
         if self._index is None or memory.embedding is None:
             return
         
-        # Add to index
-        embedding = memory.embedding.reshape(1, -1).astype(np.float32)
-        idx = self._index.ntotal
-        self._index.add(embedding)
-        self._id_to_index[memory.memory_id] = idx
-        self._health.faiss_index_size = self._index.ntotal
+        try:
+            self._index.add(memory.memory_id, memory.embedding)
+        except ValueError as e:
+            logger.error(f"❌ [Memory] Cannot index {memory.memory_id}: {e}")
+            return
+        self._recall_cache.clear()
+        self._snapshot_dirty = True
+        self._health.faiss_index_size = len(self._index)
     
     async def _generate_embedding(self, text: str) -> Optional[np.ndarray]:
-        """Generate embedding for text."""
-        if self._embedding_model is None:
-            # Return random embedding for testing
-            logger.debug("[Memory] No embedding model - using random vector")
-            return np.random.randn(self.EMBEDDING_DIM).astype(np.float32)
+        """Generate embedding for text (batched with concurrent callers)."""
+        return await self._embedder.embed(text)
+    
+    @staticmethod
+    def _normalize_query(text: str) -> str:
+        return " ".join(text.lower().split())
+    
+    async def _query_embedding(self, normalized: str) -> Optional[np.ndarray]:
+        """Embed a normalized query, reusing recent query vectors."""
+        vector = self._query_vectors.get(normalized)
+        if vector is not None:
+            self._query_vectors.move_to_end(normalized)
+            return vector
+        
+        vector = await self._generate_embedding(normalized)
+        if vector is not None:
+            self._query_vectors[normalized] = vector
+            if len(self._query_vectors) > self.RECALL_CACHE_SIZE:
+                self._query_vectors.popitem(last=False)
+        return vector
+    
+    # ----- local snapshot -----
+    
+    def save_local_snapshot(self) -> bool:
+        """Write the index and memory records to ``index_dir`` for warm restarts."""
+        if self._index_dir is None or self._index is None:
+            return False
         
         try:
-            embedding = self._embedding_model.encode(text)
-            return np.array(embedding, dtype=np.float32)
+            self._index.save(self._index_dir)
+            records_path = self._index_dir / self.SNAPSHOT_MEMORIES_FILE
+            tmp_records = records_path.with_suffix(".tmp")
+            with open(tmp_records, "w") as f:
+                for memory in self._memories.values():
+                    record = memory.to_dict()
+                    record["embedding"] = None  # lives in the vector file
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_records, records_path)
+            
+            manifest_path = self._index_dir / self.SNAPSHOT_MANIFEST_FILE
+            tmp_manifest = manifest_path.with_suffix(".tmp")
+            with open(tmp_manifest, "w") as f:
+                json.dump(
+                    {
+                        "saved_at": datetime.utcnow().isoformat(),
+                        "dim": self.EMBEDDING_DIM,
+                        "count": len(self._memories),
+                    },
+                    f,
+                )
+            os.replace(tmp_manifest, manifest_path)
         except Exception as e:
-            logger.error(f"❌ [Memory] Embedding generation failed: {e}")
+            logger.error(f"❌ [Memory] Failed to save local snapshot: {e}")
+            return False
+        
+        self._snapshot_dirty = False
+        logger.debug(f"💾 [Memory] Local snapshot saved ({len(self._memories)} memories)")
+        return True
+    
+    def _load_local_snapshot(self) -> Optional[datetime]:
+        """Load memories and the memory-mapped index; returns the snapshot time."""
+        if self._index_dir is None:
+            return None
+        
+        manifest_path = self._index_dir / self.SNAPSHOT_MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("dim") != self.EMBEDDING_DIM:
+                logger.warning("⚠️ [Memory] Local snapshot has a different dim - ignoring")
+                return None
+            
+            index = VectorStore.load(self._index_dir, self.EMBEDDING_DIM)
+            if index is None:
+                return None
+            
+            memories: dict[str, Memory] = {}
+            with open(self._index_dir / self.SNAPSHOT_MEMORIES_FILE) as f:
+                for line in f:
+                    memory = Memory.from_dict(json.loads(line))
+                    memory.embedding = index.vector(memory.memory_id)
+                    memories[memory.memory_id] = memory
+        except Exception as e:
+            logger.warning(f"⚠️ [Memory] Local snapshot unreadable: {e}")
             return None
+        
+        self._index = index
+        self._memories.update(memories)
+        logger.info(f"📂 [Memory] Warm start: {len(memories)} memories from local snapshot")
+        return datetime.fromisoformat(manifest["saved_at"])
     
     async def remember(
         self,
@@ -653,49 +979,49 @@ class HardenedMemoryManager:
             logger.debug("[Memory] No memories to search")
             return []
         
-        # Generate query embedding
-        query_embedding = await self._generate_embedding(query)
-        if query_embedding is None:
-            logger.warning("[Memory] Could not generate query embedding")
-            return []
-        
-        # Search FAISS index
-        if self._index is not None and self._index.ntotal > 0:
-            query_vec = query_embedding.reshape(1, -1).astype(np.float32)
-            distances, indices = self._index.search(query_vec, min(top_k * 2, self._index.ntotal))
-            
-            # Map indices back to memories
-            results = []
-            index_to_id = {v: k for k, v in self._id_to_index.items()}
+        # Search the vector index
+        if self._index is not None and len(self._index) > 0:
+            normalized = self._normalize_query(query)
+            cache_key = (normalized, top_k, memory_type, min_relevance)
+            hits = self._recall_cache.get(cache_key)
             
-            for dist, idx in zip(distances[0], indices[0]):
-                if idx < 0:
-                    continue
+            if hits is None:
+                query_embedding = await self._query_embedding(normalized)
+                if query_embedding is None:
+                    logger.warning("[Memory] Could not generate query embedding")
+                    return []
                 
-                memory_id = index_to_id.get(idx)
-                if memory_id is None:
-                    continue
-                
-                memory = self._memories.get(memory_id)
-                if memory is None:
-                    continue
-                
-                # Apply filters
-                if memory_type and memory.memory_type != memory_type:
-                    continue
-                
-                # Convert distance to relevance (0-1)
-                relevance = 1.0 / (1.0 + dist)
-                if relevance < min_relevance:
-                    continue
+                hits = []
+                for memory_id, dist in self._index.search(query_embedding, top_k * 2):
+                    memory = self._memories.get(memory_id)
+                    if memory is None:
+                        continue
+                    
+                    # Apply filters
+                    if memory_type and memory.memory_type != memory_type:
+                        continue
+                    
+                    # Convert distance to relevance (0-1)
+                    relevance = 1.0 / (1.0 + dist)
+                    if relevance < min_relevance:
+                        continue
+                    
+                    hits.append((memory_id, relevance))
+                    if len(hits) == top_k:
+                        break
                 
+                self._recall_cache[cache_key] = hits
+                if len(self._recall_cache) > self.RECALL_CACHE_SIZE:
+                    self._recall_cache.popitem(last=False)
+            else:
+                self._recall_cache.move_to_end(cache_key)
+            
+            results = []
+            for memory_id, relevance in hits:
+                memory = self._memories[memory_id]
                 memory.mark_accessed()
                 results.append((memory, relevance))
             
-            # Sort by relevance and limit
-            results.sort(key=lambda x: x[1], reverse=True)
-            results = results[:top_k]
-            
             logger.debug(
                 f"🔍 [Memory] Recalled {len(results)} memories | "
                 f"Query: '{query[:50]}...'"
@@ -726,6 +1052,10 @@ class HardenedMemoryManager:
                         await self._persist_memory(memory)
                     
                     self._update_health_metrics()
+                    self._snapshot_dirty = True
+                
+                if self._snapshot_dirty:
+                    self.save_local_snapshot()
                     
             except asyncio.CancelledError:
                 break
@@ -778,8 +1108,8 @@ class HardenedMemoryManager:
             if m.persistence_state == PersistenceState.FAILED
         )
         
-        if self._index:
-            self._health.faiss_index_size = self._index.ntotal
+        if self._index is not None:
+            self._health.faiss_index_size = len(self._index)
     
     def get_health(self) -> MemoryHealth:
         """Get current health status."""
@@ -816,6 +1146,8 @@ class HardenedMemoryManager:
             for memory in pending:
                 await self._persist_memory(memory)
         
+        self.save_local_snapshot()
+        
         # Cleanup WAL
         if self._wal:
             self._wal.cleanup_old_logs()
@@ -827,6 +1159,7 @@ class HardenedMemoryManager:
 async def create_memory_manager(
     firestore_client: Optional[Any] = None,
     embedding_model: Optional[Any] = None,
+    index_dir: Optional[Path] = None,
 ) -> HardenedMemoryManager:
     """
     Create and initialize a hardened memory manager.
@@ -834,6 +1167,7 @@ async def create_memory_manager(
     Args:
         firestore_client: Optional Firestore client
         embedding_model: Optional embedding model
+        index_dir: Optional directory for the local index snapshot
         
     Returns:
         Initialized HardenedMemoryManager
@@ -841,6 +1175,7 @@ async def create_memory_manager(
     manager = HardenedMemoryManager(
         firestore_client=firestore_client,
         embedding_model=embedding_model,
+        index_dir=index_dir,
     )
     await manager.initialize()
     return manager
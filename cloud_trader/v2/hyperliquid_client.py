@@ -30,6 +30,8 @@ from typing import Any, Optional
 
 import aiohttp
 
+from ..rate_limit_manager import Priority, get_venue_limiter
+
 # Configure logging with agentic persona
 logger = logging.getLogger(__name__)
 
@@ -162,9 +164,6 @@ class HyperliquidConfig:
         "DOGE-PERP",
     ])
     
-    # Rate limiting
-    rate_limit_per_second: int = 10
-    
     # Retry configuration
     max_retries: int = 3
     retry_delay: float = 1.0
@@ -222,8 +221,7 @@ class HyperliquidClient:
         # State
         self._session: Optional[aiohttp.ClientSession] = None
         self._initialized = False
-        self._last_request_time = 0.0
-        self._request_lock = asyncio.Lock()
+        self._rate_limiter = get_venue_limiter("hyperliquid")
         
         # Cache
         self._positions: dict[str, HyperliquidPosition] = {}
@@ -300,17 +298,18 @@ class HyperliquidClient:
         except Exception as e:
             logger.warning(f"⚠️ [Hyperliquid] Failed to load market info: {e}")
     
-    async def _rate_limit(self) -> None:
-        """Enforce rate limiting."""
-        async with self._request_lock:
-            now = time.time()
-            min_interval = 1.0 / self.config.rate_limit_per_second
-            elapsed = now - self._last_request_time
-            
-            if elapsed < min_interval:
-                await asyncio.sleep(min_interval - elapsed)
-            
-            self._last_request_time = time.time()
+    async def _rate_limit(self, endpoint: str, data: Optional[dict] = None) -> None:
+        """Wait for venue weight; exchange actions preempt info polling."""
+        if endpoint == "/exchange":
+            # Actions cost 1 + floor(batch_length / 40)
+            orders = len((data or {}).get("action", {}).get("orders", []) or [])
+            await self._rate_limiter.acquire({"weight": 1 + orders // 40}, Priority.ORDER)
+        else:
+            # Most info requests weigh 20; the lightweight ones 2
+            info_type = (data or {}).get("type")
+            light = ("l2Book", "allMids", "clearinghouseState", "orderStatus")
+            weight = 2 if info_type in light else 20
+            await self._rate_limiter.acquire({"weight": weight}, Priority.MARKET_DATA)
     
     async def _request(
         self,
@@ -334,11 +333,10 @@ class HyperliquidClient:
         if not self._session:
             raise RuntimeError("Client not initialized")
         
-        await self._rate_limit()
-        
         url = f"{self.config.api_url}{endpoint}"
         
         for attempt in range(self.config.max_retries):
+            await self._rate_limit(endpoint, data)
             try:
                 # Sign request if needed
                 headers = {}
@@ -360,7 +358,8 @@ class HyperliquidClient:
                         logger.warning(
                             f"⚠️ [Hyperliquid] Rate limited, waiting {wait_time}s"
                         )
-                        await asyncio.sleep(wait_time)
+                        # Pauses every Hyperliquid caller, not just this one
+                        self._rate_limiter.penalize(wait_time)
                     else:
                         text = await response.text()
                         logger.error(
@@ -756,7 +756,9 @@ if __name__ == "__main__":
         
         for i, trade in enumerate(activation_trades):
             result = await manager.execute_mit_activation_trade(**trade)
-            print(f"  Trade {i+1}: {result['activation_progress']}/5 - {'🎉 ACTIVATED!' if result.get('is_activated') else f'{result.get(\"trades_remaining\", 0)} remaining'}")
+            remaining = result.get("trades_remaining", 0)
+            status = "🎉 ACTIVATED!" if result.get("is_activated") else f"{remaining} remaining"
+            print(f"  Trade {i+1}: {result['activation_progress']}/5 - {status}")
         
         # Final status
         print("\n")
@@ -3,20 +3,25 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple, Union
 
 import structlog
 from fastapi import WebSocket, WebSocketDisconnect
 
+from .dashboard_state import dumps
 from .time_sync import get_timestamp_us
 
 logger = logging.getLogger(__name__)
 
+# Broadcast engine tuning
+QUEUE_CAPACITY = 10_000  # Pending messages per priority before new ones are dropped
+BATCH_SIZE = 256  # Messages fanned out per pass before yielding to the client writers
+CLIENT_SEND_BUFFER = 512  # Encoded messages buffered per client; the oldest is dropped
+
 
 class MessageType(Enum):
     """Types of WebSocket messages."""
@@ -32,6 +37,35 @@ class MessageType(Enum):
     ALERT = "alert"
     MARKET_REGIME = "market_regime"
     LOG = "log"  # NEW: General log stream
+    STATE_SNAPSHOT = "state_snapshot"  # Full versioned state for a subscription
+    STATE_PATCH = "state_patch"  # JSON-patch ops from one state version to the next
+
+
+def _escape_pointer(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC 6902-style ops turning ``old`` into ``new``.
+
+    Dicts are diffed key by key; lists and scalars that differ are replaced
+    whole, which keeps patches valid without index bookkeeping.
+    """
+    if old == new:
+        return []
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    ops: List[Dict[str, Any]] = []
+    for key in old.keys() - new.keys():
+        ops.append({"op": "remove", "path": f"{path}/{_escape_pointer(key)}"})
+    for key, value in new.items():
+        child = f"{path}/{_escape_pointer(key)}"
+        if key not in old:
+            ops.append({"op": "add", "path": child, "value": value})
+        else:
+            ops.extend(json_patch(old[key], value, child))
+    return ops
 
 
 class SubscriptionType(Enum):
@@ -49,6 +83,23 @@ class SubscriptionType(Enum):
     LOGS = "logs"  # NEW: Log stream subscription
 
 
+# Snapshot-style streams: a newer pending message supersedes the queued one
+COALESCED_SUBSCRIPTIONS = frozenset(
+    {
+        SubscriptionType.PORTFOLIO_CHANGES,
+        SubscriptionType.PERFORMANCE_STATS,
+        SubscriptionType.MARKET_REGIME,
+    }
+)
+
+
+def encode_message(message_type: MessageType, data: Dict[str, Any]) -> str:
+    """Serialize a message envelope once; the text is shared by every recipient."""
+    return dumps(
+        {"type": message_type.value, "timestamp_us": get_timestamp_us(), "data": data}
+    ).decode()
+
+
 @dataclass
 class WebSocketClient:
     """A connected WebSocket client."""
@@ -59,6 +110,24 @@ class WebSocketClient:
     connected_at: int = field(default_factory=get_timestamp_us)
     last_activity: int = field(default_factory=get_timestamp_us)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    outbox: Deque[str] = field(default_factory=lambda: deque(maxlen=CLIENT_SEND_BUFFER))
+    dropped: int = 0
+    writer: Optional[asyncio.Task[None]] = field(default=None, repr=False)
+    _ready: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _idle: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def __post_init__(self) -> None:
+        self._idle.set()
+
+    def enqueue(self, text: str) -> bool:
+        """Buffer an encoded message; returns False if the oldest one was dropped."""
+        overflow = len(self.outbox) == self.outbox.maxlen
+        if overflow:
+            self.dropped += 1
+        self.outbox.append(text)
+        self._idle.clear()
+        self._ready.set()
+        return not overflow
 
     async def send_message(self, message_type: MessageType, data: Dict[str, Any]) -> bool:
         """Send a message to this client."""
@@ -71,6 +140,16 @@ class WebSocketClient:
             logger.error(f"Failed to send message to client {self.client_id}: {e}")
             return False
 
+    async def send_text(self, text: str) -> bool:
+        """Send an already-serialized message."""
+        try:
+            await self.websocket.send_text(text)
+            self.last_activity = get_timestamp_us()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send message to client {self.client_id}: {e}")
+            return False
+
     async def ping(self) -> bool:
         """Send a ping to check if client is still connected."""
         try:
@@ -92,6 +171,16 @@ class WebSocketMessage:
     target_clients: Optional[Set[str]] = None  # Specific clients, None = all subscribers
     created_at: int = field(default_factory=get_timestamp_us)
 
+    def coalesce_key(self) -> Optional[Hashable]:
+        """Key under which a newer message supersedes this one (None = never)."""
+        if self.target_clients:
+            return None
+        if self.subscription_type in COALESCED_SUBSCRIPTIONS:
+            return self.subscription_type
+        if self.subscription_type == SubscriptionType.AGENT_UPDATES:
+            return (self.subscription_type, self.data.get("agent_id"))
+        return None
+
 
 class WebSocketManager:
     """
@@ -100,7 +189,8 @@ class WebSocketManager:
     Features:
     - Subscription-based messaging
     - Client connection management
-    - Message prioritization and queuing
+    - Message prioritization and queuing (event-driven, batched, coalesced)
+    - Serialize-once fan-out through bounded per-client send buffers
     - Heartbeat monitoring
     - Performance metrics
     """
@@ -111,13 +201,13 @@ class WebSocketManager:
             set
         )  # subscription_type -> client_ids
 
-        # Message queues by priority
-        self.message_queues: Dict[int, asyncio.Queue] = {
-            1: asyncio.Queue(maxsize=1000),  # Low
-            2: asyncio.Queue(maxsize=1000),  # Normal
-            3: asyncio.Queue(maxsize=1000),  # High
-            4: asyncio.Queue(maxsize=1000),  # Critical
+        # Message queues by priority: 1=low, 2=normal, 3=high, 4=critical.
+        # A coalesced message is queued as its key; the latest payload lives in _latest.
+        self.message_queues: Dict[int, Deque[Union[WebSocketMessage, Hashable]]] = {
+            priority: deque() for priority in (1, 2, 3, 4)
         }
+        self._latest: Dict[Hashable, WebSocketMessage] = {}
+        self._pending = asyncio.Event()
 
         # Background tasks
         self._broadcast_task: Optional[asyncio.Task[None]] = None
@@ -131,9 +221,15 @@ class WebSocketManager:
             "messages_sent": 0,
             "messages_failed": 0,
             "bytes_sent": 0,
+            "messages_coalesced": 0,
+            "messages_dropped": 0,
             "uptime_seconds": 0,
         }
 
+        # Versioned state per subscription: (version, data), plus each client's version
+        self.states: Dict[SubscriptionType, Tuple[int, Dict[str, Any]]] = {}
+        self._client_state_versions: Dict[str, Dict[SubscriptionType, int]] = defaultdict(dict)
+
         # Callbacks for different message types
         self.message_callbacks: Dict[MessageType, List[Callable[[WebSocketMessage], None]]] = (
             defaultdict(list)
@@ -157,6 +253,8 @@ class WebSocketManager:
     async def stop(self) -> None:
         """Stop the WebSocket manager."""
         self._shutdown_event.set()
+        self._pending.set()
+        await self.flush(timeout=1.0)
 
         # Disconnect all clients
         disconnect_tasks = []
@@ -227,6 +325,12 @@ class WebSocketManager:
         for subscription_type in list(client.subscriptions):
             self.subscriptions[subscription_type].discard(client_id)
 
+        # Stop the writer (unless it is the one disconnecting after a failed send)
+        if client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        client.outbox.clear()
+        client._idle.set()
+
         # Close WebSocket
         try:
             await client.websocket.close(code=1000, reason=reason)
@@ -235,6 +339,7 @@ class WebSocketManager:
 
         # Remove client
         del self.clients[client_id]
+        self._client_state_versions.pop(client_id, None)
         self.stats["active_clients"] -= 1
 
         logger.info(f"WebSocket client disconnected: {client_id} (reason: {reason})")
@@ -248,6 +353,12 @@ class WebSocketManager:
         client.subscriptions.add(subscription_type)
         self.subscriptions[subscription_type].add(client_id)
 
+        # Late joiners start from the current full state, then receive patches
+        if subscription_type in self.states:
+            version, data = self.states[subscription_type]
+            if self._enqueue(client, self._state_snapshot_text(subscription_type, version, data)):
+                self._client_state_versions[client_id][subscription_type] = version
+
         logger.debug(f"Client {client_id} subscribed to {subscription_type.value}")
         return True
 
@@ -265,11 +376,28 @@ class WebSocketManager:
 
     async def broadcast_message(self, message: WebSocketMessage) -> None:
         """Broadcast a message to subscribed clients."""
-        try:
-            # Add to appropriate priority queue
-            await self.message_queues[message.priority].put(message)
-        except asyncio.QueueFull:
-            logger.warning(f"Message queue full for priority {message.priority}, dropping message")
+        key = message.coalesce_key()
+        if key is not None and key in self._latest:
+            # Still queued: replace the payload in place, keeping its queue position
+            self._latest[key] = message
+            self.stats["messages_coalesced"] += 1
+            return
+
+        queue = self.message_queues[message.priority]
+        if len(queue) >= QUEUE_CAPACITY:
+            self.stats["messages_dropped"] += 1
+            if self.stats["messages_dropped"] % 1000 == 1:
+                logger.warning(
+                    f"Message queue full for priority {message.priority}, dropping message"
+                )
+            return
+
+        if key is not None:
+            self._latest[key] = message
+            queue.append(key)
+        else:
+            queue.append(message)
+        self._pending.set()
 
     async def send_to_client(
         self, client_id: str, message_type: MessageType, data: Dict[str, Any]
@@ -281,38 +409,130 @@ class WebSocketManager:
         client = self.clients[client_id]
         return await client.send_message(message_type, data)
 
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every client's send buffer is written; False on timeout."""
+        waits = [client._idle.wait() for client in list(self.clients.values())]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _enqueue(self, client: WebSocketClient, text: str) -> bool:
+        """Hand an encoded message to a client's writer; False if the buffer overflowed."""
+        accepted = client.enqueue(text)
+        if not accepted:
+            self.stats["messages_dropped"] += 1
+            # A dropped message may have been a state patch: resync with snapshots
+            self._client_state_versions.pop(client.client_id, None)
+        if client.writer is None or client.writer.done():
+            client.writer = asyncio.create_task(self._client_writer(client))
+        return accepted
+
+    async def _client_writer(self, client: WebSocketClient) -> None:
+        """Drain one client's buffer so a slow socket only delays itself."""
+        while True:
+            await client._ready.wait()
+            client._ready.clear()
+            while client.outbox:
+                text = client.outbox.popleft()
+                if not await client.send_text(text):
+                    self.stats["messages_failed"] += 1
+                    await self._disconnect_client(client.client_id, "send_failed")
+                    return
+                self.stats["messages_sent"] += 1
+                self.stats["bytes_sent"] += len(text)
+            client._idle.set()
+
+    @staticmethod
+    def _state_snapshot_text(
+        subscription_type: SubscriptionType, version: int, data: Dict[str, Any]
+    ) -> str:
+        return encode_message(
+            MessageType.STATE_SNAPSHOT,
+            {"subscription": subscription_type.value, "version": version, "state": data},
+        )
+
+    async def publish_state(
+        self, subscription_type: SubscriptionType, version: int, data: Dict[str, Any]
+    ) -> int:
+        """Push a new version of a subscription's state as a delta.
+
+        Subscribers holding the previous version get only the JSON-patch ops;
+        anyone else (new, or after a dropped message) gets the full snapshot.
+        Each message is serialized once for all recipients. Returns the op count.
+        """
+        previous = self.states.get(subscription_type)
+        if previous is not None and version <= previous[0]:
+            return 0
+        self.states[subscription_type] = (version, data)
+
+        base_version = previous[0] if previous is not None else None
+        ops = json_patch(previous[1], data) if previous is not None else []
+        patch_text = encode_message(
+            MessageType.STATE_PATCH,
+            {
+                "subscription": subscription_type.value,
+                "base_version": base_version,
+                "version": version,
+                "ops": ops,
+            },
+        )
+        snapshot_text: Optional[str] = None
+
+        for client_id in list(self.subscriptions[subscription_type]):
+            client = self.clients.get(client_id)
+            if client is None:
+                continue
+            held = self._client_state_versions[client_id].get(subscription_type)
+            if base_version is not None and held == base_version:
+                text = patch_text
+            else:
+                if snapshot_text is None:
+                    snapshot_text = self._state_snapshot_text(subscription_type, version, data)
+                text = snapshot_text
+            if self._enqueue(client, text):
+                self._client_state_versions[client_id][subscription_type] = version
+        return len(ops)
+
     def add_message_callback(
         self, message_type: MessageType, callback: Callable[[WebSocketMessage], None]
     ) -> None:
         """Add a callback for a specific message type."""
         self.message_callbacks[message_type].append(callback)
 
+    def _next_batch(self) -> List[WebSocketMessage]:
+        """Pop up to BATCH_SIZE messages, highest priority first."""
+        batch: List[WebSocketMessage] = []
+        for priority in (4, 3, 2, 1):
+            queue = self.message_queues[priority]
+            while queue and len(batch) < BATCH_SIZE:
+                item = queue.popleft()
+                batch.append(item if isinstance(item, WebSocketMessage) else self._latest.pop(item))
+        return batch
+
     async def _broadcast_loop(self) -> None:
-        """Main broadcast loop processing messages from all priority queues."""
+        """Main broadcast loop: sleeps until messages arrive, then drains them in batches."""
         while not self._shutdown_event.is_set():
             try:
-                # Process messages in priority order (highest first)
-                message = None
-
-                for priority in range(4, 0, -1):  # 4, 3, 2, 1
-                    try:
-                        message = self.message_queues[priority].get_nowait()
-                        self.message_queues[priority].task_done()
-                        break
-                    except asyncio.QueueEmpty:
-                        continue
-
-                if message:
-                    await self._process_message(message)
+                await self._pending.wait()
+                self._pending.clear()
 
-                # Small delay to prevent busy waiting
-                await asyncio.sleep(0.01)
+                batch = self._next_batch()
+                while batch:
+                    for message in batch:
+                        await self._process_message(message)
+                    # Let the client writers run between batches
+                    await asyncio.sleep(0)
+                    batch = self._next_batch()
 
             except Exception as e:
                 logger.error(f"Error in broadcast loop: {e}")
 
     async def _process_message(self, message: WebSocketMessage) -> None:
-        """Process a single message."""
+        """Fan a single message out to its recipients' send buffers."""
         # Call callbacks
         for callback in self.message_callbacks[message.message_type]:
             try:
@@ -329,19 +549,20 @@ class WebSocketManager:
         if not target_client_ids:
             return  # No subscribers
 
-        # Send to all target clients
-        send_tasks = []
-        for client_id in target_client_ids:
-            if client_id in self.clients:
-                client = self.clients[client_id]
-                send_tasks.append(client.send_message(message.message_type, message.data))
-
-        if send_tasks:
-            results = await asyncio.gather(*send_tasks, return_exceptions=True)
-
-            success_count = sum(1 for r in results if r is True)
-            self.stats["messages_sent"] += success_count
-            self.stats["messages_failed"] += len(results) - success_count
+        # Serialize once, then buffer the shared text for every target client
+        text: Optional[str] = None
+        for client_id in list(target_client_ids):
+            client = self.clients.get(client_id)
+            if client is None:
+                continue
+            if text is None:
+                try:
+                    text = encode_message(message.message_type, message.data)
+                except Exception as e:
+                    logger.error(f"Failed to encode {message.message_type.value} message: {e}")
+                    self.stats["messages_failed"] += 1
+                    return
+            self._enqueue(client, text)
 
     async def _heartbeat_loop(self) -> None:
         """Send periodic heartbeats to clients."""
@@ -407,7 +628,8 @@ class WebSocketManager:
             "stats": self.stats.copy(),
             "active_clients": len(self.clients),
             "subscription_counts": subscription_counts,
-            "queue_sizes": {f"priority_{p}": q.qsize() for p, q in self.message_queues.items()},
+            "queue_sizes": {f"priority_{p}": len(q) for p, q in self.message_queues.items()},
+            "client_buffers": {cid: len(c.outbox) for cid, c in self.clients.items()},
             "timestamp_us": get_timestamp_us(),
         }
 
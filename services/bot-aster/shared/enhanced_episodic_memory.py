@@ -24,6 +24,7 @@ from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import google.generativeai as genai
+from segment_store import SegmentStore
 
 logger = logging.getLogger(__name__)
 
@@ -458,11 +459,15 @@ class EnhancedMemoryBank:
     Enhanced episodic memory with auto-detection, causal chains, and multi-faceted lessons.
     """
 
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(self, storage_path: Optional[str] = None, max_loaded_episodes: int = 1000):
         self.episodes: Dict[str, EnhancedEpisode] = {}
         self.storage_path = storage_path or "/tmp/sapphire_enhanced_memory.json"
+        self.max_loaded_episodes = max_loaded_episodes
         self.current_episode: Optional[EnhancedEpisode] = None
 
+        # Append-only episode log next to the legacy single-file bank
+        self._store: Optional[SegmentStore] = None
+
         # Temporal pattern tracking
         self.temporal_patterns: Dict[Tuple[int, int], TemporalPattern] = {}
 
@@ -477,28 +482,42 @@ class EnhancedMemoryBank:
         self._load()
 
     def _load(self):
-        """Load enhanced episodes from storage."""
+        """Open the episode log and load the newest ``max_loaded_episodes`` episodes."""
         try:
-            if os.path.exists(self.storage_path):
-                with open(self.storage_path, "r") as f:
-                    data = json.load(f)
-                    for ep_data in data.get("episodes", []):
-                        ep = EnhancedEpisode.from_dict(ep_data)
-                        self.episodes[ep.episode_id] = ep
-                logger.info(f"📚 Loaded {len(self.episodes)} enhanced episodes")
+            self._store = SegmentStore(os.path.splitext(self.storage_path)[0] + ".log")
+            self._migrate_json_bank()
+            for _, ep_data in self._store.tail(self.max_loaded_episodes):
+                ep = EnhancedEpisode.from_dict(ep_data)
+                self.episodes[ep.episode_id] = ep
+            if self.episodes:
+                logger.info(
+                    f"📚 Loaded {len(self.episodes)} of {len(self._store)} enhanced episodes"
+                )
         except Exception as e:
             logger.warning(f"Could not load enhanced memory: {e}")
 
-    def _save(self):
-        """Persist enhanced episodes."""
+    def _migrate_json_bank(self):
+        """Move a legacy whole-bank JSON file into the episode log."""
+        if not os.path.exists(self.storage_path):
+            return
+        with open(self.storage_path, "r") as f:
+            data = json.load(f)
+        for ep_data in data.get("episodes", []):
+            self._save(EnhancedEpisode.from_dict(ep_data))
+        os.remove(self.storage_path)
+        logger.info(f"📦 Migrated {len(data.get('episodes', []))} episodes into the episode log")
+
+    def _save(self, episode: EnhancedEpisode):
+        """Append one episode's current version to the episode log."""
+        if self._store is None:
+            return
         try:
-            data = {
-                "episodes": [ep.to_dict() for ep in self.episodes.values()],
-                "saved_at": datetime.now(timezone.utc).isoformat(),
-                "version": "2.0",
-            }
-            with open(self.storage_path, "w") as f:
-                json.dump(data, f, indent=2)
+            self._store.put(
+                episode.episode_id,
+                episode.to_dict(),
+                symbol=episode.symbols_involved[0] if episode.symbols_involved else "",
+                ts=episode.start_time.timestamp(),
+            )
         except Exception as e:
             logger.error(f"Could not save enhanced memory: {e}")
 
@@ -621,7 +640,7 @@ class EnhancedMemoryBank:
         # Store and save
         self.episodes[ep.episode_id] = ep
         self.current_episode = None
-        self._save()
+        self._save(ep)
 
         logger.info(f"📚 Enhanced episode ended: {ep.name} | PnL: ${ep.total_pnl:+,.2f}")
         return ep
@@ -706,7 +725,7 @@ Format as JSON:
             )
 
             episode.lessons = lessons
-            self._save()
+            self._save(episode)
 
             logger.info(f"📖 Multi-faceted lessons extracted for {episode.name}")
             return lessons
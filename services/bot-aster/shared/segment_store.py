@@ -0,0 +1,349 @@
+"""
+Segment Store - Log-Structured Record Persistence
+
+An append-only key/value store for episode records. Every write appends one
+length-prefixed record (``<u32 length><u32 crc32><json payload>``) to the
+active segment file and one line to that segment's sidecar ``.idx`` file
+(key, offset, length, symbol, timestamp), so a write costs O(record) no
+matter how many records exist.
+
+Opening a store reads only the sidecar indexes; record bodies are read on
+demand, so loading the newest N records touches N records. Updates and
+deletes leave the previous version behind as garbage, and the live records
+are rewritten into fresh segments once garbage passes ``compact_ratio`` of
+the stored bytes. A torn record at the end of the last segment (crash mid
+write) is detected by its checksum and truncated on open.
+
+Dependency-free apart from optional ``orjson`` so it can also ship inside
+service containers.
+"""
+
+import heapq
+import json
+import logging
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<II")
+
+
+class SegmentEntry(NamedTuple):
+    """Location and sidecar metadata of a live record."""
+
+    key: str
+    segment: int
+    offset: int
+    length: int
+    symbol: str
+    ts: float
+    seq: int
+
+
+class SegmentStore:
+    """Append-only segmented record log with an in-memory key directory."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        segment_bytes: int = 8 * 1024 * 1024,
+        compact_ratio: float = 0.5,
+        min_compact_bytes: int = 1024 * 1024,
+    ):
+        """
+        Args:
+            path: Directory holding the segment and sidecar files
+            segment_bytes: Roll to a new segment once the active one exceeds this
+            compact_ratio: Compact once garbage exceeds this share of stored bytes
+            min_compact_bytes: ...and at least this many garbage bytes
+        """
+        self.path = Path(path)
+        self.segment_bytes = segment_bytes
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+
+        self._entries: Dict[str, SegmentEntry] = {}
+        self._seq = 0
+        self._total_bytes = 0
+        self._dead_bytes = 0
+
+        self._active = 0
+        self._active_size = 0
+        self._data_fh: Optional[BinaryIO] = None
+        self._idx_fh = None
+        self._readers: Dict[int, BinaryIO] = {}
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    # ----- writes -----
+
+    def put(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        symbol: str = "",
+        ts: Optional[float] = None,
+    ) -> None:
+        """Append a new version of ``key``."""
+        self._append(key, value, symbol, time.time() if ts is None else ts)
+        self._maybe_compact()
+
+    def delete(self, key: str) -> bool:
+        """Append a tombstone for ``key``."""
+        if key not in self._entries:
+            return False
+        self._append(key, None, "", time.time())
+        self._maybe_compact()
+        return True
+
+    def flush(self) -> None:
+        if self._data_fh is not None:
+            self._data_fh.flush()
+            self._idx_fh.flush()
+
+    def close(self) -> None:
+        for fh in (self._data_fh, self._idx_fh, *self._readers.values()):
+            if fh is not None:
+                fh.close()
+        self._data_fh = self._idx_fh = None
+        self._readers.clear()
+
+    # ----- reads -----
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        return self._read(entry)["v"] if entry is not None else None
+
+    def entries(self, symbol: Optional[str] = None) -> List[SegmentEntry]:
+        """Live entries (optionally for one symbol), oldest first."""
+        selected = (
+            e for e in self._entries.values() if symbol is None or e.symbol == symbol
+        )
+        return sorted(selected, key=lambda e: (e.ts, e.seq))
+
+    def tail(self, n: int, symbol: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """The newest ``n`` live records, yielded oldest first."""
+        selected = (
+            e for e in self._entries.values() if symbol is None or e.symbol == symbol
+        )
+        newest = heapq.nlargest(n, selected, key=lambda e: (e.ts, e.seq))
+        for entry in reversed(newest):
+            yield entry.key, self._read(entry)["v"]
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for entry in self.entries():
+            yield entry.key, self._read(entry)["v"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": len(self._entries),
+            "segments": len(self._segment_numbers()),
+            "total_bytes": self._total_bytes,
+            "dead_bytes": self._dead_bytes,
+        }
+
+    # ----- compaction -----
+
+    def compact(self) -> int:
+        """Rewrite live records into fresh segments; returns bytes reclaimed."""
+        old_segments = self._segment_numbers()
+        live = self.entries()
+        records = [(e, self._read(e)) for e in live]
+        reclaimed = self._dead_bytes
+
+        self._close_writer()
+        self._entries = {}
+        self._total_bytes = self._dead_bytes = 0
+        self._start_segment(max(old_segments, default=0) + 1)
+        for entry, record in records:
+            self._append(entry.key, record["v"], entry.symbol, entry.ts)
+        self.flush()
+
+        for number in old_segments:
+            reader = self._readers.pop(number, None)
+            if reader is not None:
+                reader.close()
+            for suffix in (".seg", ".idx"):
+                path = self._file(number, suffix)
+                if path.exists():
+                    path.unlink()
+
+        logger.info(f"🧹 Compacted segment store {self.path}: reclaimed {reclaimed} bytes")
+        return reclaimed
+
+    def _maybe_compact(self) -> None:
+        if (
+            self._dead_bytes >= self.min_compact_bytes
+            and self._dead_bytes > self.compact_ratio * self._total_bytes
+        ):
+            self.compact()
+
+    # ----- internals -----
+
+    def _file(self, number: int, suffix: str) -> Path:
+        return self.path / f"{number:08d}{suffix}"
+
+    def _segment_numbers(self) -> List[int]:
+        return sorted(int(p.stem) for p in self.path.glob("*.seg") if p.stem.isdigit())
+
+    def _open(self) -> None:
+        numbers = self._segment_numbers()
+        for number in numbers:
+            self._load_segment(number, last=number == numbers[-1])
+        if numbers:
+            self._active = numbers[-1]
+            self._active_size = self._file(self._active, ".seg").stat().st_size
+            self._open_writer()
+            if self._active_size >= self.segment_bytes:
+                self._roll()
+        else:
+            self._start_segment(1)
+
+    def _load_segment(self, number: int, last: bool) -> None:
+        """Replay a sidecar index; rescan the data file past what the sidecar covers."""
+        data_path = self._file(number, ".seg")
+        idx_path = self._file(number, ".idx")
+        size = data_path.stat().st_size
+        end = 0
+
+        if idx_path.exists():
+            with open(idx_path, "rb") as fh:
+                for line in fh:
+                    try:
+                        row = _loads(line)
+                    except ValueError:
+                        break  # torn trailing line
+                    if row["o"] + row["n"] > size:
+                        break
+                    self._apply(row["k"], number, row["o"], row["n"], row["s"], row["t"], row["d"])
+                    end = max(end, row["o"] + row["n"])
+
+        if end < size:
+            self._rescan(number, end, size, truncate=last)
+
+    def _rescan(self, number: int, start: int, size: int, truncate: bool) -> None:
+        data_path = self._file(number, ".seg")
+        offset = start
+        rows = []
+        with open(data_path, "rb") as fh:
+            fh.seek(start)
+            while offset + _HEADER.size <= size:
+                length, crc = _HEADER.unpack(fh.read(_HEADER.size))
+                payload = fh.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                record = _loads(payload)
+                total = _HEADER.size + length
+                deleted = record["v"] is None
+                key, symbol, ts = record["k"], record["s"], record["t"]
+                self._apply(key, number, offset, total, symbol, ts, deleted)
+                rows.append(self._idx_line(key, offset, total, symbol, ts, deleted))
+                offset += total
+
+        if offset < size:
+            if truncate:
+                logger.warning(f"⚠️ Truncating torn record in {data_path} at offset {offset}")
+                with open(data_path, "r+b") as fh:
+                    fh.truncate(offset)
+            else:
+                logger.warning(f"⚠️ Ignoring unreadable tail of {data_path} after {offset}")
+        if rows:
+            with open(self._file(number, ".idx"), "ab") as fh:
+                fh.writelines(rows)
+
+    def _apply(
+        self,
+        key: str,
+        segment: int,
+        offset: int,
+        length: int,
+        symbol: str,
+        ts: float,
+        deleted: bool,
+    ) -> None:
+        self._total_bytes += length
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._dead_bytes += previous.length
+        if deleted:
+            self._dead_bytes += length
+        else:
+            self._seq += 1
+            self._entries[key] = SegmentEntry(key, segment, offset, length, symbol, ts, self._seq)
+
+    @staticmethod
+    def _idx_line(
+        key: str, offset: int, length: int, symbol: str, ts: float, deleted: bool
+    ) -> bytes:
+        row = {"k": key, "o": offset, "n": length, "s": symbol, "t": ts, "d": deleted}
+        return _dumps(row) + b"\n"
+
+    def _append(self, key: str, value: Optional[Dict[str, Any]], symbol: str, ts: float) -> None:
+        payload = _dumps({"k": key, "s": symbol, "t": ts, "v": value})
+        total = _HEADER.size + len(payload)
+        offset = self._active_size
+
+        self._data_fh.write(_HEADER.pack(len(payload), zlib.crc32(payload)))
+        self._data_fh.write(payload)
+        self._data_fh.flush()
+        self._idx_fh.write(self._idx_line(key, offset, total, symbol, ts, value is None))
+        self._idx_fh.flush()
+
+        self._active_size += total
+        self._apply(key, self._active, offset, total, symbol, ts, value is None)
+        if self._active_size >= self.segment_bytes:
+            self._roll()
+
+    def _read(self, entry: SegmentEntry) -> Dict[str, Any]:
+        if entry.segment == self._active:
+            self._data_fh.flush()
+        reader = self._readers.get(entry.segment)
+        if reader is None:
+            reader = self._readers[entry.segment] = open(self._file(entry.segment, ".seg"), "rb")
+        reader.seek(entry.offset + _HEADER.size)
+        return _loads(reader.read(entry.length - _HEADER.size))
+
+    def _open_writer(self) -> None:
+        self._data_fh = open(self._file(self._active, ".seg"), "ab")
+        self._idx_fh = open(self._file(self._active, ".idx"), "ab")
+
+    def _close_writer(self) -> None:
+        for fh in (self._data_fh, self._idx_fh):
+            if fh is not None:
+                fh.close()
+        self._data_fh = self._idx_fh = None
+
+    def _start_segment(self, number: int) -> None:
+        self._active = number
+        self._active_size = 0
+        self._open_writer()
+
+    def _roll(self) -> None:
+        self._close_writer()
+        self._start_segment(self._active + 1)
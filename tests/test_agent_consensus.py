@@ -166,3 +166,115 @@ async def test_learning_feedback_loop(consensus_engine):
     new_weight = consensus_engine.agent_weights["trend_follower"]
     assert new_weight < initial_weight
 
+
+def _regime(kind):
+    return RegimeMetrics(
+        regime=kind,
+        confidence=0.8,
+        trend_strength=0.5,
+        volatility_level=0.5,
+        range_bound_score=0.5,
+        momentum_score=0.5,
+        timestamp_us=0,
+        adx_score=0.0,
+        rsi_score=0.0,
+        bb_position=0.0,
+        volume_trend=0.0,
+    )
+
+
+def _random_signals(engine, symbols, seed):
+    import random
+
+    rng = random.Random(seed)
+    agents = list(engine.agent_registry)
+    types = [SignalType.ENTRY_LONG, SignalType.ENTRY_SHORT, SignalType.HOLD]
+    signals = []
+    for symbol in symbols:
+        for agent_id in rng.sample(agents, rng.randint(1, len(agents))):
+            signals.append(
+                AgentSignal(
+                    agent_id=agent_id,
+                    signal_type=rng.choice(types),
+                    confidence=round(rng.uniform(0.4, 1.0), 3),
+                    strength=round(rng.uniform(0.2, 1.0), 3),
+                    symbol=symbol,
+                    timestamp_us=1,
+                    reasoning=f"{agent_id} view",
+                )
+            )
+    return signals
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("regime_kind", [None, MarketRegime.TRENDING_UP, MarketRegime.RANGING])
+async def test_batch_vote_matches_per_symbol_vote(consensus_engine, regime_kind):
+    for i in range(6):
+        consensus_engine.register_agent(f"agent_{i}", "momentum", "momentum_agents")
+    consensus_engine.agent_weights["trend_follower"] = 1.4
+    symbols = [f"SYM{i}-USDC" for i in range(25)]
+    signals = _random_signals(consensus_engine, symbols, seed=11)
+    regimes = {s: _regime(regime_kind) for s in symbols} if regime_kind else None
+
+    for signal in signals:
+        consensus_engine.submit_signal(signal)
+    batch = await consensus_engine.conduct_batch_consensus_vote(regimes=regimes)
+    assert not consensus_engine.pending_signals
+
+    for signal in signals:
+        consensus_engine.submit_signal(signal)
+    for symbol in symbols:
+        regime = regimes[symbol] if regimes else None
+        single = await consensus_engine.conduct_consensus_vote(symbol, regime)
+        result = batch[symbol]
+        assert result.winning_signal == single.winning_signal
+        assert result.consensus_confidence == pytest.approx(single.consensus_confidence)
+        assert result.agreement_level == pytest.approx(single.agreement_level)
+        assert result.participation_rate == pytest.approx(single.participation_rate)
+        assert result.total_votes == single.total_votes
+        assert list(result.agent_votes) == list(single.agent_votes)
+        assert result.reasoning == single.reasoning
+
+
+@pytest.mark.asyncio
+async def test_batch_vote_returns_only_symbols_above_threshold(consensus_engine):
+    from cloud_trader.agent_consensus import SignalBatch
+
+    signals = [
+        AgentSignal("trend_follower", SignalType.ENTRY_LONG, 0.9, 1.0, "BTC-USDC", 1),
+        AgentSignal("whale_watcher", SignalType.ENTRY_LONG, 0.9, 1.0, "BTC-USDC", 1),
+        AgentSignal("trend_follower", SignalType.ENTRY_LONG, 0.5, 0.5, "ETH-USDC", 1),
+        AgentSignal("whale_watcher", SignalType.ENTRY_SHORT, 0.5, 0.5, "ETH-USDC", 1),
+        AgentSignal("whale_watcher", SignalType.ENTRY_SHORT, 0.6, 0.9, "SOL-USDC", 1),
+    ]
+    batch = SignalBatch.from_signals(signals)
+    assert batch.symbols == ["BTC-USDC", "ETH-USDC", "SOL-USDC"]
+    assert list(batch.agent_idx) == [0, 1, 0, 1, 1]
+
+    results = await consensus_engine.conduct_batch_consensus_vote(
+        batch, min_confidence=0.6, min_agreement=0.45
+    )
+
+    assert list(results) == ["BTC-USDC"]
+    assert results["BTC-USDC"].winning_signal == SignalType.ENTRY_LONG
+    assert results["BTC-USDC"].agreement_level == 1.0
+    assert consensus_engine.consensus_history[-1] is results["BTC-USDC"]
+
+
+@pytest.mark.asyncio
+async def test_volatile_regime_drops_low_confidence_signals_in_batch(consensus_engine):
+    signals = [
+        AgentSignal("trend_follower", SignalType.ENTRY_LONG, 0.5, 1.0, "BTC-USDC", 1),
+        AgentSignal("mean_reverter", SignalType.ENTRY_LONG, 0.6, 1.0, "BTC-USDC", 1),
+        AgentSignal("whale_watcher", SignalType.ENTRY_SHORT, 0.9, 1.0, "BTC-USDC", 1),
+    ]
+    for signal in signals:
+        consensus_engine.submit_signal(signal)
+
+    results = await consensus_engine.conduct_batch_consensus_vote(
+        regimes={"BTC-USDC": _regime(MarketRegime.VOLATILE)}
+    )
+
+    assert results["BTC-USDC"].winning_signal == SignalType.ENTRY_SHORT
+    assert results["BTC-USDC"].total_votes == 1
+    assert results["BTC-USDC"].agreement_level == 1.0
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from cloud_trader.exchange import AsterClient
+
+
+class _CountingClient(AsterClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    async def _send_request(self, method, endpoint, params, signed=False):
+        self.calls.append((method, endpoint, dict(params), signed))
+        await asyncio.sleep(0.01)
+        return {"endpoint": endpoint, "params": dict(params), "bids": [[1, 2]]}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_request():
+    client = _CountingClient()
+    books = await asyncio.gather(
+        client.get_order_book("BTC-USDC", limit=50),
+        client.get_order_book("btcusdt", limit=50),
+        client.get_order_book("BTCUSDT", limit=50),
+        client.get_order_book("ETHUSDT", limit=50),
+    )
+    await client.close()
+
+    assert len(client.calls) == 2
+    assert client.coalesce_stats["coalesced"] == 2
+    assert books[0] == books[1] == books[2]
+    books[0]["bids"].clear()
+    assert books[1]["bids"] == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_freshness_window_and_signed_requests():
+    client = _CountingClient(read_freshness_seconds=60)
+    await client.get_ticker("BTCUSDT")
+    await client.get_ticker("BTCUSDT")
+    assert len(client.calls) == 1
+    assert client.coalesce_stats["fresh_hits"] == 1
+
+    await asyncio.gather(
+        client._make_request("GET", "/fapi/v2/balance", signed=True),
+        client._make_request("GET", "/fapi/v2/balance", signed=True),
+    )
+    await client.close()
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request():
+    client = _CountingClient()
+    first = asyncio.create_task(client.get_order_book("BTCUSDT"))
+    second = asyncio.create_task(client.get_order_book("BTCUSDT"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    book = await second
+    await client.close()
+    assert book["params"]["symbol"] == "BTCUSDT"
+    assert len(client.calls) == 1
@@ -0,0 +1,102 @@
+import hashlib
+import hmac
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+
+from cloud_trader.credentials import Credentials
+from cloud_trader.exchange import AsterClient
+from cloud_trader.rate_limit_manager import VenueRateLimiter
+
+
+def _client_with(handler, **kwargs):
+    client = AsterClient(
+        credentials=Credentials(api_key="key", api_secret="secret"), coalesce_reads=False, **kwargs
+    )
+    client._client = httpx.AsyncClient(
+        base_url="https://fapi.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_signed_post_signature_and_usage_headers():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(
+            200,
+            json={"orderId": 1},
+            headers={"X-MBX-USED-WEIGHT-1M": "17", "X-MBX-ORDER-COUNT-1M": "3"},
+        )
+
+    client = _client_with(handler)
+    result = await client._make_request(
+        "POST", "/fapi/v1/order", {"symbol": "BTCUSDT", "side": "BUY", "quantity": 1}, signed=True
+    )
+    await client.close()
+
+    assert result == {"orderId": 1}
+    body = seen[0].content.decode()
+    query, signature = body.rsplit("&signature=", 1)
+    expected = hmac.new(b"secret", query.encode(), hashlib.sha256).hexdigest()
+    assert signature == expected
+    assert [k for k, _ in parse_qsl(query)] == ["quantity", "side", "symbol", "timestamp"]
+    assert seen[0].headers["X-MBX-APIKEY"] == "key"
+    assert client.rate_limit_usage == {"x-mbx-used-weight-1m": 17, "x-mbx-order-count-1m": 3}
+
+
+class _Histogram:
+    def __init__(self):
+        self.observed = []
+
+    def labels(self, **labels):
+        self.current = labels
+        return self
+
+    def observe(self, value):
+        self.observed.append((self.current["endpoint"], value))
+
+
+@pytest.mark.asyncio
+async def test_latency_recorded_per_endpoint_and_warmup(monkeypatch):
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(200, json={})
+
+    histogram = _Histogram()
+    monkeypatch.setattr("cloud_trader.exchange.ASTER_API_LATENCY", histogram)
+    client = _client_with(handler)
+    await client.warmup(connections=3)
+    await client.get_order_book("BTCUSDT", limit=5)
+    await client.close()
+
+    assert paths == ["/fapi/v1/ping"] * 3 + ["/fapi/v1/depth"]
+    assert [endpoint for endpoint, _ in histogram.observed] == ["/fapi/v1/depth"]
+    assert histogram.observed[0][1] >= 0
+
+
+def test_signature_reuses_keyed_hmac():
+    client = AsterClient(credentials=Credentials(api_key="k", api_secret="s"))
+    query = "symbol=BTCUSDT&timestamp=1"
+    assert client._signature(query) == hmac.new(b"s", query.encode(), hashlib.sha256).hexdigest()
+    assert client._signature(query) == client._signature(query)
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_venue_limiter_then_retries():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+    limiter = VenueRateLimiter("aster-test", {"weight": (2400, 60)})
+    client = _client_with(lambda request: responses.pop(0), rate_limiter=limiter)
+
+    assert await client.get_ticker("BTCUSDT") == {"ok": True}
+    await client.close()
+    assert limiter.stats["penalties"] == 1
+    assert limiter.stats["waited"] == 1
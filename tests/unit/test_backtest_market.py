@@ -0,0 +1,205 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloud_trader.backtest import AlignedMarket, Backtester, BacktestTrade
+from cloud_trader.strategies import StrategySignal
+from cloud_trader.strategy import MarketSnapshot
+
+
+def _frame(start, periods, base):
+    index = pd.date_range(start, periods=periods, freq="h", name="timestamp")
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({"close": close, "volume": np.full(periods, 5.0)}, index=index)
+
+
+def test_aligned_market_grid_and_windows():
+    frames = {
+        "BTCUSDT": _frame("2024-01-01 00:00", 30, 100.0),
+        "ETHUSDT": _frame("2024-01-01 05:00", 30, 0.0),
+    }
+    market = AlignedMarket(frames)
+
+    assert len(market) == 35
+    assert market.timestamps[0] == pd.Timestamp("2024-01-01 00:00")
+    np.testing.assert_array_equal(market.columns_at(0), [0])
+    np.testing.assert_array_equal(market.columns_at(10), [0, 1])
+    np.testing.assert_array_equal(market.columns_at(34), [1])
+    assert np.isnan(market.close[34, 0])
+
+    # Window is a positional slice of the symbol's own frame
+    window = market.window(1, 12, 5)
+    assert list(window["close"]) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert len(market.window(0, 2, 30)) == 3
+
+    # 24-bar change matches the per-row lookup; a zero base price yields 0
+    assert market.change_24h[25, 0] == pytest.approx((125.0 - 101.0) / 101.0 * 100)
+    assert market.change_24h[10, 0] == 0.0
+    assert market.change_24h[29, 1] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_backtest_walks_aligned_grid(monkeypatch):
+    backtester = Backtester(initial_capital=1000.0)
+    frames = {
+        "BTCUSDT": _frame("2024-01-01 00:00", 6, 100.0),
+        "ETHUSDT": _frame("2024-01-01 02:00", 6, 50.0),
+    }
+
+    async def load(symbol, start_date, end_date, interval):
+        return frames[symbol]
+
+    seen = []
+
+    async def select(symbol, snapshot, historical):
+        seen.append((symbol, snapshot.price, len(historical)))
+        return StrategySignal(
+            strategy_name="hold",
+            symbol=symbol,
+            direction="HOLD",
+            confidence=0.0,
+            position_size=0.0,
+            reasoning="",
+            metadata={},
+        )
+
+    monkeypatch.setattr(backtester, "_load_historical_data", load)
+    monkeypatch.setattr(backtester.strategy_selector, "select_best_strategy", select)
+
+    results = await backtester.run_backtest(
+        ["BTCUSDT", "ETHUSDT"], datetime(2024, 1, 1), datetime(2024, 1, 2)
+    )
+
+    assert results.total_trades == 0
+    assert len(backtester.equity_curve) == 1 + 8
+    assert seen[:3] == [("BTCUSDT", 100.0, 1), ("BTCUSDT", 101.0, 2), ("BTCUSDT", 102.0, 3)]
+    assert ("ETHUSDT", 50.0, 1) in seen
+    assert len(seen) == 12
+
+
+class _PerTimestampBacktester(Backtester):
+    """Reference copy of the pre-grid loop: per-timestamp ``df.loc``/``get_loc`` lookups."""
+
+    async def run_backtest(self, symbols, start_date, end_date, interval="1h"):
+        all_data = {}
+        for symbol in symbols:
+            data = await self._load_historical_data(symbol, start_date, end_date, interval)
+            if data is not None and len(data) > 0:
+                all_data[symbol] = data
+
+        timestamps = sorted(set().union(*(df.index for df in all_data.values())))
+        timestamp = None
+        for timestamp in timestamps:
+            current_data = {}
+            for symbol, df in all_data.items():
+                try:
+                    current_data[symbol] = df.loc[timestamp]
+                except KeyError:
+                    continue
+            if not current_data:
+                continue
+            prices = {symbol: row["close"] for symbol, row in current_data.items()}
+            self._check_exits(prices, timestamp)
+            await self._legacy_entries(current_data, timestamp, all_data)
+            self._update_equity(prices)
+
+        for symbol in list(self.positions):
+            self._close_position(symbol, all_data[symbol].iloc[-1]["close"], timestamp)
+        return self._calculate_results(start_date, end_date)
+
+    async def _legacy_entries(self, current_data, timestamp, all_data):
+        if len(self.positions) >= 5:
+            return
+        for symbol, row in current_data.items():
+            if symbol in self.positions:
+                continue
+            df = all_data[symbol]
+            idx = df.index.get_loc(timestamp)
+            change = 0.0
+            if idx >= 24:
+                past = df.iloc[idx - 24]["close"]
+                change = (row["close"] - past) / past * 100
+            snapshot = MarketSnapshot(price=row["close"], volume=row["volume"], change_24h=change)
+            historical = df.iloc[max(0, idx - 29) : idx + 1]
+            signal = await self.strategy_selector.select_best_strategy(symbol, snapshot, historical)
+            if signal.direction != "HOLD" and signal.confidence > 0.6:
+                position_size = min(signal.position_size, 0.02) * self.capital
+                self.positions[symbol] = BacktestTrade(
+                    timestamp=timestamp,
+                    symbol=symbol,
+                    side=signal.direction,
+                    entry_price=row["close"],
+                    quantity=position_size / row["close"],
+                    strategy=signal.strategy_name,
+                )
+                self.capital -= position_size * 0.1
+
+
+def _walk(start, periods, base, seed, drop=()):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=periods, freq="h", name="timestamp")
+    close = base * np.exp(np.cumsum(rng.normal(0.0, 0.012, periods)))
+    volume = rng.uniform(1.0, 10.0, periods)
+    df = pd.DataFrame({"close": close, "volume": volume}, index=index)
+    return df.drop(index[list(drop)])
+
+
+async def _run(backtester, frames, monkeypatch):
+    async def load(symbol, start_date, end_date, interval):
+        return frames[symbol]
+
+    seen = []
+
+    async def select(symbol, snapshot, historical):
+        seen.append((symbol, snapshot.price, snapshot.volume, snapshot.change_24h, len(historical)))
+        drift = historical["close"].iloc[-1] - historical["close"].mean()
+        return StrategySignal(
+            strategy_name="mean_cross",
+            symbol=symbol,
+            direction="BUY" if drift > 0 else "SELL",
+            confidence=0.7 if len(historical) >= 5 else 0.0,
+            position_size=0.05,
+            reasoning="",
+            metadata={},
+        )
+
+    monkeypatch.setattr(backtester, "_load_historical_data", load)
+    monkeypatch.setattr(backtester.strategy_selector, "select_best_strategy", select)
+    results = await backtester.run_backtest(
+        list(frames), datetime(2024, 1, 1), datetime(2024, 1, 5)
+    )
+    return results, seen
+
+
+@pytest.mark.asyncio
+async def test_aligned_loop_matches_per_timestamp_loop(monkeypatch):
+    frames = {
+        "BTCUSDT": _walk("2024-01-01 00:00", 80, 40000.0, 1),
+        "ETHUSDT": _walk("2024-01-01 07:00", 70, 2200.0, 2, drop=(10, 11, 40)),
+        "SOLUSDT": _walk("2024-01-02 06:00", 50, 95.0, 3),
+    }
+
+    old, old_seen = await _run(_PerTimestampBacktester(initial_capital=1000.0), frames, monkeypatch)
+    new, new_seen = await _run(Backtester(initial_capital=1000.0), frames, monkeypatch)
+
+    assert old.total_trades > 5
+    assert new_seen == old_seen
+
+    def key(trade):
+        return (
+            trade.symbol,
+            trade.side,
+            trade.timestamp,
+            trade.exit_time,
+            trade.entry_price,
+            trade.exit_price,
+            trade.quantity,
+            trade.pnl_abs,
+        )
+
+    assert [key(t) for t in new.trades] == [key(t) for t in old.trades]
+    assert new.equity_curve == old.equity_curve
+    assert new.total_return == old.total_return
+    assert new.max_drawdown == old.max_drawdown
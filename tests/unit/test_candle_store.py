@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloud_trader.backtest import Backtester
+from cloud_trader.backtesting.candle_store import CandleStore
+from cloud_trader.backtesting.data_manager import BacktestDataManager
+
+HOUR = 3_600_000
+
+
+def _bars(start, count, base=100.0):
+    ts = start + np.arange(count) * HOUR
+    close = base + np.arange(count, dtype=float)
+    return {
+        "ts": ts,
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": np.ones(count),
+    }
+
+
+def test_incremental_append_and_range_read(tmp_path):
+    store = CandleStore(str(tmp_path))
+    assert store.append("BTCUSDT", "1h", _bars(0, 10)) == 10
+    # Overlapping fetch: only the tail bar is rewritten, bars 10..14 are new
+    update = _bars(9 * HOUR, 6, base=200.0)
+    assert store.append("BTCUSDT", "1h", update) == 5
+    assert store.append("BTCUSDT", "1h", _bars(0, 3)) == 0
+
+    assert store.last_timestamp("BTCUSDT", "1h") == 14 * HOUR
+    window = store.read("BTCUSDT", "1h", start=3 * HOUR, end=5 * HOUR, columns=("close",))
+    assert list(window["ts"]) == [3 * HOUR, 4 * HOUR, 5 * HOUR]
+    assert isinstance(window["close"], np.memmap)
+    assert list(window["close"]) == [103.0, 104.0, 105.0]
+    assert store.read("BTCUSDT", "1h", start=9 * HOUR, end=9 * HOUR)["close"][0] == 200.0
+
+    frame = store.read_frame("BTCUSDT", "1h", start=datetime(1970, 1, 1, 13))
+    assert list(frame.index) == list(pd.to_datetime([13 * HOUR, 14 * HOUR], unit="ms"))
+    assert store.symbols("1h") == ["BTCUSDT"]
+
+
+def test_kline_rows_and_aligned_read(tmp_path):
+    store = CandleStore(str(tmp_path))
+    klines = [[i * HOUR, "1", "2", "0.5", str(10 + i), "7", i * HOUR + HOUR - 1] for i in range(4)]
+    store.append("ETHUSDT", "1h", klines)
+    store.append("SOLUSDT", "1h", _bars(2 * HOUR, 4))
+
+    aligned = store.read_aligned(["ETHUSDT", "SOLUSDT", "XRPUSDT"], "1h", columns=("close",))
+    assert list(aligned.timestamps) == [i * HOUR for i in range(6)]
+    assert aligned["close"].shape == (3, 6)
+    np.testing.assert_array_equal(aligned["close"][0, :4], [10, 11, 12, 13])
+    assert np.isnan(aligned["close"][0, 4:]).all()
+    np.testing.assert_array_equal(aligned.present[1], [False, False, True, True, True, True])
+    assert not aligned.present[2].any()
+
+
+def test_torn_append_is_truncated(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", _bars(0, 3))
+    # Simulate a crash after a data column was extended but before ts was
+    with open(store._column_path("BTCUSDT", "1h", "close"), "ab") as fh:
+        fh.write(np.float64(999).tobytes())
+    store.append("BTCUSDT", "1h", _bars(3 * HOUR, 1, base=50.0))
+    np.testing.assert_array_equal(store.read("BTCUSDT", "1h")["close"], [100, 101, 102, 50])
+
+
+@pytest.mark.asyncio
+async def test_data_manager_and_backtester_read_from_store(tmp_path):
+    index = pd.date_range("2024-01-01", periods=5, freq="h", name="timestamp")
+    legacy = pd.DataFrame(
+        {"open": 1.0, "high": 2.0, "low": 0.5, "close": np.arange(5.0), "volume": 3.0}, index=index
+    )
+    legacy.to_csv(tmp_path / "SOL_USD_1h_cg.csv")
+
+    manager = BacktestDataManager(data_dir=str(tmp_path))
+    df = manager._load_from_cache("SOL/USD", "1h")
+    assert list(df["close"]) == [0, 1, 2, 3, 4]
+    assert manager.store.has("SOL/USD", "1h")
+
+    backtester = Backtester(candle_store=manager.store)
+    window = await backtester._load_historical_data(
+        "SOL/USD", datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 3), "1h"
+    )
+    assert list(window["close"]) == [1, 2, 3]
@@ -0,0 +1,148 @@
+import importlib
+import json
+import sys
+import time
+import types
+
+import pytest
+
+from cloud_trader.dashboard_state import DashboardState
+
+# Integration suites replace this module with a MagicMock at collection time
+if not isinstance(sys.modules.get("cloud_trader.websocket_manager"), types.ModuleType):
+    sys.modules.pop("cloud_trader.websocket_manager", None)
+websocket_manager = importlib.import_module("cloud_trader.websocket_manager")
+MessageType = websocket_manager.MessageType
+SubscriptionType = websocket_manager.SubscriptionType
+WebSocketClient = websocket_manager.WebSocketClient
+WebSocketManager = websocket_manager.WebSocketManager
+json_patch = websocket_manager.json_patch
+
+
+class Source:
+    def __init__(self):
+        self.items = []
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return list(self.items)
+
+
+def _state(source, **section_kwargs):
+    state = DashboardState(lambda sections: {"items": sections["items"]}, min_interval=0)
+    state.add_section("items", source.build, **section_kwargs)
+    return state
+
+
+def test_version_advances_only_when_payload_changes():
+    source = Source()
+    state = _state(source)
+    assert state.refresh() and state.version == 1
+
+    state.touch("items")
+    assert not state.refresh()  # rebuilt, but identical payload
+    assert state.version == 1 and source.builds == 2
+
+    first = state.to_bytes()
+    assert state.to_bytes() is first  # cached per version
+
+    source.items.append(1)
+    state.touch()
+    assert state.refresh() and state.version == 2
+    assert json.loads(state.to_bytes()) == {
+        "items": [1],
+        "timestamp": state.data["timestamp"],
+        "version": 2,
+    }
+
+
+def test_fingerprint_and_ttl_gate_rebuilds():
+    source = Source()
+    state = _state(source, fingerprint=lambda: len(source.items))
+    state.refresh()
+    state.refresh()
+    assert source.builds == 1  # fingerprint unchanged: no rebuild
+
+    source.items.append("x")
+    assert state.refresh() and source.builds == 2
+
+    timed = Source()
+    state = _state(timed, ttl=0.01)
+    state.refresh()
+    state.refresh()
+    assert timed.builds == 1
+    time.sleep(0.02)
+    state.refresh()
+    assert timed.builds == 2
+
+
+def test_failed_section_keeps_last_value():
+    source = Source()
+    source.items = [1]
+    state = _state(source)
+    state.refresh()
+
+    def boom():
+        raise RuntimeError("down")
+
+    state._sections["items"].build = boom
+    state.touch("items")
+    assert not state.refresh()
+    assert state.data["items"] == [1] and state._sections["items"].failures == 1
+
+
+def test_json_patch_ops():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "gone": True, "k/y": 0}
+    new = {"a": 2, "b": {"c": [1, 2, 3], "d": "x"}, "added": None, "k/y": 0}
+    assert sorted(json_patch(old, new), key=lambda op: op["path"]) == [
+        {"op": "replace", "path": "/a", "value": 2},
+        {"op": "add", "path": "/added", "value": None},
+        {"op": "replace", "path": "/b/c", "value": [1, 2, 3]},
+        {"op": "remove", "path": "/gone"},
+    ]
+    assert json_patch(new, new) == []
+
+
+class FakeSocket:
+    def __init__(self):
+        self.texts = []
+
+    async def send_text(self, text):
+        self.texts.append(json.loads(text))
+
+
+def _join(manager, client_id):
+    socket = FakeSocket()
+    manager.clients[client_id] = WebSocketClient(socket, client_id)
+    manager.clients[client_id].subscriptions.add(SubscriptionType.PORTFOLIO_CHANGES)
+    manager.subscriptions[SubscriptionType.PORTFOLIO_CHANGES].add(client_id)
+    return socket
+
+
+@pytest.mark.asyncio
+async def test_publish_state_sends_snapshot_then_patches():
+    manager = WebSocketManager()
+    first = _join(manager, "c1")
+    portfolio = SubscriptionType.PORTFOLIO_CHANGES
+
+    await manager.publish_state(portfolio, 1, {"pnl": 1.0, "positions": []})
+    await manager.publish_state(portfolio, 2, {"pnl": 2.0, "positions": []})
+    await manager.publish_state(portfolio, 2, {"pnl": 9.0, "positions": []})  # stale version
+    assert await manager.flush(timeout=1.0)
+
+    assert [m["type"] for m in first.texts] == [
+        MessageType.STATE_SNAPSHOT.value,
+        MessageType.STATE_PATCH.value,
+    ]
+    patch = first.texts[1]["data"]
+    assert patch["base_version"] == 1 and patch["version"] == 2
+    assert patch["ops"] == [{"op": "replace", "path": "/pnl", "value": 2.0}]
+
+    # A client that missed a version is resynced with a full snapshot
+    late = _join(manager, "c2")
+    await manager.publish_state(portfolio, 3, {"pnl": 3.0, "positions": [1]})
+    assert await manager.flush(timeout=1.0)
+    assert late.texts[-1]["type"] == MessageType.STATE_SNAPSHOT.value
+    assert late.texts[-1]["data"]["state"] == {"pnl": 3.0, "positions": [1]}
+    assert first.texts[-1]["type"] == MessageType.STATE_PATCH.value
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from cloud_trader.memory import Episode, EpisodicMemory, TradeOutcome
+from cloud_trader.memory.vector_index import HashingEmbedder, VectorIndex
+
+
+def _brute_force(vectors, query, k):
+    scores = {i: float(v @ query) for i, v in vectors.items()}
+    return sorted(scores, key=scores.get, reverse=True)[:k]
+
+
+def test_exact_mode_matches_brute_force_with_filters_and_deletes():
+    rng = np.random.default_rng(0)
+    index = VectorIndex(dim=16)
+    vectors = {}
+    for i in range(300):
+        v = rng.standard_normal(16).astype(np.float32)
+        v /= np.linalg.norm(v)
+        vectors[f"e{i}"] = v
+        index.add(f"e{i}", v, {"symbol": "BTC" if i % 3 else "ETH"})
+
+    for i in range(0, 300, 7):
+        assert index.remove(f"e{i}")
+        del vectors[f"e{i}"]
+    assert len(index) == len(vectors)
+
+    query = rng.standard_normal(16).astype(np.float32)
+    query /= np.linalg.norm(query)
+    assert [i for i, _ in index.search(query, k=10)] == _brute_force(vectors, query, 10)
+
+    eth = {i: v for i, v in vectors.items() if index.get_metadata(i)["symbol"] == "ETH"}
+    hits = index.search(query, k=5, filters={"symbol": "ETH"})
+    assert [i for i, _ in hits] == _brute_force(eth, query, 5)
+    assert index.search(query, k=5, filters={"symbol": "SOL"}) == []
+
+    # Freed slots are reused rather than growing the matrix
+    index.add("new", query)
+    assert index.search(query, k=1)[0] == ("new", pytest.approx(1.0))
+
+
+def test_lsh_mode_finds_near_duplicates():
+    rng = np.random.default_rng(1)
+    index = VectorIndex(dim=64, exact_threshold=0)
+    base = rng.standard_normal((2000, 64)).astype(np.float32)
+    for i, v in enumerate(base):
+        index.add(str(i), v)
+
+    found = 0
+    for i in range(0, 2000, 40):
+        query = base[i] + 0.05 * rng.standard_normal(64).astype(np.float32)
+        found += index.search(query, k=1)[0][0] == str(i)
+    assert found >= 45  # of 50
+
+
+def test_hashing_embedder_is_deterministic_and_normalised():
+    embed = HashingEmbedder(dim=128)
+    a = embed("BTC-USDC LONG RSI 28 oversold")
+    assert np.allclose(a, embed("btc-usdc long rsi 28 oversold"))
+    assert np.linalg.norm(a) == pytest.approx(1.0)
+    assert not embed("").any()
+
+
+@pytest.mark.asyncio
+async def test_recall_uses_index_filters_and_prunes():
+    memory = EpisodicMemory(max_memory_episodes=3)
+    start = datetime.now() - timedelta(days=1)
+    texts = [
+        ("BTC-USDC", "BTC-USDC LONG breakout high volume"),
+        ("BTC-USDC", "BTC-USDC LONG breakout funding spike"),
+        ("ETH-USDC", "ETH-USDC LONG breakout high volume"),
+        ("BTC-USDC", "BTC-USDC LONG breakout range"),
+    ]
+    ids = []
+    for n, (symbol, text) in enumerate(texts):
+        episode = Episode(
+            timestamp=start + timedelta(minutes=n),
+            symbol=symbol,
+            signal_type=text.split()[1],
+            market_state_embedding_text=text,
+        )
+        ids.append(await memory.store(episode))
+
+    # The oldest episode was pruned from memory and from the index
+    assert memory.get_by_id(ids[0]) is None
+    assert ids[0] not in memory._index
+
+    recalled = await memory.recall_similar("BTC-USDC LONG breakout", symbol="BTC-USDC", limit=2)
+    assert [ep.episode_id for ep in recalled] == [ids[3], ids[1]]
+
+    await memory.update_outcome(ids[1], TradeOutcome(success=True, pnl=50.0))
+    assert memory._index.get_metadata(ids[1])["profitable"] is True
+    recalled = await memory.recall_similar("BTC-USDC LONG breakout", symbol="BTC-USDC", limit=1)
+    assert recalled[0].episode_id == ids[1]
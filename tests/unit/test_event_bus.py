@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from cloud_trader.event_bus import Event, EventBus, EventTypes, OverflowPolicy
+
+
+def _event(event_type, **data):
+    return Event(event_type=event_type, data=data, source="test")
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_stall_publisher():
+    bus = EventBus()
+    release = asyncio.Event()
+    seen = []
+
+    async def slow_dashboard(event):
+        await release.wait()
+        seen.append(event.data["i"])
+
+    bus.subscribe(EventTypes.TRADE_EXECUTED, slow_dashboard)
+    for i in range(5):
+        await asyncio.wait_for(bus.publish(_event(EventTypes.TRADE_EXECUTED, i=i)), 0.1)
+
+    assert seen == []
+    release.set()
+    await bus.drain()
+    assert seen == [0, 1, 2, 3, 4]  # publish order preserved per event type
+
+    stats = bus.get_subscriber_stats()[0]
+    assert stats["delivered"] == 5 and stats["backlog"] == 0
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies():
+    bus = EventBus()
+    gate = asyncio.Event()
+    dropped_seen, coalesced_seen = [], []
+
+    async def drop_consumer(event):
+        await gate.wait()
+        dropped_seen.append(event.data["i"])
+
+    async def coalesce_consumer(event):
+        await gate.wait()
+        coalesced_seen.append((event.data["symbol"], event.data["i"]))
+
+    bus.subscribe(EventTypes.SYSTEM_ALERT, drop_consumer, max_queue=2)
+    bus.subscribe(
+        EventTypes.PORTFOLIO_UPDATED,
+        coalesce_consumer,
+        overflow=OverflowPolicy.COALESCE,
+        coalesce_key=lambda event: event.data["symbol"],
+    )
+
+    await bus.publish(_event(EventTypes.SYSTEM_ALERT, i=0))
+    await asyncio.sleep(0)  # worker takes the first event and parks on the gate
+    for i in range(1, 5):
+        await bus.publish(_event(EventTypes.SYSTEM_ALERT, i=i))
+    for i in range(6):
+        await bus.publish(
+            _event(EventTypes.PORTFOLIO_UPDATED, symbol="BTC" if i % 2 else "ETH", i=i)
+        )
+
+    gate.set()
+    await bus.drain()
+    # First event was already in flight; the queue of 2 kept only the newest
+    assert dropped_seen == [0, 3, 4]
+    # One slot per symbol, each holding the latest update
+    assert coalesced_seen == [("ETH", 4), ("BTC", 5)]
+
+    stats = {s["subscriber"]: s for s in bus.get_subscriber_stats()}
+    assert stats[drop_consumer.__qualname__]["dropped"] == 2
+    assert stats[coalesce_consumer.__qualname__]["coalesced"] == 4
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure_and_inline_runs_in_publish():
+    bus = EventBus()
+    gate = asyncio.Event()
+    inline_seen, blocked_seen = [], []
+
+    async def consumer(event):
+        await gate.wait()
+        blocked_seen.append(event.data["i"])
+
+    bus.subscribe(EventTypes.AGENT_DECISION, consumer, max_queue=1, overflow=OverflowPolicy.BLOCK)
+    bus.subscribe(EventTypes.AGENT_DECISION, lambda e: inline_seen.append(e.data["i"]), inline=True)
+
+    await bus.publish(_event(EventTypes.AGENT_DECISION, i=0))
+    await asyncio.sleep(0)
+    await bus.publish(_event(EventTypes.AGENT_DECISION, i=1))
+    third = asyncio.create_task(bus.publish(_event(EventTypes.AGENT_DECISION, i=2)))
+    await asyncio.sleep(0.01)
+    assert not third.done()
+    assert inline_seen == [0, 1, 2]  # inline subscribers ran before the queued put blocked
+
+    gate.set()
+    await third
+    await bus.drain()
+    assert blocked_seen == [0, 1, 2]
+    await bus.stop()
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    def publish(self, channel, payload):
+        self.queued.append(channel)
+
+    async def execute(self):
+        self.redis.batches.append(self.queued)
+
+
+class _Redis:
+    def __init__(self):
+        self.batches = []
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_redis_publishes_are_batched():
+    bus = EventBus(redis_batch_size=3, redis_flush_interval=0.01)
+    bus._redis = _Redis()
+    await bus.start()
+
+    for i in range(7):
+        await bus.publish(_event(EventTypes.TRADE_EXECUTED, i=i))
+    await asyncio.sleep(0.05)
+    await bus.stop()
+
+    assert [len(batch) for batch in bus._redis.batches] == [3, 3, 1]
+    assert bus.get_stats()["redis_batches"] == 3
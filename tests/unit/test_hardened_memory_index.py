@@ -0,0 +1,109 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from cloud_trader.v2.hardened_memory_manager import (
+    BatchingEmbedder,
+    HardenedMemoryManager,
+    MemoryType,
+    VectorStore,
+)
+
+DIM = HardenedMemoryManager.EMBEDDING_DIM
+
+
+class CountingModel:
+    """Deterministic bag-of-letters encoder that records each batch it sees."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for ch in text.lower():
+                out[row, ord(ch) % DIM] += 1.0
+        return out
+
+
+def _manager(tmp_path, model):
+    return HardenedMemoryManager(
+        embedding_model=model, enable_wal=False, index_dir=tmp_path / "index"
+    )
+
+
+def test_vector_store_maps_ids_and_reuses_slots(tmp_path):
+    rng = np.random.default_rng(0)
+    store = VectorStore(8)
+    vectors = {f"m{i}": rng.standard_normal(8).astype(np.float32) for i in range(50)}
+    for memory_id, vector in vectors.items():
+        store.add(memory_id, vector)
+    for i in range(0, 50, 5):
+        store.remove(f"m{i}")
+        del vectors[f"m{i}"]
+
+    query = rng.standard_normal(8).astype(np.float32)
+    expected = sorted(vectors, key=lambda m: float(np.sum((vectors[m] - query) ** 2)))[:5]
+    hits = store.search(query, 5)
+    assert [m for m, _ in hits] == expected
+    assert hits[0][1] == pytest.approx(float(np.sum((vectors[expected[0]] - query) ** 2)), rel=1e-4)
+
+    store.save(tmp_path)
+    loaded = VectorStore.load(tmp_path, 8)
+    assert len(loaded) == len(vectors)
+    assert [m for m, _ in loaded.search(query, 5)] == expected
+
+    # First write after loading copies the memory-mapped matrix
+    loaded.add("new", query)
+    assert loaded.search(query, 1)[0][0] == "new"
+    assert VectorStore.load(tmp_path, 16) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_embeddings_share_one_model_call():
+    model = CountingModel()
+    embedder = BatchingEmbedder(model, DIM, max_batch=16, max_delay=0.01)
+
+    vectors = await asyncio.gather(*(embedder.embed(t) for t in ["a", "b", "a", "c"]))
+
+    assert model.calls == [["a", "b", "c"]]
+    assert np.array_equal(vectors[0], vectors[2])
+    assert all(v.shape == (DIM,) for v in vectors)
+
+
+@pytest.mark.asyncio
+async def test_recall_is_cached_and_warm_restart_skips_reembedding(tmp_path):
+    model = CountingModel()
+    manager = _manager(tmp_path, model)
+    await manager.initialize()
+    await asyncio.gather(
+        manager.remember("btc pump after fed hold", MemoryType.MARKET_PATTERN),
+        manager.remember("eth funding squeeze", MemoryType.MARKET_PATTERN),
+        manager.remember("size down after drawdown", MemoryType.LESSON_LEARNED),
+    )
+    assert len(model.calls) == 1  # three remembers, one batched encode
+
+    first = await manager.recall("BTC  pump after Fed hold", top_k=2)
+    assert first[0][0].content == "btc pump after fed hold"
+    calls = len(model.calls)
+    again = await manager.recall("btc pump after fed hold", top_k=2)
+    assert [m.memory_id for m, _ in again] == [m.memory_id for m, _ in first]
+    assert len(model.calls) == calls  # served from the recall cache
+    assert first[0][0].access_count == 2
+
+    lessons = await manager.recall("drawdown", memory_type=MemoryType.LESSON_LEARNED)
+    assert [m.content for m, _ in lessons] == ["size down after drawdown"]
+    await manager.shutdown()
+
+    restarted_model = CountingModel()
+    restarted = _manager(tmp_path, restarted_model)
+    await restarted.initialize()
+    assert restarted.get_health().total_memories == 3
+    assert restarted_model.calls == []  # nothing re-embedded on warm start
+
+    hits = await restarted.recall("btc pump after fed hold", top_k=1)
+    assert hits[0][0].content == "btc pump after fed hold"
+    assert restarted_model.calls == [["btc pump after fed hold"]]
+    await restarted.shutdown()
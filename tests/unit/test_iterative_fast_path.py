@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloud_trader.backtesting.iterative_engine import IterativeBacktestEngine
+
+
+def _prices(n, seed=3):
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    return pd.DataFrame({"close": close}, index=index)
+
+
+def _run_iterative(engine, df, actions, fractions):
+    bars = iter(range(len(df)))
+
+    def step(row, state):
+        i = next(bars)
+        return actions[i], fractions[i]
+
+    return engine.run_agent(df, step)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vectorized_path_matches_iterative(seed):
+    df = _prices(500, seed)
+    rng = np.random.default_rng(seed)
+    # 2 is a no-op code for run_agent; -1 and 0 both exit a long
+    actions = rng.choice([-1, 0, 1, 1, 2, 2, 2], size=len(df))
+    fractions = rng.choice([0.0, 0.25, 0.5, 1.0], size=len(df))
+
+    engine = IterativeBacktestEngine(initial_capital=10000.0, commission=0.001)
+    slow = _run_iterative(engine, df, actions, fractions)
+    fast = engine.run_signals(df, pd.Series(actions, index=df.index), fractions)
+
+    assert fast.total_return == pytest.approx(slow.total_return, rel=1e-9)
+    assert fast.metrics["final_equity"] == pytest.approx(slow.metrics["final_equity"], rel=1e-9)
+    np.testing.assert_allclose(
+        fast.equity_curve.to_numpy(), slow.equity_curve.to_numpy(), rtol=1e-9
+    )
+    assert fast.metrics["trades"] > 0
+
+
+def test_open_position_is_closed_on_last_bar():
+    df = pd.DataFrame({"close": [100.0, 110.0, 121.0]})
+    engine = IterativeBacktestEngine(initial_capital=1000.0, commission=0.0)
+    result = engine.run_signals(df, np.array([1, 2, 2]))
+
+    assert list(result.equity_curve) == pytest.approx([1000.0, 1100.0, 1210.0])
+    assert result.metrics == {"final_equity": pytest.approx(1210.0), "trades": 1, "commission": 0.0}
+    assert result.total_return == pytest.approx(0.21)
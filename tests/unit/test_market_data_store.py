@@ -0,0 +1,250 @@
+import asyncio
+import math
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from cloud_trader.agents.vpin_hft_agent import VpinHFTAgent
+from cloud_trader.data import market_data_store
+from cloud_trader.data.market_data_store import (
+    MarketDataStore,
+    MarketDataStreamService,
+    StoreBackedExchange,
+)
+from cloud_trader.data.vpin import VpinEngine
+
+
+def _kline(open_time, close, closed=False, symbol="BTCUSDT"):
+    return {
+        "stream": f"{symbol.lower()}@kline_1h",
+        "data": {
+            "e": "kline",
+            "s": symbol,
+            "k": {
+                "t": open_time,
+                "T": open_time + 3_599_999,
+                "i": "1h",
+                "o": "1",
+                "h": "2",
+                "l": "0.5",
+                "c": str(close),
+                "v": "10",
+                "x": closed,
+            },
+        },
+    }
+
+
+class _RestClient:
+    def __init__(self):
+        self.calls = []
+
+    def _normalize_symbol(self, symbol):
+        return symbol.replace("-", "").upper()
+
+    async def get_ticker(self, symbol):
+        self.calls.append(("ticker", symbol))
+        return {"symbol": symbol, "lastPrice": "1"}
+
+    async def get_order_book(self, symbol, limit=100):
+        self.calls.append(("depth", symbol))
+        return {"bids": [], "asks": []}
+
+    async def get_historical_klines(self, symbol, interval="1h", limit=100):
+        self.calls.append(("klines", symbol))
+        return [
+            [i * 3_600_000, "1", "2", "0.5", "1", "10", 0, 0, 0, 0, 0, "0"] for i in range(limit)
+        ]
+
+    async def place_order(self, **kwargs):
+        return {"orderId": 1}
+
+
+@pytest.mark.asyncio
+async def test_reads_served_from_stream_messages():
+    store = MarketDataStore()
+    store.handle_message(
+        {
+            "stream": "!ticker@arr",
+            "data": [{"e": "24hrTicker", "s": "BTCUSDT", "c": "65000", "P": "1.5"}],
+        }
+    )
+    store.handle_message(
+        {
+            "e": "depthUpdate",
+            "s": "BTCUSDT",
+            "u": 7,
+            "b": [["64999", "1"], ["64998", "2"]],
+            "a": [["65001", "1"], ["65002", "3"]],
+        }
+    )
+    rest = _RestClient()
+    client = StoreBackedExchange(rest, store)
+
+    ticker = await client.get_ticker("BTC-USDT")
+    book = await client.get_order_book("BTCUSDT", limit=2)
+    assert ticker["lastPrice"] == "65000"
+    assert ticker["priceChangePercent"] == "1.5"
+    assert book["bids"][0] == ["64999", "1"]
+    assert rest.calls == []
+
+    await client.get_order_book("BTCUSDT", limit=100)  # deeper than the stream carries
+    await client.get_ticker("ETHUSDT")
+    assert rest.calls == [("depth", "BTCUSDT"), ("ticker", "ETHUSDT")]
+    assert (await client.place_order(symbol="BTCUSDT")) == {"orderId": 1}
+
+
+@pytest.mark.asyncio
+async def test_klines_seeded_from_rest_then_extended_by_stream():
+    store = MarketDataStore()
+    rest = _RestClient()
+    client = StoreBackedExchange(rest, store)
+
+    first = await client.get_historical_klines("BTCUSDT", "1h", 5)
+    assert len(first) == 5 and len(rest.calls) == 1
+
+    store.handle_message(_kline(4 * 3_600_000, 3, closed=True))
+    store.handle_message(_kline(5 * 3_600_000, 4))
+    rows = await client.get_historical_klines("BTCUSDT", "1h", 5)
+    assert len(rest.calls) == 1
+    assert [row[4] for row in rows[-2:]] == ["3", "4"]
+
+    store.mark_gap(["BTCUSDT"])
+    await client.get_historical_klines("BTCUSDT", "1h", 5)
+    assert len(rest.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_unstreamed_klines_go_back_to_rest(monkeypatch):
+    store = MarketDataStore()
+    service = MarketDataStreamService(store, kline_interval="1h", max_symbols=1)
+    service.track(["BTCUSDT"])  # ETHUSDT will be over max_symbols
+    rest = _RestClient()
+    client = StoreBackedExchange(rest, store, stream=service)
+
+    for symbol, interval in [("BTCUSDT", "1h"), ("BTCUSDT", "4h"), ("ETHUSDT", "1h")]:
+        for _ in range(2):
+            await client.get_historical_klines(symbol, interval, 5)
+    assert [c[1] for c in rest.calls] == ["BTCUSDT"] + ["BTCUSDT"] * 2 + ["ETHUSDT"] * 2
+    assert not service.streams_klines("ETHUSDT", "1h")
+
+    # A seeded series the stream never extends expires after one bar interval
+    now = time.monotonic()
+    monkeypatch.setattr(market_data_store, "time", SimpleNamespace(monotonic=lambda: now + 3601))
+    await client.get_historical_klines("BTCUSDT", "1h", 5)
+    assert len(rest.calls) == 6
+
+
+class _FlakyWebSocket:
+    symbol_connects = 0
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.path = None
+
+    async def connect(self, path="/ws/"):
+        self.path = path
+
+    async def listen(self, callback):
+        if "kline" in self.path:
+            type(self).symbol_connects += 1
+            await callback(_kline(0, 1))
+            if type(self).symbol_connects == 1:
+                raise ConnectionError("dropped")
+        await asyncio.sleep(10)
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_stream_service_reconnects_and_marks_gap():
+    store = MarketDataStore()
+    service = MarketDataStreamService(store, reconnect_backoff=0.01, client_factory=_FlakyWebSocket)
+    _FlakyWebSocket.symbol_connects = 0
+
+    await service.start(["BTCUSDT"])
+    for _ in range(50):
+        if _FlakyWebSocket.symbol_connects == 2:
+            break
+        await asyncio.sleep(0.01)
+    await service.stop()
+
+    assert service.reconnects == 1
+    assert _FlakyWebSocket.symbol_connects == 2
+    assert store.stats["gaps"] == 1
+    assert service.symbols == {"BTCUSDT"}
+
+
+class _RecordingWebSocket:
+    sockets = []
+    messages = {}  # stream -> messages delivered once connected
+
+    def __init__(self, base_url):
+        self.streams = []
+        self.closed = asyncio.Event()
+        type(self).sockets.append(self)
+
+    async def connect(self, path="/ws/"):
+        self.streams.extend(path.split("streams=", 1)[1].split("/"))
+
+    async def subscribe(self, streams, wait_for_ack=True):
+        assert not wait_for_ack  # listen() owns recv
+        self.streams.extend(streams)
+
+    async def listen(self, callback):
+        for stream in self.streams:
+            for message in type(self).messages.get(stream, []):
+                await callback(message)
+        await self.closed.wait()
+
+    async def disconnect(self):
+        self.closed.set()
+
+
+@pytest.mark.asyncio
+async def test_lazily_tracked_symbols_share_connections():
+    _RecordingWebSocket.sockets = []
+    service = MarketDataStreamService(
+        MarketDataStore(), streams_per_connection=6, client_factory=_RecordingWebSocket
+    )
+    await service.start()
+    symbols = [f"SYM{i}USDT" for i in range(8)]
+    for symbol in symbols:  # one REST fallback at a time, as StoreBackedExchange tracks them
+        service.track([symbol])
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    symbol_sockets = _RecordingWebSocket.sockets[1:]
+    assert len(service._tasks) == 1 + math.ceil(len(symbols) * 2 / 6)
+    assert len(symbol_sockets) == 3
+    carried = [stream for socket in symbol_sockets for stream in socket.streams]
+    assert sorted(carried) == sorted(
+        stream for symbol in symbols for stream in service._symbol_streams(symbol)
+    )
+    assert all(len(socket.streams) <= 6 for socket in symbol_sockets)
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_agg_trade_stream_feeds_vpin_agent():
+    store = MarketDataStore()
+    agent = VpinHFTAgent(None, None, "risk")
+    agent.vpin_engine = VpinEngine(bucket_volume=10.0)
+    store.add_agg_trade_listener(agent.on_agg_trade)
+
+    trade = {"e": "aggTrade", "s": "BTCUSDT", "p": "100.5", "q": "12", "T": 1, "m": False}
+    _RecordingWebSocket.sockets = []
+    _RecordingWebSocket.messages = {
+        "btcusdt@aggTrade": [{"stream": "btcusdt@aggTrade", "data": trade}]
+    }
+    service = MarketDataStreamService(store, agg_trades=True, client_factory=_RecordingWebSocket)
+    await service.start(["BTCUSDT"])
+    await asyncio.sleep(0.01)
+    await service.stop()
+    _RecordingWebSocket.messages = {}
+
+    assert "btcusdt@aggTrade" in _RecordingWebSocket.sockets[1].streams
+    reading = agent.vpin_engine.snapshot("BTCUSDT")
+    assert reading["trades"] == 1 and reading["buckets"] == 1
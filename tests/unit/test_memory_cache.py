@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+from cloud_trader.cache import InMemoryCache
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_missed_and_reaped(monkeypatch):
+    cache = InMemoryCache(reaper_interval=0.01)
+    # Pretend entries were written in the past so they are already due by the
+    # time the reaper runs against the real clock.
+    now = time.monotonic() - 10
+    monkeypatch.setattr("cloud_trader.cache.time.monotonic", lambda: now)
+
+    await cache.set("orderbook:BTCUSDT", {"bids": []}, ttl=1)
+    await cache.set("symbol:info:BTCUSDT", {"tick": 0.1})
+    assert await cache.get("orderbook:BTCUSDT") == {"bids": []}
+
+    now += 2
+    assert await cache.get("orderbook:BTCUSDT") is None
+    assert await cache.get("symbol:info:BTCUSDT") == {"tick": 0.1}
+
+    await cache.set("funding:BTCUSDT", {"funding_rate": 0.01}, ttl=1)
+    monkeypatch.undo()
+    await cache.connect()
+    await asyncio.sleep(0.05)
+    stats = await cache.get_stats()
+    await cache.disconnect()
+
+    assert stats["entries"] == 1
+    assert stats["expirations"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_bound_evicts_least_recently_used():
+    cache = InMemoryCache(max_entries=2, max_bytes=0)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+    assert (await cache.get_stats())["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_byte_bound_evicts_until_under_limit():
+    cache = InMemoryCache(max_entries=0, max_bytes=2_000)
+    for i in range(10):
+        await cache.set(f"blob:{i}", "x" * 500)
+
+    stats = await cache.get_stats()
+    assert stats["bytes"] <= 2_000
+    assert await cache.get("blob:9") is not None
+    assert await cache.get("blob:0") is None
+
+
+@pytest.mark.asyncio
+async def test_clear_pattern_uses_namespace_index():
+    cache = InMemoryCache()
+    for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+        await cache.set(f"market:snapshot:{symbol}", {"symbol": symbol})
+        await cache.set(f"atr:{symbol}:14", {"atr": 1.0})
+
+    assert await cache.clear_pattern("market:snapshot:*USDT") == 3
+    assert await cache.clear_pattern("atr:ETH*") == 1
+    assert await cache.clear_pattern("atr:BTCUSDT:14") == 1
+    assert await cache.get("atr:SOLUSDT:14") == {"atr": 1.0}
+    assert (await cache.get_stats())["entries"] == 1
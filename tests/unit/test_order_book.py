@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from cloud_trader.agents.vpin_hft_agent import VpinHFTAgent
+from cloud_trader.data.feature_pipeline import FeaturePipeline
+from cloud_trader.data.market_data_store import MarketDataStore, StoreBackedExchange
+from cloud_trader.data.order_book import L2OrderBook, OrderBookEngine
+from cloud_trader.data.vpin import VpinEngine
+
+SNAPSHOT = {
+    "lastUpdateId": 100,
+    "bids": [["99.0", "2"], ["100.0", "1"], ["98.0", "5"]],
+    "asks": [["101.0", "1"], ["102.0", "3"], ["103.0", "4"]],
+}
+
+
+def _diff(first, final, prev, bids=(), asks=()):
+    return {
+        "e": "depthUpdate",
+        "s": "BTCUSDT",
+        "U": first,
+        "u": final,
+        "pu": prev,
+        "b": [list(level) for level in bids],
+        "a": [list(level) for level in asks],
+    }
+
+
+def test_book_queries():
+    book = L2OrderBook("BTCUSDT")
+    book.load_snapshot(SNAPSHOT)
+
+    assert book.best_bid == 100.0 and book.best_ask == 101.0
+    assert book.mid == 100.5
+    # Equal top sizes -> microprice equals mid; heavier bid pulls it toward the ask
+    assert book.microprice == pytest.approx(100.5)
+    book.apply_levels([["100.0", "3"]], [])
+    assert book.microprice == pytest.approx((100 * 1 + 101 * 3) / 4)
+
+    assert book.imbalance(2) == pytest.approx((5 - 4) / 9)
+    depth = book.depth_within_bps(150)  # +-1.5075 around 100.5
+    assert depth["bid_qty"] == 5 and depth["ask_qty"] == 4
+
+    impact = book.market_impact("BUY", 3)
+    assert impact["avg_price"] == pytest.approx((101 + 2 * 102) / 3)
+    assert impact["levels_consumed"] == 2 and impact["unfilled_qty"] == 0
+    assert impact["impact_bps"] == pytest.approx((impact["avg_price"] - 100.5) / 100.5 * 1e4)
+    assert book.market_impact("SELL", 100)["unfilled_qty"] == pytest.approx(90)
+
+    book.apply_levels([["100.0", "0"]], [])
+    assert book.to_dict(1)["bids"] == [["99.0", "2.0"]]
+
+
+@pytest.mark.asyncio
+async def test_engine_sequencing_and_gap_resync():
+    snapshots = []
+
+    async def fetch(symbol):
+        snapshots.append(symbol)
+        return {**SNAPSHOT, "lastUpdateId": 130}
+
+    engine = OrderBookEngine(snapshot_fetcher=fetch)
+    engine.load_snapshot("BTCUSDT", SNAPSHOT)
+
+    assert engine.apply_diff("BTCUSDT", _diff(90, 99, 89))  # older than snapshot, dropped
+    assert engine.apply_diff("BTCUSDT", _diff(95, 105, 94, bids=[("100.5", "1")]))
+    assert engine.apply_diff("BTCUSDT", _diff(106, 110, 105, asks=[("101.0", "0")]))
+    book = engine.get_book("BTCUSDT")
+    assert book.best_bid == 100.5 and book.best_ask == 102.0
+
+    # pu does not chain from the previous u -> gap, book withdrawn, resync scheduled
+    assert not engine.apply_diff("BTCUSDT", _diff(120, 125, 118))
+    assert engine.get_book("BTCUSDT") is None
+    engine.handle_message({"stream": "btcusdt@depth@100ms", "data": _diff(126, 135, 125)})
+    await asyncio.sleep(0.01)
+
+    assert snapshots == ["BTCUSDT"]
+    assert engine.is_synced("BTCUSDT")
+    # Buffered event straddling the new snapshot id was replayed on top of it
+    assert engine.get_book("BTCUSDT").last_update_id == 135
+    assert engine.stats["gaps"] == 1 and engine.stats["resyncs"] == 1
+    await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_live_book_feeds_reads_and_features():
+    engine = OrderBookEngine()
+    engine.load_snapshot("BTCUSDT", SNAPSHOT)
+
+    class _Rest:
+        def _normalize_symbol(self, symbol):
+            return symbol.replace("-", "").upper()
+
+        async def get_order_book(self, symbol, limit=100):
+            raise AssertionError("REST should not be hit for a live book")
+
+    client = StoreBackedExchange(_Rest(), MarketDataStore(), order_books=engine)
+    depth = await client.get_order_book("BTC-USDT", limit=2)
+    assert depth["asks"] == [["101.0", "1.0"], ["102.0", "3.0"]]
+
+    pipeline = FeaturePipeline(client)
+    features = pipeline._process_analysis("BTCUSDT", None, client.get_live_book("BTCUSDT"))
+    assert features["bid_pressure"] == pytest.approx(8 / 16)
+    assert features["microprice"] == pytest.approx(100.5)
+    assert features["spread_pct"] == pytest.approx(1 / 101)
+
+
+def test_vpin_readings_carry_live_quote_imbalance():
+    engine = OrderBookEngine()
+    engine.load_snapshot("BTCUSDT", SNAPSHOT)
+    engine.get_book("BTCUSDT").apply_levels([["100.0", "3"]], [])
+    agent = VpinHFTAgent(None, None, "risk", order_books=engine)
+    agent.vpin_engine = VpinEngine(bucket_volume=10.0)
+
+    def trade(symbol):
+        return {"e": "aggTrade", "s": symbol, "p": "100.5", "q": "12", "T": 1, "m": False}
+
+    reading = agent.on_agg_trade(trade("BTCUSDT"))
+    assert reading["quote_imbalance"]["quote_imbalance"] == pytest.approx((10 - 8) / 18)
+    assert "quote_imbalance" not in agent.on_agg_trade(trade("ETHUSDT"))  # no live book
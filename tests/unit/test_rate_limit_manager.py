@@ -3,7 +3,12 @@ import time
 
 import pytest
 
-from cloud_trader.rate_limit_manager import RateLimitManager
+from cloud_trader.rate_limit_manager import (
+    Priority,
+    RateLimitManager,
+    VenueRateLimiter,
+    get_venue_limiter,
+)
 
 
 @pytest.fixture
@@ -95,3 +100,50 @@ def test_update_rate_limits(rate_limit_manager):
     rate_limit_manager.update_rate_limits("agent1", rps=10, rpm=200)
     assert rate_limit_manager._rate_limits["agent1"]["rps"] == 10
     assert rate_limit_manager._rate_limits["agent1"]["rpm"] == 200
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_orders_preempt_market_data():
+    limiter = VenueRateLimiter("test", {"weight": (10, 1.0)}, order_reserve=0.0)
+    await limiter.acquire({"weight": 10})  # drain the bucket
+
+    served = []
+
+    async def request(name, priority):
+        await limiter.acquire({"weight": 5}, priority)
+        served.append(name)
+
+    poll = asyncio.create_task(request("poll", Priority.MARKET_DATA))
+    await asyncio.sleep(0)
+    order = asyncio.create_task(request("order", Priority.ORDER))
+    await asyncio.wait_for(asyncio.gather(poll, order), 2.0)
+
+    assert served == ["order", "poll"]
+    assert limiter.stats["waited"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reserve_headers_and_penalty():
+    limiter = VenueRateLimiter(
+        "test",
+        {"weight": (100, 60.0)},
+        order_reserve=0.2,
+        header_buckets={"x-mbx-used-weight-1m": "weight"},
+    )
+    limiter.sync_from_headers({"X-MBX-USED-WEIGHT-1M": "85"})
+
+    # 15 left: market data may not dip into the 20-token order reserve, orders may
+    with pytest.raises(TimeoutError):
+        await limiter.acquire({"weight": 1}, Priority.MARKET_DATA, timeout=0.05)
+    await limiter.acquire({"weight": 10}, Priority.ORDER, timeout=0.05)
+
+    limiter.penalize(0.05)
+    start = time.monotonic()
+    limiter.buckets["weight"].tokens = 100
+    await limiter.acquire({"weight": 1}, Priority.ORDER, timeout=1.0)
+    assert time.monotonic() - start >= 0.04
+
+
+def test_venue_limiters_are_shared():
+    assert get_venue_limiter("aster") is get_venue_limiter("aster")
+    assert get_venue_limiter("aster").buckets["weight"].capacity == 2400
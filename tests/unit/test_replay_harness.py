@@ -0,0 +1,189 @@
+import importlib
+import sys
+import time
+import types
+
+import numpy as np
+import pytest
+
+from cloud_trader.agent_consensus import AgentConsensusEngine
+from cloud_trader.backtesting.candle_store import CandleStore
+from cloud_trader.backtesting.replay import ReplayHarness, SimulatedExchange, VirtualClock
+from cloud_trader.config import Settings
+from cloud_trader.definitions import MinimalAgentState
+from cloud_trader.platform_router import PlatformRouter
+from cloud_trader.risk import PortfolioState
+from cloud_trader.scan_pipeline import ScanPipeline
+from cloud_trader.swarm import SwarmManager
+
+HOUR = 3_600_000
+
+
+def _store(tmp_path, symbols=("BTCUSDT", "ETHUSDT"), count=60, step=1.0, swing=0.0):
+    """Rising closes; ``swing`` alternates each bar down/up around the trend."""
+    store = CandleStore(str(tmp_path))
+    bars = np.arange(count, dtype=float)
+    for n, symbol in enumerate(symbols):
+        close = 100.0 * (n + 1) + step * bars + swing * np.where(bars % 2, 1.0, -1.0)
+        store.append(
+            symbol,
+            "1h",
+            {
+                "ts": np.arange(count) * HOUR,
+                "open": close - 0.5,
+                "high": close + 1,
+                "low": close - 1,
+                "close": close,
+                "volume": np.full(count, 10.0),
+            },
+        )
+    return store
+
+
+@pytest.mark.asyncio
+async def test_simulated_exchange_hides_unclosed_bars_and_nets_fills(tmp_path):
+    clock = VirtualClock()
+    exchange = SimulatedExchange(
+        _store(tmp_path), clock, balance=1000.0, fee_rate=0.0, slippage_bps=0.0
+    )
+
+    clock.advance_to(11 * HOUR)  # bar 10 has just closed
+    ticker = await exchange.get_ticker("BTCUSDT")
+    assert float(ticker["lastPrice"]) == 110.0
+    klines = await exchange.get_historical_klines("BTCUSDT", "1h", limit=5)
+    assert [row[0] for row in klines] == [6 * HOUR, 7 * HOUR, 8 * HOUR, 9 * HOUR, 10 * HOUR]
+    assert float(klines[-1][4]) == 110.0
+
+    order = await exchange.place_order("BTCUSDT", "BUY", quantity=2.0)
+    assert order["status"] == "FILLED" and float(order["avgPrice"]) == 110.0
+    assert (await exchange.get_order("BTCUSDT", orderId=order["orderId"]))["status"] == "FILLED"
+
+    clock.advance_to(21 * HOUR)
+    risk = await exchange.get_position_risk()
+    assert float(risk[0]["unRealizedProfit"]) == pytest.approx(20.0)
+
+    await exchange.place_order("BTCUSDT", "SELL", quantity=2.0)
+    assert exchange.positions == {}
+    assert exchange.balance == pytest.approx(1020.0)
+    assert len(exchange.fills) == 2
+
+
+class _Router:
+    def __init__(self):
+        self.jitter_range = (0.1, 1.5)
+
+
+class _Consensus:
+    async def conduct_consensus_vote(self, symbol):
+        return symbol
+
+
+class _StubService:
+    """Just the surface ReplayHarness wires into, with a three-stage cycle."""
+
+    def __init__(self):
+        self.position_manager = None
+        self._swarm_manager = SwarmManager()
+        self._consensus_engine = _Consensus()
+        self._consensus_history = []
+        self._portfolio = PortfolioState(balance=0.0, equity=0.0)
+        self.platform_router = _Router()
+        self.agent = MinimalAgentState(
+            id="m1", name="Momentum", type="momentum", model="none", emoji=""
+        )
+        self.clock_seen = []
+
+    async def _execute_trade_order(self, agent, symbol, side, quantity, thesis, is_closing=False):
+        await self._exchange.place_order(symbol, side, quantity=quantity)
+
+    async def _scan_and_execute_new_trades(self):
+        # Look the module up the way mock.patch does; other tests may have re-imported it
+        trading_service = sys.modules["cloud_trader.trading_service"]
+        self.clock_seen.append(trading_service.time.time())
+        for symbol in self._market_structure:
+            await self._analysis_engine.analyze_market(self.agent, symbol)
+            if symbol not in self._exchange.positions:
+                decision = await self._consensus_engine.conduct_consensus_vote(symbol)
+                await self._execute_trade_order(self.agent, decision, "BUY", 1.0, "test")
+
+
+@pytest.mark.asyncio
+async def test_harness_replays_service_cycle_on_virtual_clock(tmp_path):
+    service = _StubService()
+    harness = ReplayHarness(service, _store(tmp_path), ["BTCUSDT", "ETHUSDT"], balance=5000.0)
+
+    report = await harness.run(warmup_bars=30)
+
+    assert report.cycles == 30
+    assert service.clock_seen[0] == 31 * HOUR / 1000
+    assert time.time() > 1_000_000_000  # real clock restored afterwards
+    assert service.platform_router.jitter_range == (0.0, 0.0)
+
+    # Each symbol is bought once, on the first replayed bar
+    assert report.decisions() == [(31 * HOUR, "BTCUSDT", "BUY"), (31 * HOUR, "ETHUSDT", "BUY")]
+    assert report.stages["analyze"]["count"] == 60
+    assert report.stages["execute"]["count"] == 2
+    assert report.stages["cycle"]["count"] == 30
+    assert report.simulated_ms == 30 * HOUR
+    assert report.speedup > 1
+
+
+def _trading_service(monkeypatch):
+    """A bare ``TradingService`` with the real analysis, consensus and routing stack."""
+    # Integration suites replace this module with a MagicMock at collection time
+    if not isinstance(sys.modules.get("cloud_trader.trading_service"), types.ModuleType):
+        monkeypatch.delitem(sys.modules, "cloud_trader.trading_service", raising=False)
+    trading_service = importlib.import_module("cloud_trader.trading_service")
+
+    # TradingService() needs live credentials and clients; set only what the scan cycle reads
+    service = trading_service.TradingService.__new__(trading_service.TradingService)
+    service._settings = Settings()
+    service.position_manager = None
+    service.market_data_manager = None
+    service._internal_open_positions = {}
+    service._internal_market_structure = {}
+    service._agent_states = {
+        agent_id: MinimalAgentState(
+            id=agent_id, name=f"Momentum {agent_id}", type="momentum", model="none", emoji=""
+        )
+        for agent_id in ("m1", "m2")
+    }
+    service._swarm_manager = SwarmManager()
+    service._consensus_engine = AgentConsensusEngine()
+    service._consensus_history = []
+    service._scan_pipeline = ScanPipeline(max_concurrency=4, cycle_deadline_seconds=30.0)
+    service._portfolio = PortfolioState(balance=0.0, equity=0.0)
+    service._telegram = None
+    service._latencies = []
+    service.platform_router = PlatformRouter(service)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_harness_replays_real_trading_service_pipeline(tmp_path, monkeypatch):
+    service = _trading_service(monkeypatch)
+    store = _store(tmp_path, count=90, step=0.2, swing=1.5)
+    harness = ReplayHarness(service, store, ["BTCUSDT", "ETHUSDT"], balance=5000.0)
+
+    report = await harness.run(warmup_bars=55)
+
+    # Both momentum agents vote BUY on the uptrend; each symbol is entered once
+    assert report.cycles == 35
+    assert sorted(report.decisions()) == [
+        (56 * HOUR, "BTCUSDT", "BUY"),
+        (56 * HOUR, "ETHUSDT", "BUY"),
+    ]
+    assert [c["winning_signal"] for c in report.consensus] == ["entry_long", "entry_long"]
+    assert set(harness.exchange.positions) == {"BTCUSDT", "ETHUSDT"}
+    assert all(f["avgPrice"] for f in report.fills)
+
+    # Entries are stamped with the replay clock, not the wall clock
+    assert service._open_positions["BTCUSDT"]["open_time"] == 56 * HOUR / 1000
+    assert service._open_positions["BTCUSDT"]["platform"] == "aster"
+
+    # Open positions drop the symbols from later scans
+    assert report.stages["analyze"]["count"] == 4
+    assert report.stages["consensus"]["count"] == 2
+    assert report.stages["execute"]["count"] == 2
+    assert report.stages["cycle"]["count"] == 35
+    assert all(stage["avg_ms"] > 0 for stage in report.stages.values())
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from cloud_trader.scan_pipeline import ScanPipeline
+
+
+@pytest.mark.asyncio
+async def test_gather_respects_concurrency_limit():
+    pipeline = ScanPipeline(max_concurrency=3, cycle_deadline_seconds=5)
+    in_flight = 0
+    peak = 0
+
+    async def gather(symbol):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return symbol
+
+    async def vote(symbol, gathered):
+        return None
+
+    async def execute(symbol, decision):
+        raise AssertionError("should not execute without a decision")
+
+    stats = await pipeline.run([f"SYM{i}" for i in range(10)], gather, vote, execute)
+
+    assert peak == 3
+    assert stats.symbols_gathered == 10
+    assert stats.symbols_voted == 10
+    assert stats.symbols_executed == 0
+
+
+@pytest.mark.asyncio
+async def test_results_stream_in_completion_order():
+    pipeline = ScanPipeline(max_concurrency=10, cycle_deadline_seconds=5)
+    delays = {"SLOW": 0.05, "FAST": 0.0}
+    executed = []
+
+    async def gather(symbol):
+        await asyncio.sleep(delays[symbol])
+        return symbol
+
+    async def vote(symbol, gathered):
+        return gathered
+
+    async def execute(symbol, decision):
+        executed.append(symbol)
+
+    stats = await pipeline.run(["SLOW", "FAST"], gather, vote, execute)
+
+    assert executed == ["FAST", "SLOW"]
+    assert stats.to_dict()["phases"]["execute"]["count"] == 2
+    assert pipeline.last_stats is stats
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_pending_symbols():
+    pipeline = ScanPipeline(max_concurrency=2, cycle_deadline_seconds=0.05)
+
+    async def gather(symbol):
+        await asyncio.sleep(0 if symbol == "QUICK" else 1.0)
+        return symbol
+
+    async def vote(symbol, gathered):
+        return gathered
+
+    async def execute(symbol, decision):
+        pass
+
+    stats = await pipeline.run(["QUICK", "STUCK1", "STUCK2"], gather, vote, execute)
+
+    assert stats.deadline_hit is True
+    assert stats.symbols_executed == 1
+    assert stats.symbols_timed_out == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_isolated_per_symbol():
+    pipeline = ScanPipeline(max_concurrency=4, cycle_deadline_seconds=5)
+
+    async def gather(symbol):
+        if symbol == "BAD_GATHER":
+            raise RuntimeError("boom")
+        return symbol
+
+    async def vote(symbol, gathered):
+        if symbol == "BAD_VOTE":
+            raise RuntimeError("boom")
+        return gathered
+
+    async def execute(symbol, decision):
+        pass
+
+    stats = await pipeline.run(["OK", "BAD_GATHER", "BAD_VOTE"], gather, vote, execute)
+
+    assert stats.symbols_failed == 2
+    assert stats.symbols_executed == 1
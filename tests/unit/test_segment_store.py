@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from cloud_trader.memory import Episode, EpisodicMemory, TradeOutcome
+from cloud_trader.memory.segment_store import SegmentStore
+
+
+def test_put_get_delete_and_reopen(tmp_path):
+    store = SegmentStore(tmp_path, segment_bytes=256)
+    for i in range(20):
+        store.put(f"k{i}", {"i": i}, symbol="BTC" if i % 2 else "ETH", ts=float(i))
+    store.put("k3", {"i": 33}, symbol="BTC", ts=3.0)
+    assert store.delete("k4")
+    assert not store.delete("missing")
+    store.close()
+
+    reopened = SegmentStore(tmp_path, segment_bytes=256)
+    assert reopened.stats()["segments"] > 1
+    assert len(reopened) == 19
+    assert reopened.get("k3") == {"i": 33}
+    assert reopened.get("k4") is None
+    assert [k for k, _ in reopened.tail(3)] == ["k17", "k18", "k19"]
+    assert [k for k, _ in reopened.tail(2, symbol="ETH")] == ["k16", "k18"]
+
+
+def test_compaction_drops_garbage_and_keeps_live_records(tmp_path):
+    store = SegmentStore(tmp_path, segment_bytes=512, min_compact_bytes=0)
+    for version in range(10):
+        store.put("hot", {"version": version}, ts=1.0)
+        store.put(f"cold{version}", {"v": version}, ts=2.0 + version)
+
+    stats = store.stats()
+    assert stats["dead_bytes"] <= 0.5 * stats["total_bytes"]
+    assert store.get("hot") == {"version": 9}
+    assert len(store) == 11
+    store.close()
+
+    reopened = SegmentStore(tmp_path)
+    assert reopened.get("hot") == {"version": 9}
+    assert dict(reopened.items())["cold9"] == {"v": 9}
+
+
+def test_torn_tail_is_truncated_and_missing_sidecar_rebuilt(tmp_path):
+    store = SegmentStore(tmp_path)
+    store.put("a", {"x": 1}, ts=1.0)
+    store.put("b", {"x": 2}, ts=2.0)
+    store.close()
+
+    segment = sorted(tmp_path.glob("*.seg"))[-1]
+    intact = segment.stat().st_size
+    with open(segment, "ab") as fh:
+        fh.write(b"\x40\x00\x00\x00garbage")  # header of a record that never finished
+    segment.with_suffix(".idx").unlink()
+
+    reopened = SegmentStore(tmp_path)
+    assert reopened.get("a") == {"x": 1} and reopened.get("b") == {"x": 2}
+    assert segment.stat().st_size == intact
+    reopened.put("c", {"x": 3}, ts=3.0)
+    reopened.close()
+    assert len(SegmentStore(tmp_path)) == 3
+
+
+@pytest.mark.asyncio
+async def test_episodic_memory_appends_and_loads_only_the_window(tmp_path):
+    legacy = Episode(symbol="SOL-USDC", signal_type="LONG", market_state_embedding_text="legacy")
+    (tmp_path / f"{legacy.episode_id}.json").write_text(json.dumps(legacy.to_dict()))
+
+    memory = EpisodicMemory(storage_path=str(tmp_path), max_memory_episodes=50)
+    assert memory.get_by_id(legacy.episode_id) is not None
+    assert not list(tmp_path.glob("*.json"))  # migrated into the log
+
+    episode = Episode(symbol="BTC-USDC", signal_type="LONG", market_state_embedding_text="btc")
+    await memory.store(episode)
+    await memory.update_outcome(episode.episode_id, TradeOutcome(success=True, pnl=10.0))
+
+    windowed = EpisodicMemory(storage_path=str(tmp_path), max_memory_episodes=1)
+    assert windowed.get_stats()["in_memory"] == 1
+    loaded = windowed.get_by_id(episode.episode_id)
+    assert loaded is not None and loaded.outcome.pnl == 10.0
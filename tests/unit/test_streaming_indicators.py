@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloud_trader.data.feature_pipeline import FeaturePipeline
+from cloud_trader.data.market_data_store import MarketDataStore
+from cloud_trader.data.streaming_indicators import StreamingIndicatorEngine
+
+HOUR = 3_600_000
+
+COLUMNS = [
+    "EMA_20",
+    "EMA_50",
+    "RSI_14",
+    "ATRr_14",
+    "MACD",
+    "MACD_signal",
+    "MACD_hist",
+    "BB_mid",
+    "BB_upper",
+    "BB_lower",
+    "STOCH_K",
+    "STOCH_D",
+    "CCI",
+    "OBV",
+    "ADX",
+    "FIB_0.5",
+    "FIB_0.618",
+    "VSOP",
+]
+
+
+def _candles(n=150, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    high = close * (1 + np.abs(rng.normal(0, 0.004, n)))
+    low = close * (1 - np.abs(rng.normal(0, 0.004, n)))
+    volume = rng.uniform(500, 1500, n)
+    timestamps = pd.date_range("2024-01-01", periods=n, freq="h")
+    return pd.DataFrame(
+        {"timestamp": timestamps, "high": high, "low": low, "close": close, "volume": volume}
+    )
+
+
+def _assert_row_matches(row, expected):
+    for col in COLUMNS:
+        a, b = row[col], float(expected[col])
+        if math.isnan(b):
+            assert math.isnan(a), col
+        else:
+            assert a == pytest.approx(b, rel=1e-7, abs=1e-7), col
+    assert row["WYCKOFF_PHASE"] == expected["WYCKOFF_PHASE"]
+
+
+def test_incremental_rows_match_batch_recompute():
+    df = _candles()
+    pipeline = FeaturePipeline(None)
+    engine = StreamingIndicatorEngine()
+
+    for i, candle in enumerate(df.to_dict("records")):
+        row = engine.update("BTCUSDT", candle)
+        if i >= 60 and i % 9 == 0:
+            batch = pipeline.calculate_indicators(df.iloc[: i + 1].copy())
+            _assert_row_matches(row, batch.iloc[-1])
+
+
+def test_partial_candle_does_not_commit_state():
+    df = _candles()
+    engine = StreamingIndicatorEngine()
+    records = df.to_dict("records")
+    for candle in records[:-1]:
+        engine.update("ETHUSDT", candle)
+
+    forming = dict(records[-1], close=records[-1]["close"] * 1.05)
+    first = engine.update("ETHUSDT", forming, closed=False)
+    again = engine.update("ETHUSDT", forming, closed=False)
+    assert first["RSI_14"] == again["RSI_14"]
+    assert engine.bars("ETHUSDT") == len(records) - 1
+
+    final = engine.update("ETHUSDT", records[-1], closed=True)
+    batch = FeaturePipeline(None).calculate_indicators(df.copy())
+    _assert_row_matches(final, batch.iloc[-1])
+
+
+def test_ingest_frame_only_applies_new_bars():
+    df = _candles(n=120)
+    engine = StreamingIndicatorEngine()
+    engine.ingest_frame("SOLUSDT", df.iloc[:100])
+    assert engine.bars("SOLUSDT") == 99  # last row is the forming candle
+
+    row = engine.ingest_frame("SOLUSDT", df.iloc[20:120].reset_index(drop=True))
+    assert engine.bars("SOLUSDT") == 119
+
+    batch = FeaturePipeline(None).calculate_indicators(df.copy())
+    _assert_row_matches(row, batch.iloc[-1])
+
+
+def _kline_message(symbol, candle, closed):
+    open_time = int(candle["timestamp"].value // 1_000_000)
+    return {
+        "e": "kline",
+        "s": symbol,
+        "k": {
+            "t": open_time,
+            "T": open_time + HOUR - 1,
+            "i": "1h",
+            "o": str(candle["close"]),
+            "h": str(candle["high"]),
+            "l": str(candle["low"]),
+            "c": str(candle["close"]),
+            "v": str(candle["volume"]),
+            "x": closed,
+        },
+    }
+
+
+def test_streamed_klines_interleave_with_frame_ingests():
+    df = _candles(n=140)
+    records = df.to_dict("records")
+    pipeline = FeaturePipeline(None)
+    engine = pipeline._indicator_engine
+    store = MarketDataStore()
+    store.add_kline_listener(pipeline.on_kline)
+
+    pipeline._process_analysis("BTCUSDT", df.iloc[:100], {})
+    for i in range(99, 110):  # forming update, then the close, for each bar
+        store.handle_message(_kline_message("BTCUSDT", dict(records[i], close=1.0), False))
+        store.handle_message(_kline_message("BTCUSDT", records[i], True))
+    assert engine.bars("BTCUSDT") == 110
+    assert engine.last_timestamp("BTCUSDT") == int(df["timestamp"].iloc[109].value // 1_000_000)
+
+    # A REST refresh after streamed bars applies only the newer ones
+    pipeline._process_analysis("BTCUSDT", df.iloc[20:120].reset_index(drop=True), {})
+    assert engine.bars("BTCUSDT") == 119
+    store.handle_message(_kline_message("BTCUSDT", records[100], True))  # already committed
+    for i in range(119, 140):
+        store.handle_message(_kline_message("BTCUSDT", records[i], True))
+    assert engine.bars("BTCUSDT") == 140
+
+    batch = pipeline.calculate_indicators(df.copy())
+    _assert_row_matches(engine.snapshot("BTCUSDT"), batch.iloc[-1])
+    assert pipeline._analysis_cache["BTCUSDT"][0]["rsi"] == engine.snapshot("BTCUSDT")["RSI_14"]
+
+    # A skipped bar drops the state; the next frame rebuilds it
+    later = _candles(n=145).to_dict("records")
+    store.handle_message(_kline_message("BTCUSDT", later[141], True))
+    assert not engine.has_state("BTCUSDT")
+    store.handle_message(_kline_message("ETHUSDT", records[0], True))  # never warmed from REST
+    assert not engine.has_state("ETHUSDT")
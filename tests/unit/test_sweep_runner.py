@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from cloud_trader.backtesting.sweep import (
+    SweepRunner,
+    grid,
+    random_sample,
+    signals_to_trades,
+    walk_forward_folds,
+)
+
+
+def threshold_strategy(df, params):
+    return (df["close"] > df["sma_5"] * params["k"]).astype(int)
+
+
+def _frame(n=200):
+    index = pd.date_range("2024-01-01", periods=n, freq="h", name="timestamp")
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    df = pd.DataFrame({"close": close, "volume": 1.0}, index=index)
+    df["sma_5"] = df["close"].rolling(5).mean()
+    return df
+
+
+def test_spaces_and_folds():
+    assert grid({"a": [1, 2], "b": ["x"]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+    samples = random_sample({"n": (1, 3), "k": (0.5, 1.5), "m": ["a", "b"]}, 5, seed=1)
+    assert samples == random_sample({"n": (1, 3), "k": (0.5, 1.5), "m": ["a", "b"]}, 5, seed=1)
+    assert all(1 <= s["n"] <= 3 and 0.5 <= s["k"] <= 1.5 for s in samples)
+
+    folds = walk_forward_folds(100, train_size=40, test_size=20)
+    assert [(f.train, f.test) for f in folds] == [
+        ((0, 40), (40, 60)),
+        ((20, 60), (60, 80)),
+        ((40, 80), (80, 100)),
+    ]
+
+
+def test_signals_to_trades_round_trips():
+    df = _frame(6)
+    trades = signals_to_trades(df, pd.Series([0, 1, 1, 0, -1, -1]), "SOL/USD", 1000.0)
+    assert [(t.side, t.entry_time, t.exit_time) for t in trades] == [
+        ("LONG", df.index[1], df.index[3]),
+        ("SHORT", df.index[4], df.index[5]),
+    ]
+
+
+def test_sweep_streams_ranks_and_resumes(tmp_path):
+    frame = _frame()
+    folds = walk_forward_folds(len(frame), train_size=80, test_size=40)
+    output = str(tmp_path / "leaderboard.json")
+
+    inline = SweepRunner(frame, threshold_strategy, output, max_workers=1)
+    board = inline.run(grid({"k": [0.99, 1.0]}), folds)
+    assert [row["rank"] for row in board] == [1, 2]
+    assert all(row["folds"] == len(folds) for row in board)
+    assert board[0]["oos_sharpe_ratio"] >= board[1]["oos_sharpe_ratio"]
+
+    # Resume on a process pool: only the new parameter set is evaluated
+    pooled = SweepRunner(frame, threshold_strategy, output, max_workers=2)
+    board = pooled.run(grid({"k": [0.99, 1.0, 1.01]}), folds)
+    assert len(pooled.load_records()) == 3 * len(folds)
+    assert len(board) == 3
+
+    with open(output) as fh:
+        assert json.load(fh) == json.loads(json.dumps(board))
+
+    # Identical inputs score identically whether run inline or in a worker
+    fresh = SweepRunner(frame, threshold_strategy, str(tmp_path / "other.json"), max_workers=2)
+    by_params = {json.dumps(r["params"]): r for r in fresh.run(grid({"k": [0.99]}), folds)}
+    inline_row = next(r for r in board if r["params"] == {"k": 0.99})
+    assert by_params['{"k": 0.99}']["oos_total_return"] == inline_row["oos_total_return"]
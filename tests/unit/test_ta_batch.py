@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas_ta")
+
+from cloud_trader.ta_indicators import TAIndicators  # noqa: E402
+
+
+def _market(n_symbols=6, n_bars=220, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_symbols, n_bars)), axis=1))
+    high = close * (1 + np.abs(rng.normal(0, 0.004, close.shape)))
+    low = close * (1 - np.abs(rng.normal(0, 0.004, close.shape)))
+    volume = rng.uniform(500, 1500, close.shape)
+    return high, low, close, volume
+
+
+def _assert_close(actual, expected, label):
+    if expected is None:
+        assert actual is None or math.isnan(actual), label
+    else:
+        assert actual == pytest.approx(expected, rel=1e-8, abs=1e-8), label
+
+
+@pytest.mark.parametrize("n_bars", [16, 40, 60, 220])
+def test_batch_matches_per_symbol_analysis(n_bars):
+    high, low, close, volume = _market(n_bars=n_bars)
+    batch = TAIndicators.get_comprehensive_analysis_batch(high, low, close, volume)
+
+    for row, analysis in enumerate(batch):
+        expected = TAIndicators.get_comprehensive_analysis(
+            list(high[row]), list(low[row]), list(close[row]), list(volume[row])
+        )
+        for key in ("rsi", "atr", "vwap", "ema_20", "ema_50", "sma_200"):
+            _assert_close(analysis[key], expected[key], key)
+        for key in ("macd", "bollinger", "stoch_rsi", "adx", "obv"):
+            if expected[key] is None:
+                assert analysis[key] is None, key
+                continue
+            for field, value in expected[key].items():
+                _assert_close(analysis[key][field], value, f"{key}.{field}")
+
+        assert analysis["signal_count"] == expected["signal_count"]
+        assert analysis["signal_strength"] == pytest.approx(expected["signal_strength"])
+        assert analysis["bias"] == expected["bias"]
+
+
+def test_calculate_batch_accepts_single_symbol_and_validates_shape():
+    high, low, close, volume = _market(n_symbols=1, n_bars=50)
+    batch = TAIndicators.calculate_batch(high[0], low[0], close[0], volume[0])
+    assert batch["rsi"].shape == (1,)
+    assert math.isnan(batch["sma_200"][0])
+
+    with pytest.raises(ValueError):
+        TAIndicators.calculate_batch(high, low, close[:, :-1], volume)
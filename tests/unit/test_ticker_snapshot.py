@@ -0,0 +1,110 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from cloud_trader.data.ticker_snapshot import TickerSnapshotEngine
+from cloud_trader.position_manager import PositionManager
+
+
+def _ticker(symbol, last, change="1.5"):
+    return {
+        "symbol": symbol,
+        "lastPrice": str(last),
+        "priceChangePercent": change,
+        "highPrice": str(last * 1.1),
+        "lowPrice": str(last * 0.9),
+        "volume": "1000",
+        "closeTime": 1,
+    }
+
+
+class BulkClient:
+    def __init__(self, prices):
+        self.prices = prices
+        self.bulk_calls = 0
+        self.single_calls = 0
+
+    async def get_all_tickers(self):
+        self.bulk_calls += 1
+        await asyncio.sleep(0)
+        return [_ticker(s, p) for s, p in self.prices.items()]
+
+    async def get_ticker(self, symbol):
+        self.single_calls += 1
+        return _ticker(symbol, self.prices[symbol])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_consumers_share_one_bulk_request():
+    client = BulkClient({"BTCUSDC": 60000.0, "ETHUSDC": 3000.0})
+    engine = TickerSnapshotEngine(client, refresh_interval=60)
+
+    snapshots = await asyncio.gather(*(engine.get() for _ in range(5)))
+
+    assert client.bulk_calls == 1 and client.single_calls == 0
+    assert all(s is snapshots[0] for s in snapshots)
+    snapshot = snapshots[0]
+    assert set(snapshot) == {"BTCUSDC", "ETHUSDC"}
+    assert float(snapshot["BTCUSDC"].get("lastPrice", 0)) == 60000.0
+    assert snapshot["ETHUSDC"]["symbol"] == "ETHUSDC"
+    assert snapshot["ETHUSDC"].get("quoteVolume", 0) == 0  # field missing from payload
+    assert snapshot.price("SOLUSDC") == 0.0 and "SOLUSDC" not in snapshot
+
+    column = snapshot.column("lastPrice")
+    assert np.shares_memory(column, snapshot.values)
+    with pytest.raises(ValueError):
+        column[0] = 1.0
+
+
+@pytest.mark.asyncio
+async def test_published_snapshots_are_not_mutated_by_later_refreshes():
+    client = BulkClient({"BTCUSDC": 60000.0})
+    engine = TickerSnapshotEngine(client, refresh_interval=0)
+    first = await engine.get()
+
+    client.prices = {"BTCUSDC": 61000.0, "ARBUSDC": 1.2}
+    second = await engine.get()
+
+    assert first["BTCUSDC"]["lastPrice"] == 60000.0 and "ARBUSDC" not in first
+    assert second["BTCUSDC"]["lastPrice"] == 61000.0 and second.version == first.version + 1
+
+    # Partial stream push keeps the other symbols
+    merged = engine.publish([_ticker("ARBUSDC", 1.3)], merge=True)
+    assert merged["BTCUSDC"]["lastPrice"] == 61000.0
+    assert merged["ARBUSDC"]["lastPrice"] == pytest.approx(1.3)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_serves_last_snapshot():
+    client = BulkClient({"BTCUSDC": 60000.0})
+    engine = TickerSnapshotEngine(client, refresh_interval=0)
+    good = await engine.get()
+
+    async def boom():
+        raise ConnectionError("down")
+
+    client.get_all_tickers = boom
+    assert await engine.get() is good
+    assert engine.stats["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_positions_uses_one_request_and_updates_prices():
+    client = BulkClient({"BTCUSDC": 60000.0, "ETHUSDC": 3000.0})
+    manager = PositionManager(None, {})
+    manager.exchange_client = client
+    manager.open_positions["BTCUSDC"] = {
+        "side": "BUY",
+        "entry_price": 50000.0,
+        "sl_price": 48000.0,
+        "agent": None,
+    }
+
+    ticker_map = await manager.monitor_positions()
+
+    assert client.bulk_calls == 1 and client.single_calls == 0
+    assert manager.open_positions["BTCUSDC"]["current_price"] == 60000.0
+    # > 3% in profit: trailing stop locked above entry
+    assert manager.open_positions["BTCUSDC"]["sl_price"] > 50000.0
+    assert ticker_map is await manager.ticker_snapshots.get()
@@ -0,0 +1,84 @@
+import statistics
+
+import numpy as np
+import pytest
+
+from cloud_trader.trade_correlation import RollingCorrelationEngine, TradeCorrelationAnalyzer
+
+
+def _prices(n_symbols, n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.01, n_bars)
+    returns = rng.normal(0, 0.01, (n_symbols, n_bars))
+    returns[:3] += 2 * factor  # one tightly correlated cluster
+    return 100 * np.cumprod(1 + returns, axis=1)
+
+
+def test_incremental_moments_match_full_recompute_across_ring_wrap():
+    prices = _prices(6, 130)
+    symbols = [f"S{i}" for i in range(6)]
+    engine = RollingCorrelationEngine(window=50, min_samples=10, capacity=2)  # forces growth
+
+    for bar in range(prices.shape[1]):
+        engine.update(dict(zip(symbols, prices[:, bar])))
+        if bar == 74:  # mid-window: running sums only, no periodic recompute yet
+            returns = np.diff(prices[:, : bar + 1], axis=1) / prices[:, :bar]
+            expected = np.corrcoef(returns[:, -50:])
+            np.testing.assert_allclose(engine.correlation(), expected, atol=1e-9)
+
+    returns = np.diff(prices, axis=1) / prices[:, :-1]
+    np.testing.assert_allclose(engine.correlation(), np.corrcoef(returns[:, -50:]), atol=1e-9)
+    assert engine.sample_size() == 50
+
+
+def test_missing_bars_use_pairwise_overlap():
+    prices = _prices(3, 60, seed=1)
+    engine = RollingCorrelationEngine(window=100, min_samples=10)
+    for bar in range(60):
+        quotes = {"A": prices[0, bar], "B": prices[1, bar], "C": prices[2, bar]}
+        if bar % 3 == 0:
+            del quotes["C"]  # C misses every third bar
+        engine.update(quotes)
+
+    returns = {s: np.full(60, np.nan) for s in "ABC"}
+    last = {}
+    for bar in range(60):
+        for i, s in enumerate("ABC"):
+            if s == "C" and bar % 3 == 0:
+                continue
+            if s in last:
+                returns[s][bar] = prices[i, bar] / last[s] - 1
+            last[s] = prices[i, bar]
+    both = ~np.isnan(returns["A"]) & ~np.isnan(returns["C"])
+    expected = statistics.correlation(list(returns["A"][both]), list(returns["C"][both]))
+
+    corr = engine.correlation()
+    assert corr[engine.index["A"], engine.index["C"]] == pytest.approx(expected, abs=1e-9)
+    assert np.isnan(RollingCorrelationEngine(min_samples=10).correlation()).all()
+
+
+def test_analyzer_clusters_risk_and_betas():
+    prices = _prices(8, 120, seed=2)
+    symbols = [f"S{i}" for i in range(8)]
+    analyzer = TradeCorrelationAnalyzer(correlation_window=100)
+    for bar in range(120):
+        for symbol, price in zip(symbols, prices[:, bar]):
+            analyzer.add_price_data(symbol, price)  # per-symbol ticks are grouped into bars
+
+    matrix = analyzer.get_correlation_matrix()
+    assert matrix is analyzer.get_correlation_matrix()  # no new bar: same snapshot
+    assert matrix.sample_size == 100
+    groups = matrix.get_highly_correlated_groups(0.6)
+    assert groups == [{"S0", "S1", "S2"}]
+    assert matrix.get_highly_correlated_groups(0.6) == groups  # served from the cache
+    assert matrix.get_correlation("S0", "S0") == 1.0
+    assert matrix.get_correlation("S0", "UNKNOWN") == 0.0
+    assert ("S0", "S1") in matrix.correlations
+
+    risk = analyzer.get_symbol_correlation_risk("S0")
+    assert set(risk["highly_correlated_symbols"]) == {"S1", "S2"}
+    assert 0 < risk["recommended_limit"] < 1.0
+
+    assert analyzer.symbol_betas["S0"] > analyzer.symbol_betas["S7"]
+    clusters = analyzer.get_correlation_clusters()
+    assert clusters[0]["size"] == 3 and clusters[0]["avg_correlation"] > 0.6
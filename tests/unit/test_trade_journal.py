@@ -0,0 +1,133 @@
+import json
+import os
+
+import pytest
+
+from cloud_trader.trade_journal import JOURNAL_FILE, TradeJournal
+
+
+class FakeStorage:
+    def __init__(self, ready=True):
+        self.ready = ready
+        self.batches = []
+
+    def is_ready(self):
+        return self.ready
+
+    async def insert_batch(self, trades=None, positions=None):
+        if not self.ready:
+            return False
+        self.batches.append((list(trades or []), list(positions or [])))
+        return True
+
+
+def _trade(i, price=100.0):
+    return {
+        "id": i,
+        "timestamp": 1_700_000_000 + i,
+        "symbol": "BTCUSDC",
+        "side": "BUY",
+        "price": price,
+        "quantity": 0.5,
+        "value": price * 0.5,
+        "agent_id": "a1",
+    }
+
+
+def _position(qty, current=100.0):
+    return {
+        "symbol": "BTCUSDC",
+        "side": "BUY",
+        "quantity": qty,
+        "entry_price": 100.0,
+        "current_price": current,
+        "agent_id": "a1",
+        "agent": object(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_group_commit_and_incremental_position_snapshots(tmp_path):
+    storage = FakeStorage()
+    journal = TradeJournal(str(tmp_path), storage=storage, batch_size=50)
+    journal.recover()
+
+    for i in range(3):
+        journal.record_trade(_trade(i))
+    positions = {"BTCUSDC": _position(1.0)}
+    assert journal.snapshot_positions(positions) == 1
+    assert journal.snapshot_positions(positions) == 0  # unchanged: nothing appended
+    positions["ETHUSDC"] = {**_position(2.0), "symbol": "ETHUSDC", "side": "SELL"}
+    assert journal.snapshot_positions(positions) == 1
+    del positions["BTCUSDC"]
+    assert journal.snapshot_positions(positions) == 1
+
+    assert storage.batches == []  # nothing committed on the write path
+    assert await journal.flush() == 6
+
+    [(trades, position_rows)] = storage.batches
+    assert [t["order_id"] for t in trades] == ["0", "1", "2"]
+    assert trades[0]["notional"] == 50.0 and trades[0]["timestamp"].year == 2023
+    assert [(p["symbol"], p["side"], p["status"]) for p in position_rows] == [
+        ("BTCUSDC", "LONG", "open"),
+        ("ETHUSDC", "SHORT", "open"),
+        ("BTCUSDC", "LONG", "closed"),
+    ]
+    assert await journal.flush() == 0
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_crash_recovery_replays_uncommitted_rows(tmp_path):
+    storage = FakeStorage()
+    journal = TradeJournal(str(tmp_path), storage=storage)
+    journal.recover()
+    journal.record_trade(_trade(1))
+    await journal.flush()
+    journal.record_trade(_trade(2))
+    journal.snapshot_positions({"BTCUSDC": _position(1.5)})
+    # Crash: no close(), plus a torn half-written line at the tail
+    with open(tmp_path / JOURNAL_FILE, "a") as f:
+        f.write('{"t": "trade", "d": {"id"')
+
+    restarted_storage = FakeStorage()
+    restarted = TradeJournal(str(tmp_path), storage=restarted_storage)
+    trades, positions = restarted.recover()
+
+    assert [t["id"] for t in trades] == [2, 1]  # newest first
+    assert positions["BTCUSDC"]["quantity"] == 1.5 and "agent" not in positions["BTCUSDC"]
+    assert restarted.snapshot_positions({"BTCUSDC": {**positions["BTCUSDC"]}}) == 0
+
+    await restarted.flush()
+    [(trade_rows, position_rows)] = restarted_storage.batches
+    assert [t["order_id"] for t in trade_rows] == ["2"]  # #1 was already committed
+    assert len(position_rows) == 1
+
+    restarted.record_trade(_trade(3))  # appends cleanly after the truncated tail
+    await restarted.close()
+    lines = (tmp_path / JOURNAL_FILE).read_text().splitlines()
+    assert all(json.loads(line) for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_storage_outage_keeps_rows_pending_and_compaction_keeps_state(tmp_path):
+    storage = FakeStorage(ready=False)
+    journal = TradeJournal(str(tmp_path), storage=storage, max_trades=5, compact_records=20)
+    journal.recover()
+    for i in range(30):
+        journal.record_trade(_trade(i))
+        journal.snapshot_positions({"BTCUSDC": _position(1.0, current=100.0 + i)})
+
+    assert await journal.flush() == 0
+    storage.ready = True
+    assert await journal.flush() == 60
+
+    await journal.compact()
+    lines = (tmp_path / JOURNAL_FILE).read_text().splitlines()
+    assert len(lines) == 6  # 5 retained trades + 1 live position
+    await journal.close()
+
+    trades, positions = TradeJournal(str(tmp_path), max_trades=5).recover()
+    assert [t["id"] for t in trades] == [29, 28, 27, 26, 25]
+    assert positions["BTCUSDC"]["current_price"] == 129.0
+    assert os.path.exists(tmp_path / "trading_journal.ckpt")
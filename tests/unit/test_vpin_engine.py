@@ -0,0 +1,90 @@
+import random
+import statistics
+
+import pytest
+
+from cloud_trader.data.vpin import RollingDistribution, VpinEngine
+
+
+def _agg_trade(symbol, price, qty, ts_ms=0):
+    return {"e": "aggTrade", "s": symbol, "p": str(price), "q": str(qty), "T": ts_ms, "m": False}
+
+
+def test_rolling_distribution_matches_full_recompute():
+    rng = random.Random(5)
+    dist = RollingDistribution(20)
+    values = []
+    for _ in range(75):
+        value = rng.random()
+        dist.push(value)
+        values = (values + [value])[-20:]
+
+        probe = rng.random()
+        assert dist.cdf(probe) == sum(1 for v in values if v <= probe) / len(values)
+        assert dist.mean() == pytest.approx(statistics.mean(values))
+        if len(values) > 1:
+            assert dist.stdev() == pytest.approx(statistics.stdev(values))
+
+
+def test_trades_fill_equal_volume_buckets_and_spill_over():
+    engine = VpinEngine(bucket_volume=10.0, window=4)
+
+    assert engine.on_trade("BTCUSDT", 100.0, 6.0) is None
+    reading = engine.on_trade("BTCUSDT", 100.0, 9.0)  # closes one bucket, 5 spills over
+
+    assert reading["buckets"] == 1
+    assert reading["bucket_fill"] == pytest.approx(0.5)
+    # Unchanged prices classify half buy / half sell: no imbalance
+    assert reading["vpin"] == pytest.approx(0.0)
+
+    # One large trade closes several buckets at once
+    reading = engine.on_trade("BTCUSDT", 100.0, 35.0)
+    assert reading["buckets"] == 5
+
+
+def test_one_sided_flow_is_toxic_and_balanced_flow_is_not():
+    engine = VpinEngine(bucket_volume=50.0, window=10)
+    price = 100.0
+    for i in range(400):
+        price += 0.01
+        engine.handle_message(_agg_trade("BUYUSDT", price, 5.0, i))
+    for i in range(400):
+        price += 0.01 if i % 2 else -0.01
+        engine.handle_message({"stream": "x", "data": _agg_trade("MIXUSDT", price, 5.0, i)})
+
+    toxic = engine.snapshot("BUYUSDT")
+    assert toxic["vpin"] > 0.5
+    assert toxic["confidence"] == 1.0
+    assert toxic["timestamp_us"] == 399_000
+    assert engine.vpin("MIXUSDT") < 0.2
+    assert set(engine.snapshots()) == {"BUYUSDT", "MIXUSDT"}
+    assert engine.snapshot("ETHUSDT") is None
+
+
+def test_rolling_vpin_tracks_last_window_of_buckets():
+    engine = VpinEngine(bucket_volume=1.0, window=5, cdf_window=50)
+    rng = random.Random(11)
+    price = 100.0
+    for _ in range(300):
+        price += rng.choice([-0.02, -0.01, 0.0, 0.01, 0.03])
+        engine.on_trade("SOLUSDT", price, rng.choice([0.25, 0.5, 1.0, 2.5]))
+
+    state = engine._states["SOLUSDT"]
+    assert state.count == 5
+    assert state.vpin == pytest.approx(sum(state.imbalances) / 5)
+
+    reading = engine.snapshot("SOLUSDT")
+    assert 0.0 <= reading["cdf"] <= 1.0
+    assert reading["percentile"] == pytest.approx(reading["cdf"] * 100)
+
+
+def test_bucket_resize_applies_from_next_bucket():
+    engine = VpinEngine(bucket_volume=10.0)
+    engine.on_trade("BTCUSDT", 100.0, 4.0)
+    engine.set_bucket_volume("BTCUSDT", 20.0)
+
+    reading = engine.on_trade("BTCUSDT", 100.0, 6.0)
+    assert reading["buckets"] == 1 and reading["bucket_volume"] == 20.0
+
+    with pytest.raises(ValueError):
+        engine.set_bucket_volume("BTCUSDT", 0)
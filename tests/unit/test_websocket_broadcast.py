@@ -0,0 +1,133 @@
+import asyncio
+import importlib
+import json
+import sys
+import time
+import types
+
+import pytest
+
+# Integration suites replace this module with a MagicMock at collection time
+if not isinstance(sys.modules.get("cloud_trader.websocket_manager"), types.ModuleType):
+    sys.modules.pop("cloud_trader.websocket_manager", None)
+websocket_manager = importlib.import_module("cloud_trader.websocket_manager")
+MessageType = websocket_manager.MessageType
+SubscriptionType = websocket_manager.SubscriptionType
+WebSocketClient = websocket_manager.WebSocketClient
+WebSocketManager = websocket_manager.WebSocketManager
+WebSocketMessage = websocket_manager.WebSocketMessage
+
+
+class FakeSocket:
+    def __init__(self, blocked=False):
+        self.texts = []
+        self.blocked = blocked
+        self._never = asyncio.Event()
+
+    async def send_text(self, text):
+        if self.blocked:
+            await self._never.wait()
+        self.texts.append(text)
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+def _join(manager, client_id, *subscriptions, blocked=False):
+    socket = FakeSocket(blocked=blocked)
+    client = WebSocketClient(socket, client_id)
+    manager.clients[client_id] = client
+    for subscription in subscriptions:
+        client.subscriptions.add(subscription)
+        manager.subscriptions[subscription].add(client_id)
+    return socket
+
+
+def _message(message_type, subscription, data, priority=2):
+    return WebSocketMessage(message_type, subscription, data, priority=priority)
+
+
+async def _drain(manager):
+    while any(manager.message_queues.values()):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_serializes_once_and_shares_text(monkeypatch):
+    calls = []
+    real_dumps = websocket_manager.dumps
+    monkeypatch.setattr(websocket_manager, "dumps", lambda d: calls.append(d) or real_dumps(d))
+
+    manager = WebSocketManager()
+    for i in range(3):
+        _join(manager, f"c{i}", SubscriptionType.ALL_TRADES)
+
+    await manager._process_message(
+        _message(MessageType.TRADE_UPDATE, SubscriptionType.ALL_TRADES, {"symbol": "BTCUSDC"})
+    )
+
+    assert len(calls) == 1
+    texts = [client.outbox[0] for client in manager.clients.values()]
+    assert all(text is texts[0] for text in texts)
+    assert await manager.flush(timeout=1.0)
+    assert json.loads(texts[0])["data"] == {"symbol": "BTCUSDC"}
+    assert manager.stats["messages_sent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_superseded_snapshots_coalesce_and_priority_is_kept():
+    manager = WebSocketManager()
+    for i in range(100):
+        await manager.broadcast_message(
+            _message(MessageType.PORTFOLIO_UPDATE, SubscriptionType.PORTFOLIO_CHANGES, {"n": i})
+        )
+    for i in range(3):
+        await manager.broadcast_message(
+            _message(MessageType.LOG, SubscriptionType.LOGS, {"line": i}, priority=1)
+        )
+    await manager.broadcast_message(
+        _message(MessageType.ALERT, SubscriptionType.SYSTEM_ALERTS, {"a": 1}, priority=4)
+    )
+
+    batch = manager._next_batch()
+
+    assert [m.message_type for m in batch] == [
+        MessageType.ALERT,
+        MessageType.PORTFOLIO_UPDATE,
+        MessageType.LOG,
+        MessageType.LOG,
+        MessageType.LOG,
+    ]
+    assert batch[1].data == {"n": 99}
+    assert manager.stats["messages_coalesced"] == 99
+    assert manager._next_batch() == [] and not manager._latest
+
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_while_others_keep_up():
+    manager = WebSocketManager()
+    fast = _join(manager, "fast", SubscriptionType.LOGS)
+    slow = _join(manager, "slow", SubscriptionType.LOGS, blocked=True)
+    loop_task = asyncio.create_task(manager._broadcast_loop())
+
+    count = 5000
+    started = time.perf_counter()
+    for i in range(count):
+        await manager.broadcast_message(
+            _message(MessageType.LOG, SubscriptionType.LOGS, {"line": i}, priority=1)
+        )
+    await _drain(manager)
+    assert not await manager.flush(timeout=0.2)  # the slow socket never finishes
+    elapsed = time.perf_counter() - started
+
+    assert len(fast.texts) == count and json.loads(fast.texts[-1])["data"] == {"line": count - 1}
+    assert elapsed < 5.0  # the old 10ms poll needed ~50s for this
+    slow_client = manager.clients["slow"]
+    assert slow.texts == [] and slow_client.dropped > 0
+    assert len(slow_client.outbox) <= websocket_manager.CLIENT_SEND_BUFFER
+
+    manager._shutdown_event.set()
+    manager._pending.set()
+    await asyncio.wait_for(loop_task, 1.0)
+    for client_id in ("fast", "slow"):
+        await manager._disconnect_client(client_id, "test")